@@ -1,8 +1,4 @@
 import logging
-import mimetypes
-import os
-
-from wsgiref.util import FileWrapper
 
 from rest_framework import status
 from rest_framework.generics import (
@@ -14,8 +10,6 @@ from rest_framework.generics import (
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from django.http import StreamingHttpResponse
-
 import auditor
 
 from api.build_jobs.serializers import (
@@ -25,7 +19,8 @@ from api.build_jobs.serializers import (
     BuildJobStatusSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
-from api.utils.views import AuditorMixinView, ListCreateAPIView
+from api.pagination import KeysetPagination
+from api.utils.views import AuditorMixinView, ListCreateAPIView, LogsViewMixin
 from db.models.build_jobs import BuildJob, BuildJobStatus
 from event_manager.events.build_job import (
     BUILD_JOB_CREATED,
@@ -50,6 +45,7 @@ class ProjectBuildListView(ListCreateAPIView):
     """List/Create an build under a project"""
     queryset = BuildJob.objects.all()
     serializer_class = BuildJobSerializer
+    pagination_class = KeysetPagination
     create_serializer_class = BuildJobCreateSerializer
     permission_classes = (IsAuthenticated,)
     filter_backends = (QueryFilter, OrderingFilter,)
@@ -119,6 +115,8 @@ class BuildViewMixin(object):
 class BuildStatusListView(BuildViewMixin, ListCreateAPIView):
     queryset = BuildJobStatus.objects.order_by('created_at').all()
     serializer_class = BuildJobStatusSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('created_at', 'id')
     permission_classes = (IsAuthenticated,)
 
     def perform_create(self, serializer):
@@ -139,7 +137,7 @@ class BuildStatusDetailView(BuildViewMixin, RetrieveAPIView):
     lookup_field = 'uuid'
 
 
-class BuildLogsView(BuildViewMixin, RetrieveAPIView):
+class BuildLogsView(BuildViewMixin, LogsViewMixin, RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request, *args, **kwargs):
@@ -149,19 +147,7 @@ class BuildLogsView(BuildViewMixin, RetrieveAPIView):
                        actor_id=request.user.id)
         log_path = get_job_logs_path(job.unique_name)
 
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_response(log_path)
 
 
 class BuildStopView(CreateAPIView):
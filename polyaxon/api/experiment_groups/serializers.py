@@ -49,12 +49,19 @@ class ExperimentGroupSerializer(serializers.ModelSerializer):
         return obj.user.username
 
     def get_num_experiments(self, obj):
+        # Annotated by the list views
+        if hasattr(obj, 'num_experiments'):
+            return obj.num_experiments
         return obj.experiments.count()
 
     def get_num_pending_experiments(self, obj):
+        if hasattr(obj, 'num_pending_experiments'):
+            return obj.num_pending_experiments
         return obj.pending_experiments.count()
 
     def get_num_running_experiments(self, obj):
+        if hasattr(obj, 'num_running_experiments'):
+            return obj.num_running_experiments
         return obj.running_experiments.count()
 
 
@@ -10,8 +10,13 @@ from api.experiment_groups.serializers import (
     ExperimentGroupSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
+from api.pagination import KeysetPagination
 from api.utils.views import AuditorMixinView, ListCreateAPIView
+from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment
+from db.models.tensorboards import TensorboardJob
+from db.models.utils import get_count_subquery, get_last_status_subquery
 from event_manager.events.experiment_group import (
     EXPERIMENT_GROUP_DELETED_TRIGGERED,
     EXPERIMENT_GROUP_STOPPED_TRIGGERED,
@@ -26,8 +31,19 @@ from polyaxon.settings import SchedulerCeleryTasks
 
 
 class ExperimentGroupListView(ListCreateAPIView):
-    queryset = ExperimentGroup.objects.all()
+    queryset = ExperimentGroup.objects.select_related('user', 'project__user', 'status').annotate(
+        num_experiments=get_count_subquery(Experiment, 'experiment_group'),
+        num_pending_experiments=get_count_subquery(
+            Experiment,
+            'experiment_group',
+            status__status__in=ExperimentLifeCycle.PENDING_STATUS),
+        num_running_experiments=get_count_subquery(
+            Experiment,
+            'experiment_group',
+            status__status__in=ExperimentLifeCycle.RUNNING_STATUS),
+        tensorboard_status=get_last_status_subquery(TensorboardJob, 'experiment_group'))
     serializer_class = ExperimentGroupSerializer
+    pagination_class = KeysetPagination
     create_serializer_class = ExperimentGroupDetailSerializer
     permission_classes = (IsAuthenticated,)
     filter_backends = (QueryFilter, OrderingFilter,)
@@ -136,6 +136,9 @@ class ExperimentSerializer(serializers.ModelSerializer):
         return obj.project.unique_name
 
     def get_num_jobs(self, obj):
+        # Annotated by the list views
+        if hasattr(obj, 'num_jobs'):
+            return obj.num_jobs
         return obj.jobs.count()
 
     def get_last_metric(self, obj):
@@ -31,6 +31,9 @@ experiments_urlpatterns = [
     re_path(r'^{}/{}/experiments/{}/metrics/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentMetricListView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/metrics/series/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
+        views.ExperimentMetricSeriesView.as_view()),
     re_path(r'^{}/{}/experiments/{}/statuses/{}/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN, UUID_PATTERN),
         views.ExperimentStatusDetailView.as_view()),
@@ -40,6 +43,9 @@ experiments_urlpatterns = [
     re_path(r'^{}/{}/experiments/{}/logs/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
         views.ExperimentLogsView.as_view()),
+    re_path(r'^{}/{}/experiments/{}/logs/search/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, EXPERIMENT_ID_PATTERN),
+        views.ExperimentLogsSearchView.as_view()),
     re_path(
         r'^{}/{}/experiments/{}/stop/?$'.format(USERNAME_PATTERN, NAME_PATTERN, ID_PATTERN),
         views.ExperimentStopView.as_view()),
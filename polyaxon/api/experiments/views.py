@@ -1,8 +1,4 @@
 import logging
-import mimetypes
-import os
-
-from wsgiref.util import FileWrapper
 
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -18,8 +14,6 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 
-from django.http import StreamingHttpResponse
-
 import auditor
 
 from api.experiments.serializers import (
@@ -33,16 +27,20 @@ from api.experiments.serializers import (
     ExperimentStatusSerializer
 )
 from api.filters import OrderingFilter, QueryFilter
-from api.utils.views import AuditorMixinView, ListCreateAPIView
+from api.pagination import KeysetPagination
+from api.utils.views import AuditorMixinView, ListCreateAPIView, LogsViewMixin
 from db.models.experiment_groups import ExperimentGroup
 from db.models.experiment_jobs import ExperimentJob, ExperimentJobStatus
 from db.models.experiments import Experiment, ExperimentMetric, ExperimentStatus
+from db.models.tensorboards import TensorboardJob
+from db.models.utils import get_count_subquery, get_last_status_subquery
 from event_manager.events.experiment import (
     EXPERIMENT_COPIED_TRIGGERED,
     EXPERIMENT_CREATED,
     EXPERIMENT_DELETED_TRIGGERED,
     EXPERIMENT_JOBS_VIEWED,
     EXPERIMENT_LOGS_VIEWED,
+    EXPERIMENT_METRICS_VIEWED,
     EXPERIMENT_RESTARTED_TRIGGERED,
     EXPERIMENT_RESUMED_TRIGGERED,
     EXPERIMENT_STATUSES_VIEWED,
@@ -56,6 +54,8 @@ from event_manager.events.experiment_job import (
     EXPERIMENT_JOB_VIEWED
 )
 from event_manager.events.project import PROJECT_EXPERIMENTS_VIEWED
+from libs.downsampling import LTTB, METHODS, downsample
+from libs.metric_series import create_metrics, get_metric_names, get_metric_series
 from libs.paths.experiments import get_experiment_logs_path
 from libs.permissions.authentication import InternalAuthentication
 from libs.permissions.internal import IsAuthenticatedOrInternal
@@ -68,17 +68,32 @@ from polyaxon.settings import SchedulerCeleryTasks
 _logger = logging.getLogger("polyaxon.views.experiments")
 
 
+def get_experiments_list_queryset():
+    """Fetches everything the list serializer needs in a single query."""
+    return Experiment.objects.select_related(
+        'user',
+        'project__user',
+        'experiment_group__project__user',
+        'status',
+        'metric',
+    ).annotate(
+        num_jobs=get_count_subquery(ExperimentJob, 'experiment'),
+        tensorboard_status=get_last_status_subquery(TensorboardJob, 'experiment'))
+
+
 class ExperimentListView(ListAPIView):
     """List all experiments"""
-    queryset = Experiment.objects.all()
+    queryset = get_experiments_list_queryset()
     serializer_class = ExperimentSerializer
+    pagination_class = KeysetPagination
     permission_classes = (IsAuthenticated,)
 
 
 class ProjectExperimentListView(ListCreateAPIView):
     """List/Create an experiment under a project"""
-    queryset = Experiment.objects.all()
+    queryset = get_experiments_list_queryset()
     serializer_class = ExperimentSerializer
+    pagination_class = KeysetPagination
     create_serializer_class = ExperimentCreateSerializer
     permission_classes = (IsAuthenticated,)
     filter_backends = (QueryFilter, OrderingFilter,)
@@ -251,6 +266,8 @@ class ExperimentViewMixin(object):
 class ExperimentStatusListView(ExperimentViewMixin, ListCreateAPIView):
     queryset = ExperimentStatus.objects.order_by('created_at').all()
     serializer_class = ExperimentStatusSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('created_at', 'id')
     permission_classes = (IsAuthenticated,)
 
     def perform_create(self, serializer):
@@ -265,8 +282,10 @@ class ExperimentStatusListView(ExperimentViewMixin, ListCreateAPIView):
 
 
 class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
-    queryset = ExperimentMetric.objects.all()
+    queryset = ExperimentMetric.objects.select_related('experiment')
     serializer_class = ExperimentMetricSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('created_at', 'id')
     authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES + [
         InternalAuthentication,
     ]
@@ -275,6 +294,60 @@ class ExperimentMetricListView(ExperimentViewMixin, ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(experiment=self.get_experiment())
 
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+
+        # A batch of metrics
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        metrics = create_metrics(experiment=self.get_experiment(),
+                                 metrics=serializer.validated_data)
+        return Response(self.get_serializer(metrics, many=True).data,
+                        status=status.HTTP_201_CREATED)
+
+
+class ExperimentMetricSeriesView(ExperimentViewMixin, RetrieveAPIView):
+    """Returns the time series of an experiment metric, downsampled to `points` values.
+
+    Query params:
+        * metric: the name of the metric, if not provided the metric names are returned.
+        * points: the max number of values to return.
+        * method: the downsampling method, `lttb` or `minmax`.
+    """
+    permission_classes = (IsAuthenticated,)
+    DEFAULT_POINTS = 1000
+
+    def get(self, request, *args, **kwargs):
+        experiment = self.get_experiment()
+        auditor.record(event_type=EXPERIMENT_METRICS_VIEWED,
+                       instance=self.experiment,
+                       actor_id=request.user.id)
+        name = request.query_params.get('metric')
+        if not name:
+            return Response(data={'metrics': get_metric_names(experiment.id)},
+                            status=status.HTTP_200_OK)
+
+        method = request.query_params.get('method', LTTB)
+        if method not in METHODS:
+            raise ValidationError('`method` must be one of {}.'.format(METHODS))
+        try:
+            num_points = int(request.query_params.get('points', self.DEFAULT_POINTS))
+        except ValueError:
+            num_points = -1
+        if num_points < 0:
+            raise ValidationError('`points` must be a positive integer.')
+
+        timestamps, values = get_metric_series(experiment.id, name)
+        indices = downsample(xs=timestamps, ys=values, num_points=num_points, method=method)
+        return Response(data={
+            'metric': name,
+            'num_values': len(values),
+            'steps': indices,
+            'timestamps': [timestamps[i] for i in indices],
+            'values': [values[i] for i in indices],
+        }, status=status.HTTP_200_OK)
+
 
 class ExperimentStatusDetailView(ExperimentViewMixin, RetrieveAPIView):
     queryset = ExperimentStatus.objects.all()
@@ -286,6 +359,7 @@ class ExperimentStatusDetailView(ExperimentViewMixin, RetrieveAPIView):
 class ExperimentJobListView(ExperimentViewMixin, ListCreateAPIView):
     queryset = ExperimentJob.objects.order_by('-updated_at').all()
     serializer_class = ExperimentJobSerializer
+    pagination_class = KeysetPagination
     create_serializer_class = ExperimentJobDetailSerializer
     permission_classes = (IsAuthenticated,)
 
@@ -308,7 +382,7 @@ class ExperimentJobDetailView(AuditorMixinView, ExperimentViewMixin, RetrieveUpd
     get_event = EXPERIMENT_JOB_VIEWED
 
 
-class ExperimentLogsView(ExperimentViewMixin, RetrieveAPIView):
+class ExperimentLogsView(ExperimentViewMixin, LogsViewMixin, RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request, *args, **kwargs):
@@ -318,19 +392,20 @@ class ExperimentLogsView(ExperimentViewMixin, RetrieveAPIView):
                        actor_id=request.user.id)
         log_path = get_experiment_logs_path(experiment.unique_name)
 
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_response(log_path)
+
+
+class ExperimentLogsSearchView(ExperimentViewMixin, LogsViewMixin, RetrieveAPIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        experiment = self.get_experiment()
+        auditor.record(event_type=EXPERIMENT_LOGS_VIEWED,
+                       instance=self.experiment,
+                       actor_id=request.user.id)
+        log_path = get_experiment_logs_path(experiment.unique_name)
+
+        return self.get_logs_search_response(log_path)
 
 
 class ExperimentJobViewMixin(object):
@@ -361,6 +436,8 @@ class ExperimentJobViewMixin(object):
 class ExperimentJobStatusListView(ExperimentJobViewMixin, ListCreateAPIView):
     queryset = ExperimentJobStatus.objects.order_by('created_at').all()
     serializer_class = ExperimentJobStatusSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('created_at', 'id')
     permission_classes = (IsAuthenticated,)
 
     def perform_create(self, serializer):
@@ -20,6 +20,9 @@ jobs_urlpatterns = [
     re_path(r'^{}/{}/jobs/{}/logs/?$'.format(
         USERNAME_PATTERN, NAME_PATTERN, JOB_ID_PATTERN),
         views.JobLogsView.as_view()),
+    re_path(r'^{}/{}/jobs/{}/logs/search/?$'.format(
+        USERNAME_PATTERN, NAME_PATTERN, JOB_ID_PATTERN),
+        views.JobLogsSearchView.as_view()),
     re_path(
         r'^{}/{}/jobs/{}/stop/?$'.format(USERNAME_PATTERN, NAME_PATTERN, ID_PATTERN),
         views.JobStopView.as_view()),
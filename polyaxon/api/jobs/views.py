@@ -1,8 +1,4 @@
 import logging
-import mimetypes
-import os
-
-from wsgiref.util import FileWrapper
 
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
@@ -15,8 +11,6 @@ from rest_framework.generics import (
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from django.http import StreamingHttpResponse
-
 import auditor
 
 from api.filters import OrderingFilter, QueryFilter
@@ -26,7 +20,8 @@ from api.jobs.serializers import (
     JobSerializer,
     JobStatusSerializer
 )
-from api.utils.views import AuditorMixinView, ListCreateAPIView
+from api.pagination import KeysetPagination
+from api.utils.views import AuditorMixinView, ListCreateAPIView, LogsViewMixin
 from db.models.jobs import Job, JobStatus
 from event_manager.events.job import (
     JOB_CREATED,
@@ -53,6 +48,7 @@ class ProjectJobListView(ListCreateAPIView):
     """List/Create an job under a project"""
     queryset = Job.objects.all()
     serializer_class = JobSerializer
+    pagination_class = KeysetPagination
     create_serializer_class = JobCreateSerializer
     permission_classes = (IsAuthenticated,)
     filter_backends = (QueryFilter, OrderingFilter,)
@@ -168,6 +164,8 @@ class JobViewMixin(object):
 class JobStatusListView(JobViewMixin, ListCreateAPIView):
     queryset = JobStatus.objects.order_by('created_at').all()
     serializer_class = JobStatusSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('created_at', 'id')
     permission_classes = (IsAuthenticated,)
 
     def perform_create(self, serializer):
@@ -188,7 +186,20 @@ class JobStatusDetailView(JobViewMixin, RetrieveAPIView):
     lookup_field = 'uuid'
 
 
-class JobLogsView(JobViewMixin, RetrieveAPIView):
+class JobLogsView(JobViewMixin, LogsViewMixin, RetrieveAPIView):
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request, *args, **kwargs):
+        job = self.get_job()
+        auditor.record(event_type=JOB_LOGS_VIEWED,
+                       instance=self.job,
+                       actor_id=request.user.id)
+        log_path = get_job_logs_path(job.unique_name)
+
+        return self.get_logs_response(log_path)
+
+
+class JobLogsSearchView(JobViewMixin, LogsViewMixin, RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get(self, request, *args, **kwargs):
@@ -198,19 +209,7 @@ class JobLogsView(JobViewMixin, RetrieveAPIView):
                        actor_id=request.user.id)
         log_path = get_job_logs_path(job.unique_name)
 
-        filename = os.path.basename(log_path)
-        chunk_size = 8192
-        try:
-            wrapped_file = FileWrapper(open(log_path, 'rb'), chunk_size)
-            response = StreamingHttpResponse(wrapped_file,
-                                             content_type=mimetypes.guess_type(log_path)[0])
-            response['Content-Length'] = os.path.getsize(log_path)
-            response['Content-Disposition'] = "attachment; filename={}".format(filename)
-            return response
-        except FileNotFoundError:
-            _logger.warning('Log file not found: log_path=%s', log_path)
-            return Response(status=status.HTTP_404_NOT_FOUND,
-                            data='Log file not found: log_path={}'.format(log_path))
+        return self.get_logs_search_response(log_path)
 
 
 class JobStopView(CreateAPIView):
@@ -0,0 +1,123 @@
+import base64
+
+from collections import OrderedDict
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from libs.utils import to_bool
+
+
+class KeysetPagination(LimitOffsetPagination):
+    """Limit/offset pagination, with an opt-in keyset pagination on `(created_at, id)`.
+
+    Passing the `cursor` query param, empty for the first page, switches to the keyset
+    pagination: the results are ordered by the view's `cursor_ordering`, and each page
+    starts after the position encoded in the cursor instead of skipping `offset` rows,
+    so the cost of a page does not depend on its depth.
+    The keyset pagination can not be combined with the ordering of the view's filters,
+    e.g. `sort`, since the cursor only encodes a position in the `cursor_ordering`.
+    The total count is only computed if `count=true` is passed.
+    """
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    cursor_ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    use_cursor = False
+    next_position = None
+
+    def get_cursor_ordering(self, view):
+        return getattr(view, 'cursor_ordering', self.cursor_ordering)
+
+    def validate_ordering(self, request, view):
+        for backend in getattr(view, 'filter_backends', ()):
+            ordering_param = getattr(backend, 'ordering_param', None)
+            if ordering_param and ordering_param in request.query_params:
+                raise ValidationError('`{}` can not be used with `{}`.'.format(
+                    ordering_param, self.cursor_query_param))
+
+    def should_count(self, request):
+        try:
+            return to_bool(request.query_params.get(self.count_query_param, False))
+        except (TypeError, ValueError):
+            raise ValidationError('`{}` must be a boolean.'.format(self.count_query_param))
+
+    @staticmethod
+    def encode_cursor(position):
+        created_at, pk = position
+        value = '{}|{}'.format(created_at.isoformat(), pk)
+        return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii')
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            value = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            created_at, pk = value.split('|')
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+    @staticmethod
+    def get_position_filter(ordering, position):
+        created_at, pk = position
+        if ordering[0].startswith('-'):
+            return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.use_cursor = self.cursor_query_param in request.query_params
+        if not self.use_cursor:
+            return super().paginate_queryset(queryset, request, view=view)
+
+        self.validate_ordering(request, view)
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.count = queryset.count() if self.should_count(request) else None
+        ordering = self.get_cursor_ordering(view)
+        queryset = queryset.order_by(*ordering)
+        position = self.decode_cursor(request)
+        if position:
+            queryset = queryset.filter(self.get_position_filter(ordering, position))
+
+        results = list(queryset[:self.limit + 1])
+        self.next_position = None
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_position = (results[-1].created_at, results[-1].id)
+        return results
+
+    def get_next_link(self):
+        if not self.use_cursor:
+            return super().get_next_link()
+        if self.next_position is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), self.offset_query_param)
+        return replace_query_param(url,
+                                   self.cursor_query_param,
+                                   self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        if not self.use_cursor:
+            return super().get_paginated_response(data)
+
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['results'] = data
+        return Response(response)
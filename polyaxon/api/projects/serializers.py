@@ -33,9 +33,14 @@ class ProjectSerializer(serializers.ModelSerializer):
         return obj.user.username
 
     def get_num_experiment_groups(self, obj):
+        # Annotated by the list views
+        if hasattr(obj, 'num_experiment_groups'):
+            return obj.num_experiment_groups
         return obj.experiment_groups.count()
 
     def get_num_experiments(self, obj):
+        if hasattr(obj, 'num_experiments'):
+            return obj.num_experiments
         return obj.experiments.count()
 
 
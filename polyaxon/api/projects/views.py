@@ -4,9 +4,15 @@ from rest_framework.permissions import IsAuthenticated
 
 import auditor
 
+from api.pagination import KeysetPagination
 from api.projects.serializers import ProjectDetailSerializer, ProjectSerializer
 from api.utils.views import AuditorMixinView
+from db.models.experiment_groups import ExperimentGroup
+from db.models.experiments import Experiment
+from db.models.notebooks import NotebookJob
 from db.models.projects import Project
+from db.models.tensorboards import TensorboardJob
+from db.models.utils import get_count_subquery, get_last_status_subquery
 from event_manager.events.project import (
     PROJECT_CREATED,
     PROJECT_DELETED_TRIGGERED,
@@ -31,8 +37,15 @@ class ProjectCreateView(CreateAPIView):
 
 
 class ProjectListView(ListAPIView):
-    queryset = Project.objects.order_by('-updated_at').all()
+    queryset = Project.objects.select_related('user', 'repo').annotate(
+        num_experiment_groups=get_count_subquery(ExperimentGroup, 'project'),
+        num_experiments=get_count_subquery(Experiment, 'project'),
+        notebook_status=get_last_status_subquery(NotebookJob, 'project'),
+        tensorboard_status=get_last_status_subquery(
+            TensorboardJob, 'project', experiment=None, experiment_group=None),
+    ).order_by('-updated_at')
     serializer_class = ProjectSerializer
+    pagination_class = KeysetPagination
     permission_classes = (IsAuthenticated,)
 
     def filter_queryset(self, queryset):
@@ -1,19 +1,29 @@
 import json
+import logging
+import mimetypes
 import os
+import re
 
 from rest_framework import exceptions as rest_exceptions
-from rest_framework import generics
+from rest_framework import generics, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from django.conf import settings
 from django.core import exceptions as django_exceptions
-from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import Http404, HttpResponse, HttpResponseRedirect, StreamingHttpResponse
 from django.urls import reverse
 
 import auditor
 
+from libs.date_utils import DateTimeFormatter, DateTimeFormatterException, to_timestamp
+from libs.log_search import MAX_SEARCH_RESULTS, LogsFilter, search_logs
+from libs.log_store import LogStore
+
+_logger = logging.getLogger('polyaxon.api.utils')
+
 
 class ListCreateAPIView(generics.ListCreateAPIView):
     create_serializer_class = None
@@ -121,3 +131,132 @@ class AuditorMixinView(object):
         auditor.record(event_type=self.delete_event,
                        instance=instance,
                        actor_id=self.request.user.id)
+
+
+class LogsViewMixin(object):
+    """A mixin to serve the logs of a log store, entirely or partially.
+
+    Query params:
+        * tail: returns the last `tail` lines.
+        * offset, limit: returns `limit` lines starting from the line `offset`.
+
+    A `Range: bytes=start-end` header returns the requested bytes of the logs.
+
+    Search query params:
+        * query: a substring to look for.
+        * regex: a regular expression to look for, without nested quantifiers.
+        * task_type, task_idx: the task that emitted the lines (experiments only).
+        * since, until: the time window, e.g. `2018-05-01 10:30`.
+        * limit: the max number of lines to return.
+    """
+    RANGE_PATTERN = re.compile(r'^bytes=(?P<start>\d*)-(?P<end>\d*)$')
+
+    @staticmethod
+    def _get_int_param(request, param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        try:
+            value = int(value)
+        except ValueError:
+            value = -1
+        if value < 0:
+            raise rest_exceptions.ValidationError(
+                '`{}` must be a positive integer.'.format(param))
+        return value
+
+    @staticmethod
+    def _get_time_param(request, param):
+        value = request.query_params.get(param)
+        if not value:
+            return None
+        try:
+            return to_timestamp(DateTimeFormatter.extract(value))
+        except DateTimeFormatterException:
+            raise rest_exceptions.ValidationError(
+                '`{}` must be a valid datetime.'.format(param))
+
+    @classmethod
+    def _get_range(cls, range_header, size):
+        """Returns the (start, end) of a single bytes range, end is exclusive."""
+        match = cls.RANGE_PATTERN.match(range_header.strip())
+        if not match or not (match.group('start') or match.group('end')):
+            return None
+        if not match.group('start'):
+            start = max(size - int(match.group('end')), 0)
+            end = size
+        else:
+            start = int(match.group('start'))
+            end = int(match.group('end')) + 1 if match.group('end') else size
+        end = min(end, size)
+        if start >= end:
+            return None
+        return start, end
+
+    def get_logs_response(self, log_path):
+        log_store = LogStore(log_path)
+        if not log_store.exists():
+            _logger.warning('Log file not found: log_path=%s', log_path)
+            return Response(status=status.HTTP_404_NOT_FOUND,
+                            data='Log file not found: log_path={}'.format(log_path))
+
+        tail = self._get_int_param(self.request, 'tail')
+        offset = self._get_int_param(self.request, 'offset')
+        limit = self._get_int_param(self.request, 'limit')
+        if tail is not None:
+            lines = log_store.tail(tail)
+            return HttpResponse('\n'.join(lines), content_type='text/plain')
+        if offset is not None or limit is not None:
+            lines = log_store.read_lines(offset=offset or 0, limit=limit)
+            return HttpResponse('\n'.join(lines), content_type='text/plain')
+
+        size = log_store.get_size()
+        range_header = self.request.META.get('HTTP_RANGE')
+        filename = os.path.basename(log_path)
+        if range_header:
+            byte_range = self._get_range(range_header, size)
+            if byte_range is None:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = 'bytes */{}'.format(size)
+                return response
+            start, end = byte_range
+            response = StreamingHttpResponse(log_store.iter_range(start=start, end=end),
+                                             status=status.HTTP_206_PARTIAL_CONTENT,
+                                             content_type=mimetypes.guess_type(log_path)[0])
+            response['Content-Length'] = end - start
+            response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end - 1, size)
+        else:
+            response = StreamingHttpResponse(log_store.iter_range(),
+                                             content_type=mimetypes.guess_type(log_path)[0])
+            response['Content-Length'] = size
+        response['Accept-Ranges'] = 'bytes'
+        response['Content-Disposition'] = "attachment; filename={}".format(filename)
+        return response
+
+    def get_logs_search_response(self, log_path):
+        log_store = LogStore(log_path)
+        if not log_store.exists():
+            _logger.warning('Log file not found: log_path=%s', log_path)
+            return Response(status=status.HTTP_404_NOT_FOUND,
+                            data='Log file not found: log_path={}'.format(log_path))
+
+        try:
+            logs_filter = LogsFilter(query=self.request.query_params.get('query'),
+                                     regex=self.request.query_params.get('regex'),
+                                     task_type=self.request.query_params.get('task_type'),
+                                     task_idx=self._get_int_param(self.request, 'task_idx'))
+        except re.error as e:
+            raise rest_exceptions.ValidationError('`regex` is not valid: {}.'.format(e))
+        except ValueError as e:
+            raise rest_exceptions.ValidationError(str(e))
+
+        limit = self._get_int_param(self.request, 'limit')
+        if limit == 0:
+            raise rest_exceptions.ValidationError('`limit` must be a positive integer.')
+        lines = search_logs(log_store=log_store,
+                            logs_filter=logs_filter,
+                            since=self._get_time_param(self.request, 'since'),
+                            until=self._get_time_param(self.request, 'until'),
+                            limit=min(limit or MAX_SEARCH_RESULTS, MAX_SEARCH_RESULTS))
+        return StreamingHttpResponse(('{}\n'.format(line) for line in lines),
+                                     content_type='text/plain')
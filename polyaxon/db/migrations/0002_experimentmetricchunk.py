@@ -0,0 +1,68 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+MAX_POINTS = 1000
+
+
+def backfill_metric_chunks(apps, schema_editor):
+    """Builds the metric series of the existing experiments from their metric reports."""
+    ExperimentMetric = apps.get_model('db', 'ExperimentMetric')
+    ExperimentMetricChunk = apps.get_model('db', 'ExperimentMetricChunk')
+
+    def get_chunks(experiment_id, series):
+        for name, (timestamps, values) in series.items():
+            for index, start in enumerate(range(0, len(values), MAX_POINTS)):
+                yield ExperimentMetricChunk(experiment_id=experiment_id,
+                                            name=name,
+                                            index=index,
+                                            num_points=len(values[start:start + MAX_POINTS]),
+                                            timestamps=timestamps[start:start + MAX_POINTS],
+                                            values=values[start:start + MAX_POINTS])
+
+    experiment_id = None
+    series = {}
+    metrics = ExperimentMetric.objects.order_by('experiment_id', 'created_at', 'id').values_list(
+        'experiment_id', 'created_at', 'values')
+    for metric_experiment_id, created_at, values in metrics.iterator():
+        if metric_experiment_id != experiment_id:
+            ExperimentMetricChunk.objects.bulk_create(get_chunks(experiment_id, series))
+            experiment_id = metric_experiment_id
+            series = {}
+        for name, value in (values or {}).items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            timestamps, points = series.setdefault(name, ([], []))
+            timestamps.append(created_at.timestamp())
+            points.append(value)
+    ExperimentMetricChunk.objects.bulk_create(get_chunks(experiment_id, series))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricChunk',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256)),
+                ('index', models.PositiveIntegerField(default=0)),
+                ('num_points', models.PositiveIntegerField(default=0)),
+                ('timestamps', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), default=list, help_text='The POSIX timestamps of the values.', size=None)),
+                ('values', django.contrib.postgres.fields.ArrayField(base_field=models.FloatField(), default=list, size=None)),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_chunks', to='db.Experiment')),
+            ],
+            options={
+                'ordering': ['index'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='experimentmetricchunk',
+            unique_together={('experiment', 'name', 'index')},
+        ),
+        migrations.RunPython(backfill_metric_chunks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0002_experimentmetricchunk'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='experiment',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='db_experiment_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentstatus',
+            index=models.Index(fields=['experiment', 'created_at', 'id'], name='db_experimentstatus_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentmetric',
+            index=models.Index(fields=['experiment', 'created_at', 'id'], name='db_experimentmetric_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentgroup',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='db_experimentgroup_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentjob',
+            index=models.Index(fields=['experiment', 'created_at', 'id'], name='db_experimentjob_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentjobstatus',
+            index=models.Index(fields=['job', 'created_at', 'id'], name='db_experimentjobstatus_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='db_job_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='jobstatus',
+            index=models.Index(fields=['job', 'created_at', 'id'], name='db_jobstatus_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='buildjob',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='db_buildjob_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='buildjobstatus',
+            index=models.Index(fields=['job', 'created_at', 'id'], name='db_buildjobstatus_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='db_project_keyset'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_metric_values(apps, schema_editor):
+    """Stores the numeric values of the last metric of the existing experiments."""
+    Experiment = apps.get_model('db', 'Experiment')
+    ExperimentMetricValue = apps.get_model('db', 'ExperimentMetricValue')
+
+    def get_metric_values():
+        experiments = Experiment.objects.filter(metric__isnull=False).values_list(
+            'id', 'experiment_group_id', 'metric_id', 'metric__values')
+        for experiment_id, experiment_group_id, metric_id, values in experiments.iterator():
+            for name, value in (values or {}).items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                yield ExperimentMetricValue(experiment_id=experiment_id,
+                                            experiment_group_id=experiment_group_id,
+                                            metric_id=metric_id,
+                                            name=name,
+                                            value=value)
+
+    ExperimentMetricValue.objects.bulk_create(get_metric_values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('db', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExperimentMetricValue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=256)),
+                ('value', models.FloatField()),
+                ('experiment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='metric_values', to='db.Experiment')),
+                ('experiment_group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.ExperimentGroup')),
+                ('metric', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='db.ExperimentMetric')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='experimentmetricvalue',
+            unique_together={('experiment', 'name')},
+        ),
+        migrations.AddIndex(
+            model_name='experimentmetricvalue',
+            index=models.Index(fields=['experiment_group', 'name', 'value'], name='db_experimentmetricvalue_group'),
+        ),
+        migrations.AddIndex(
+            model_name='experimentmetricvalue',
+            index=models.Index(fields=['name', 'value'], name='db_experimentmetricvalue_value'),
+        ),
+        migrations.RunPython(backfill_metric_values, migrations.RunPython.noop),
+    ]
@@ -81,6 +81,9 @@ class TensorboardJobMixin(object):
 
     @property
     def has_tensorboard(self):
+        if hasattr(self, 'tensorboard_status'):
+            # Annotated by the list views
+            return self.tensorboard_status and JobLifeCycle.is_running(self.tensorboard_status)
         tensorboard = self.tensorboard
         return tensorboard and tensorboard.is_running
 
@@ -44,6 +44,9 @@ class BuildJob(AbstractJob, NameableModel, DescribableModel, TagModel, JobMixin)
     class Meta:
         app_label = 'db'
         unique_together = (('project', 'name'),)
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='db_buildjob_keyset'),
+        ]
 
     @cached_property
     def unique_name(self):
@@ -89,3 +92,6 @@ class BuildJobStatus(AbstractJobStatus):
     class Meta(AbstractJobStatus.Meta):
         app_label = 'db'
         verbose_name_plural = 'Build Job Statuses'
+        indexes = [
+            models.Index(fields=['job', 'created_at', 'id'], name='db_buildjobstatus_keyset'),
+        ]
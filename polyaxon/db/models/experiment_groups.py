@@ -6,14 +6,14 @@ from operator import __or__ as OR
 
 from django.conf import settings
 from django.contrib.postgres.fields import JSONField
-from django.contrib.postgres.fields.jsonb import KeyTransform
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, OuterRef, Q, Subquery
 from django.utils.functional import cached_property
 
 from constants.experiment_groups import ExperimentGroupLifeCycle
 from constants.experiments import ExperimentLifeCycle
 from db.models.abstract_jobs import TensorboardJobMixin
+from db.models.experiments import ExperimentMetricValue
 from db.models.utils import (
     DescribableModel,
     DiffModel,
@@ -26,7 +26,7 @@ from db.models.utils import (
 from libs.spec_validation import validate_group_hptuning_config, validate_group_spec_content
 from polyaxon_schemas.hptuning import HPTuningConfig
 from polyaxon_schemas.polyaxonfile.specification import GroupSpecification
-from polyaxon_schemas.utils import Optimization
+from polyaxon_schemas.utils import Optimization, SearchAlgorithms
 
 _logger = logging.getLogger('polyaxon.db.experiment_groups')
 
@@ -82,6 +82,9 @@ class ExperimentGroup(DiffModel,
     class Meta:
         app_label = 'db'
         unique_together = (('project', 'name'),)
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='db_experimentgroup_keyset'),
+        ]
 
     def __str__(self):
         return self.unique_name
@@ -204,19 +207,21 @@ class ExperimentGroup(DiffModel,
         for early_stopping_metric in self.early_stopping:
             comparison = (
                 'gte' if Optimization.maximize(early_stopping_metric.optimization) else 'lte')
-            metric_filter = 'metric__values__{}__{}'.format(
-                early_stopping_metric.metric, comparison)
-            filters.append({metric_filter: early_stopping_metric.value})
+            value_filter = 'value__{}'.format(comparison)
+            filters.append(Q(**{'name': early_stopping_metric.metric,
+                                value_filter: early_stopping_metric.value}))
         if filters:
-            return self.experiments.filter(functools.reduce(OR, [Q(**f) for f in filters])).exists()
+            return ExperimentMetricValue.objects.filter(
+                experiment_group=self).filter(functools.reduce(OR, filters)).exists()
         return False
 
     def get_annotated_experiments_with_metric(self, metric, experiment_ids=None):
         query = self.experiments
         if experiment_ids:
             query = query.filter(id__in=experiment_ids)
+        metric_values = ExperimentMetricValue.objects.filter(experiment=OuterRef('pk'), name=metric)
         annotation = {
-            metric: KeyTransform(metric, 'metric__values')
+            metric: Subquery(metric_values.values('value')[:1])
         }
         return query.annotate(**annotation)
 
@@ -225,10 +230,9 @@ class ExperimentGroup(DiffModel,
             metric=metric,
             experiment_ids=experiment_ids)
 
-        metric_order_by = '{}{}'.format(
-            '-' if Optimization.maximize(optimization) else '',
-            metric)
-        return query.order_by(metric_order_by)
+        if Optimization.maximize(optimization):
+            return query.order_by(F(metric).desc(nulls_last=True))
+        return query.order_by(F(metric).asc(nulls_last=True))
 
     def get_experiments_metrics(self, metric, experiment_ids=None):
         query = self.get_annotated_experiments_with_metric(
@@ -240,7 +244,8 @@ class ExperimentGroup(DiffModel,
     def search_manager(self):
         from hpsearch.search_managers import get_search_algorithm_manager
 
-        return get_search_algorithm_manager(hptuning_config=self.hptuning_config)
+        return get_search_algorithm_manager(hptuning_config=self.hptuning_config,
+                                            async_hyperband=self.is_async_hyperband)
 
     @cached_property
     def iteration_manager(self):
@@ -248,6 +253,15 @@ class ExperimentGroup(DiffModel,
 
         return get_search_iteration_manager(experiment_group=self)
 
+    @property
+    def is_async_hyperband(self):
+        """Whether the hyperband search is asynchronous (ASHA), as recorded when it was created."""
+        from hpsearch.schemas import is_async_hyperband
+
+        if not SearchAlgorithms.is_hyperband(self.search_algorithm):
+            return False
+        return is_async_hyperband(self.iteration_data)
+
     @property
     def iteration_config(self):
         from hpsearch.schemas import get_iteration_config
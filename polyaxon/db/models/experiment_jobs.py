@@ -29,6 +29,9 @@ class ExperimentJob(AbstractJob):
 
     class Meta:
         app_label = 'db'
+        indexes = [
+            models.Index(fields=['experiment', 'created_at', 'id'], name='db_experimentjob_keyset'),
+        ]
 
     @cached_property
     def unique_name(self):
@@ -51,3 +54,6 @@ class ExperimentJobStatus(AbstractJobStatus):
     class Meta(AbstractJobStatus.Meta):
         app_label = 'db'
         verbose_name_plural = 'Experiment Job Statuses'
+        indexes = [
+            models.Index(fields=['job', 'created_at', 'id'], name='db_experimentjobstatus_keyset'),
+        ]
@@ -1,8 +1,9 @@
 import uuid
 
 from django.conf import settings
-from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields import ArrayField, JSONField
 from django.db import models
+from django.db.models import Count
 from django.utils import timezone
 from django.utils.functional import cached_property
 
@@ -113,6 +114,11 @@ class Experiment(DiffModel,
     class Meta:
         app_label = 'db'
         unique_together = (('project', 'name'),)
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='db_experiment_keyset'),
+            # The keyset pagination of the experiments of all the projects
+            models.Index(fields=['created_at', 'id'], name='db_experiment_created_keyset'),
+        ]
 
     def __str__(self):
         return self.unique_name
@@ -140,13 +146,20 @@ class Experiment(DiffModel,
     @property
     def last_job_statuses(self):
         """The last constants of the job in this experiment."""
-        # TODO: use F to calculate this property in one query
-
-        statuses = []
-        for job in self.jobs.all():
-            status = job.last_status
+        return [status for status in self.jobs.values_list('status__status', flat=True)
+                if status is not None]
+
+    def get_last_job_statuses_by_role(self):
+        """The distinct last statuses of the jobs in this experiment grouped by role.
+
+        The statuses are aggregated in one query.
+        """
+        statuses = {}
+        rows = self.jobs.order_by().values_list('role', 'status__status').annotate(
+            count=Count('id'))
+        for role, status, _ in rows:
             if status is not None:
-                statuses.append(status)
+                statuses.setdefault(role, []).append(status)
         return statuses
 
     @property
@@ -156,10 +169,13 @@ class Experiment(DiffModel,
 
     @property
     def calculated_status(self):
-        master_status = self.jobs.filter(role=TaskType.MASTER)[0].last_status
+        statuses = self.get_last_job_statuses_by_role()
+        master_statuses = statuses.get(TaskType.MASTER)
+        master_status = master_statuses[0] if master_statuses else None
         calculated_status = master_status if JobLifeCycle.is_done(master_status) else None
         if calculated_status is None:
-            calculated_status = ExperimentLifeCycle.jobs_status(self.last_job_statuses)
+            calculated_status = ExperimentLifeCycle.jobs_status(
+                [status for role_statuses in statuses.values() for status in role_statuses])
         if calculated_status is None:
             return self.last_status
         return calculated_status
@@ -170,7 +186,7 @@ class Experiment(DiffModel,
 
     @property
     def is_clone(self):
-        return self.original_experiment is not None
+        return self.original_experiment_id is not None
 
     @property
     def original_unique_name(self):
@@ -318,6 +334,10 @@ class ExperimentStatus(StatusModel):
         app_label = 'db'
         verbose_name_plural = 'Experiment Statuses'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['experiment', 'created_at', 'id'],
+                         name='db_experimentstatus_keyset'),
+        ]
 
     def __str__(self):
         return '{} <{}>'.format(self.experiment.unique_name, self.status)
@@ -338,3 +358,74 @@ class ExperimentMetric(models.Model):
     class Meta:
         app_label = 'db'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['experiment', 'created_at', 'id'],
+                         name='db_experimentmetric_keyset'),
+        ]
+
+
+class ExperimentMetricValue(models.Model):
+    """A model that represents a numeric value of the last metric of an experiment.
+
+    The values of `Experiment.metric` are stored as typed and indexed rows,
+    to rank and filter the experiments by metric without reading their json values.
+    """
+    experiment = models.ForeignKey(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_values')
+    experiment_group = models.ForeignKey(
+        'db.ExperimentGroup',
+        on_delete=models.CASCADE,
+        related_name='+',
+        blank=True,
+        null=True)
+    metric = models.ForeignKey(
+        'db.ExperimentMetric',
+        on_delete=models.CASCADE,
+        related_name='+')
+    name = models.CharField(max_length=256)
+    value = models.FloatField()
+
+    def __str__(self):
+        return '{} <{}:{}>'.format(self.experiment.unique_name, self.name, self.value)
+
+    class Meta:
+        app_label = 'db'
+        unique_together = (('experiment', 'name'),)
+        indexes = [
+            models.Index(fields=['experiment_group', 'name', 'value'],
+                         name='db_experimentmetricvalue_group'),
+            models.Index(fields=['name', 'value'],
+                         name='db_experimentmetricvalue_value'),
+        ]
+
+
+class ExperimentMetricChunk(models.Model):
+    """A model that represents a chunk of the time series of an experiment metric.
+
+    The values reported for a metric are appended to the last chunk of its series,
+    a new chunk is created once it holds `MAX_POINTS` values.
+    """
+    MAX_POINTS = 1000
+
+    experiment = models.ForeignKey(
+        'db.Experiment',
+        on_delete=models.CASCADE,
+        related_name='metric_chunks')
+    name = models.CharField(max_length=256)
+    index = models.PositiveIntegerField(default=0)
+    num_points = models.PositiveIntegerField(default=0)
+    timestamps = ArrayField(
+        models.FloatField(),
+        default=list,
+        help_text='The POSIX timestamps of the values.')
+    values = ArrayField(models.FloatField(), default=list)
+
+    def __str__(self):
+        return '{} <{}:{}>'.format(self.experiment.unique_name, self.name, self.index)
+
+    class Meta:
+        app_label = 'db'
+        unique_together = (('experiment', 'name', 'index'),)
+        ordering = ['index']
@@ -62,6 +62,9 @@ class Job(AbstractJob, NameableModel, DescribableModel, TagModel, JobMixin):
     class Meta:
         app_label = 'db'
         unique_together = (('project', 'name'),)
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='db_job_keyset'),
+        ]
 
     @cached_property
     def unique_name(self):
@@ -143,3 +146,6 @@ class JobStatus(AbstractJobStatus):
     class Meta(AbstractJobStatus.Meta):
         app_label = 'db'
         verbose_name_plural = 'Job Statuses'
+        indexes = [
+            models.Index(fields=['job', 'created_at', 'id'], name='db_jobstatus_keyset'),
+        ]
@@ -4,6 +4,7 @@ from django.conf import settings
 from django.core.validators import validate_slug
 from django.db import models
 
+from constants.jobs import JobLifeCycle
 from db.models.abstract_jobs import TensorboardJobMixin
 from db.models.utils import DescribableModel, DiffModel, TagModel
 from libs.blacklist import validate_blacklist_name
@@ -33,6 +34,9 @@ class Project(DiffModel, DescribableModel, TagModel, TensorboardJobMixin):
     class Meta:
         app_label = 'db'
         unique_together = (('user', 'name'),)
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='db_project_keyset'),
+        ]
 
     @property
     def unique_name(self):
@@ -48,6 +52,9 @@ class Project(DiffModel, DescribableModel, TagModel, TensorboardJobMixin):
 
     @property
     def has_notebook(self):
+        if hasattr(self, 'notebook_status'):
+            # Annotated by the list views
+            return self.notebook_status and JobLifeCycle.is_running(self.notebook_status)
         notebook = self.notebook
         return notebook and notebook.is_running
 
@@ -57,5 +64,8 @@ class Project(DiffModel, DescribableModel, TagModel, TensorboardJobMixin):
 
     @property
     def has_tensorboard(self):
+        if hasattr(self, 'tensorboard_status'):
+            # Annotated by the list views
+            return self.tensorboard_status and JobLifeCycle.is_running(self.tensorboard_status)
         tensorboard = self.tensorboard
         return tensorboard and tensorboard.is_running
@@ -4,6 +4,8 @@ from django.contrib.postgres.fields import ArrayField
 from django.core.cache import cache
 from django.core.validators import validate_slug
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
 from libs.blacklist import validate_blacklist_name
 
@@ -198,3 +200,17 @@ class LastStatusMixin(object):
 
     def set_status(self, status, message=None, **kwargs):
         raise NotImplemented  # noqa
+
+
+def get_count_subquery(model, field, **filters):
+    """Returns an annotation counting the `model` instances related by `field` to a row."""
+    queryset = model.objects.filter(**{field: OuterRef('pk')}, **filters).order_by().values(
+        field).annotate(count=Count('*')).values('count')
+    return Coalesce(Subquery(queryset, output_field=models.IntegerField()), 0)
+
+
+def get_last_status_subquery(model, field, **filters):
+    """Returns an annotation with the status of the last `model` instance related to a row."""
+    queryset = model.objects.filter(**{field: OuterRef('pk')}, **filters).order_by(
+        '-pk').values('status__status')[:1]
+    return Subquery(queryset, output_field=models.CharField())
@@ -0,0 +1,129 @@
+import logging
+import uuid
+
+from collections import OrderedDict
+
+from db.models.build_jobs import BuildJob
+from db.models.experiments import Experiment
+from db.models.jobs import Job
+from events_handlers.utils import existence_cache, safe_log_experiment_job, safe_log_job
+from polyaxon.settings import EventsCeleryTasks
+from polyaxon_schemas.utils import to_list
+
+_logger = logging.getLogger('polyaxon.events_handlers.ingest')
+
+LOGS_TASKS = {
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB,
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_BUILD_JOB,
+}
+
+LOGS_TASKS_KWARGS = {
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB: (
+        'experiment_uuid', 'experiment_name', 'log_lines'),
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB: ('job_uuid', 'job_name', 'log_lines'),
+    EventsCeleryTasks.EVENTS_HANDLE_LOGS_BUILD_JOB: ('job_uuid', 'job_name', 'log_lines'),
+}
+
+
+def validate_task_kwargs(task, kwargs):
+    """Raises a `ValueError` if the logs task can never be handled."""
+    if task not in LOGS_TASKS:
+        raise ValueError('Received unexpected task `{}`'.format(task))
+    if not isinstance(kwargs, dict):
+        raise ValueError('Received invalid kwargs for task `{}`'.format(task))
+    missing_kwargs = [key for key in LOGS_TASKS_KWARGS[task] if key not in kwargs]
+    if missing_kwargs:
+        raise ValueError('Received task `{}` without `{}`'.format(task, missing_kwargs))
+    # The uuid and the task index must be valid, their parsing raises a `ValueError` otherwise
+    uuid.UUID(str(kwargs[LOGS_TASKS_KWARGS[task][0]]))
+    if kwargs.get('task_idx') is not None:
+        int(kwargs['task_idx'])
+
+
+def get_task_kwargs(message):
+    """Returns the task name and kwargs of a celery task message (protocol v1 and v2).
+
+    Raises a `ValueError` or a `TypeError` if the message can not be decoded,
+    or if its task can never be handled.
+    """
+    task = message.headers.get('task')
+    if task:
+        _, kwargs, _ = message.decode()
+    else:
+        body = message.decode()
+        task, kwargs = body.get('task'), body.get('kwargs') or {}
+    validate_task_kwargs(task, kwargs)
+    return task, kwargs
+
+
+def format_experiment_job_log_lines(log_lines, task_type=None, task_idx=None):
+    log_lines = to_list(log_lines)
+    if task_type and task_idx:
+        return ['{}.{} -- {}'.format(task_type, int(task_idx) + 1, log_line)
+                for log_line in log_lines]
+    return log_lines
+
+
+def handle_logs(tasks):
+    """Persists the log lines of a batch of log tasks.
+
+    The existence of the experiments and jobs is checked with one query per model,
+    and the log lines are coalesced to write each log file once.
+
+    Args:
+        tasks: list of (task name, kwargs) of the logs tasks.
+
+    Returns:
+        the number of log lines written.
+    """
+    uuids = {task: set() for task in LOGS_TASKS}
+    for task, kwargs in tasks:
+        if task == EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB:
+            uuids[task].add(kwargs['experiment_uuid'])
+        elif task in LOGS_TASKS:
+            uuids[task].add(kwargs['job_uuid'])
+
+    models = {
+        EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB: Experiment,
+        EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB: Job,
+        EventsCeleryTasks.EVENTS_HANDLE_LOGS_BUILD_JOB: BuildJob,
+    }
+    existing = {task: existence_cache.filter_existing(model, uuids[task])
+                for task, model in models.items()}
+
+    # The log lines, and the function checking the instance still exists, by name
+    experiments_logs = OrderedDict()
+    jobs_logs = OrderedDict()
+    for task, kwargs in tasks:
+        if task not in LOGS_TASKS:
+            _logger.warning('Received unexpected task `%s`', task)
+            continue
+
+        if task == EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB:
+            if kwargs['experiment_uuid'] not in existing[task]:
+                continue
+            log_lines = format_experiment_job_log_lines(log_lines=kwargs['log_lines'],
+                                                        task_type=kwargs.get('task_type'),
+                                                        task_idx=kwargs.get('task_idx'))
+            check_exists = existence_cache.get_exists_check(models[task],
+                                                            kwargs['experiment_uuid'])
+            experiments_logs.setdefault(
+                kwargs['experiment_name'], (check_exists, []))[1].extend(log_lines)
+        else:
+            if kwargs['job_uuid'] not in existing[task]:
+                continue
+            check_exists = existence_cache.get_exists_check(models[task], kwargs['job_uuid'])
+            jobs_logs.setdefault(
+                kwargs['job_name'], (check_exists, []))[1].extend(to_list(kwargs['log_lines']))
+
+    num_lines = 0
+    for experiment_name, (check_exists, log_lines) in experiments_logs.items():
+        if safe_log_experiment_job(experiment_name=experiment_name,
+                                   log_lines=log_lines,
+                                   check_exists=check_exists):
+            num_lines += len(log_lines)
+    for job_name, (check_exists, log_lines) in jobs_logs.items():
+        if safe_log_job(job_name=job_name, log_lines=log_lines, check_exists=check_exists):
+            num_lines += len(log_lines)
+    return num_lines
@@ -0,0 +1,93 @@
+import fcntl
+import os
+import shutil
+import tempfile
+import time
+
+from collections import OrderedDict
+
+from django.core.management.base import BaseCommand
+
+from events_handlers.utils import LogWriters
+
+
+def write_per_message(log_path, log_lines):
+    """Opens, locks, and closes the log file for every message, as the logs tasks used to."""
+    with open(log_path, 'a') as log_file:
+        fcntl.flock(log_file, fcntl.LOCK_EX)
+        log_file.write('\n'.join(log_lines) + '\n')
+        fcntl.flock(log_file, fcntl.LOCK_UN)
+
+
+class Command(BaseCommand):
+    help = 'Measures the throughput, in lines/s, of the logs writes with and without batching.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--num_lines',
+                            type=int,
+                            default=200000,
+                            help='Number of log lines to write.')
+        parser.add_argument('--message_lines',
+                            type=int,
+                            default=50,
+                            help='Number of log lines per message, as sent by the sidecars.')
+        parser.add_argument('--num_files',
+                            type=int,
+                            default=20,
+                            help='Number of log files the messages are spread over.')
+        parser.add_argument('--batch_size',
+                            type=int,
+                            default=500,
+                            help='Number of messages per batch, as handled by `ingest_logs`.')
+
+    @staticmethod
+    def get_messages(log_dir, num_lines, message_lines, num_files):
+        line = 'worker.1 -- Epoch 1/10: loss=0.3761 - accuracy=0.8873'
+        log_paths = [os.path.join(log_dir, str(i)) for i in range(num_files)]
+        return [(log_paths[i % num_files], [line] * message_lines)
+                for i in range(num_lines // message_lines)]
+
+    @staticmethod
+    def run_per_message(messages, batch_size):
+        for log_path, log_lines in messages:
+            write_per_message(log_path, log_lines)
+
+    @staticmethod
+    def run_log_writers(messages, batch_size):
+        log_writers = LogWriters()
+        for log_path, log_lines in messages:
+            log_writers.write(log_path, log_lines)
+        log_writers.close()
+
+    @staticmethod
+    def run_batches(messages, batch_size):
+        log_writers = LogWriters()
+        for i in range(0, len(messages), batch_size):
+            coalesced = OrderedDict()
+            for log_path, log_lines in messages[i:i + batch_size]:
+                coalesced.setdefault(log_path, []).extend(log_lines)
+            for log_path, log_lines in coalesced.items():
+                log_writers.write(log_path, log_lines)
+        log_writers.close()
+
+    def handle(self, *args, **options):
+        modes = [
+            ('per message (open/flock/close)', self.run_per_message),
+            ('open log writers', self.run_log_writers),
+            ('batches coalesced per file', self.run_batches),
+        ]
+        for name, run in modes:
+            log_dir = tempfile.mkdtemp()
+            try:
+                messages = self.get_messages(log_dir=log_dir,
+                                             num_lines=options['num_lines'],
+                                             message_lines=options['message_lines'],
+                                             num_files=options['num_files'])
+                num_lines = sum(len(log_lines) for _, log_lines in messages)
+                start = time.time()
+                run(messages, batch_size=options['batch_size'])
+                duration = time.time() - start
+            finally:
+                shutil.rmtree(log_dir)
+            self.stdout.write('{}: {:.0f} lines/s'.format(name, num_lines / duration),
+                              ending='\n')
@@ -0,0 +1,123 @@
+import logging
+import socket
+import time
+
+from kombu import Connection, Consumer, Exchange, Queue
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import InterfaceError, OperationalError
+
+from events_handlers.ingest import get_task_kwargs, handle_logs
+from polyaxon.settings import CeleryQueues
+
+_logger = logging.getLogger('polyaxon.events_handlers.ingest')
+
+# The errors after which the logs can be persisted later
+TRANSIENT_ERRORS = (InterfaceError, OperationalError, OSError)
+
+
+class Command(BaseCommand):
+    help = 'Consume and persist logs in bulk, replaces the celery worker of the logs queue.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch_size',
+                            type=int,
+                            default=500,
+                            help='Max number of log messages to handle at once.')
+        parser.add_argument('--batch_timeout',
+                            type=float,
+                            default=1,
+                            help='Max number of seconds to wait before handling a batch.')
+
+    @staticmethod
+    def get_queue():
+        return Queue(CeleryQueues.LOGS_SIDECARS,
+                     exchange=Exchange(CeleryQueues.LOGS_SIDECARS, 'direct'),
+                     routing_key=CeleryQueues.LOGS_SIDECARS)
+
+    @staticmethod
+    def requeue(message):
+        """Requeues the message, unless it already failed after being redelivered."""
+        if message.delivery_info.get('redelivered'):
+            _logger.error('Dropping log message, it failed again after being redelivered.')
+            message.ack()
+        else:
+            message.reject(requeue=True)
+
+    @classmethod
+    def handle_messages(cls, messages, tasks):
+        """Persists the logs of the messages' tasks, and acks or requeues the messages.
+
+        The messages are requeued after a transient error, if another error occurs,
+        the messages are handled one by one, and the ones failing are dropped.
+        """
+        try:
+            num_lines = handle_logs(tasks)
+        except TRANSIENT_ERRORS as e:
+            _logger.warning('Could not persist the logs, requeuing the messages: %s', e)
+            for message in messages:
+                cls.requeue(message)
+            return
+        except Exception as e:  # noqa
+            if len(messages) > 1:
+                for message, task in zip(messages, tasks):
+                    cls.handle_messages([message], [task])
+                return
+            _logger.exception('Unhandled exception occurred, dropping log message: %s', e)
+            for message in messages:
+                message.ack()
+            return
+        _logger.debug('Handled %s messages, %s log lines', len(messages), num_lines)
+        for message in messages:
+            message.ack()
+
+    @classmethod
+    def handle_batch(cls, messages):
+        """Persists the logs of a batch of messages.
+
+        The messages that can not be decoded or that are invalid are acked,
+        since they can not be handled later.
+        """
+        tasks = []
+        decoded_messages = []
+        for message in messages:
+            try:
+                tasks.append(get_task_kwargs(message))
+                decoded_messages.append(message)
+            except (ValueError, TypeError) as e:
+                _logger.warning('Could not decode log message: %s', e)
+                message.ack()
+        cls.handle_messages(decoded_messages, tasks)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        batch_timeout = options['batch_timeout']
+        self.stdout.write(
+            "Started a new logs ingestor with, "
+            "batch size: `{}` and batch timeout: `{}`.".format(batch_size, batch_timeout),
+            ending='\n')
+
+        messages = []
+        with Connection(settings.CELERY_BROKER_URL) as connection:
+            consumer = Consumer(connection,
+                                queues=[self.get_queue()],
+                                callbacks=[lambda body, message: messages.append(message)],
+                                accept=['json'],
+                                prefetch_count=batch_size)
+            with consumer:
+                batch_start = time.time()
+                while True:
+                    try:
+                        connection.drain_events(timeout=batch_timeout)
+                    except socket.timeout:
+                        pass
+                    batch_cond = (
+                        len(messages) >= batch_size or
+                        (messages and time.time() - batch_start > batch_timeout)
+                    )
+                    if batch_cond:
+                        self.handle_batch(messages)
+                        messages = []
+                    if not messages:
+                        batch_start = time.time()
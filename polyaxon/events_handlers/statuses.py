@@ -0,0 +1,93 @@
+import logging
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError
+
+from db.models.build_jobs import BuildJob
+from db.models.experiment_jobs import ExperimentJob
+from db.models.jobs import Job
+from db.models.notebooks import NotebookJob
+from db.models.tensorboards import TensorboardJob
+from polyaxon.settings import EventsCeleryTasks
+
+_logger = logging.getLogger('polyaxon.events_handlers.statuses')
+
+STATUSES_TASKS = {
+    EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
+    EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES,
+    EventsCeleryTasks.EVENTS_HANDLE_PLUGIN_JOB_STATUSES,
+    EventsCeleryTasks.EVENTS_HANDLE_BUILD_JOB_STATUSES,
+}
+
+
+def get_status_model(task, payload):
+    """Returns the job model and the related fields to fetch for a status payload."""
+    if task == EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES:
+        return ExperimentJob, ('status', 'experiment')
+    if task == EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES:
+        return Job, ('status', 'project')
+    if task == EventsCeleryTasks.EVENTS_HANDLE_BUILD_JOB_STATUSES:
+        return BuildJob, ('status', 'project')
+    if task == EventsCeleryTasks.EVENTS_HANDLE_PLUGIN_JOB_STATUSES:
+        app = payload['details']['labels']['app']
+        if app == settings.APP_LABELS_TENSORBOARD:
+            return TensorboardJob, ('status', 'project')
+        if app == settings.APP_LABELS_NOTEBOOK:
+            return NotebookJob, ('status', 'project')
+        _logger.info('Plugin job `%s` does not exist', app)
+    return None, None
+
+
+def get_jobs(models_uuids):
+    """Returns the jobs by model and uuid (hex), with one query per model."""
+    jobs = {}
+    for model, (related, uuids) in models_uuids.items():
+        queryset = model.objects.filter(uuid__in=uuids).select_related(*related)
+        jobs[model] = {job.uuid.hex: job for job in queryset}
+    return jobs
+
+
+def handle_statuses(payloads):
+    """Sets the statuses of a batch of job status payloads.
+
+    The jobs are fetched, with their experiment or project, in one query per model,
+    and the statuses are set in the order they were received.
+
+    Args:
+        payloads: list of (task name, payload) of the statuses tasks.
+
+    Returns:
+        the number of statuses set.
+    """
+    statuses = []
+    models_uuids = {}
+    for task, payload in payloads:
+        if task not in STATUSES_TASKS:
+            _logger.warning('Received unexpected task `%s`', task)
+            continue
+        model, related = get_status_model(task, payload)
+        if model is None:
+            continue
+        job_uuid = uuid.UUID(payload['details']['labels']['job_uuid']).hex
+        models_uuids.setdefault(model, (related, set()))[1].add(job_uuid)
+        statuses.append((model, job_uuid, payload))
+
+    jobs = get_jobs(models_uuids)
+
+    num_statuses = 0
+    for model, job_uuid, payload in statuses:
+        job = jobs[model].get(job_uuid)
+        if job is None:
+            _logger.debug('%s `%s` does not exist', model.__name__, job_uuid)
+            continue
+        # Set the new status
+        try:
+            if job.set_status(status=payload['status'],
+                              message=payload['message'],
+                              details=payload['details']):
+                num_statuses += 1
+        except IntegrityError:
+            # Due to concurrency this could happen, we just ignore it
+            pass
+    return num_statuses
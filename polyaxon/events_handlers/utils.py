@@ -1,33 +1,161 @@
 import fcntl
+import os
+import time
 
+from collections import OrderedDict
+from functools import partial
+
+from libs.log_store import LogStore
 from libs.paths.experiments import create_experiment_logs_path, get_experiment_logs_path
 from libs.paths.jobs import create_job_logs_path, get_job_logs_path
 from polyaxon_schemas.utils import to_list
 
+MAX_OPEN_LOG_FILES = 128
+EXISTENCE_CACHE_TTL = 60
+
+
+class LogWriters(object):
+    """Keeps the most recently used log files open to avoid reopening them on every write."""
+
+    def __init__(self, max_open_files=MAX_OPEN_LOG_FILES):
+        self.max_open_files = max_open_files
+        self._files = OrderedDict()
+
+    def _get_file(self, log_path):
+        log_file = self._files.pop(log_path, None)
+        if log_file is None:
+            log_file = open(log_path, 'a')
+            while len(self._files) >= self.max_open_files:
+                _, lru_file = self._files.popitem(last=False)
+                lru_file.close()
+        self._files[log_path] = log_file
+        return log_file
+
+    @staticmethod
+    def _is_current(log_path, log_file):
+        """Checks that the open file is still the active segment at `log_path`."""
+        try:
+            return os.stat(log_path).st_ino == os.fstat(log_file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def write(self, log_path, log_lines, check_exists=None):
+        """Appends the log lines to the active segment at `log_path`.
+
+        `check_exists` is called before creating a new file, so that the logs of an instance
+        deleted in the meantime are not created again.
+
+        Returns:
+            whether the lines were written.
+        """
+        log_lines = to_list(log_lines)
+        while True:
+            if (check_exists is not None and
+                    log_path not in self._files and
+                    not os.path.exists(log_path) and
+                    not check_exists()):
+                return False
+            log_file = self._get_file(log_path)
+            fcntl.flock(log_file, fcntl.LOCK_EX)
+            # The file could have been sealed or removed by another process
+            if self._is_current(log_path, log_file):
+                break
+            fcntl.flock(log_file, fcntl.LOCK_UN)
+            self.discard(log_path)
+
+        try:
+            log_file.write('\n'.join(log_lines) + '\n')
+            log_file.flush()
+            log_store = LogStore(log_path)
+            sealed = log_store.should_seal(log_file.tell())
+            if sealed:
+                log_store.seal()
+        finally:
+            fcntl.flock(log_file, fcntl.LOCK_UN)
+        if sealed:
+            self.discard(log_path)
+        return True
+
+    def discard(self, log_path):
+        log_file = self._files.pop(log_path, None)
+        if log_file is not None:
+            log_file.close()
+
+    def close(self):
+        while self._files:
+            _, log_file = self._files.popitem()
+            log_file.close()
+
+
+class ExistenceCache(object):
+    """Caches, for a short period, the uuids of the instances known to exist."""
+
+    def __init__(self, ttl=EXISTENCE_CACHE_TTL):
+        self.ttl = ttl
+        self._uuids = {}
+
+    def filter_existing(self, model, uuids):
+        """Returns the subset of `uuids` (hex) that exist for `model`, with at most one query."""
+        now = time.time()
+        cached = self._uuids.setdefault(model, {})
+        existing = {value for value in uuids if cached.get(value, 0) > now}
+        missing = set(uuids) - existing
+        if missing:
+            for value in model.objects.filter(uuid__in=missing).values_list('uuid', flat=True):
+                cached[value.hex] = now + self.ttl
+                existing.add(value.hex)
+        return existing
+
+    def invalidate(self, model, uuid):
+        self._uuids.get(model, {}).pop(uuid, None)
+
+    def exists(self, model, uuid, refresh=False):
+        """Checks that the instance exists, `refresh` bypasses the cached value."""
+        if refresh:
+            self.invalidate(model, uuid)
+        return uuid in self.filter_existing(model, [uuid])
+
+    def get_exists_check(self, model, uuid):
+        """Returns a function checking again, bypassing the cache, that the instance exists."""
+        return partial(self.exists, model, uuid, refresh=True)
+
+
+log_writers = LogWriters()
+existence_cache = ExistenceCache()
+
+
+def _lock_log(log_path, log_lines, check_exists=None):
+    try:
+        return log_writers.write(log_path, log_lines, check_exists=check_exists)
+    except (FileNotFoundError, OSError):
+        log_writers.discard(log_path)
+        raise
+
 
-def _lock_log(log_path, log_lines):
-    log_lines = to_list(log_lines)
-    with open(log_path, "a") as log_file:
-        fcntl.flock(log_file, fcntl.LOCK_EX)
-        log_file.write('\n'.join(log_lines) + '\n')
-        fcntl.flock(log_file, fcntl.LOCK_UN)
+def safe_log_job(job_name, log_lines, check_exists=None):
+    """Appends the log lines to the job's logs, creating the logs path if necessary.
 
+    `check_exists` is called before creating a new log file, so that the logs of a job
+    deleted in the meantime are not created again.
 
-def safe_log_job(job_name, log_lines):
+    Returns:
+        whether the lines were written.
+    """
     log_path = get_job_logs_path(job_name)
     try:
-        _lock_log(log_path, log_lines)
+        return _lock_log(log_path, log_lines, check_exists=check_exists)
     except (FileNotFoundError, OSError):
         create_job_logs_path(job_name=job_name)
         # Retry
-        _lock_log(log_path, log_lines)
+        return _lock_log(log_path, log_lines)
 
 
-def safe_log_experiment_job(experiment_name, log_lines):
+def safe_log_experiment_job(experiment_name, log_lines, check_exists=None):
+    """Appends the log lines to the experiment's logs, see `safe_log_job`."""
     log_path = get_experiment_logs_path(experiment_name)
     try:
-        _lock_log(log_path, log_lines)
+        return _lock_log(log_path, log_lines, check_exists=check_exists)
     except (FileNotFoundError, OSError):
         create_experiment_logs_path(experiment_name=experiment_name)
         # Retry
-        _lock_log(log_path, log_lines)
+        return _lock_log(log_path, log_lines)
@@ -1,12 +1,18 @@
+from hpsearch.iteration_managers.asha import AshaIterationManager
 from hpsearch.iteration_managers.bayesian_optimization import BOIterationManager
+from hpsearch.iteration_managers.grid import GridIterationManager
 from hpsearch.iteration_managers.hyperband import HyperbandIterationManager
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
 def get_search_iteration_manager(experiment_group):
     if SearchAlgorithms.is_hyperband(experiment_group.search_algorithm):
+        if experiment_group.is_async_hyperband:
+            return AshaIterationManager(experiment_group=experiment_group)
         return HyperbandIterationManager(experiment_group=experiment_group)
     if SearchAlgorithms.is_bo(experiment_group.search_algorithm):
         return BOIterationManager(experiment_group=experiment_group)
+    if SearchAlgorithms.is_grid(experiment_group.search_algorithm):
+        return GridIterationManager(experiment_group=experiment_group)
 
     return None
@@ -0,0 +1,110 @@
+from hpsearch.iteration_managers.base import BaseIterationManger
+from hpsearch.schemas import AshaIterationConfig
+
+
+class AshaIterationManager(BaseIterationManger):
+    """The search has a single iteration, updated every time experiments are added."""
+
+    def get_metric_name(self):
+        return self.experiment_group.hptuning_config.hyperband.metric.name
+
+    def create_iteration(self, experiment_ids):
+        """Create the iteration of the experiment group with the first rung's experiments."""
+        from db.models.experiment_groups import ExperimentGroupIteration
+
+        iteration_config = AshaIterationConfig(
+            iteration=0,
+            experiment_ids=experiment_ids,
+            experiments_rungs=[[experiment_id, 0] for experiment_id in experiment_ids])
+        return ExperimentGroupIteration.objects.create(
+            experiment_group=self.experiment_group,
+            data=iteration_config.to_dict())
+
+    @staticmethod
+    def _add_experiments(iteration_config, experiment_ids, rung):
+        iteration_config.experiment_ids = (iteration_config.experiment_ids or []) + experiment_ids
+        iteration_config.experiments_rungs = (
+            (iteration_config.experiments_rungs or []) +
+            [[experiment_id, rung] for experiment_id in experiment_ids])
+
+    def add_iteration_experiments(self, experiment_ids, rung=0):
+        iteration_config = self.get_iteration_config()
+        if not iteration_config:
+            return
+
+        iteration_config.iteration += 1
+        self._add_experiments(iteration_config=iteration_config,
+                              experiment_ids=experiment_ids,
+                              rung=rung)
+        self._update_config(iteration_config)
+
+    def update_iteration(self):
+        """Add the performance of the experiments that are done."""
+        iteration_config = self.get_iteration_config()
+        if not iteration_config:
+            return
+        experiments_metrics = iteration_config.experiments_metrics or []
+        observed_ids = {experiment_id for experiment_id, _ in experiments_metrics}
+        done_ids = list(self.experiment_group.done_experiments.filter(
+            id__in=[experiment_id for experiment_id in iteration_config.experiment_ids or []
+                    if experiment_id not in observed_ids]
+        ).values_list('id', flat=True))
+        if not done_ids:
+            return
+
+        new_experiments_metrics = self.experiment_group.get_experiments_metrics(
+            experiment_ids=done_ids,
+            metric=self.get_metric_name()
+        )
+        new_experiments_metrics = [m for m in new_experiments_metrics if m[1] is not None]
+        if new_experiments_metrics:
+            iteration_config.experiments_metrics = experiments_metrics + new_experiments_metrics
+            self._update_config(iteration_config)
+
+    def promote_experiments(self, n_promotions):
+        """Resume or restart up to `n_promotions` experiments on their next rung.
+
+        Returns:
+            the new experiments.
+        """
+        iteration_config = self.get_iteration_config()
+        if not iteration_config:
+            return []
+        search_manager = self.experiment_group.search_manager
+        promotions = search_manager.get_promotions(iteration_config=iteration_config,
+                                                   n_promotions=n_promotions)
+        if not promotions:
+            return []
+
+        hptuning_config = self.experiment_group.hptuning_config
+        resource_name = hptuning_config.hyperband.resource.name
+        experiments = self.experiment_group.experiments.in_bulk(
+            [experiment_id for experiment_id, _ in promotions])
+        new_experiments = []
+        for experiment_id, rung in promotions:
+            experiment = experiments[experiment_id]
+            declarations = experiment.declarations
+            declarations[resource_name] = search_manager.get_n_resources_for_rung(rung=rung)
+            declarations_spec = {'declarations': declarations}
+            specification = experiment.specification.patch(declarations_spec)
+
+            if hptuning_config.hyperband.resume:
+                new_experiment = experiment.resume(
+                    declarations=declarations,
+                    config=specification.parsed_data)
+            else:
+                new_experiment = experiment.restart(
+                    experiment_group=self.experiment_group,
+                    declarations=declarations,
+                    config=specification.parsed_data)
+            new_experiments.append(new_experiment)
+            self._add_experiments(iteration_config=iteration_config,
+                                  experiment_ids=[new_experiment.id],
+                                  rung=rung)
+
+        iteration_config.iteration += 1
+        iteration_config.promoted_experiment_ids = (
+            (iteration_config.promoted_experiment_ids or []) +
+            [experiment_id for experiment_id, _ in promotions])
+        self._update_config(iteration_config)
+        return new_experiments
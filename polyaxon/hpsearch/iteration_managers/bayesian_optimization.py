@@ -6,7 +6,32 @@ class BOIterationManager(BaseIterationManger):
     def get_metric_name(self):
         return self.experiment_group.hptuning_config.bo.metric.name
 
-    def create_iteration(self, experiment_ids, experiments_configs):
+    def update_iteration(self):
+        """Update the last experiment group's iteration with experiment performance.
+
+        The experiments of the previous iterations might still be running
+        when the iteration is created, their metrics are added once they are available.
+        """
+        iteration_config = self.get_iteration_config()
+        if not iteration_config:
+            return
+        old_experiments_metrics = iteration_config.old_experiments_metrics or []
+        observed_ids = {experiment_id for experiment_id, _ in old_experiments_metrics}
+        missing_ids = [experiment_id for experiment_id in iteration_config.old_experiment_ids or []
+                       if experiment_id not in observed_ids]
+        if missing_ids:
+            experiments_metrics = self.experiment_group.get_experiments_metrics(
+                experiment_ids=missing_ids,
+                metric=self.get_metric_name()
+            )
+            experiments_metrics = [m for m in experiments_metrics if m[1] is not None]
+            if experiments_metrics:
+                iteration_config.old_experiments_metrics = (
+                    old_experiments_metrics + experiments_metrics)
+                self._update_config(iteration_config)
+        super().update_iteration()
+
+    def create_iteration(self, experiment_ids, experiments_configs, gaussian_process=None):
         """Create an iteration for the experiment group."""
         from db.models.experiment_groups import ExperimentGroupIteration
 
@@ -31,6 +56,7 @@ class BOIterationManager(BaseIterationManger):
             old_experiments_metrics=old_experiments_metrics,
             experiment_ids=experiment_ids,
             experiments_configs=experiments_configs,
+            gaussian_process=gaussian_process,
         )
         return ExperimentGroupIteration.objects.create(
             experiment_group=self.experiment_group,
@@ -0,0 +1,31 @@
+from hpsearch.iteration_managers.base import BaseIterationManger
+from hpsearch.schemas import GridIterationConfig
+
+
+class GridIterationManager(BaseIterationManger):
+    """The search has a single iteration, updated every time a chunk of the grid is created."""
+
+    def create_iteration(self, offset):
+        """Create the iteration of the experiment group with the next offset in the grid."""
+        from db.models.experiment_groups import ExperimentGroupIteration
+
+        iteration_config = GridIterationConfig(offset=offset)
+        return ExperimentGroupIteration.objects.create(
+            experiment_group=self.experiment_group,
+            data=iteration_config.to_dict())
+
+    def get_offset(self):
+        """The index in the grid of the next experiment to create."""
+        iteration_config = self.experiment_group.iteration_config
+        if iteration_config is None:
+            # The groups created before the offset was recorded
+            return self.experiment_group.experiments.count()
+        return iteration_config.offset
+
+    def update_offset(self, offset):
+        iteration_config = self.experiment_group.iteration_config
+        if iteration_config is None:
+            self.create_iteration(offset=offset)
+            return
+        iteration_config.offset = offset
+        self._update_config(iteration_config)
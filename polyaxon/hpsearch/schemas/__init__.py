@@ -1,15 +1,30 @@
+from hpsearch.schemas.asha import AshaIterationConfig
 from hpsearch.schemas.bayesian_optimization import BOIterationConfig
+from hpsearch.schemas.grid import GridIterationConfig
 from hpsearch.schemas.hyperband import HyperbandIterationConfig
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
+def is_async_hyperband(iteration):
+    """Whether the iteration data is the one of an asynchronous hyperband search (ASHA).
+
+    The mode is recorded with the first iteration, when the group's search is created,
+    changing `HPSEARCH_ASYNC_HYPERBAND` does not apply to the existing groups.
+    """
+    return bool(iteration and iteration.get('asynchronous'))
+
+
 def get_iteration_config(search_algorithm, iteration=None):
     if SearchAlgorithms.is_hyperband(search_algorithm):
         if not iteration:
             raise ValueError('No iteration was provided')
+        if is_async_hyperband(iteration):
+            return AshaIterationConfig.from_dict(iteration)
         return HyperbandIterationConfig.from_dict(iteration)
     if SearchAlgorithms.is_bo(search_algorithm):
         if not iteration:
             raise ValueError('No iteration was provided')
         return BOIterationConfig.from_dict(iteration)
+    if SearchAlgorithms.is_grid(search_algorithm) and iteration:
+        return GridIterationConfig.from_dict(iteration)
     return None
@@ -0,0 +1,58 @@
+from marshmallow import Schema, fields, post_dump, post_load, validate
+
+from polyaxon_schemas.base import BaseConfig
+
+
+class AshaIterationSchema(Schema):
+    iteration = fields.Int()
+    experiment_ids = fields.List(fields.Int(), allow_none=True)
+    experiments_rungs = fields.List(fields.List(fields.Int(), validate=validate.Length(equal=2)),
+                                    allow_none=True)
+    experiments_metrics = fields.List(fields.List(fields.Raw(), validate=validate.Length(equal=2)),
+                                      allow_none=True)
+    promoted_experiment_ids = fields.List(fields.Int(), allow_none=True)
+    asynchronous = fields.Bool()
+
+    class Meta:
+        ordered = True
+
+    @post_load
+    def make(self, data):
+        return AshaIterationConfig(**data)
+
+    @post_dump
+    def unmake(self, data):
+        return AshaIterationConfig.remove_reduced_attrs(data)
+
+
+class AshaIterationConfig(BaseConfig):
+    """The state of an asynchronous successive halving search.
+
+    Args:
+        iteration: the number of times experiments were added to the search.
+        experiment_ids: the experiments of the search.
+        experiments_rungs: the rung of each experiment.
+        experiments_metrics: the metric of each done experiment.
+        promoted_experiment_ids: the experiments already promoted to the next rung.
+        asynchronous: records in the group's iteration that its hyperband search is asynchronous.
+    """
+    SCHEMA = AshaIterationSchema
+
+    def __init__(self,
+                 iteration,
+                 experiment_ids=None,
+                 experiments_rungs=None,
+                 experiments_metrics=None,
+                 promoted_experiment_ids=None,
+                 asynchronous=True):
+        self.iteration = iteration
+        self.experiment_ids = experiment_ids
+        self.experiments_rungs = experiments_rungs
+        self.experiments_metrics = experiments_metrics
+        self.promoted_experiment_ids = promoted_experiment_ids
+        self.asynchronous = asynchronous
+
+    @property
+    def n_configs(self):
+        """The number of configs started on the first rung."""
+        return len([rung for _, rung in self.experiments_rungs or [] if rung == 0])
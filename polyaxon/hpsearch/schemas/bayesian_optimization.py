@@ -19,6 +19,7 @@ class BOIterationSchema(Schema):
     experiments_metrics = fields.List(
         fields.List(fields.Raw(), validate=validate.Length(equal=2)),
         allow_none=True)
+    gaussian_process = fields.Dict(allow_none=True)
 
     class Meta:
         ordered = True
@@ -34,6 +35,7 @@ class BOIterationSchema(Schema):
 
 class BOIterationConfig(BaseConfig):
     SCHEMA = BOIterationSchema
+    REDUCED_ATTRIBUTES = ['gaussian_process']
 
     def __init__(self,
                  iteration,
@@ -42,7 +44,8 @@ class BOIterationConfig(BaseConfig):
                  old_experiments_configs=None,
                  experiment_ids=None,
                  experiments_metrics=None,
-                 experiments_configs=None):
+                 experiments_configs=None,
+                 gaussian_process=None):
         self.iteration = iteration
         self.old_experiment_ids = old_experiment_ids
         self.old_experiments_metrics = old_experiments_metrics
@@ -50,6 +53,8 @@ class BOIterationConfig(BaseConfig):
         self.experiment_ids = experiment_ids
         self.experiments_configs = experiments_configs
         self.experiments_metrics = experiments_metrics
+        # The state of the gaussian process fitted to suggest the iteration's experiments
+        self.gaussian_process = gaussian_process
 
     @property
     def combined_experiment_ids(self):
@@ -0,0 +1,30 @@
+from marshmallow import Schema, fields, post_dump, post_load
+
+from polyaxon_schemas.base import BaseConfig
+
+
+class GridIterationSchema(Schema):
+    offset = fields.Int()
+
+    class Meta:
+        ordered = True
+
+    @post_load
+    def make(self, data):
+        return GridIterationConfig(**data)
+
+    @post_dump
+    def unmake(self, data):
+        return GridIterationConfig.remove_reduced_attrs(data)
+
+
+class GridIterationConfig(BaseConfig):
+    """The state of a grid search, created by chunks.
+
+    Args:
+        offset: the index in the grid of the next experiment to create.
+    """
+    SCHEMA = GridIterationSchema
+
+    def __init__(self, offset):
+        self.offset = offset
@@ -1,3 +1,4 @@
+from hpsearch.search_managers.asha import AshaSearchManager
 from hpsearch.search_managers.bayesian_optimization.manager import BOSearchManager
 from hpsearch.search_managers.grid import GridSearchManager
 from hpsearch.search_managers.hyperband import HyperbandSearchManager
@@ -5,7 +6,7 @@ from hpsearch.search_managers.random import RandomSearchManager
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
-def get_search_algorithm_manager(hptuning_config):
+def get_search_algorithm_manager(hptuning_config, async_hyperband=False):
     if not hptuning_config:
         return None
 
@@ -14,6 +15,8 @@ def get_search_algorithm_manager(hptuning_config):
     if SearchAlgorithms.is_random(hptuning_config.search_algorithm):
         return RandomSearchManager(hptuning_config=hptuning_config)
     if SearchAlgorithms.is_hyperband(hptuning_config.search_algorithm):
+        if async_hyperband:
+            return AshaSearchManager(hptuning_config=hptuning_config)
         return HyperbandSearchManager(hptuning_config=hptuning_config)
     if SearchAlgorithms.is_bo(hptuning_config.search_algorithm):
         return BOSearchManager(hptuning_config=hptuning_config)
@@ -0,0 +1,65 @@
+from hpsearch.search_managers.hyperband import HyperbandSearchManager
+from polyaxon_schemas.utils import Optimization
+
+
+class AshaSearchManager(HyperbandSearchManager):
+    """Asynchronous successive halving algorithm (ASHA) manager for hyperparameter optimization.
+
+    The configs run with the resources of the successive halving bracket `s_max` of hyperband,
+    i.e. on the rungs `0, ..., s_max`, but instead of waiting for all the configs of a rung,
+    every free slot of the group is used, either to promote a config to the next rung,
+    as soon as it ranks in the top `1 / eta` of the configs that completed its rung,
+    or otherwise to run a new config on the first rung.
+    """
+
+    def __init__(self, hptuning_config):
+        super().__init__(hptuning_config=hptuning_config)
+        self.n_rungs = self.s_max + 1
+        # Number of configs to run on the first rung
+        self.n_configs = self.get_n_configs(bracket=self.s_max)
+
+    def get_n_resources_for_rung(self, rung):
+        n_resources = self.get_n_resources(n_resources=self.get_resources(bracket=self.s_max),
+                                           bracket_iteration=rung)
+        return self.hptuning_config.hyperband.resource.cast_value(n_resources)
+
+    def get_suggestions(self, iteration_config=None, n_suggestions=None):
+        """Return up to `n_suggestions` new configs to run on the first rung."""
+        n_started = iteration_config.n_configs if iteration_config else 0
+        n_remaining = self.n_configs - n_started
+        if n_suggestions is not None:
+            n_remaining = min(n_suggestions, n_remaining)
+        if n_remaining <= 0:
+            return []
+        suggestion_params = {
+            self.hptuning_config.hyperband.resource.name: self.get_n_resources_for_rung(rung=0)
+        }
+        # The configs are sampled all at once, so that a seeded search does not repeat them
+        suggestions = self.space.get_random_suggestions(n_suggestions=self.n_configs,
+                                                        suggestion_params=suggestion_params,
+                                                        seed=self.hptuning_config.seed)
+        return suggestions[n_started:n_started + n_remaining]
+
+    def get_promotions(self, iteration_config, n_promotions):
+        """Return up to `n_promotions` (experiment id, rung) to promote, highest rungs first."""
+        experiments_rungs = dict(iteration_config.experiments_rungs or [])
+        experiments_metrics = dict(iteration_config.experiments_metrics or [])
+        promoted_experiment_ids = set(iteration_config.promoted_experiment_ids or [])
+        reverse = Optimization.maximize(self.hptuning_config.hyperband.metric.optimization)
+
+        promotions = []
+        for rung in reversed(range(self.n_rungs - 1)):
+            rung_experiment_ids = [experiment_id
+                                   for experiment_id, experiment_rung in experiments_rungs.items()
+                                   if experiment_rung == rung]
+            completed = sorted([(experiment_id, experiments_metrics[experiment_id])
+                                for experiment_id in rung_experiment_ids
+                                if experiment_id in experiments_metrics],
+                               key=lambda x: x[1],
+                               reverse=reverse)
+            for experiment_id, _ in completed[:int(len(completed) / self.eta)]:
+                if len(promotions) >= n_promotions:
+                    return promotions
+                if experiment_id not in promoted_experiment_ids:
+                    promotions.append((experiment_id, rung + 1))
+        return promotions
@@ -1,3 +1,8 @@
+from django.utils.functional import cached_property
+
+from hpsearch.search_managers.space import MatrixSpace
+
+
 class BaseSearchAlgorithmManager(object):
     NAME = None
 
@@ -9,5 +14,9 @@ class BaseSearchAlgorithmManager(object):
                 'with the search algorithm `{}` defined in the config.'.format(
                     self.NAME, self.hptuning_config.search_algorithm))
 
+    @cached_property
+    def space(self):
+        return MatrixSpace(matrix=self.hptuning_config.matrix)
+
     def get_suggestions(self, iteration_config=None):
         raise NotImplemented  # noqa
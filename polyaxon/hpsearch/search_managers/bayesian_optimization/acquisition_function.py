@@ -1,3 +1,6 @@
+import logging
+import time
+
 import numpy as np
 
 from scipy.optimize import minimize
@@ -5,12 +8,17 @@ from scipy.stats import norm
 from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF, Matern
 
+from hpsearch.search_managers.bayesian_optimization.posterior import GaussianProcessPosterior
 from hpsearch.search_managers.utils import get_random_generator
 from polyaxon_schemas.hptuning import GaussianProcessConfig, UtilityFunctionConfig
 from polyaxon_schemas.utils import AcquisitionFunctions, GaussianProcessesKernels
 
+_logger = logging.getLogger('polyaxon.hpsearch.search_managers')
+
 
 class UtilityFunction(object):
+    MIN_STD = 1e-9
+    MAX_ITER = 200
 
     def __init__(self, config, seed=None):
         if not isinstance(config, UtilityFunctionConfig):
@@ -23,6 +31,8 @@ class UtilityFunction(object):
         self.random_generator = get_random_generator(seed=seed)
         self.gaussian_process = self.get_gaussian_process(config=config.gaussian_process,
                                                           random_generator=self.random_generator)
+        self._posterior = None
+        self.timings = {}
 
     @staticmethod
     def get_gaussian_process(config, random_generator):
@@ -41,27 +51,106 @@ class UtilityFunction(object):
             random_state=random_generator
         )
 
-    def _compute_ucb(self, x):
-        mean, std = self.gaussian_process.predict(x, return_std=True)
+    @property
+    def posterior(self):
+        """The posterior of the fitted gaussian process, recomputed only after a new fit."""
+        if not GaussianProcessPosterior.is_fitted(self.gaussian_process):
+            return None
+        if self._posterior is None or not self._posterior.is_posterior_of(self.gaussian_process):
+            self._posterior = GaussianProcessPosterior(self.gaussian_process)
+        return self._posterior
+
+    def _predict(self, x):
+        posterior = self.posterior
+        if posterior is None:
+            return self.gaussian_process.predict(x, return_std=True)
+        return posterior.predict(x)
+
+    def _compute_ucb(self, mean, std):
         return mean + self.kappa * std
 
-    def _compute_ei(self, x, y_max):
-        mean, std = self.gaussian_process.predict(x, return_std=True)
+    def _compute_ei(self, mean, std, y_max):
+        std = np.maximum(std, self.MIN_STD)
         z = (mean - y_max - self.eps) / std
         return (mean - y_max - self.eps) * norm.cdf(z) + std * norm.pdf(z)
 
-    def _compute_poi(self, x, y_max):
-        mean, std = self.gaussian_process.predict(x, return_std=True)
+    def _compute_poi(self, mean, std, y_max):
+        std = np.maximum(std, self.MIN_STD)
         z = (mean - y_max - self.eps) / std
         return norm.cdf(z)
 
     def compute(self, x, y_max):
+        mean, std = self._predict(x)
         if AcquisitionFunctions.is_ucb(self.acquisition_function):
-            return self._compute_ucb(x=x)
+            return self._compute_ucb(mean=mean, std=std)
         if AcquisitionFunctions.is_ei(self.acquisition_function):
-            return self._compute_ei(x=x, y_max=y_max)
+            return self._compute_ei(mean=mean, std=std, y_max=y_max)
         if AcquisitionFunctions.is_poi(self.acquisition_function):
-            return self._compute_poi(x=x, y_max=y_max)
+            return self._compute_poi(mean=mean, std=std, y_max=y_max)
+
+    def compute_with_gradient(self, x, y_max):
+        """Computes the acquisition function of the points `x` and its gradients w.r.t. `x`."""
+        mean, std, mean_gradient, std_gradient = self.posterior.predict_with_gradient(x)
+        if AcquisitionFunctions.is_ucb(self.acquisition_function):
+            return (self._compute_ucb(mean=mean, std=std),
+                    mean_gradient + self.kappa * std_gradient)
+
+        std = np.maximum(std, self.MIN_STD)[:, np.newaxis]
+        improvement = (mean - y_max - self.eps)[:, np.newaxis]
+        z = improvement / std
+        if AcquisitionFunctions.is_ei(self.acquisition_function):
+            values = improvement * norm.cdf(z) + std * norm.pdf(z)
+            gradient = norm.cdf(z) * mean_gradient + norm.pdf(z) * std_gradient
+            return values[:, 0], gradient
+        if AcquisitionFunctions.is_poi(self.acquisition_function):
+            gradient = norm.pdf(z) * (mean_gradient * std - improvement * std_gradient) / std ** 2
+            return norm.cdf(z)[:, 0], gradient
+
+    def _maximize_seeds(self, x_seeds, y_max, bounds):
+        """Runs L-BFGS-B from all the seeds at once.
+
+        The seeds are stacked in a single vector and the objective is the sum of
+        the acquisition function of all the seeds. Since the sum is separable,
+        each iteration evaluates the acquisition function and its gradients for all the seeds
+        with a single batched prediction.
+        The number of iterations is bounded by `MAX_ITER`.
+        """
+        n_seeds, n_dims = x_seeds.shape
+
+        def objective(x):
+            values, gradient = self.compute_with_gradient(x.reshape(n_seeds, n_dims), y_max=y_max)
+            return -values.sum(), -gradient.ravel()
+
+        res = minimize(objective,
+                       x_seeds.ravel(),
+                       jac=True,
+                       bounds=np.tile(bounds, (n_seeds, 1)),
+                       method="L-BFGS-B",
+                       options={'maxiter': self.MAX_ITER})
+        x_tries = np.clip(res.x.reshape(n_seeds, n_dims), bounds[:, 0], bounds[:, 1])
+        ys = self.compute(x_tries, y_max=y_max)
+        return x_tries[ys.argmax()], ys.max()
+
+    def _maximize_each_seed(self, x_seeds, y_max, bounds):
+        """Runs L-BFGS-B from each seed, with gradients approximated numerically."""
+        x_max = None
+        max_acq = None
+        for x_try in x_seeds:
+            # Find the minimum of minus the acquisition function
+            res = minimize(lambda x: -self.compute(x.reshape(1, -1), y_max=y_max)[0],
+                           x_try,
+                           bounds=bounds,
+                           method="L-BFGS-B")
+
+            # See if success
+            if not res.success:
+                continue
+
+            # Store it if better than previous minimum(maximum).
+            if max_acq is None or -res.fun >= max_acq:
+                x_max = res.x
+                max_acq = -res.fun
+        return x_max, max_acq
 
     def max_compute(self, y_max, bounds, n_warmup=100000, n_iter=250):
         """A function to find the maximum of the acquisition function
@@ -70,6 +159,10 @@ class UtilityFunction(object):
 
         First by sampling `n_warmup` (1e5) points at random,
         and then running L-BFGS-B from `n_iter` (250) random starting points.
+        When the gradients of the gaussian process are known analytically,
+        the starting points are optimized together, see `_maximize_seeds`.
+
+        The time spent in each step is stored in `timings`.
 
         Params:
             y_max: The current maximum known value of the target function.
@@ -81,30 +174,32 @@ class UtilityFunction(object):
             x_max: The arg max of the acquisition function.
         """
         # Warm up with random points
+        start = time.time()
         x_tries = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
                                                 size=(n_warmup, bounds.shape[0]))
         ys = self.compute(x_tries, y_max=y_max)
         x_max = x_tries[ys.argmax()]
         max_acq = ys.max()
+        self.timings['warmup'] = time.time() - start
 
         # Explore the parameter space more throughly
+        start = time.time()
         x_seeds = self.random_generator.uniform(bounds[:, 0], bounds[:, 1],
                                                 size=(n_iter, bounds.shape[0]))
-        for x_try in x_seeds:
-            # Find the minimum of minus the acquisition function
-            res = minimize(lambda x: -self.compute(x.reshape(1, -1), y_max=y_max),
-                           x_try.reshape(1, -1),
-                           bounds=bounds,
-                           method="L-BFGS-B")
-
-            # See if success
-            if not res.success:
-                continue
-
-            # Store it if better than previous minimum(maximum).
-            if max_acq is None or -res.fun[0] >= max_acq:
-                x_max = res.x
-                max_acq = -res.fun[0]
+        posterior = self.posterior
+        if posterior is not None and posterior.has_gradient:
+            x_seeds_max, seeds_max_acq = self._maximize_seeds(
+                x_seeds=x_seeds, y_max=y_max, bounds=bounds)
+        else:
+            x_seeds_max, seeds_max_acq = self._maximize_each_seed(
+                x_seeds=x_seeds, y_max=y_max, bounds=bounds)
+        if seeds_max_acq is not None and seeds_max_acq >= max_acq:
+            x_max = x_seeds_max
+        self.timings['optimization'] = time.time() - start
+        _logger.debug('Acquisition function maximized in %.3fs (warmup %.3fs, optimization %.3fs)',
+                      self.timings['warmup'] + self.timings['optimization'],
+                      self.timings['warmup'],
+                      self.timings['optimization'])
 
         # Clip output to make sure it lies within the bounds. Due to floating
         # point technicalities this is not always the case.
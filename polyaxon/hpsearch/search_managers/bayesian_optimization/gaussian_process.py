@@ -0,0 +1,200 @@
+import logging
+
+from collections import OrderedDict
+
+import numpy as np
+
+from scipy.linalg import cho_solve, cholesky, solve_triangular
+
+_logger = logging.getLogger('polyaxon.hpsearch.search_managers')
+
+# The kernel hyperparameters are optimized again once the number of observations
+# grew by this factor since their last optimization.
+REOPTIMIZATION_GROWTH = 1.5
+MAX_CACHED_FACTORS = 16
+
+# Cholesky factors of the latest fits, by state key, to extend them with new observations.
+_cholesky_factors = OrderedDict()
+
+
+def _get_cholesky_factor(key):
+    return _cholesky_factors.get(key)
+
+
+def _cache_cholesky_factor(key, factor):
+    _cholesky_factors[key] = factor
+    _cholesky_factors.move_to_end(key)
+    while len(_cholesky_factors) > MAX_CACHED_FACTORS:
+        _cholesky_factors.popitem(last=False)
+
+
+class GaussianProcessState(object):
+    """The encoded observations and the kernel hyperparameters of a fitted gaussian process.
+
+    The state is persisted with the experiment group iteration, so that the next iteration
+    reuses the encoded observations and the hyperparameters instead of fitting from scratch.
+    """
+
+    def __init__(self, experiment_ids, x, theta, n_optimized):
+        self.experiment_ids = list(experiment_ids)
+        self.x = np.asarray(x, dtype=float)
+        self.theta = np.asarray(theta, dtype=float)
+        self.n_optimized = n_optimized
+
+    @property
+    def key(self):
+        return hash((self.x.shape, self.x.tobytes(), self.theta.tobytes()))
+
+    def get_observations(self):
+        """Returns the encoded observation of each experiment."""
+        return dict(zip(self.experiment_ids, self.x))
+
+    def is_prefix_of(self, x):
+        n_observations = len(self.x)
+        return (n_observations <= len(x) and
+                self.x.shape[1:] == x.shape[1:] and
+                np.array_equal(self.x, x[:n_observations]))
+
+    def to_dict(self):
+        return {
+            'experiment_ids': self.experiment_ids,
+            'x': self.x.tolist(),
+            'theta': self.theta.tolist(),
+            'n_optimized': self.n_optimized,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def extend_cholesky_factor(factor, kernel, x, x_new, noise):
+    """Extends the Cholesky factor of `kernel(x) + noise * I` with the observations `x_new`.
+
+    Only the new rows of the factor are computed, in O(n^2 * k) for k new observations.
+    """
+    k_cross = kernel(x, x_new)
+    k_new = kernel(x_new)
+    k_new[np.diag_indices_from(k_new)] += noise
+    lower_left = solve_triangular(factor, k_cross, lower=True).T
+    lower_right = cholesky(k_new - lower_left.dot(lower_left.T), lower=True)
+    n_observations, n_new_observations = len(x), len(x_new)
+    extended_factor = np.zeros((n_observations + n_new_observations,
+                                n_observations + n_new_observations))
+    extended_factor[:n_observations, :n_observations] = factor
+    extended_factor[n_observations:, :n_observations] = lower_left
+    extended_factor[n_observations:, n_observations:] = lower_right
+    return extended_factor
+
+
+def _set_fit(gaussian_process, kernel, x, y, factor):
+    """Sets the fitted attributes of a `GaussianProcessRegressor` computed without `fit`."""
+    gaussian_process.kernel_ = kernel
+    gaussian_process.X_train_ = np.copy(x)
+    gaussian_process.y_train_ = np.copy(y)
+    gaussian_process._y_train_mean = np.zeros(1)  # pylint:disable=protected-access
+    gaussian_process._y_train_std = np.ones(1)  # pylint:disable=protected-access
+    gaussian_process._K_inv = None  # pylint:disable=protected-access
+    gaussian_process.L_ = factor
+    gaussian_process.alpha_ = cho_solve((factor, True), y)
+
+
+def _update_fit(gaussian_process, x, y, state):
+    """Fits the gaussian process with the hyperparameters of the state.
+
+    If the Cholesky factor of the state is cached, it is reused as is without new observations,
+    or extended with the new observations, otherwise it is computed,
+    in all cases the hyperparameters are not optimized.
+    """
+    kernel = gaussian_process.kernel.clone_with_theta(state.theta)
+    factor = _get_cholesky_factor(state.key)
+    x_new = x[len(state.x):]
+    if factor is not None:
+        if len(x_new):
+            factor = extend_cholesky_factor(factor=factor,
+                                            kernel=kernel,
+                                            x=state.x,
+                                            x_new=x_new,
+                                            noise=gaussian_process.alpha)
+    else:
+        k = kernel(x)
+        k[np.diag_indices_from(k)] += gaussian_process.alpha
+        factor = cholesky(k, lower=True)
+    _set_fit(gaussian_process=gaussian_process, kernel=kernel, x=x, y=y, factor=factor)
+
+
+def condition_gaussian_process(gaussian_process, x, y):
+    """Adds the observations `x`, `y` to a fitted gaussian process.
+
+    The hyperparameters are not optimized again, only the new rows of the Cholesky factor
+    are computed, the process is left unchanged if the factor can not be extended.
+    """
+    factor = extend_cholesky_factor(factor=gaussian_process.L_,
+                                    kernel=gaussian_process.kernel_,
+                                    x=gaussian_process.X_train_,
+                                    x_new=x,
+                                    noise=gaussian_process.alpha)
+    _set_fit(gaussian_process=gaussian_process,
+             kernel=gaussian_process.kernel_,
+             x=np.vstack([gaussian_process.X_train_, x]),
+             y=np.concatenate([gaussian_process.y_train_, y]),
+             factor=factor)
+
+
+def _warm_start_fit(gaussian_process, x, y, state):
+    """Optimizes the hyperparameters starting from the ones of the state, without restarts."""
+    kernel = gaussian_process.kernel
+    n_restarts_optimizer = gaussian_process.n_restarts_optimizer
+    gaussian_process.kernel = kernel.clone_with_theta(state.theta)
+    gaussian_process.n_restarts_optimizer = 0
+    try:
+        gaussian_process.fit(x, y)
+    finally:
+        gaussian_process.kernel = kernel
+        gaussian_process.n_restarts_optimizer = n_restarts_optimizer
+
+
+def fit_gaussian_process(gaussian_process, x, y, experiment_ids, state=None):
+    """Fits the gaussian process on the observations, and returns the new state.
+
+    Without a usable state, the gaussian process is fitted from scratch,
+    with `n_restarts_optimizer` random restarts of the hyperparameters optimization.
+    With a state whose observations are the first rows of `x`:
+        * the hyperparameters are optimized again, warm started from the state's ones,
+          once the number of observations grew by `REOPTIMIZATION_GROWTH`.
+        * otherwise the hyperparameters are kept, and only the new rows
+          of the Cholesky factor are computed if the previous factor is cached.
+
+    Args:
+        gaussian_process: `GaussianProcessRegressor`.
+        x: the encoded observations.
+        y: the observed values.
+        experiment_ids: the experiment of each observation, if known.
+        state: `GaussianProcessState` of the previous fit.
+
+    Returns:
+        `GaussianProcessState`.
+    """
+    n_optimized = len(x)
+    if (state is None or
+            gaussian_process.normalize_y or
+            not state.is_prefix_of(x) or
+            len(state.theta) != gaussian_process.kernel.n_dims):
+        gaussian_process.fit(x, y)
+    elif len(x) >= REOPTIMIZATION_GROWTH * state.n_optimized:
+        _warm_start_fit(gaussian_process=gaussian_process, x=x, y=y, state=state)
+    else:
+        n_optimized = state.n_optimized
+        try:
+            _update_fit(gaussian_process=gaussian_process, x=x, y=y, state=state)
+        except (np.linalg.LinAlgError, ValueError):
+            _logger.warning('Could not update the gaussian process, fitting it from scratch.')
+            gaussian_process.fit(x, y)
+            n_optimized = len(x)
+
+    new_state = GaussianProcessState(experiment_ids=experiment_ids,
+                                     x=x,
+                                     theta=gaussian_process.kernel_.theta,
+                                     n_optimized=n_optimized)
+    _cache_cholesky_factor(new_state.key, gaussian_process.L_)
+    return new_state
@@ -1,6 +1,6 @@
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
+from hpsearch.search_managers.bayesian_optimization.gaussian_process import GaussianProcessState
 from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer
-from hpsearch.search_managers.utils import get_random_suggestions
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
@@ -13,25 +13,60 @@ class BOSearchManager(BaseSearchAlgorithmManager):
         super().__init__(hptuning_config=hptuning_config)
         self.n_initial_trials = self.hptuning_config.bo.n_initial_trials
         self.n_iterations = self.hptuning_config.bo.n_iterations
+        # The state of the gaussian process fitted by the last suggestion
+        self.gaussian_process_state = None
 
-    def get_suggestions(self, iteration_config=None):
+    def get_suggestions(self, iteration_config=None, n_suggestions=1, pending_experiment_ids=None):
+        """Returns the initial random suggestions, or up to `n_suggestions` suggestions
+        to run in parallel, taking into account the pending experiments.
+
+        The pending experiments are the ones in `pending_experiment_ids` without a metric yet,
+        e.g. still running, all the experiments without a metric if not provided.
+        """
         if not iteration_config:
-            return get_random_suggestions(matrix=self.hptuning_config.matrix,
-                                          n_suggestions=self.n_initial_trials,
-                                          seed=self.hptuning_config.seed)
+            return self.space.get_random_suggestions(n_suggestions=self.n_initial_trials,
+                                                     seed=self.hptuning_config.seed)
         # Use the iteration_config to construct observed point and metrics
         experiments_configs = dict(iteration_config.combined_experiments_configs)
         experiments_metrics = dict(iteration_config.combined_experiments_metrics)
+        gaussian_process_state = None
+        if iteration_config.gaussian_process:
+            gaussian_process_state = GaussianProcessState.from_dict(
+                iteration_config.gaussian_process)
+        # The observations of the previous fit come first, to update the fit incrementally
+        experiment_ids = [key for key in gaussian_process_state.experiment_ids
+                          if key in experiments_metrics] if gaussian_process_state else []
+        experiment_ids += [key for key in experiments_metrics.keys() if key not in experiment_ids]
         configs = []
         metrics = []
-        for key in experiments_metrics.keys():
+        for key in experiment_ids:
             configs.append(experiments_configs[key])
             metrics.append(experiments_metrics[key])
-        optimizer = BOOptimizer(hptuning_config=self.hptuning_config)
-        optimizer.add_observations(configs=configs, metrics=metrics)
-        suggestion = optimizer.get_suggestion()
-        return [suggestion] if suggestion else None
-
-    def should_reschedule(self, iteration):
-        """Return a boolean to indicate if we need to reschedule another iteration."""
-        return iteration < self.n_iterations
+        # The experiments without a metric, still running, should not be suggested again,
+        # the ones done without a metric, e.g. failed, are not expected to get a value
+        pending_configs = [config for key, config in experiments_configs.items()
+                           if key not in experiments_metrics and
+                           (pending_experiment_ids is None or key in pending_experiment_ids)]
+        optimizer = BOOptimizer(hptuning_config=self.hptuning_config,
+                                gaussian_process_state=gaussian_process_state,
+                                space=self.space)
+        optimizer.add_observations(configs=configs, metrics=metrics, experiment_ids=experiment_ids)
+        suggestions = optimizer.get_suggestions(n_suggestions=n_suggestions,
+                                                pending_configs=pending_configs)
+        self.gaussian_process_state = optimizer.gaussian_process_state
+        return suggestions or None
+
+    def get_n_remaining_suggestions(self, iteration_config):
+        """Returns the number of experiments to suggest after the ones of the iteration.
+
+        `n_iterations` is the number of experiments suggested after the initial random trials,
+        whatever the number of iterations they were suggested in.
+        """
+        n_experiments = (len(iteration_config.old_experiment_ids or []) +
+                         len(iteration_config.experiment_ids or []))
+        n_suggested = max(n_experiments - self.n_initial_trials, 0)
+        return max(self.n_iterations - n_suggested, 0)
+
+    def should_reschedule(self, iteration_config):
+        """Return a boolean to indicate if we need to suggest more experiments."""
+        return self.get_n_remaining_suggestions(iteration_config) > 0
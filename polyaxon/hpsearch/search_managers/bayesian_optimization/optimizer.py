@@ -1,33 +1,105 @@
+import numpy as np
+
 from hpsearch.search_managers.bayesian_optimization.acquisition_function import UtilityFunction
+from hpsearch.search_managers.bayesian_optimization.gaussian_process import (
+    condition_gaussian_process,
+    fit_gaussian_process
+)
 from hpsearch.search_managers.bayesian_optimization.space import SearchSpace
 
 
 class BOOptimizer(object):
 
-    def __init__(self, hptuning_config):
+    def __init__(self, hptuning_config, gaussian_process_state=None, space=None):
         self.hptuning_config = hptuning_config
         self.n_initial_trials = self.hptuning_config.bo.n_initial_trials
-        self.space = SearchSpace(hptuning_config=hptuning_config)
+        self.space = SearchSpace(hptuning_config=hptuning_config, space=space)
         self.utility_function = UtilityFunction(
             config=hptuning_config.bo.utility_function, seed=hptuning_config.seed)
         self.n_warmup = hptuning_config.bo.utility_function.n_warmup or 5
         self.n_iter = hptuning_config.bo.utility_function.n_iter or 10
+        self.gaussian_process_state = gaussian_process_state
+        self.experiment_ids = None
+        self.y_max = None
 
-    def _maximize(self):
-        """ Find argmax of the acquisition function."""
+    def _fit(self):
+        """Fits the gaussian process on the observations, returns `False` if they are not valid."""
         if not self.space.is_observations_valid():
+            return False
+        self.y_max = self.space.y.max()
+        self.gaussian_process_state = fit_gaussian_process(
+            gaussian_process=self.utility_function.gaussian_process,
+            x=self.space.x,
+            y=self.space.y,
+            experiment_ids=self.experiment_ids or [],
+            state=self.gaussian_process_state)
+        return True
+
+    def _believe(self, x):
+        """Adds the encoded points `x` to the gaussian process, with their predicted mean as value.
+
+        The believed values are not added to the observations of the space,
+        nor to the state of the gaussian process.
+        """
+        gaussian_process = self.utility_function.gaussian_process
+        try:
+            condition_gaussian_process(gaussian_process=gaussian_process,
+                                       x=x,
+                                       y=gaussian_process.predict(x))
+        except np.linalg.LinAlgError:
+            return False
+        return True
+
+    def _maximize(self, fit=True):
+        """ Find argmax of the acquisition function."""
+        if fit and not self._fit():
             return None
-        y_max = self.space.y.max()
-        self.utility_function.gaussian_process.fit(self.space.x, self.space.y)
-        return self.utility_function.max_compute(y_max=y_max,
+        return self.utility_function.max_compute(y_max=self.y_max,
                                                  bounds=self.space.bounds,
                                                  n_warmup=self.n_warmup,
                                                  n_iter=self.n_iter)
 
-    def add_observations(self, configs, metrics):
-        # Turn configs and metrics into data points
-        self.space.add_observations(configs=configs, metrics=metrics)
+    def add_observations(self, configs, metrics, experiment_ids=None):
+        """Turns configs and metrics into data points.
+
+        If `experiment_ids` are given, the configs encoded in the gaussian process state
+        are not encoded again.
+        """
+        self.experiment_ids = experiment_ids
+        encoded_configs = None
+        if experiment_ids and self.gaussian_process_state:
+            observations = self.gaussian_process_state.get_observations()
+            encoded_configs = [observations.get(experiment_id) for experiment_id in experiment_ids]
+        self.space.add_observations(configs=configs,
+                                    metrics=metrics,
+                                    encoded_configs=encoded_configs)
 
     def get_suggestion(self):
         x = self._maximize()
         return self.space.get_suggestion(x)
+
+    def get_suggestions(self, n_suggestions=1, pending_configs=None):
+        """Returns up to `n_suggestions` distinct suggestions to evaluate in parallel.
+
+        The suggestions are selected one at a time with the Kriging believer heuristic:
+        the pending configs, e.g. of the running experiments, and every selected suggestion
+        are believed to have the value predicted by the gaussian process,
+        so that the next suggestion is selected in another region of the space.
+        Fewer suggestions are returned if a suggestion is repeated.
+        """
+        if not pending_configs:
+            suggestion = self.get_suggestion()
+        elif self._fit():
+            self._believe(self.space.parse_x(configs=pending_configs))
+            suggestion = self.space.get_suggestion(self._maximize(fit=False))
+        else:
+            suggestion = None
+
+        suggestions = []
+        while suggestion is not None and suggestion not in suggestions:
+            suggestions.append(suggestion)
+            if (len(suggestions) >= n_suggestions or
+                    not self._believe(self.space.parse_x(configs=[suggestion]))):
+                break
+            suggestion = self.space.get_suggestion(self._maximize(fit=False))
+        return suggestions
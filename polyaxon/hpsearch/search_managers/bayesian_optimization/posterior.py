@@ -0,0 +1,83 @@
+import numpy as np
+
+from scipy.linalg import cho_solve, solve_triangular
+from scipy.spatial.distance import cdist
+from sklearn.gaussian_process.kernels import RBF, Matern
+
+
+class GaussianProcessPosterior(object):
+    """The predictive distribution of a fitted `GaussianProcessRegressor`.
+
+    The Cholesky factor computed while fitting the process is reused by every prediction,
+    the mean and the std are computed together for a whole batch of points,
+    and their gradients are computed analytically for the RBF kernel
+    and the Matern kernels with `nu` in `GRADIENT_NUS`.
+    """
+    GRADIENT_NUS = (0.5, 1.5, 2.5)
+
+    def __init__(self, gaussian_process):
+        self.kernel = gaussian_process.kernel_
+        self.x_train = gaussian_process.X_train_
+        self.alpha = gaussian_process.alpha_
+        self.L = gaussian_process.L_
+        self.y_mean = getattr(gaussian_process, '_y_train_mean', 0.)
+        self.y_std = getattr(gaussian_process, '_y_train_std', 1.)
+
+    @classmethod
+    def is_fitted(cls, gaussian_process):
+        return hasattr(gaussian_process, 'L_')
+
+    def is_posterior_of(self, gaussian_process):
+        """Whether the process was not refitted since the posterior was computed."""
+        return getattr(gaussian_process, 'L_', None) is self.L
+
+    @property
+    def has_gradient(self):
+        if isinstance(self.kernel, Matern):
+            return self.kernel.nu in self.GRADIENT_NUS
+        return isinstance(self.kernel, RBF)
+
+    def _kernel_gradient(self, x, k_trans):
+        """The gradient of `k(x, x_train)` w.r.t. `x`, with the shape (n_x, n_train, n_dims)."""
+        length_scale = np.asarray(self.kernel.length_scale, dtype=float)
+        diff = (x[:, np.newaxis, :] - self.x_train[np.newaxis, :, :]) / length_scale ** 2
+        if not isinstance(self.kernel, Matern):
+            factor = -k_trans
+        else:
+            dists = cdist(x / length_scale, self.x_train / length_scale)
+            if self.kernel.nu == 0.5:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    factor = np.where(dists > 0, -np.exp(-dists) / dists, 0.)
+            elif self.kernel.nu == 1.5:
+                factor = -3. * np.exp(-np.sqrt(3.) * dists)
+            else:
+                factor = -5. / 3. * (1. + np.sqrt(5.) * dists) * np.exp(-np.sqrt(5.) * dists)
+        return factor[:, :, np.newaxis] * diff
+
+    def predict(self, x):
+        """Returns the mean and the std of the points `x`."""
+        k_trans = self.kernel(x, self.x_train)
+        mean = k_trans.dot(self.alpha)
+        v = solve_triangular(self.L, k_trans.T, lower=True)
+        var = np.maximum(self.kernel.diag(x) - np.einsum('ij,ij->j', v, v), 0.)
+        return self.y_std * mean + self.y_mean, self.y_std * np.sqrt(var)
+
+    def predict_with_gradient(self, x):
+        """Returns the mean and the std of the points `x`, and their gradients w.r.t. `x`."""
+        k_trans = self.kernel(x, self.x_train)
+        mean = k_trans.dot(self.alpha)
+        k_inv_trans = cho_solve((self.L, True), k_trans.T)
+        var = np.maximum(self.kernel.diag(x) - np.einsum('ij,ji->i', k_trans, k_inv_trans), 0.)
+        std = np.sqrt(var)
+
+        k_gradient = self._kernel_gradient(x, k_trans)
+        mean_gradient = np.einsum('ijk,j->ik', k_gradient, self.alpha)
+        var_gradient = -2. * np.einsum('ijk,ji->ik', k_gradient, k_inv_trans)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            std_gradient = np.where(std[:, np.newaxis] > 0,
+                                    var_gradient / (2. * std[:, np.newaxis]),
+                                    0.)
+        return (self.y_std * mean + self.y_mean,
+                self.y_std * std,
+                self.y_std * mean_gradient,
+                self.y_std * std_gradient)
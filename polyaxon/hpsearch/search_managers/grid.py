@@ -1,5 +1,3 @@
-import itertools
-
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
 from polyaxon_schemas.utils import SearchAlgorithms
 
@@ -9,23 +7,28 @@ class GridSearchManager(BaseSearchAlgorithmManager):
 
     NAME = SearchAlgorithms.GRID
 
-    def get_suggestions(self, iteration_config=None):
+    def get_n_suggestions(self):
+        """Return the number of suggestions of the grid."""
+        n_suggestions = self.space.size
+
+        if self.hptuning_config.grid_search and self.hptuning_config.grid_search.n_experiments:
+            return min(n_suggestions, self.hptuning_config.grid_search.n_experiments)
+        return n_suggestions
+
+    def get_suggestions(self, iteration_config=None, offset=0, n_suggestions=None):
         """Return a list of suggestions based on grid search.
 
+        The grid is expanded lazily, only the requested suggestions are generated.
+
         Params:
             matrix: `dict` representing the {hyperparam: hyperparam matrix config}.
-            n_suggestions: number of suggestions to make.
+            offset: index of the first suggestion to return.
+            n_suggestions: number of suggestions to make, by default all remaining suggestions.
         """
-        matrix = self.hptuning_config.matrix
-
-        suggestions = []
-        keys = list(matrix.keys())
-        values = [v.to_numpy() for v in matrix.values()]
-        for v in itertools.product(*values):
-            suggestions.append(dict(zip(keys, v)))
-
-        if self.hptuning_config.grid_search:
-            n_suggestions = self.hptuning_config.grid_search.n_experiments
-            if n_suggestions:
-                return suggestions[:n_suggestions]
-        return suggestions
+        stop = None
+        if self.hptuning_config.grid_search and self.hptuning_config.grid_search.n_experiments:
+            stop = self.hptuning_config.grid_search.n_experiments
+        if n_suggestions is not None:
+            stop = offset + n_suggestions if stop is None else min(stop, offset + n_suggestions)
+
+        return self.space.enumerate(offset=offset, stop=stop)
@@ -2,7 +2,6 @@ import math
 
 from hpsearch.schemas import HyperbandIterationConfig
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
-from hpsearch.search_managers.utils import get_random_suggestions
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
@@ -125,10 +124,9 @@ class HyperbandSearchManager(BaseSearchAlgorithmManager):
         suggestion_params = {
             self.hptuning_config.hyperband.resource.name: n_resources
         }
-        return get_random_suggestions(matrix=self.hptuning_config.matrix,
-                                      n_suggestions=n_configs,
-                                      suggestion_params=suggestion_params,
-                                      seed=self.hptuning_config.seed)
+        return self.space.get_random_suggestions(n_suggestions=n_configs,
+                                                 suggestion_params=suggestion_params,
+                                                 seed=self.hptuning_config.seed)
 
     def should_reschedule(self, iteration, bracket_iteration):
         """Return a boolean to indicate if we need to reschedule another iteration."""
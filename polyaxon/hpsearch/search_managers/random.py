@@ -1,5 +1,4 @@
 from hpsearch.search_managers.base import BaseSearchAlgorithmManager
-from hpsearch.search_managers.utils import get_random_suggestions
 from polyaxon_schemas.utils import SearchAlgorithms
 
 
@@ -15,7 +14,6 @@ class RandomSearchManager(BaseSearchAlgorithmManager):
             matrix: `dict` representing the {hyperparam: hyperparam matrix config}.
             n_suggestions: number of suggestions to make.
         """
-        matrix = self.hptuning_config.matrix
         n_suggestions = self.hptuning_config.random_search.n_experiments
         seed = self.hptuning_config.seed
-        return get_random_suggestions(matrix=matrix, n_suggestions=n_suggestions, seed=seed)
+        return self.space.get_random_suggestions(n_suggestions=n_suggestions, seed=seed)
@@ -0,0 +1,205 @@
+import copy
+import itertools
+import logging
+import numpy as np
+
+from django.utils.functional import cached_property
+
+from hpsearch.search_managers.utils import Suggestion, get_random_generator
+
+_logger = logging.getLogger('polyaxon.hpsearch.search_managers')
+
+# Number of batches sampled before enumerating the remaining points of a discrete space
+MAX_SAMPLING_ATTEMPTS = 10
+
+
+class MatrixSpace(object):
+    """The search space of a matrix, compiled once and shared by the search managers.
+
+    The values of the matrix and the encoding of its features are computed on first use,
+    and the space provides the enumeration, sampling, and encoding/decoding of the suggestions.
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+        # The order of the matrix is used for the enumeration and sampling
+        self.keys = list(matrix.keys())
+        # The sorted features are used for the encoding
+        self.features = sorted(self.keys)
+        self._values = {}
+
+    def get_values(self, key):
+        """Return the cached values of a discrete matrix."""
+        if key not in self._values:
+            self._values[key] = self.matrix[key].to_numpy()
+        return self._values[key]
+
+    @cached_property
+    def size(self):
+        """The number of points of the space, or `None` if the matrix has a distribution."""
+        size = 1
+        for key in self.keys:
+            if self.matrix[key].is_distribution:
+                return None
+            size *= len(self.get_values(key))
+        return size
+
+    def enumerate(self, offset=0, stop=None):
+        """Return the points of the space from `offset` to `stop`, in the grid order."""
+        values = [self.get_values(key) for key in self.keys]
+        return [dict(zip(self.keys, v))
+                for v in itertools.islice(itertools.product(*values), offset, stop)]
+
+    def _enumerate_shuffled(self, n_suggestions, rand_generator, excluded=None):
+        """Return `n_suggestions` points of the space not in `excluded`, in random order."""
+        excluded = excluded or set()
+        suggestions = [s for s in self.enumerate() if Suggestion(params=s) not in excluded]
+        indices = rand_generator.permutation(len(suggestions))[:n_suggestions]
+        return [suggestions[i] for i in indices]
+
+    def _sample(self, key, size, rand_generator):
+        if size == 1:
+            return [self.matrix[key].sample(rand_generator=rand_generator)]
+        return self.matrix[key].sample(size=size, rand_generator=rand_generator)
+
+    def sample(self, size, rand_generator):
+        """Return `size` random points of the space, sampled with one call per feature."""
+        samples = [self._sample(key=key, size=size, rand_generator=rand_generator)
+                   for key in self.keys]
+        return [dict(zip(self.keys, values)) for values in zip(*samples)]
+
+    def get_random_suggestions(self, n_suggestions, suggestion_params=None, seed=None):
+        """Return `n_suggestions` unique random suggestions.
+
+        The suggestions are sampled in batches, and deduplicated by hash.
+        If the space is discrete and too small to sample the suggestions in a few batches,
+        the remaining points are enumerated instead.
+        """
+        if not n_suggestions:
+            raise ValueError('This search algorithm requires `n_experiments`.')
+        suggestion_params = suggestion_params or {}
+        rand_generator = get_random_generator(seed=seed)
+
+        seen = set()
+        suggestions = []
+        if self.size is not None and n_suggestions >= self.size:
+            # Every point of the space is suggested
+            suggestions = self._enumerate_shuffled(n_suggestions=n_suggestions,
+                                                   rand_generator=rand_generator)
+            if n_suggestions > self.size:
+                _logger.warning(
+                    'The search space has only %s points, %s suggestions were requested.',
+                    self.size, n_suggestions)
+        else:
+            for _ in range(MAX_SAMPLING_ATTEMPTS):
+                n_remaining = n_suggestions - len(suggestions)
+                if n_remaining <= 0:
+                    break
+                for params in self.sample(size=n_remaining, rand_generator=rand_generator):
+                    suggestion = Suggestion(params=params)
+                    if suggestion not in seen:
+                        seen.add(suggestion)
+                        suggestions.append(params)
+
+            n_remaining = n_suggestions - len(suggestions)
+            if n_remaining > 0:
+                if self.size is not None:
+                    suggestions += self._enumerate_shuffled(n_suggestions=n_remaining,
+                                                            rand_generator=rand_generator,
+                                                            excluded=seen)
+                else:
+                    _logger.warning('Could only sample %s unique suggestions out of %s.',
+                                    len(suggestions), n_suggestions)
+
+        results = []
+        for suggestion in suggestions:
+            params = copy.deepcopy(suggestion_params)
+            params.update(suggestion)
+            results.append(params)
+        return results
+
+    @cached_property
+    def _encoding(self):
+        """The bounds, and the discrete and categorical features of the encoded space."""
+        bounds = []
+        discrete_features = {}
+        categorical_features = {}
+        for key in self.features:
+            value = self.matrix[key]
+            # one hot encoding for categorical type
+            if value.is_categorical:
+                values = self.get_values(key)
+                num_feasible = len(values)
+                for _ in range(num_feasible):
+                    bounds.append((0, 1))
+                categorical_features[key] = {
+                    "values": values,
+                    "number": num_feasible,
+                }
+            elif value.is_discrete:
+                bounds.append((value.min, value.max))
+                discrete_features[key] = {
+                    "values": self.get_values(key),
+                }
+            elif value.is_uniform:
+                bounds.append((float(value.min), float(value.max)))
+        return np.asarray(bounds), discrete_features, categorical_features
+
+    @property
+    def bounds(self):
+        return self._encoding[0]
+
+    @property
+    def dim(self):
+        return len(self.bounds)
+
+    @property
+    def discrete_features(self):
+        return self._encoding[1]
+
+    @property
+    def categorical_features(self):
+        return self._encoding[2]
+
+    @cached_property
+    def _categorical_indices(self):
+        return {
+            feature: {v: i for i, v in enumerate(categorical_feature['values'])}
+            for feature, categorical_feature in self.categorical_features.items()
+        }
+
+    def encode(self, configs):
+        """Encode the configs as an array of points, one row per config."""
+        columns = []
+        for feature in self.features:
+            if feature in self.categorical_features:
+                indices = np.array([self._categorical_indices[feature].get(config[feature], -1)
+                                    for config in configs])
+                one_hot = np.zeros((len(configs), self.categorical_features[feature]['number']))
+                rows = np.nonzero(indices >= 0)[0]
+                one_hot[rows, indices[rows]] = 1
+                columns.append(one_hot)
+            else:
+                columns.append(np.array([[config[feature]] for config in configs]))
+        return np.hstack(columns)
+
+    def decode(self, x):
+        """Decode a point of the encoded space to the closest config."""
+        counter = 0
+        results = []
+        for feature in self.features:
+            if feature in self.discrete_features:
+                feasible_values = self.discrete_features[feature]["values"]
+                results.append(
+                    feasible_values[np.argmin(np.absolute(np.subtract(feasible_values,
+                                                                      x[counter])))])
+                counter += 1
+            elif feature in self.categorical_features:
+                number = self.categorical_features[feature]["number"]
+                feasible_values = self.categorical_features[feature]["values"]
+                results.append(feasible_values[np.argmax(x[counter:counter + number])])
+                counter += number
+            else:
+                results.append(x[counter])
+                counter += 1
+        return dict(zip(self.features, results))
@@ -1,4 +1,3 @@
-import copy
 import numpy as np
 import uuid
 
@@ -33,19 +32,3 @@ class Suggestion(object):
 
 def get_random_generator(seed=None):
     return np.random.RandomState(seed) if seed else np.random
-
-
-def get_random_suggestions(matrix, n_suggestions, suggestion_params=None, seed=None):
-    if not n_suggestions:
-        raise ValueError('This search algorithm requires `n_experiments`.')
-    suggestions = []
-    suggestion_params = suggestion_params or {}
-    rand_generator = get_random_generator(seed=seed)
-    while n_suggestions > 0:
-        params = copy.deepcopy(suggestion_params)
-        params.update({k: v.sample(rand_generator=rand_generator) for k, v in matrix.items()})
-        suggestion = Suggestion(params=params)
-        if suggestion not in suggestions:
-            suggestions.append(suggestion)
-            n_suggestions -= 1
-    return [suggestion.params for suggestion in suggestions]
@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from polyaxon_schemas.utils import SearchAlgorithms
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import HPCeleryTasks
@@ -11,7 +13,7 @@ from event_manager.events.experiment_group import (
     EXPERIMENT_GROUP_HYPERBAND,
     EXPERIMENT_GROUP_BO
 )
-from hpsearch.tasks import grid, hyperband, bo, random
+from hpsearch.tasks import asha, grid, hyperband, bo, random
 
 
 @celery_app.task(name=HPCeleryTasks.HP_CREATE)
@@ -32,6 +34,9 @@ def create(experiment_group):
     elif SearchAlgorithms.is_hyperband(experiment_group.search_algorithm):
         auditor.record(event_type=EXPERIMENT_GROUP_HYPERBAND,
                        instance=experiment_group)
+        # The mode is only read for the new searches, ASHA records it in the group's iteration
+        if settings.HPSEARCH_ASYNC_HYPERBAND:
+            return asha.create(experiment_group=experiment_group)
         return hyperband.create(experiment_group=experiment_group)
     elif SearchAlgorithms.is_bo(experiment_group.search_algorithm):
         auditor.record(event_type=EXPERIMENT_GROUP_BO,
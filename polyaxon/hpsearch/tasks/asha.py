@@ -0,0 +1,84 @@
+from db.getters.experiment_groups import get_running_experiment_group
+from hpsearch.iteration_managers.asha import AshaIterationManager
+from hpsearch.search_managers.asha import AshaSearchManager
+from hpsearch.tasks import base
+from polyaxon.celery_api import app as celery_app
+from polyaxon.settings import HPCeleryTasks
+
+
+def create(experiment_group):
+    # The group's managers are only asynchronous once its first iteration records it
+    search_manager = AshaSearchManager(hptuning_config=experiment_group.hptuning_config)
+    iteration_manager = AshaIterationManager(experiment_group=experiment_group)
+    suggestions = search_manager.get_suggestions(n_suggestions=experiment_group.concurrency)
+    experiments = base.create_group_experiments(experiment_group=experiment_group,
+                                                suggestions=suggestions)
+    iteration_manager.create_iteration(experiment_ids=[xp.id for xp in experiments])
+
+    celery_app.send_task(
+        HPCeleryTasks.HP_ASHA_START,
+        kwargs={'experiment_group_id': experiment_group.id},
+        countdown=1)
+
+
+@celery_app.task(name=HPCeleryTasks.HP_ASHA_START, bind=True, max_retries=None)
+def hp_asha_start(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
+    experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
+    if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
+        return
+
+    should_retry = base.start_group_experiments(experiment_group=experiment_group)
+    if should_retry:
+        # Schedule another task
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
+        return
+
+    base.hand_over_group_scheduler(task=self,
+                                   experiment_group_id=experiment_group_id,
+                                   task_name=HPCeleryTasks.HP_ASHA_ITERATE)
+
+
+@celery_app.task(name=HPCeleryTasks.HP_ASHA_ITERATE, bind=True, max_retries=None)
+def hp_asha_iterate(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
+    experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
+    if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
+        return
+
+    iteration_manager = experiment_group.iteration_manager
+    search_manager = experiment_group.search_manager
+
+    iteration_manager.update_iteration()
+
+    n_free_slots = experiment_group.concurrency - experiment_group.non_done_experiments.count()
+    if n_free_slots > 0:
+        # Promote the experiments that rank in the top of their rung,
+        # and use the remaining free slots for new configs
+        experiments = iteration_manager.promote_experiments(n_promotions=n_free_slots)
+        suggestions = search_manager.get_suggestions(
+            iteration_config=experiment_group.iteration_config,
+            n_suggestions=n_free_slots - len(experiments))
+        if suggestions:
+            new_experiments = base.create_group_experiments(experiment_group=experiment_group,
+                                                            suggestions=suggestions)
+            iteration_manager.add_iteration_experiments(
+                experiment_ids=[xp.id for xp in new_experiments])
+        if experiments or suggestions:
+            base.hand_over_group_scheduler(task=self,
+                                           experiment_group_id=experiment_group_id,
+                                           task_name=HPCeleryTasks.HP_ASHA_START)
+            return
+
+    if experiment_group.non_done_experiments.exists():
+        # Schedule another task, to use the slots of the next experiments done
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
+        return
+
+    base.check_group_experiments_finished(experiment_group_id)
@@ -1,31 +1,70 @@
 import logging
+import uuid
 
-from db.models.experiments import Experiment
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+import auditor
+
+from constants.experiments import ExperimentLifeCycle
+from db.models.experiments import Experiment, ExperimentStatus
+from event_manager.events.experiment import EXPERIMENT_NEW_STATUS
+from libs.redis_db import RedisGroupScheduler
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import SchedulerCeleryTasks
+from polyaxon.settings import Intervals, SchedulerCeleryTasks
 
 _logger = logging.getLogger(__name__)
 
 
-def create_group_experiments(experiment_group):
+def _bulk_create_experiments(experiments):
+    """Create the experiments and their initial statuses, without the per instance signals."""
+    with transaction.atomic():
+        experiments = Experiment.objects.bulk_create(experiments)
+        statuses = ExperimentStatus.objects.bulk_create([
+            ExperimentStatus(experiment=experiment, status=ExperimentLifeCycle.CREATED)
+            for experiment in experiments
+        ])
+        last_status = ExperimentStatus.objects.filter(
+            experiment_id=OuterRef('pk')).order_by('-id').values('id')[:1]
+        Experiment.objects.filter(id__in=[experiment.id for experiment in experiments]).update(
+            status=Subquery(last_status))
+
+    for experiment, status in zip(experiments, statuses):
+        experiment.status = status
+        auditor.record(event_type=EXPERIMENT_NEW_STATUS,
+                       instance=experiment,
+                       previous_status=None)
+    return experiments
+
+
+def create_group_experiments(experiment_group, suggestions=None):
     # Parse polyaxonfile content and create the experiments
     specification = experiment_group.specification
-    suggestions = experiment_group.get_suggestions()
+    if suggestions is None:
+        suggestions = experiment_group.get_suggestions()
 
     if not suggestions:
         _logger.warning('Search algorithm was not found `%s`', specification.search_algorithm)
         return
 
     experiments = []
+    batch = []
     for suggestion in suggestions:
-        # We need to check if we should create or restart
-        experiment = Experiment.objects.create(
+        experiment_spec = specification.get_experiment_spec(matrix_declaration=suggestion)
+        batch.append(Experiment(
             project_id=experiment_group.project_id,
             user_id=experiment_group.user_id,
             experiment_group=experiment_group,
-            config=specification.get_experiment_spec(matrix_declaration=suggestion).parsed_data,
-            code_reference_id=experiment_group.code_reference_id)
-        experiments.append(experiment)
+            config=experiment_spec.parsed_data,
+            declarations=experiment_spec.declarations,
+            tags=experiment_spec.tags,
+            code_reference_id=experiment_group.code_reference_id))
+        if len(batch) == settings.HPSEARCH_EXPERIMENTS_CHUNK_SIZE:
+            experiments += _bulk_create_experiments(batch)
+            batch = []
+    if batch:
+        experiments += _bulk_create_experiments(batch)
 
     return experiments
 
@@ -52,6 +91,77 @@ def start_group_experiments(experiment_group):
     return n_pending_experiment - experiment_to_start > 0
 
 
+def _get_scheduler_ttl():
+    # The run of a task that died without handing it over or releasing it expires
+    return 3 * Intervals.EXPERIMENTS_GROUPS_SCHEDULER
+
+
+def claim_group_scheduler(task, experiment_group_id):
+    """Make the task the scheduler of the group, to be woken by the experiments done.
+
+    The task runs the scheduler until it hands it over to the next task of the search,
+    retries, or the group is finished.
+
+    Returns False if another task is running the scheduler, which will make another pass,
+    or if the task is a retry superseded by another task of the group,
+    in which case the task should stop.
+    """
+    if not task.request.id:
+        return True
+    return RedisGroupScheduler.claim(experiment_group_id=experiment_group_id,
+                                     task_name=task.name,
+                                     task_id=task.request.id,
+                                     is_retry=task.request.retries > 0,
+                                     ttl=_get_scheduler_ttl())
+
+
+def acquire_group_scheduler(task, experiment_group_id):
+    """Run the scheduler of the group, e.g. to create its experiments, without being woken.
+
+    Returns False if another task is running the scheduler, in which case the task should stop.
+    """
+    if not task.request.id:
+        return True
+    return RedisGroupScheduler.acquire(experiment_group_id=experiment_group_id,
+                                       task_id=task.request.id,
+                                       ttl=_get_scheduler_ttl())
+
+
+def hand_over_group_scheduler(task, experiment_group_id, task_name, countdown=None, **kwargs):
+    """Send the next task of the search, which keeps running the scheduler of the group.
+
+    `task` is None when the search is created, no task is running the scheduler yet.
+    """
+    next_task_id = None
+    if task and task.request.id:
+        next_task_id = str(uuid.uuid4())
+        RedisGroupScheduler.hand_over(experiment_group_id=experiment_group_id,
+                                      task_id=task.request.id,
+                                      next_task_id=next_task_id,
+                                      ttl=_get_scheduler_ttl())
+    kwargs['experiment_group_id'] = experiment_group_id
+    celery_app.send_task(task_name, kwargs=kwargs, countdown=countdown, task_id=next_task_id)
+
+
+def release_group_scheduler(task, experiment_group_id):
+    """Stop running the scheduler of the group.
+
+    Returns True if the group was woken during the run, and needs another pass.
+    """
+    if not task.request.id:
+        return False
+    return RedisGroupScheduler.release(experiment_group_id=experiment_group_id,
+                                       task_id=task.request.id)
+
+
+def retry_group_scheduler(task, experiment_group_id):
+    # The task is woken by the experiments done, polling is only a safety net
+    needs_another_pass = release_group_scheduler(task=task,
+                                                 experiment_group_id=experiment_group_id)
+    task.retry(countdown=1 if needs_another_pass else Intervals.EXPERIMENTS_GROUPS_SCHEDULER)
+
+
 def check_group_experiments_finished(experiment_group_id):
+    RedisGroupScheduler.remove(experiment_group_id=experiment_group_id)
     celery_app.send_task(SchedulerCeleryTasks.EXPERIMENTS_GROUP_CHECK_FINISHED,
                          kwargs={'experiment_group_id': experiment_group_id})
@@ -4,55 +4,86 @@ from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import HPCeleryTasks, Intervals
 
 
-def create(experiment_group):
-    experiments = base.create_group_experiments(experiment_group=experiment_group)
+def create(experiment_group, n_suggestions=1, task=None):
+    pending_experiment_ids = set(
+        experiment_group.non_done_experiments.values_list('id', flat=True))
+    suggestions = experiment_group.search_manager.get_suggestions(
+        iteration_config=experiment_group.iteration_config,
+        n_suggestions=n_suggestions,
+        pending_experiment_ids=pending_experiment_ids)
+    experiments = base.create_group_experiments(experiment_group=experiment_group,
+                                                suggestions=suggestions or [])
+    if not experiments:
+        if experiment_group.non_done_experiments.exists():
+            # Wait for the running experiments to make new observations,
+            # the scheduler is woken by the experiments done
+            needs_another_pass = task and base.release_group_scheduler(
+                task=task, experiment_group_id=experiment_group.id)
+            celery_app.send_task(
+                HPCeleryTasks.HP_BO_ITERATE,
+                kwargs={'experiment_group_id': experiment_group.id},
+                countdown=1 if needs_another_pass else Intervals.EXPERIMENTS_GROUPS_SCHEDULER)
+        else:
+            base.check_group_experiments_finished(experiment_group.id)
+        return
     experiment_ids = [xp.id for xp in experiments]
     experiments_configs = [[xp.id, xp.declarations] for xp in experiments]
+    gaussian_process_state = experiment_group.search_manager.gaussian_process_state
     experiment_group.iteration_manager.create_iteration(
         experiment_ids=experiment_ids,
-        experiments_configs=experiments_configs)
+        experiments_configs=experiments_configs,
+        gaussian_process=gaussian_process_state.to_dict() if gaussian_process_state else None)
+
+    base.hand_over_group_scheduler(task=task,
+                                   experiment_group_id=experiment_group.id,
+                                   task_name=HPCeleryTasks.HP_BO_START,
+                                   countdown=1)
 
-    celery_app.send_task(
-        HPCeleryTasks.HP_BO_START,
-        kwargs={'experiment_group_id': experiment_group.id},
-        countdown=1)
 
+@celery_app.task(name=HPCeleryTasks.HP_BO_CREATE, bind=True)
+def hp_bo_create(self, experiment_group_id, n_suggestions=1):
+    # Runs the scheduler handed over by the iterate task,
+    # the experiments done while the suggestions are made only ask for another pass
+    if not base.acquire_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
 
-@celery_app.task(name=HPCeleryTasks.HP_BO_CREATE)
-def hp_bo_create(experiment_group_id):
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
-    create(experiment_group)
+    create(experiment_group, n_suggestions=n_suggestions, task=self)
 
 
 @celery_app.task(name=HPCeleryTasks.HP_BO_START, bind=True, max_retries=None)
 def hp_bo_start(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     should_retry = base.start_group_experiments(experiment_group=experiment_group)
     if should_retry:
         # Schedule another task
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
-    celery_app.send_task(
-        HPCeleryTasks.HP_BO_ITERATE,
-        kwargs={'experiment_group_id': experiment_group_id})
+    base.hand_over_group_scheduler(task=self,
+                                   experiment_group_id=experiment_group_id,
+                                   task_name=HPCeleryTasks.HP_BO_ITERATE)
 
 
 @celery_app.task(name=HPCeleryTasks.HP_BO_ITERATE, bind=True, max_retries=None)
 def hp_bo_iterate(self, experiment_group_id):
-    experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
-    if not experiment_group:
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
         return
 
-    if experiment_group.non_done_experiments.count() > 0:
-        # Schedule another task, because all experiment must be done
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+    experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
+    if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     iteration_config = experiment_group.iteration_config
@@ -61,10 +92,25 @@ def hp_bo_iterate(self, experiment_group_id):
 
     iteration_manager.update_iteration()
 
-    if search_manager.should_reschedule(iteration=iteration_config.iteration):
-        celery_app.send_task(
-            HPCeleryTasks.HP_BO_CREATE,
-            kwargs={'experiment_group_id': experiment_group_id})
+    # The experiments done, with or without a metric, do not take a slot
+    n_non_done_experiments = experiment_group.non_done_experiments.count()
+    if search_manager.should_reschedule(iteration_config=iteration_config):
+        # Suggest experiments for the free slots as soon as an experiment is done,
+        # the pending experiments are taken into account by the suggestions
+        n_suggestions = min(experiment_group.concurrency - n_non_done_experiments,
+                            search_manager.get_n_remaining_suggestions(iteration_config))
+        has_new_done_experiments = experiment_group.done_experiments.filter(
+            status__created_at__gt=experiment_group.iteration.created_at).exists()
+        if n_suggestions > 0 and (n_non_done_experiments == 0 or has_new_done_experiments):
+            base.hand_over_group_scheduler(task=self,
+                                           experiment_group_id=experiment_group_id,
+                                           task_name=HPCeleryTasks.HP_BO_CREATE,
+                                           n_suggestions=n_suggestions)
+            return
+
+    if n_non_done_experiments > 0:
+        # Schedule another task, because all experiment must be done
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     base.check_group_experiments_finished(experiment_group_id)
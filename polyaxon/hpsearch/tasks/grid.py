@@ -1,11 +1,16 @@
+from django.conf import settings
+
 from db.getters.experiment_groups import get_running_experiment_group
 from hpsearch.tasks import base
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import HPCeleryTasks, Intervals
+from polyaxon.settings import HPCeleryTasks
 
 
 def create(experiment_group):
-    base.create_group_experiments(experiment_group=experiment_group)
+    suggestions = experiment_group.search_manager.get_suggestions(
+        n_suggestions=settings.HPSEARCH_EXPERIMENTS_CHUNK_SIZE)
+    base.create_group_experiments(experiment_group=experiment_group, suggestions=suggestions)
+    experiment_group.iteration_manager.create_iteration(offset=len(suggestions))
 
     celery_app.send_task(
         HPCeleryTasks.HP_GRID_SEARCH_START,
@@ -13,6 +18,31 @@ def create(experiment_group):
         countdown=1)
 
 
+def create_next_experiments(experiment_group):
+    """Create the next chunk of the grid if the pending experiments don't fill the free slots.
+
+    Returns:
+        a boolean to indicate if the grid still has experiments to create.
+    """
+    search_manager = experiment_group.search_manager
+    iteration_manager = experiment_group.iteration_manager
+    n_suggestions = search_manager.get_n_suggestions()
+    # The offset is recorded, the group's experiments might have been deleted
+    offset = iteration_manager.get_offset()
+    if offset >= n_suggestions:
+        return False
+
+    if experiment_group.pending_experiments.count() < experiment_group.n_experiments_to_start:
+        suggestions = search_manager.get_suggestions(
+            offset=offset,
+            n_suggestions=settings.HPSEARCH_EXPERIMENTS_CHUNK_SIZE)
+        base.create_group_experiments(experiment_group=experiment_group,
+                                      suggestions=suggestions)
+        offset += len(suggestions)
+        iteration_manager.update_offset(offset=offset)
+    return offset < n_suggestions
+
+
 @celery_app.task(name=HPCeleryTasks.HP_GRID_SEARCH_CREATE)
 def hp_grid_search_create(experiment_group_id):
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
@@ -24,14 +54,20 @@ def hp_grid_search_create(experiment_group_id):
 
 @celery_app.task(name=HPCeleryTasks.HP_GRID_SEARCH_START, bind=True, max_retries=None)
 def hp_grid_search_start(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
+    has_next_experiments = create_next_experiments(experiment_group=experiment_group)
     should_retry = base.start_group_experiments(experiment_group=experiment_group)
-    if should_retry:
+    # `None` means that the group was stopped early
+    if should_retry or (should_retry is not None and has_next_experiments):
         # Schedule another task
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     base.check_group_experiments_finished(experiment_group_id)
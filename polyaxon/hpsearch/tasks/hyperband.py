@@ -1,56 +1,69 @@
 from db.getters.experiment_groups import get_running_experiment_group
 from hpsearch.tasks import base
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import HPCeleryTasks, Intervals
+from polyaxon.settings import HPCeleryTasks
 
 
-def create(experiment_group):
+def create(experiment_group, task=None):
     experiment_group.iteration_manager.create_iteration()
     experiments = base.create_group_experiments(experiment_group=experiment_group)
     experiment_group.iteration_manager.add_iteration_experiments(
         experiment_ids=[xp.id for xp in experiments])
 
-    celery_app.send_task(
-        HPCeleryTasks.HP_HYPERBAND_START,
-        kwargs={'experiment_group_id': experiment_group.id},
-        countdown=1)
+    base.hand_over_group_scheduler(task=task,
+                                   experiment_group_id=experiment_group.id,
+                                   task_name=HPCeleryTasks.HP_HYPERBAND_START,
+                                   countdown=1)
 
 
-@celery_app.task(name=HPCeleryTasks.HP_HYPERBAND_CREATE)
-def hp_hyperband_create(experiment_group_id):
+@celery_app.task(name=HPCeleryTasks.HP_HYPERBAND_CREATE, bind=True)
+def hp_hyperband_create(self, experiment_group_id):
+    # Runs the scheduler handed over by the iterate task
+    if not base.acquire_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
-    create(experiment_group)
+    create(experiment_group, task=self)
 
 
 @celery_app.task(name=HPCeleryTasks.HP_HYPERBAND_START, bind=True, max_retries=None)
 def hp_hyperband_start(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     should_retry = base.start_group_experiments(experiment_group=experiment_group)
     if should_retry:
         # Schedule another task
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
-    celery_app.send_task(
-        HPCeleryTasks.HP_HYPERBAND_ITERATE,
-        kwargs={'experiment_group_id': experiment_group_id})
+    base.hand_over_group_scheduler(task=self,
+                                   experiment_group_id=experiment_group_id,
+                                   task_name=HPCeleryTasks.HP_HYPERBAND_ITERATE)
 
 
 @celery_app.task(name=HPCeleryTasks.HP_HYPERBAND_ITERATE, bind=True, max_retries=None)
 def hp_hyperband_iterate(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     if experiment_group.non_done_experiments.count() > 0:
         # Schedule another task, because all experiment must be done
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     iteration_config = experiment_group.iteration_config
@@ -61,17 +74,17 @@ def hp_hyperband_iterate(self, experiment_group_id):
 
     if search_manager.should_reschedule(iteration=iteration_config.iteration,
                                         bracket_iteration=iteration_config.bracket_iteration):
-        celery_app.send_task(
-            HPCeleryTasks.HP_HYPERBAND_CREATE,
-            kwargs={'experiment_group_id': experiment_group_id})
+        base.hand_over_group_scheduler(task=self,
+                                       experiment_group_id=experiment_group_id,
+                                       task_name=HPCeleryTasks.HP_HYPERBAND_CREATE)
         return
 
     if search_manager.should_reduce_configs(iteration=iteration_config.iteration,
                                             bracket_iteration=iteration_config.bracket_iteration):
         iteration_manager.reduce_configs()
-        celery_app.send_task(
-            HPCeleryTasks.HP_HYPERBAND_START,
-            kwargs={'experiment_group_id': experiment_group_id})
+        base.hand_over_group_scheduler(task=self,
+                                       experiment_group_id=experiment_group_id,
+                                       task_name=HPCeleryTasks.HP_HYPERBAND_START)
         return
 
     base.check_group_experiments_finished(experiment_group_id)
@@ -1,7 +1,7 @@
 from db.getters.experiment_groups import get_running_experiment_group
 from hpsearch.tasks import base
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import HPCeleryTasks, Intervals
+from polyaxon.settings import HPCeleryTasks
 
 
 def create(experiment_group):
@@ -24,14 +24,18 @@ def hp_random_search_create(experiment_group_id):
 
 @celery_app.task(name=HPCeleryTasks.HP_RANDOM_SEARCH_START, bind=True, max_retries=None)
 def hp_random_search_start(self, experiment_group_id):
+    if not base.claim_group_scheduler(task=self, experiment_group_id=experiment_group_id):
+        return
+
     experiment_group = get_running_experiment_group(experiment_group_id=experiment_group_id)
     if not experiment_group:
+        base.release_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     should_retry = base.start_group_experiments(experiment_group=experiment_group)
     if should_retry:
         # Schedule another task
-        self.retry(countdown=Intervals.EXPERIMENTS_SCHEDULER)
+        base.retry_group_scheduler(task=self, experiment_group_id=experiment_group_id)
         return
 
     base.check_group_experiments_finished(experiment_group_id)
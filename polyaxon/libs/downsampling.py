@@ -0,0 +1,75 @@
+"""Downsampling of time series for display.
+
+Both methods return the indices of the points to keep, so that any attribute
+of the points, e.g. timestamps, can be selected with the values.
+"""
+
+LTTB = 'lttb'
+MIN_MAX = 'minmax'
+METHODS = (LTTB, MIN_MAX)
+
+
+def lttb(xs, ys, num_points):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points, and for each bucket, the point forming the largest
+    triangle with the point kept in the previous bucket and the average of the next bucket.
+    """
+    size = len(ys)
+    if num_points >= size:
+        return list(range(size))
+    if num_points < 3:
+        return [0, size - 1][:num_points]
+
+    bucket_size = (size - 2) / (num_points - 2)
+    indices = [0]
+    a = 0
+    for i in range(num_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, size)
+
+        next_size = next_end - end
+        avg_x = sum(xs[end:next_end]) / next_size
+        avg_y = sum(ys[end:next_end]) / next_size
+
+        a_x = xs[a]
+        a_y = ys[a]
+        d_x = avg_x - a_x
+        d_y = avg_y - a_y
+        max_area = -1
+        max_index = start
+        for j in range(start, end):
+            area = abs(d_x * (ys[j] - a_y) - d_y * (xs[j] - a_x))
+            if area > max_area:
+                max_area = area
+                max_index = j
+        indices.append(max_index)
+        a = max_index
+    indices.append(size - 1)
+    return indices
+
+
+def min_max(ys, num_points):
+    """Keeps the min and the max points of `num_points / 2` buckets, in order."""
+    size = len(ys)
+    if num_points >= size:
+        return list(range(size))
+
+    num_buckets = max(num_points // 2, 1)
+    bucket_size = size / num_buckets
+    indices = []
+    for i in range(num_buckets):
+        start = int(i * bucket_size)
+        end = int((i + 1) * bucket_size)
+        bucket = ys[start:end]
+        min_index = start + bucket.index(min(bucket))
+        max_index = start + bucket.index(max(bucket))
+        indices += sorted({min_index, max_index})
+    return indices
+
+
+def downsample(xs, ys, num_points, method=LTTB):
+    if method == MIN_MAX:
+        return min_max(ys, num_points)
+    return lttb(xs, ys, num_points)
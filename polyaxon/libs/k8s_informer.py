@@ -0,0 +1,153 @@
+import logging
+import threading
+import time
+
+from kubernetes import watch
+
+from django.conf import settings
+
+_logger = logging.getLogger('polyaxon.monitors.informer')
+
+# The label set on all the pods, services and config maps created by polyaxon
+POLYAXON_LABEL_SELECTOR = 'project_uuid'
+
+
+class Informer(object):
+    """Keeps an in-memory cache of the k8s objects of a list function, by name.
+
+    A background thread lists the objects, and keeps the cache up to date by watching them.
+    Until the first list succeeds, and after every watch error, the cache is not synced,
+    and the callers should query the API instead.
+
+    Args:
+        name: the name of the informer, used for logging.
+        list_fn: the k8s list function, e.g. `list_namespaced_pod`.
+        retry_interval: the number of seconds to wait before listing again after an error.
+        kwargs: the kwargs of the list function, e.g. `namespace` or `label_selector`.
+    """
+
+    def __init__(self, name, list_fn, retry_interval=1, **kwargs):
+        self.name = name
+        self.list_fn = list_fn
+        self.retry_interval = retry_interval
+        self.kwargs = kwargs
+        self._objects = {}
+        self._synced = False
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._watch = None
+        self._thread = None
+
+    @property
+    def is_synced(self):
+        return self._synced
+
+    def get(self, name):
+        """Returns a tuple (is_synced, object), the object is `None` if it does not exist."""
+        with self._condition:
+            return self._synced, self._objects.get(name)
+
+    def wait_for(self, name, predicate, timeout):
+        """Waits for the object to satisfy the predicate, returns `None` on timeout."""
+        deadline = time.time() + timeout
+        with self._condition:
+            while True:
+                obj = self._objects.get(name)
+                if self._synced and obj is not None and predicate(obj):
+                    return obj
+                remaining = deadline - time.time()
+                if remaining <= 0 or self._stopped.is_set():
+                    return None
+                self._condition.wait(remaining)
+
+    def _set_objects(self, objects, synced):
+        with self._condition:
+            self._objects = objects
+            self._synced = synced
+            self._condition.notify_all()
+
+    def _list(self):
+        objects = self.list_fn(**self.kwargs)
+        self._set_objects({obj.metadata.name: obj for obj in objects.items}, synced=True)
+        return objects.metadata.resource_version
+
+    def _handle_event(self, event):
+        event_type = event['type']
+        if event_type == 'BOOKMARK':
+            return True
+        if event_type == 'ERROR':
+            raw_object = event.get('raw_object') or {}
+            _logger.info('Received an error on the informer `%s`: %s',
+                         self.name, raw_object.get('message'))
+            return False
+
+        obj = event['object']
+        with self._condition:
+            if event_type == 'DELETED':
+                self._objects.pop(obj.metadata.name, None)
+            else:
+                self._objects[obj.metadata.name] = obj
+            self._condition.notify_all()
+        return True
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                resource_version = self._list()
+                self._watch = watch.Watch()
+                for event in self._watch.stream(self.list_fn,
+                                                resource_version=resource_version,
+                                                **self.kwargs):
+                    if not self._handle_event(event):
+                        break
+            except Exception as e:
+                _logger.warning('Informer `%s` failed: %s', self.name, e)
+                self._set_objects({}, synced=False)
+                self._stopped.wait(self.retry_interval)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='informer_{}'.format(self.name))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._watch:
+            self._watch.stop()
+        self._set_objects({}, synced=False)
+
+
+PODS = 'pods'
+SERVICES = 'services'
+CONFIG_MAPS = 'config_maps'
+
+LIST_FUNCTIONS = {
+    PODS: 'list_namespaced_pod',
+    SERVICES: 'list_namespaced_service',
+    CONFIG_MAPS: 'list_namespaced_config_map',
+}
+
+_informers = {}
+_informers_lock = threading.Lock()
+
+
+def get_informer(kind, k8s_api, namespace):
+    """Returns the started informer of the polyaxon objects of a kind in the process.
+
+    Returns `None` if the informers are disabled.
+    """
+    if not settings.K8S_INFORMERS:
+        return None
+
+    key = (kind, namespace)
+    with _informers_lock:
+        informer = _informers.get(key)
+        if informer is None:
+            informer = Informer(name=kind,
+                                list_fn=getattr(k8s_api, LIST_FUNCTIONS[kind]),
+                                namespace=namespace,
+                                label_selector=POLYAXON_LABEL_SELECTOR)
+            informer.start()
+            _informers[key] = informer
+    return informer
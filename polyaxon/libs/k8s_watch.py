@@ -0,0 +1,173 @@
+import logging
+import time
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+from django.conf import settings
+
+from libs.redis_db import RedisWatches
+
+_logger = logging.getLogger('polyaxon.monitors.watch')
+
+HTTP_GONE = 410
+
+
+class ResourceVersionExpired(Exception):
+    """The resource version of the watch is too old to resume from (410 Gone)."""
+
+
+class ResumableWatch(object):
+    """Watches the objects of a k8s list function, resuming from the last seen resource version.
+
+    The resource version is persisted in redis to resume the watch after a restart,
+    it is only persisted once the events it covers were delivered by `before_persist`.
+    When the resource version expired, the objects are listed again,
+    and only the objects that changed since they were last seen are yielded.
+
+    Args:
+        name: the name of the watch, used to persist its state.
+        list_fn: the k8s list function to watch, e.g. `list_namespaced_pod`.
+        emit_deletions: whether to yield `DELETED` events for the objects
+            found missing when listing the objects again.
+        persist_interval: the min number of seconds between two saves of the state.
+        before_persist: a function delivering the events yielded so far, if they are buffered
+            by the consumer, the state is not saved if it raises.
+        kwargs: the kwargs of the list function.
+    """
+
+    def __init__(self,
+                 name,
+                 list_fn,
+                 emit_deletions=False,
+                 persist_interval=1,
+                 before_persist=None,
+                 **kwargs):
+        self.name = name
+        self.list_fn = list_fn
+        self.kwargs = kwargs
+        self.emit_deletions = emit_deletions
+        self.persist_interval = persist_interval
+        self.before_persist = before_persist
+        self.resource_version = RedisWatches.get_resource_version(name)
+        # The resource versions, and the objects if the deletions are emitted, by uid
+        self._versions = {}
+        self._objects = {}
+        self.counters = {'new': 0, 'replayed': 0, 'relists': 0}
+        self._pending_counters = dict.fromkeys(self.counters, 0)
+        self._last_persist = time.time()
+
+    def _count(self, key):
+        self.counters[key] += 1
+        self._pending_counters[key] += 1
+
+    def persist(self):
+        """Saves the state of the watch, returns whether it was saved."""
+        self._last_persist = time.time()
+        if self.before_persist is not None:
+            try:
+                self.before_persist()
+            except Exception as e:
+                # The events would not be replayed after a restart
+                _logger.warning('Could not deliver the events of the watch `%s`, '
+                                'not persisting its resource version: %s', self.name, e)
+                return False
+        RedisWatches.save(watch_name=self.name,
+                          resource_version=self.resource_version,
+                          counters=self._pending_counters)
+        self._pending_counters = dict.fromkeys(self.counters, 0)
+        return True
+
+    def _set_resource_version(self, resource_version):
+        self.resource_version = resource_version
+        if time.time() - self._last_persist >= self.persist_interval:
+            self.persist()
+
+    def _track(self, event_type, obj):
+        """Updates the last seen objects, returns whether the event was already seen."""
+        uid = obj.metadata.uid
+        if event_type == 'DELETED':
+            self._versions.pop(uid, None)
+            self._objects.pop(uid, None)
+            return False
+
+        resource_version = obj.metadata.resource_version
+        if self._versions.get(uid) == resource_version:
+            return True
+        self._versions[uid] = resource_version
+        if self.emit_deletions:
+            self._objects[uid] = obj
+        return False
+
+    def _relist(self):
+        self._count('relists')
+        objects = self.list_fn(**self.kwargs)
+        uids = set()
+        for obj in objects.items:
+            uids.add(obj.metadata.uid)
+            event_type = 'MODIFIED' if obj.metadata.uid in self._versions else 'ADDED'
+            if self._track(event_type, obj):
+                self._count('replayed')
+                continue
+            self._count('new')
+            yield {'type': event_type, 'object': obj}
+
+        for uid in set(self._versions) - uids:
+            self._versions.pop(uid)
+            obj = self._objects.pop(uid, None)
+            if obj is not None:
+                self._count('new')
+                yield {'type': 'DELETED', 'object': obj}
+
+        self._set_resource_version(objects.metadata.resource_version)
+
+    def _watch(self):
+        kwargs = dict(self.kwargs)
+        if settings.K8S_WATCH_BOOKMARKS:
+            kwargs['allow_watch_bookmarks'] = True
+
+        w = watch.Watch()
+        try:
+            for event in w.stream(self.list_fn, resource_version=self.resource_version, **kwargs):
+                event_type = event['type']
+                if event_type == 'ERROR':
+                    raw_object = event.get('raw_object') or {}
+                    if raw_object.get('code') == HTTP_GONE:
+                        raise ResourceVersionExpired()
+                    _logger.warning('Received an error on the watch `%s`: %s',
+                                    self.name, raw_object.get('message'))
+                    continue
+
+                obj = event['object']
+                if event_type != 'BOOKMARK':
+                    if self._track(event_type, obj):
+                        self._count('replayed')
+                    else:
+                        self._count('new')
+                        yield event
+                self._set_resource_version(obj.metadata.resource_version)
+        except ApiException as e:
+            if e.status == HTTP_GONE:
+                raise ResourceVersionExpired()
+            raise
+        finally:
+            w.stop()
+
+    def stream(self):
+        """Yields the new events of the watched objects."""
+        try:
+            while True:
+                if self.resource_version is None:
+                    for event in self._relist():
+                        yield event
+                try:
+                    for event in self._watch():
+                        yield event
+                    return
+                except ResourceVersionExpired:
+                    _logger.info('The resource version of the watch `%s` expired, '
+                                 'listing the objects again.', self.name)
+                    self.resource_version = None
+        finally:
+            self.persist()
+            _logger.debug('Watch `%s` counters: %s', self.name, self.counters)
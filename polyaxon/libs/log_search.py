@@ -0,0 +1,63 @@
+import re
+
+from itertools import islice
+
+MAX_SEARCH_RESULTS = 1000
+# The max number of lines scanned by a search, and the max length of its regex
+MAX_SCANNED_LINES = 1000000
+MAX_REGEX_LENGTH = 256
+# A quantified group containing a quantifier, e.g. `(a+)+`, can backtrack exponentially
+NESTED_QUANTIFIERS = re.compile(r'\([^()]*[*+}][^()]*\)[*+{]')
+
+
+def compile_regex(regex):
+    """Compiles the regex of a search, rejecting the patterns too expensive to match."""
+    if len(regex) > MAX_REGEX_LENGTH:
+        raise ValueError('`regex` can not be longer than {} characters.'.format(MAX_REGEX_LENGTH))
+    if NESTED_QUANTIFIERS.search(regex):
+        raise ValueError('`regex` can not contain nested quantifiers.')
+    return re.compile(regex)
+
+
+class LogsFilter(object):
+    """Matches log lines by content and by the task that emitted them.
+
+    Experiment logs are prefixed with `<task_type>.<task_idx> -- `,
+    the task filters only apply to these lines.
+    """
+    TASK_SEPARATOR = ' -- '
+
+    def __init__(self, query=None, regex=None, task_type=None, task_idx=None):
+        self.query = query
+        self.regex = compile_regex(regex) if regex else None
+        self.task_prefix = None
+        if task_type:
+            self.task_prefix = '{}.'.format(task_type)
+            if task_idx is not None:
+                self.task_prefix += '{}{}'.format(task_idx, self.TASK_SEPARATOR)
+        elif task_idx is not None:
+            raise ValueError('A task index requires a task type.')
+
+    def match(self, line):
+        if self.task_prefix and not line.startswith(self.task_prefix):
+            return False
+        if self.query and self.query not in line:
+            return False
+        if self.regex and not self.regex.search(line):
+            return False
+        return True
+
+
+def search_logs(log_store,
+                logs_filter,
+                since=None,
+                until=None,
+                limit=MAX_SEARCH_RESULTS,
+                max_scanned_lines=MAX_SCANNED_LINES):
+    """Yields the lines of the log store matching the filter.
+
+    The segments are scanned lazily, the scan stops as soon as `limit` lines are found,
+    or once `max_scanned_lines` lines are scanned.
+    """
+    lines = islice(log_store.iter_window_lines(since=since, until=until), max_scanned_lines)
+    return islice((line for line in lines if logs_filter.match(line)), limit)
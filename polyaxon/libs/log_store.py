@@ -0,0 +1,257 @@
+import gzip
+import json
+import os
+import time
+
+from django.conf import settings
+
+from libs.paths.utils import delete_path
+
+CHUNK_SIZE = 8192
+
+
+class LogStore(object):
+    """Segmented storage for experiments and jobs logs.
+
+    Logs are appended to the active segment at `log_path`. Once the active segment grows
+    beyond `segment_size` bytes, it's sealed: renamed to `<log_path>.<n>`, optionally
+    compressed, and registered in the index `<log_path>.index` with its first line,
+    number of lines, uncompressed size, and the time it was sealed.
+
+    The index allows reading a range of lines or bytes, or the last lines of the logs,
+    by only opening the segments concerned.
+    """
+    INDEX_SUFFIX = '.index'
+    GZIP = 'gzip'
+    COMPRESSION_SUFFIXES = {None: '', GZIP: '.gz'}
+
+    def __init__(self, log_path, segment_size=None, compression=None):
+        self.log_path = log_path
+        self.segment_size = segment_size or settings.LOGS_SEGMENT_SIZE
+        if compression is None:
+            compression = settings.LOGS_SEGMENT_COMPRESSION
+        self.compression = compression or None
+        if self.compression not in self.COMPRESSION_SUFFIXES:
+            raise ValueError('Unsupported logs compression `{}`'.format(self.compression))
+
+    @property
+    def index_path(self):
+        return self.log_path + self.INDEX_SUFFIX
+
+    def exists(self):
+        return os.path.exists(self.log_path) or os.path.exists(self.index_path)
+
+    def get_segments(self):
+        """Returns the sealed segments in order."""
+        try:
+            with open(self.index_path, 'r') as index_file:
+                return [json.loads(line) for line in index_file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def get_segment_path(self, segment):
+        return os.path.join(os.path.dirname(self.log_path), segment['name'])
+
+    def _open_segment(self, segment):
+        segment_path = self.get_segment_path(segment)
+        if segment.get('compression') == self.GZIP:
+            return gzip.open(segment_path, 'rb')
+        return open(segment_path, 'rb')
+
+    def _get_active_size(self):
+        try:
+            return os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return 0
+
+    def get_size(self):
+        """Returns the total uncompressed size of the logs."""
+        return sum(segment['size'] for segment in self.get_segments()) + self._get_active_size()
+
+    def should_seal(self, active_size):
+        return active_size >= self.segment_size
+
+    def seal(self):
+        """Seals the active segment.
+
+        N.B. The caller must hold the lock of the active segment.
+        """
+        segments = self.get_segments()
+        num_lines = 0
+        size = 0
+        with open(self.log_path, 'rb') as log_file:
+            for chunk in iter(lambda: log_file.read(CHUNK_SIZE), b''):
+                num_lines += chunk.count(b'\n')
+                size += len(chunk)
+        if not size:
+            return None
+
+        first_line = segments[-1]['first_line'] + segments[-1]['num_lines'] if segments else 0
+        name = '{}.{}'.format(os.path.basename(self.log_path), len(segments))
+        segment_path = os.path.join(os.path.dirname(self.log_path), name)
+        os.rename(self.log_path, segment_path)
+        if self.compression == self.GZIP:
+            with open(segment_path, 'rb') as src, gzip.open(segment_path + '.gz', 'wb') as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b''):
+                    dst.write(chunk)
+            os.remove(segment_path)
+            name += self.COMPRESSION_SUFFIXES[self.GZIP]
+
+        segment = {
+            'name': name,
+            'first_line': first_line,
+            'num_lines': num_lines,
+            'size': size,
+            'compression': self.compression,
+            'sealed_at': time.time()
+        }
+        with open(self.index_path, 'a') as index_file:
+            index_file.write(json.dumps(segment) + '\n')
+        return segment
+
+    def _iter_sources(self):
+        """Yields the sealed segments then the active segment, with their start offsets."""
+        offset = 0
+        for segment in self.get_segments():
+            yield offset, segment
+            offset += segment['size']
+        yield offset, None
+
+    def _open_source(self, segment):
+        if segment is None:
+            try:
+                return open(self.log_path, 'rb')
+            except FileNotFoundError:
+                return None
+        return self._open_segment(segment)
+
+    def iter_range(self, start=0, end=None, chunk_size=CHUNK_SIZE):
+        """Yields the bytes of the logs between `start` and `end` (exclusive)."""
+        for offset, segment in self._iter_sources():
+            if end is not None and offset >= end:
+                return
+            if segment is not None and offset + segment['size'] <= start:
+                continue
+            source = self._open_source(segment)
+            if source is None:
+                return
+            with source:
+                position = max(start - offset, 0)
+                if position:
+                    source.seek(position)
+                while end is None or offset + position < end:
+                    size = chunk_size if end is None else min(chunk_size, end - offset - position)
+                    chunk = source.read(size)
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    yield chunk
+
+    def iter_lines(self, offset=0):
+        """Yields the log lines starting from the line `offset`."""
+        segments = self.get_segments()
+        line = 0
+        for segment in segments:
+            if segment['first_line'] + segment['num_lines'] <= offset:
+                continue
+            line = segment['first_line']
+            with self._open_segment(segment) as source:
+                for value in source:
+                    if line >= offset:
+                        yield value.decode('utf-8').rstrip('\n')
+                    line += 1
+        if segments:
+            line = segments[-1]['first_line'] + segments[-1]['num_lines']
+
+        source = self._open_source(None)
+        if source is None:
+            return
+        with source:
+            for value in source:
+                if line >= offset:
+                    yield value.decode('utf-8').rstrip('\n')
+                line += 1
+
+    @staticmethod
+    def _overlaps(start, end, since, until):
+        """Checks if a segment written between `start` and `end` overlaps a time window.
+
+        An unknown `start` or `end` is considered unbounded.
+        """
+        if since is not None and end is not None and end < since:
+            return False
+        if until is not None and start is not None and start > until:
+            return False
+        return True
+
+    def iter_window_lines(self, since=None, until=None):
+        """Yields the log lines of the segments written during the time window.
+
+        Lines are not timestamped, the window is applied with the granularity of a segment:
+        a segment covers the period between the sealing of the previous segment and its own.
+        """
+        start = None
+        for segment in self.get_segments():
+            end = segment.get('sealed_at')
+            if self._overlaps(start, end, since, until):
+                with self._open_segment(segment) as source:
+                    for value in source:
+                        yield value.decode('utf-8', errors='replace').rstrip('\n')
+            start = end
+
+        if not self._overlaps(start, None, since, until):
+            return
+        source = self._open_source(None)
+        if source is None:
+            return
+        with source:
+            for value in source:
+                yield value.decode('utf-8', errors='replace').rstrip('\n')
+
+    def read_lines(self, offset=0, limit=None):
+        lines = []
+        for value in self.iter_lines(offset=offset):
+            if limit is not None and len(lines) >= limit:
+                break
+            lines.append(value)
+        return lines
+
+    @staticmethod
+    def _tail_file(source, size, num_lines, chunk_size=CHUNK_SIZE):
+        """Reads backward the last `num_lines` lines of an uncompressed file."""
+        data = b''
+        position = size
+        while position > 0 and data.count(b'\n') <= num_lines:
+            read_size = min(chunk_size, position)
+            position -= read_size
+            source.seek(position)
+            data = source.read(read_size) + data
+        # The first line might be partial, and cut in the middle of a character
+        lines = data.decode('utf-8', errors='replace').splitlines()
+        return lines[-num_lines:] if num_lines else []
+
+    def tail(self, num_lines):
+        """Returns the last `num_lines` lines of the logs."""
+        lines = []
+        active_size = self._get_active_size()
+        if active_size:
+            with open(self.log_path, 'rb') as source:
+                lines = self._tail_file(source, active_size, num_lines)
+
+        for segment in reversed(self.get_segments()):
+            if len(lines) >= num_lines:
+                break
+            missing = num_lines - len(lines)
+            with self._open_segment(segment) as source:
+                if segment.get('compression'):
+                    values = source.read().decode('utf-8').splitlines()[-missing:]
+                else:
+                    values = self._tail_file(source, segment['size'], missing)
+            lines = values + lines
+        return lines
+
+    def delete(self):
+        for segment in self.get_segments():
+            delete_path(self.get_segment_path(segment))
+        delete_path(self.index_path)
+        delete_path(self.log_path)
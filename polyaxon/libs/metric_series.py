@@ -0,0 +1,218 @@
+from collections import OrderedDict
+
+from django.contrib.postgres.fields import ArrayField
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.functions import Cast
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+import auditor
+
+from db.models.experiments import (
+    Experiment,
+    ExperimentMetric,
+    ExperimentMetricChunk,
+    ExperimentMetricValue
+)
+from event_manager.events.experiment import EXPERIMENT_NEW_METRIC
+
+MAX_APPEND_RETRIES = 3
+FLOAT_ARRAY = ArrayField(FloatField())
+
+
+class ArrayAppend(Func):
+    function = 'array_append'
+
+
+class ArrayCat(Func):
+    function = 'array_cat'
+
+
+def get_numeric_values(values):
+    """Returns the metrics that can be stored in a time series."""
+    return {name: value for name, value in (values or {}).items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)}
+
+
+def get_timestamp(created_at):
+    if isinstance(created_at, str):
+        created_at = parse_datetime(created_at)
+    return (created_at or timezone.now()).timestamp()
+
+
+def _append_point(experiment_id, name, timestamp, value):
+    for _ in range(MAX_APPEND_RETRIES):
+        chunk = ExperimentMetricChunk.objects.filter(
+            experiment_id=experiment_id, name=name).order_by('-index').values('id', 'index').first()
+        if chunk:
+            updated = ExperimentMetricChunk.objects.filter(
+                id=chunk['id'],
+                num_points__lt=ExperimentMetricChunk.MAX_POINTS
+            ).update(
+                timestamps=ArrayAppend(F('timestamps'), Cast(Value(timestamp), FloatField())),
+                values=ArrayAppend(F('values'), Cast(Value(value), FloatField())),
+                num_points=F('num_points') + 1)
+            if updated:
+                return
+        try:
+            with transaction.atomic():
+                ExperimentMetricChunk.objects.create(experiment_id=experiment_id,
+                                                     name=name,
+                                                     index=chunk['index'] + 1 if chunk else 0,
+                                                     num_points=1,
+                                                     timestamps=[timestamp],
+                                                     values=[value])
+            return
+        except IntegrityError:
+            # Another process created the chunk, retry appending to it
+            pass
+    raise IntegrityError('Could not append a value to the metric `{}` of experiment `{}`.'.format(
+        name, experiment_id))
+
+
+def _extend_chunk(chunk, timestamps, values):
+    """Appends the points to a chunk, unless it was modified concurrently."""
+    return ExperimentMetricChunk.objects.filter(
+        id=chunk['id'],
+        num_points=chunk['num_points']
+    ).update(
+        timestamps=ArrayCat(F('timestamps'), Cast(Value(timestamps), FLOAT_ARRAY)),
+        values=ArrayCat(F('values'), Cast(Value(values), FLOAT_ARRAY)),
+        num_points=F('num_points') + len(values))
+
+
+def append_metrics_batch(experiment_id, reports):
+    """Appends a batch of metric reports to the time series of the experiment.
+
+    The last chunk of every series is fetched in one query, filled with one update,
+    and the remaining points are bulk created in new chunks.
+
+    Args:
+        experiment_id: the experiment id.
+        reports: list of (created_at, values) in chronological order.
+    """
+    series = OrderedDict()
+    for created_at, values in reports:
+        timestamp = get_timestamp(created_at)
+        for name, value in get_numeric_values(values).items():
+            timestamps, points = series.setdefault(name, ([], []))
+            timestamps.append(timestamp)
+            points.append(value)
+    if not series:
+        return
+
+    last_chunks = {
+        chunk['name']: chunk for chunk in ExperimentMetricChunk.objects.filter(
+            experiment_id=experiment_id, name__in=list(series)
+        ).order_by('name', '-index').distinct('name').values('id', 'name', 'index', 'num_points')
+    }
+
+    new_chunks = []
+    for name, (timestamps, values) in series.items():
+        chunk = last_chunks.get(name)
+        start = 0
+        if chunk:
+            start = min(ExperimentMetricChunk.MAX_POINTS - chunk['num_points'], len(values))
+            if start > 0 and not _extend_chunk(chunk, timestamps[:start], values[:start]):
+                # The chunk was modified concurrently, fallback to appending point by point
+                for timestamp, value in zip(timestamps, values):
+                    _append_point(experiment_id, name, timestamp, value)
+                continue
+        index = chunk['index'] + 1 if chunk else 0
+        for i in range(start, len(values), ExperimentMetricChunk.MAX_POINTS):
+            chunk_values = values[i:i + ExperimentMetricChunk.MAX_POINTS]
+            new_chunks.append(ExperimentMetricChunk(
+                experiment_id=experiment_id,
+                name=name,
+                index=index,
+                num_points=len(chunk_values),
+                timestamps=timestamps[i:i + ExperimentMetricChunk.MAX_POINTS],
+                values=chunk_values))
+            index += 1
+
+    try:
+        with transaction.atomic():
+            ExperimentMetricChunk.objects.bulk_create(new_chunks)
+    except IntegrityError:
+        # Another process created some of the chunks, fallback to appending point by point
+        for chunk in new_chunks:
+            for timestamp, value in zip(chunk.timestamps, chunk.values):
+                _append_point(experiment_id, chunk.name, timestamp, value)
+
+
+def append_metrics(experiment_id, values, created_at=None):
+    """Appends the values of a metric report to the time series of the experiment."""
+    append_metrics_batch(experiment_id=experiment_id, reports=[(created_at, values)])
+
+
+def set_last_metric_values(experiment, metric):
+    """Replaces the indexed values of the last metric of the experiment."""
+    with transaction.atomic():
+        # Serialize the concurrent updates of the experiment's values
+        Experiment.objects.select_for_update().filter(id=experiment.id).exists()
+        ExperimentMetricValue.objects.filter(experiment_id=experiment.id).delete()
+        ExperimentMetricValue.objects.bulk_create([
+            ExperimentMetricValue(experiment_id=experiment.id,
+                                  experiment_group_id=experiment.experiment_group_id,
+                                  metric_id=metric.id,
+                                  name=name,
+                                  value=value)
+            for name, value in get_numeric_values(metric.values).items()
+        ])
+
+
+def create_metrics(experiment, metrics):
+    """Creates a batch of metric reports for an experiment.
+
+    The reports are bulk created, without triggering the `post_save` signal of each report:
+    the last metric of the experiment is updated, and the new metric event recorded, once.
+
+    Args:
+        experiment: the experiment.
+        metrics: list of dict with `values` and optionally `created_at`.
+
+    Returns:
+        the created metrics.
+    """
+    if not metrics:
+        return []
+    now = timezone.now()
+    instances = []
+    for metric in metrics:
+        created_at = metric.get('created_at') or now
+        if isinstance(created_at, str):
+            created_at = parse_datetime(created_at) or now
+        instances.append(ExperimentMetric(experiment=experiment,
+                                          created_at=created_at,
+                                          values=metric['values']))
+    instances = ExperimentMetric.objects.bulk_create(instances)
+
+    last_metric = max(instances, key=lambda instance: (instance.created_at, instance.id))
+    Experiment.objects.filter(id=experiment.id).update(metric=last_metric)
+    experiment.metric = last_metric
+    set_last_metric_values(experiment=experiment, metric=last_metric)
+    append_metrics_batch(
+        experiment_id=experiment.id,
+        reports=sorted([(instance.created_at, instance.values) for instance in instances],
+                       key=lambda report: report[0]))
+    auditor.record(event_type=EXPERIMENT_NEW_METRIC, instance=experiment)
+    return instances
+
+
+def get_metric_names(experiment_id):
+    return list(ExperimentMetricChunk.objects.filter(
+        experiment_id=experiment_id, index=0).order_by('name').values_list('name', flat=True))
+
+
+def get_metric_series(experiment_id, name):
+    """Returns the timestamps and values of an experiment metric."""
+    timestamps = []
+    values = []
+    chunks = ExperimentMetricChunk.objects.filter(
+        experiment_id=experiment_id, name=name).order_by('index')
+    chunks = chunks.values_list('timestamps', 'values')
+    for chunk_timestamps, chunk_values in chunks:
+        timestamps += chunk_timestamps
+        values += chunk_values
+    return timestamps, values
@@ -4,6 +4,7 @@ import shutil
 from django.conf import settings
 
 from db.models.cloning_strategies import CloningStrategy
+from libs.log_store import LogStore
 from libs.paths.utils import create_path, delete_path
 
 
@@ -38,7 +39,7 @@ def get_experiment_logs_path(experiment_name):
 
 def delete_experiment_logs(experiment_name):
     path = get_experiment_logs_path(experiment_name)
-    delete_path(path)
+    LogStore(path).delete()
 
 
 def delete_experiment_outputs(experiment_name):
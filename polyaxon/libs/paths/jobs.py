@@ -2,6 +2,7 @@ import os
 
 from django.conf import settings
 
+from libs.log_store import LogStore
 from libs.paths.utils import create_path, delete_path
 
 
@@ -24,7 +25,7 @@ def delete_job_outputs(job_name):
 
 def delete_job_logs(job_name):
     path = get_job_logs_path(job_name)
-    delete_path(path)
+    LogStore(path).delete()
 
 
 def create_job_path(job_name, path):
@@ -21,6 +21,18 @@ class RedisJobContainers(BaseRedisDb):
     KEY_JOBS_TO_CONTAINERS = 'JOBS_TO_CONTAINERS:{}'  # Redis set, maps jobs to containers
     KEY_JOBS_TO_EXPERIMENTS = 'JOBS_TO_EXPERIMENTS:'  # Redis hash, maps jobs to experiments
 
+    # Removes the job, its containers and its experiment mapping atomically
+    LUA_REMOVE_JOB = """
+    local containers = redis.call('SMEMBERS', KEYS[1])
+    for _, container_id in ipairs(containers) do
+        redis.call('SREM', KEYS[2], container_id)
+        redis.call('HDEL', KEYS[3], container_id)
+    end
+    redis.call('DEL', KEYS[1])
+    redis.call('HDEL', KEYS[4], ARGV[1])
+    return #containers
+    """
+
     REDIS_POOL = RedisPools.JOB_CONTAINERS
 
     @classmethod
@@ -48,6 +60,32 @@ class RedisJobContainers(BaseRedisDb):
             return job_uuid, experiment_uuid
         return None, None
 
+    @classmethod
+    def get_jobs(cls, container_ids):
+        """Returns a mapping of container ids to (job_uuid, experiment_uuid) in 2 round-trips."""
+        container_ids = list(container_ids)
+        if not container_ids:
+            return {}
+
+        red = cls._get_redis()
+        job_uuids = red.hmget(cls.KEY_CONTAINERS_TO_JOBS, container_ids)
+        job_uuids = [job_uuid.decode('utf-8') if job_uuid else None for job_uuid in job_uuids]
+        monitored_job_uuids = [job_uuid for job_uuid in job_uuids if job_uuid]
+        experiment_uuids = {}
+        if monitored_job_uuids:
+            values = red.hmget(cls.KEY_JOBS_TO_EXPERIMENTS, monitored_job_uuids)
+            experiment_uuids = {
+                job_uuid: experiment_uuid.decode('utf-8')
+                for job_uuid, experiment_uuid in zip(monitored_job_uuids, values)
+                if experiment_uuid
+            }
+
+        return {
+            container_id: (job_uuid, experiment_uuids.get(job_uuid))
+            for container_id, job_uuid in zip(container_ids, job_uuids)
+            if job_uuid
+        }
+
     @classmethod
     def remove_container(cls, container_id, red=None):
         red = red or cls._get_redis()
@@ -57,15 +95,12 @@ class RedisJobContainers(BaseRedisDb):
     @classmethod
     def remove_job(cls, job_uuid):
         red = cls._get_redis()
-        key_jobs_to_containers = cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid)
-        containers = red.smembers(key_jobs_to_containers)
-        for container_id in containers:
-            container_id = container_id.decode('utf-8')
-            red.srem(key_jobs_to_containers, container_id)
-            cls.remove_container(container_id=container_id, red=red)
-
-        # Remove the experiment too
-        red.hdel(cls.KEY_CONTAINERS_TO_JOBS, job_uuid)
+        red.register_script(cls.LUA_REMOVE_JOB)(
+            keys=[cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid),
+                  cls.KEY_CONTAINERS,
+                  cls.KEY_CONTAINERS_TO_JOBS,
+                  cls.KEY_JOBS_TO_EXPERIMENTS],
+            args=[job_uuid])
 
     @classmethod
     def monitor(cls, container_id, job_uuid):
@@ -78,12 +113,14 @@ class RedisJobContainers(BaseRedisDb):
             except ExperimentJob.DoesNotExist:
                 return
 
-            red.sadd(cls.KEY_CONTAINERS, container_id)
-            red.hset(cls.KEY_CONTAINERS_TO_JOBS, container_id, job_uuid)
+            pipe = red.pipeline()
+            pipe.sadd(cls.KEY_CONTAINERS, container_id)
+            pipe.hset(cls.KEY_CONTAINERS_TO_JOBS, container_id, job_uuid)
             # Add container for job
-            red.sadd(cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid), container_id)
+            pipe.sadd(cls.KEY_JOBS_TO_CONTAINERS.format(job_uuid), container_id)
             # Add job to experiment
-            red.hset(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuid, job.experiment.uuid.hex)
+            pipe.hset(cls.KEY_JOBS_TO_EXPERIMENTS, job_uuid, job.experiment.uuid.hex)
+            pipe.execute()
 
 
 class RedisToStream(BaseRedisDb):
@@ -95,6 +132,8 @@ class RedisToStream(BaseRedisDb):
     KEY_JOB_LOGS = 'JOB_LOGS'  # Redis set: job ids that we need to stream logs for
     KEY_EXPERIMENT_LOGS = 'EXPERIMENT_LOGS'  # Redis set: xp ids that we need to stream logs for
     KEY_JOB_LATEST_STATS = 'JOB_LATEST_STATS'  # Redis hash, maps job id to dict of stats
+    KEY_JOB_RESOURCES_CHANNEL = 'JOB_RESOURCES_CHANNEL:{}'  # Redis pub/sub: job stats
+    KEY_EXPERIMENT_RESOURCES_CHANNEL = 'EXPERIMENT_RESOURCES_CHANNEL:{}'  # Redis pub/sub: xp stats
     # We don't need a key for experiment because we will just aggregate jobs' stats
     # N.B: for logs, since we need to send all data since the tracking we will publish the data
     # Through an exchange
@@ -143,6 +182,17 @@ class RedisToStream(BaseRedisDb):
     def is_monitored_experiment_logs(cls, experiment_uuid):
         return cls._is_monitored(cls.KEY_EXPERIMENT_LOGS, experiment_uuid)
 
+    @classmethod
+    def get_monitored_resources(cls):
+        """Returns the sets of job and experiment uuids monitored for resources."""
+        red = cls._get_redis()
+        pipe = red.pipeline(transaction=False)
+        pipe.smembers(cls.KEY_JOB_RESOURCES)
+        pipe.smembers(cls.KEY_EXPERIMENT_RESOURCES)
+        job_uuids, experiment_uuids = pipe.execute()
+        return ({job_uuid.decode('utf-8') for job_uuid in job_uuids},
+                {experiment_uuid.decode('utf-8') for experiment_uuid in experiment_uuids})
+
     @classmethod
     def _remove_object(cls, key, object_id):
         red = cls._get_redis()
@@ -178,12 +228,14 @@ class RedisToStream(BaseRedisDb):
     @classmethod
     def get_latest_experiment_resources(cls, jobs, as_json=False):
         stats = []
-        for job in jobs:
-            job_resources = cls.get_latest_job_resources(job=job['uuid'],
-                                                         job_name=job['name'],
-                                                         as_json=True)
-            if job_resources:
-                stats.append(job_resources)
+        if jobs:
+            red = cls._get_redis()
+            values = red.hmget(cls.KEY_JOB_LATEST_STATS, [job['uuid'] for job in jobs])
+            for job, job_resources in zip(jobs, values):
+                if job_resources:
+                    job_resources = json.loads(job_resources.decode('utf-8'))
+                    job_resources['job_name'] = job['name']
+                    stats.append(job_resources)
         return stats if as_json else json.dumps(stats)
 
     @classmethod
@@ -191,6 +243,218 @@ class RedisToStream(BaseRedisDb):
         red = cls._get_redis()
         red.hset(cls.KEY_JOB_LATEST_STATS, job, json.dumps(payload))
 
+    @classmethod
+    def publish_latest_job_resources(cls, job, experiment, payload):
+        """Stores the latest stats of the job and pushes them to the streams subscribers."""
+        red = cls._get_redis()
+        payload = json.dumps(payload)
+        pipe = red.pipeline(transaction=False)
+        pipe.hset(cls.KEY_JOB_LATEST_STATS, job, payload)
+        pipe.publish(cls.KEY_JOB_RESOURCES_CHANNEL.format(job), payload)
+        if experiment:
+            pipe.publish(cls.KEY_EXPERIMENT_RESOURCES_CHANNEL.format(experiment), payload)
+        pipe.execute()
+
+    @classmethod
+    def _subscribe(cls, channel):
+        red = cls._get_redis()
+        pubsub = red.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+        return pubsub
+
+    @classmethod
+    def subscribe_job_resources(cls, job_uuid):
+        return cls._subscribe(cls.KEY_JOB_RESOURCES_CHANNEL.format(job_uuid))
+
+    @classmethod
+    def subscribe_experiment_resources(cls, experiment_uuid):
+        return cls._subscribe(cls.KEY_EXPERIMENT_RESOURCES_CHANNEL.format(experiment_uuid))
+
+
+class RedisDebounce(BaseRedisDb):
+    """Coalesces the events of an object happening within a short period."""
+
+    KEY_DEBOUNCE = 'DEBOUNCE:{}:{}'  # Redis key: set while the event of an object is pending
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def acquire(cls, event, object_id, ttl):
+        """Returns `True` if no event is already pending for the object."""
+        red = cls._get_redis()
+        return bool(red.set(cls.KEY_DEBOUNCE.format(event, object_id), 1, nx=True, ex=ttl))
+
+    @classmethod
+    def release(cls, event, object_id):
+        red = cls._get_redis()
+        red.delete(cls.KEY_DEBOUNCE.format(event, object_id))
+
+
+class RedisGroupScheduler(BaseRedisDb):
+    """Tracks the task scheduling each experiment group, to wake it on experiments events.
+
+    A single task runs the scheduler of a group at a time, it hands the run over to the next
+    task of the search, or releases it. The wake ups arriving during a run are not sent,
+    the group is marked as needing another pass instead.
+    """
+
+    KEY_SCHEDULER = 'GROUP_SCHEDULER:{}'  # Redis hash: id and name of the group's scheduling task
+    KEY_WAKE = 'GROUP_SCHEDULER_WAKE:{}'  # Redis key: set while a wake up is already scheduled
+    KEY_RUN = 'GROUP_SCHEDULER_RUN:{}'  # Redis key: id of the task running the group's scheduler
+    KEY_PENDING = 'GROUP_SCHEDULER_PENDING:{}'  # Redis key: set if the group needs another pass
+
+    # Runs the scheduler of the group, unless another task is running it
+    LUA_ACQUIRE = """
+    local run = redis.call('GET', KEYS[1])
+    if run and run ~= ARGV[1] then
+        redis.call('SET', KEYS[2], 1)
+        return 0
+    end
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+    """
+
+    # Claims the scheduling of the group, unless another task is running it,
+    # or the task is a retry superseded by another task
+    LUA_CLAIM = """
+    local run = redis.call('GET', KEYS[2])
+    if run and run ~= ARGV[1] then
+        redis.call('SET', KEYS[3], 1)
+        return 0
+    end
+    local current = redis.call('HGET', KEYS[1], 'id')
+    if ARGV[3] == '1' and current and current ~= ARGV[1] then
+        return 0
+    end
+    redis.call('HSET', KEYS[1], 'id', ARGV[1], 'task', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[4])
+    return 1
+    """
+
+    # Hands the run over to the next task, if the task is still running the scheduler
+    LUA_HAND_OVER = """
+    if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+        return 0
+    end
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+    """
+
+    # Ends the run, and returns whether the group needs another pass
+    LUA_RELEASE = """
+    if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+        return 0
+    end
+    redis.call('DEL', KEYS[1])
+    return redis.call('DEL', KEYS[2])
+    """
+
+    # Returns the task to wake, only once per debounce period and if the scheduler is not running
+    LUA_WAKE = """
+    local task = redis.call('HGET', KEYS[1], 'task')
+    if not task then
+        return nil
+    end
+    if redis.call('EXISTS', KEYS[3]) == 1 then
+        redis.call('SET', KEYS[4], 1)
+        return nil
+    end
+    if redis.call('SET', KEYS[2], 1, 'NX', 'EX', ARGV[1]) then
+        return task
+    end
+    return nil
+    """
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def acquire(cls, experiment_group_id, task_id, ttl):
+        """Runs the scheduler of the group, without becoming the task woken by the events."""
+        red = cls._get_redis()
+        return bool(red.register_script(cls.LUA_ACQUIRE)(
+            keys=[cls.KEY_RUN.format(experiment_group_id),
+                  cls.KEY_PENDING.format(experiment_group_id)],
+            args=[task_id, ttl]))
+
+    @classmethod
+    def claim(cls, experiment_group_id, task_name, task_id, is_retry, ttl):
+        red = cls._get_redis()
+        return bool(red.register_script(cls.LUA_CLAIM)(
+            keys=[cls.KEY_SCHEDULER.format(experiment_group_id),
+                  cls.KEY_RUN.format(experiment_group_id),
+                  cls.KEY_PENDING.format(experiment_group_id)],
+            args=[task_id, task_name, 1 if is_retry else 0, ttl]))
+
+    @classmethod
+    def hand_over(cls, experiment_group_id, task_id, next_task_id, ttl):
+        red = cls._get_redis()
+        return bool(red.register_script(cls.LUA_HAND_OVER)(
+            keys=[cls.KEY_RUN.format(experiment_group_id)],
+            args=[task_id, next_task_id, ttl]))
+
+    @classmethod
+    def release(cls, experiment_group_id, task_id):
+        red = cls._get_redis()
+        return bool(red.register_script(cls.LUA_RELEASE)(
+            keys=[cls.KEY_RUN.format(experiment_group_id),
+                  cls.KEY_PENDING.format(experiment_group_id)],
+            args=[task_id]))
+
+    @classmethod
+    def wake(cls, experiment_group_id, debounce):
+        red = cls._get_redis()
+        task_name = red.register_script(cls.LUA_WAKE)(
+            keys=[cls.KEY_SCHEDULER.format(experiment_group_id),
+                  cls.KEY_WAKE.format(experiment_group_id),
+                  cls.KEY_RUN.format(experiment_group_id),
+                  cls.KEY_PENDING.format(experiment_group_id)],
+            args=[debounce])
+        return task_name.decode('utf-8') if task_name else None
+
+    @classmethod
+    def remove(cls, experiment_group_id):
+        red = cls._get_redis()
+        red.delete(cls.KEY_SCHEDULER.format(experiment_group_id),
+                   cls.KEY_WAKE.format(experiment_group_id),
+                   cls.KEY_RUN.format(experiment_group_id),
+                   cls.KEY_PENDING.format(experiment_group_id))
+
+
+class RedisWatches(BaseRedisDb):
+    """Persists the state of the k8s watches to resume them after a restart."""
+
+    KEY_RESOURCE_VERSION = 'WATCH_RESOURCE_VERSION:{}'  # Redis key: last seen resource version
+    KEY_COUNTERS = 'WATCH_COUNTERS:{}'  # Redis hash: counts of the watch events by kind
+
+    REDIS_POOL = RedisPools.JOB_CONTAINERS
+
+    @classmethod
+    def get_resource_version(cls, watch_name):
+        red = cls._get_redis()
+        resource_version = red.get(cls.KEY_RESOURCE_VERSION.format(watch_name))
+        return resource_version.decode('utf-8') if resource_version else None
+
+    @classmethod
+    def save(cls, watch_name, resource_version, counters=None):
+        """Saves the resource version, and increments the counters of the watch."""
+        red = cls._get_redis()
+        pipe = red.pipeline()
+        if resource_version:
+            pipe.set(cls.KEY_RESOURCE_VERSION.format(watch_name), resource_version)
+        else:
+            pipe.delete(cls.KEY_RESOURCE_VERSION.format(watch_name))
+        for key, value in (counters or {}).items():
+            if value:
+                pipe.hincrby(cls.KEY_COUNTERS.format(watch_name), key, value)
+        pipe.execute()
+
+    @classmethod
+    def get_counters(cls, watch_name):
+        red = cls._get_redis()
+        counters = red.hgetall(cls.KEY_COUNTERS.format(watch_name))
+        return {key.decode('utf-8'): int(value) for key, value in counters.items()}
+
 
 class RedisSessions(BaseRedisDb):
     """ RedisSessions provides a db to store data related to a request session.
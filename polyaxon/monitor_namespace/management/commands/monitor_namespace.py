@@ -38,9 +38,10 @@ class Command(BaseMonitorCommand):
             # End process
             return
 
+        resumable_watch = monitor.get_watch(k8s_manager)
         while True:
             try:
-                monitor.run(k8s_manager, cluster)
+                monitor.run(k8s_manager, resumable_watch=resumable_watch, cluster=cluster)
             except ApiException as e:
                 monitor.logger.error(
                     "Exception when calling CoreV1Api->list_event_for_all_namespaces: %s\n", e)
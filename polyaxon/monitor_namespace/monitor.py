@@ -1,7 +1,6 @@
 import logging
 
-from kubernetes import watch
-
+from libs.k8s_watch import ResumableWatch
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import EventsCeleryTasks
 
@@ -12,11 +11,14 @@ LEVEL_MAPPING = {
 }
 
 
-def run(k8s_manager, cluster):  # pylint:disable=too-many-branches
-    w = watch.Watch()
+def get_watch(k8s_manager):
+    return ResumableWatch(name='namespace',
+                          list_fn=k8s_manager.k8s_api.list_namespaced_event,
+                          namespace=k8s_manager.namespace)
+
 
-    for event in w.stream(k8s_manager.k8s_api.list_namespaced_event,
-                          namespace=k8s_manager.namespace):
+def run(k8s_manager, resumable_watch, cluster):  # pylint:disable=too-many-branches
+    for event in resumable_watch.stream():
         logger.debug("event: %s", event)
 
         event_type = event['type'].lower()
@@ -56,15 +56,13 @@ def get_container(containers, container_id):
     return container
 
 
-def get_container_resources(node, container, gpu_resources):
+def get_container_resources(node, container, gpu_resources, job_uuid, experiment_uuid):
     # Check if the container is running
     if container.status != ContainerStatuses.RUNNING:
         logger.debug("`%s` container is not running", container.name)
         RedisJobContainers.remove_container(container.id)
         return
 
-    job_uuid, experiment_uuid = RedisJobContainers.get_job(container.id)
-
     if not job_uuid:
         logger.debug("`%s` container is not recognised", container.name)
         return
@@ -147,6 +145,8 @@ def update_cluster(node_gpus):
 
 def run(containers, node, persist):
     container_ids = RedisJobContainers.get_containers()
+    container_jobs = RedisJobContainers.get_jobs(container_ids)
+    monitored_jobs, monitored_experiments = RedisToStream.get_monitored_resources()
     gpu_resources = get_gpu_resources()
     if gpu_resources:
         gpu_resources = {gpu_resource['index']: gpu_resource for gpu_resource in gpu_resources}
@@ -156,7 +156,12 @@ def run(containers, node, persist):
         container = get_container(containers, container_id)
         if not container:
             continue
-        payload = get_container_resources(node, containers[container_id], gpu_resources)
+        job_uuid, experiment_uuid = container_jobs.get(container_id, (None, None))
+        payload = get_container_resources(node=node,
+                                          container=containers[container_id],
+                                          gpu_resources=gpu_resources,
+                                          job_uuid=job_uuid,
+                                          experiment_uuid=experiment_uuid)
         if payload:
             payload = payload.to_dict()
             logger.debug("Publishing resources event")
@@ -164,12 +169,11 @@ def run(containers, node, persist):
                 EventsCeleryTasks.EVENTS_HANDLE_RESOURCES,
                 kwargs={'payload': payload, 'persist': persist})
 
-            job_uuid = payload['job_uuid']
             # Check if we should stream the payload
-            # Check if we have this container already in place
-            experiment_uuid = RedisJobContainers.get_experiment_for_job(job_uuid)
             set_last_resources_cond = (
-                RedisToStream.is_monitored_job_resources(job_uuid) or
-                RedisToStream.is_monitored_experiment_resources(experiment_uuid))
+                job_uuid in monitored_jobs or
+                experiment_uuid in monitored_experiments)
             if set_last_resources_cond:
-                RedisToStream.set_latest_job_resources(job_uuid, payload)
+                RedisToStream.publish_latest_job_resources(job=job_uuid,
+                                                           experiment=experiment_uuid,
+                                                           payload=payload)
@@ -1,3 +1,5 @@
+import signal
+import sys
 import time
 
 from kubernetes.client.rest import ApiException
@@ -19,12 +21,21 @@ class Command(BaseMonitorCommand):
             "log sleep interval: `{}`.".format(log_sleep_interval),
             ending='\n')
         k8s_manager = K8SManager(namespace=settings.K8S_NAMESPACE, in_cluster=True)
-        while True:
-            try:
-                monitor.run(k8s_manager)
-            except ApiException as e:
-                monitor.logger.error(
-                    "Exception when calling CoreV1Api->list_namespaced_pod: %s\n", e)
-                time.sleep(log_sleep_interval)
-            except Exception as e:
-                monitor.logger.exception("Unhandled exception occurred %s\n", e)
+        statuses_buffer = monitor.StatusesBuffer()
+        resumable_watch = monitor.get_watch(k8s_manager, statuses_buffer=statuses_buffer)
+        statuses_buffer.start()
+        # Exit through the shutdown path below when the monitor is stopped
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            while True:
+                try:
+                    monitor.run(resumable_watch, statuses_buffer=statuses_buffer)
+                except ApiException as e:
+                    monitor.logger.error(
+                        "Exception when calling CoreV1Api->list_namespaced_pod: %s\n", e)
+                    time.sleep(log_sleep_interval)
+                except Exception as e:
+                    monitor.logger.exception("Unhandled exception occurred %s\n", e)
+        finally:
+            # Send the buffered statuses, and persist the resource version covering them
+            resumable_watch.persist()
@@ -1,17 +1,88 @@
 import logging
+import threading
+import time
 
-from kubernetes import watch
+from collections import OrderedDict
 
 from django.conf import settings
 
 from constants.jobs import JobLifeCycle
+from libs.k8s_watch import ResumableWatch
 from libs.redis_db import RedisJobContainers
 from monitor_statuses.jobs import get_job_state
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import EventsCeleryTasks
+from polyaxon.settings import EventsCeleryTasks, Intervals
 
 logger = logging.getLogger('polyaxon.monitors.statuses')
 
+MAX_CACHED_JOBS = 10000
+
+
+class StatusesBuffer(object):
+    """Buffers the jobs statuses events and sends them in batches.
+
+    A status is only emitted if it changed since the last status emitted for the job,
+    and the emitted statuses are sent in one task per flush interval.
+    """
+
+    def __init__(self, flush_interval=None, max_jobs=MAX_CACHED_JOBS):
+        if flush_interval is None:
+            flush_interval = Intervals.EVENTS_STATUSES_FLUSH
+        self.flush_interval = flush_interval
+        self.max_jobs = max_jobs
+        # The last emitted status of the most recently updated jobs
+        self._last_statuses = OrderedDict()
+        self._payloads = []
+        self._lock = threading.Lock()
+        # A flush returns once the statuses sent by a concurrent flush are delivered
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def add(self, task, job_state):
+        """Buffers the job state if its status changed, returns whether it was buffered."""
+        job_uuid = job_state['details']['labels']['job_uuid']
+        status = job_state['status']
+        with self._lock:
+            last_status = self._last_statuses.pop(job_uuid, None)
+            self._last_statuses[job_uuid] = status
+            if last_status == status:
+                return False
+            while len(self._last_statuses) > self.max_jobs:
+                self._last_statuses.popitem(last=False)
+            self._payloads.append((task, job_state))
+        return True
+
+    def flush(self):
+        """Sends the buffered statuses in one task, returns the number of statuses sent."""
+        with self._flush_lock:
+            with self._lock:
+                payloads, self._payloads = self._payloads, []
+            if not payloads:
+                return 0
+            try:
+                celery_app.send_task(EventsCeleryTasks.EVENTS_HANDLE_STATUSES,
+                                     kwargs={'payloads': payloads})
+            except Exception:
+                # Keep the statuses for the next flush
+                with self._lock:
+                    self._payloads = payloads + self._payloads
+                raise
+            return len(payloads)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.exception("Could not send the statuses %s\n", e)
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='statuses_buffer')
+            self._thread.daemon = True
+            self._thread.start()
+
 
 def update_job_containers(event, status, job_container_name):
     if JobLifeCycle.is_done(status):
@@ -54,12 +125,19 @@ def get_label_selector():
         type_label)
 
 
-def run(k8s_manager):
-    w = watch.Watch()
-
-    for event in w.stream(k8s_manager.k8s_api.list_namespaced_pod,
+def get_watch(k8s_manager, statuses_buffer):
+    # The resource version is persisted once the buffered statuses are sent
+    return ResumableWatch(name='statuses',
+                          list_fn=k8s_manager.k8s_api.list_namespaced_pod,
+                          emit_deletions=True,
+                          persist_interval=statuses_buffer.flush_interval,
+                          before_persist=statuses_buffer.flush,
                           namespace=k8s_manager.namespace,
-                          label_selector=get_label_selector()):
+                          label_selector=get_label_selector())
+
+
+def run(resumable_watch, statuses_buffer):
+    for event in resumable_watch.stream():
         logger.debug("Received event: %s", event['type'])
         event_object = event['object'].to_dict()
         job_state = get_job_state(
@@ -99,25 +177,18 @@ def run(k8s_manager):
             if experiment_job_condition:
                 update_job_containers(event_object, status, settings.CONTAINER_NAME_EXPERIMENT_JOB)
                 # Handle experiment job statuses differently than plugin job statuses
-                celery_app.send_task(
-                    EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
-                    kwargs={'payload': job_state})
+                statuses_buffer.add(EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
+                                    job_state)
 
             elif job_condition:
                 update_job_containers(event_object, status, settings.CONTAINER_NAME_JOB)
                 # Handle experiment job statuses differently than plugin job statuses
-                celery_app.send_task(
-                    EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES,
-                    kwargs={'payload': job_state})
+                statuses_buffer.add(EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES, job_state)
 
             elif plugin_job_condition:
                 # Handle plugin job statuses
-                celery_app.send_task(
-                    EventsCeleryTasks.EVENTS_HANDLE_PLUGIN_JOB_STATUSES,
-                    kwargs={'payload': job_state})
+                statuses_buffer.add(EventsCeleryTasks.EVENTS_HANDLE_PLUGIN_JOB_STATUSES, job_state)
 
             elif dockerizer_job_condition:
                 # Handle dockerizer job statuses
-                celery_app.send_task(
-                    EventsCeleryTasks.EVENTS_HANDLE_BUILD_JOB_STATUSES,
-                    kwargs={'payload': job_state})
+                statuses_buffer.add(EventsCeleryTasks.EVENTS_HANDLE_BUILD_JOB_STATUSES, job_state)
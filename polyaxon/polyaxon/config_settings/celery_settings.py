@@ -57,10 +57,22 @@ class Intervals(object):
         'POLYAXON_INTERVALS_EXPERIMENTS_SCHEDULER',
         is_optional=True,
         default=30)
+    EXPERIMENTS_GROUPS_SCHEDULER = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENTS_GROUPS_SCHEDULER',
+        is_optional=True,
+        default=5 * 60)
+    EXPERIMENTS_GROUPS_SCHEDULER_DEBOUNCE = config.get_int(
+        'POLYAXON_INTERVALS_EXPERIMENTS_GROUPS_SCHEDULER_DEBOUNCE',
+        is_optional=True,
+        default=3)
     EXPERIMENTS_SYNC = config.get_int(
         'POLYAXON_INTERVALS_EXPERIMENTS_SYNC',
         is_optional=True,
         default=30)
+    EVENTS_STATUSES_FLUSH = config.get_int(
+        'POLYAXON_INTERVALS_EVENTS_STATUSES_FLUSH',
+        is_optional=True,
+        default=1)
     CLUSTERS_UPDATE_SYSTEM_INFO = config.get_int(
         'POLYAXON_INTERVALS_CLUSTERS_UPDATE_SYSTEM_INFO',
         is_optional=True,
@@ -136,6 +148,7 @@ class EventsCeleryTasks(object):
     """
     EVENTS_HANDLE_NAMESPACE = 'events_handle_namespace'
     EVENTS_HANDLE_RESOURCES = 'events_handle_resources'
+    EVENTS_HANDLE_STATUSES = 'events_handle_statuses'
     EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES = 'events_handle_experiment_job_statuses'
     EVENTS_HANDLE_JOB_STATUSES = 'events_handle_job_statuses'
     EVENTS_HANDLE_PLUGIN_JOB_STATUSES = 'events_handle_plugin_job_statuses'
@@ -155,6 +168,7 @@ class SchedulerCeleryTasks(object):
     EXPERIMENTS_STOP = 'experiments_stop'
     EXPERIMENTS_CHECK_STATUS = 'experiments_check_status'
     EXPERIMENTS_SET_METRICS = 'experiments_set_metrics'
+    EXPERIMENTS_SET_METRICS_BATCH = 'experiments_set_metrics_batch'
 
     EXPERIMENTS_GROUP_CREATE = 'experiments_group_create'
     EXPERIMENTS_GROUP_STOP_EXPERIMENTS = 'experiments_group_stop_experiments'
@@ -195,6 +209,9 @@ class HPCeleryTasks(object):
     HP_HYPERBAND_START = 'hp_hyperband_start'
     HP_HYPERBAND_ITERATE = 'hp_hyperband_iterate'
 
+    HP_ASHA_START = 'hp_asha_start'
+    HP_ASHA_ITERATE = 'hp_asha_iterate'
+
     HP_BO_CREATE = 'hp_bo_create'
     HP_BO_START = 'hp_bo_start'
     HP_BO_ITERATE = 'hp_bo_iterate'
@@ -272,6 +289,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
     SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
+    SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS_BATCH:
+        {'queue': CeleryQueues.SCHEDULER_EXPERIMENTS},
 
     SchedulerCeleryTasks.EXPERIMENTS_GROUP_CREATE:
         {'queue': CeleryQueues.SCHEDULER_EXPERIMENT_GROUPS},
@@ -336,6 +355,10 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.HP},
     HPCeleryTasks.HP_HYPERBAND_ITERATE:
         {'queue': CeleryQueues.HP},
+    HPCeleryTasks.HP_ASHA_START:
+        {'queue': CeleryQueues.HP},
+    HPCeleryTasks.HP_ASHA_ITERATE:
+        {'queue': CeleryQueues.HP},
     HPCeleryTasks.HP_BO_CREATE:
         {'queue': CeleryQueues.HP},
     HPCeleryTasks.HP_BO_START:
@@ -347,6 +370,8 @@ CELERY_TASK_ROUTES = {
         {'queue': CeleryQueues.EVENTS_NAMESPACE},
     EventsCeleryTasks.EVENTS_HANDLE_RESOURCES:
         {'queue': CeleryQueues.EVENTS_RESOURCES},
+    EventsCeleryTasks.EVENTS_HANDLE_STATUSES:
+        {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
     EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES:
         {'queue': CeleryQueues.EVENTS_JOB_STATUSES},
     EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES:
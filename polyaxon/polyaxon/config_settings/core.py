@@ -7,6 +7,14 @@ K8S_NAMESPACE = config.namespace
 K8S_NODE_NAME = config.node_name
 K8S_GPU_RESOURCE_KEY = config.get_string('POLYAXON_K8S_GPU_RESOURCE_KEY')
 REPOS_ARCHIVE_ROOT = '/tmp/archived_repos'
+# Run the hyperband groups with the asynchronous successive halving algorithm (ASHA)
+HPSEARCH_ASYNC_HYPERBAND = config.get_boolean('POLYAXON_HPSEARCH_ASYNC_HYPERBAND',
+                                              is_optional=True,
+                                              default=False)
+# Number of experiments created at once by the groups, the grids are created lazily in chunks
+HPSEARCH_EXPERIMENTS_CHUNK_SIZE = config.get_int('POLYAXON_HPSEARCH_EXPERIMENTS_CHUNK_SIZE',
+                                                 is_optional=True,
+                                                 default=500)
 
 ALLOWED_HOSTS = ['*']
 
@@ -17,6 +17,18 @@ K8S_AUTHORISATION = config.get_string('POLYAXON_K8S_AUTHORISATION',
                                       is_secret=True)
 K8S_HOST = config.get_string('POLYAXON_K8S_HOST', is_optional=True)
 SSL_CA_CERT = config.get_string('POLYAXON_K8S_SSL_CA_CERT', is_optional=True)
+# Keep an in-memory cache of the pods, services, and config maps created by polyaxon,
+# only the long running services spawning or watching the jobs start the informers
+K8S_INFORMERS = config.get_boolean('POLYAXON_K8S_INFORMERS',
+                                   is_optional=True,
+                                   default=False) and (config.is_scheduler_service or
+                                                       config.is_monitor_statuses_service or
+                                                       config.is_monitor_namespace_service or
+                                                       config.is_sidecar_service)
+# Requires kubernetes >= 1.15 and a client supporting `allow_watch_bookmarks`
+K8S_WATCH_BOOKMARKS = config.get_boolean('POLYAXON_K8S_WATCH_BOOKMARKS',
+                                         is_optional=True,
+                                         default=False)
 
 K8S_CONFIG = None
 if K8S_AUTHORISATION and K8S_HOST:
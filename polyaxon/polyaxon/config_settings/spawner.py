@@ -11,6 +11,13 @@ K8S_RBAC_ENABLED = config.get_boolean('POLYAXON_K8S_RBAC_ENABLED')
 K8S_PROVISIONER_ENABLED = config.get_boolean('POLYAXON_K8S_PROVISIONER_ENABLED')
 K8S_INGRESS_ENABLED = config.get_boolean('POLYAXON_K8S_INGRESS_ENABLED')
 K8S_INGRESS_ANNOTATIONS = config.get_string('POLYAXON_K8S_INGRESS_ANNOTATIONS', is_optional=True)
+# The max number of jobs created or deleted concurrently, and the retries of each call
+K8S_SPAWNER_MAX_WORKERS = config.get_int('POLYAXON_K8S_SPAWNER_MAX_WORKERS',
+                                         is_optional=True,
+                                         default=16)
+K8S_SPAWNER_MAX_RETRIES = config.get_int('POLYAXON_K8S_SPAWNER_MAX_RETRIES',
+                                         is_optional=True,
+                                         default=3)
 TENSORBOARD_PORT_RANGE = [5700, 6700]
 NOTEBOOK_PORT_RANGE = [6700, 7700]
 
@@ -8,6 +8,14 @@ LOGS_ROOT = config.get_string('POLYAXON_MOUNT_PATHS_LOGS')
 OUTPUTS_ROOT = config.get_string('POLYAXON_MOUNT_PATHS_OUTPUTS')
 REPOS_ROOT = config.get_string('POLYAXON_MOUNT_PATHS_REPOS')
 
+# Logs are stored in segments, sealed segments are compressed if a compression is set
+LOGS_SEGMENT_SIZE = config.get_int('POLYAXON_LOGS_SEGMENT_SIZE',
+                                   is_optional=True,
+                                   default=64 * 1024 * 1024)
+LOGS_SEGMENT_COMPRESSION = config.get_string('POLYAXON_LOGS_SEGMENT_COMPRESSION',
+                                             is_optional=True,
+                                             default='gzip')
+
 UPLOAD_CLAIM_NAME = config.get_string('POLYAXON_CLAIM_NAMES_UPLOAD')
 DATA_CLAIM_NAME = config.get_string('POLYAXON_CLAIM_NAMES_DATA')
 LOGS_CLAIM_NAME = config.get_string('POLYAXON_CLAIM_NAMES_LOGS')
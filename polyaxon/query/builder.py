@@ -153,6 +153,32 @@ class ComparisonCondition(EqualityCondition):
         return Q(**{name: params})
 
 
+class ValuesTableCondition(ComparisonCondition):
+    """Compares the values stored as `(name, value)` rows of a related table.
+
+    The condition expects a name of the form `<relation>__<key>`,
+    e.g. `metric_values__loss`, and filters the rows by key before comparing their value.
+    """
+
+    @classmethod
+    def _get_operator(cls, op, negation=False):
+        if negation and (op in EqualityCondition.VALUES or
+                         op in EqualityCondition.REPRESENTATIONS):
+            # A negated lookup on a related table would exclude rows of any key
+            return cls._neq_operator
+        return super()._get_operator(op, negation)
+
+    @classmethod
+    def _neq_operator(cls, name, params):
+        return cls._lt_operator(name, params) | cls._gt_operator(name, params)
+
+    def apply(self, queryset, name, params):
+        relation, key = name.split('__', 1)
+        key_filter = Q(**{'{}__name'.format(relation): key})
+        value_name = '{}__value'.format(relation)
+        return queryset.filter(key_filter & self.operator(name=value_name, params=params))
+
+
 class DateTimeCondition(ComparisonCondition):
     VALUES = ComparisonCondition.VALUES | {'range', }
     REPRESENTATIONS = ComparisonCondition.REPRESENTATIONS | {'..', }
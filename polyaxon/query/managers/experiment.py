@@ -1,4 +1,9 @@
-from query.builder import ArrayCondition, ComparisonCondition, DateTimeCondition, ValueCondition
+from query.builder import (
+    ArrayCondition,
+    DateTimeCondition,
+    ValueCondition,
+    ValuesTableCondition
+)
 from query.managers.base import BaseQueryManager
 from query.parser import parse_datetime_operation, parse_scalar_operation, parse_value_operation
 
@@ -6,7 +11,7 @@ from query.parser import parse_datetime_operation, parse_scalar_operation, parse
 class ExperimentQueryManager(BaseQueryManager):
     NAME = 'experiment'
     FIELDS_PROXY = {
-        'metric': 'metric__values',
+        'metric': 'metric_values',
         'status': 'status__status'
     }
     PARSERS_BY_FIELD = {
@@ -45,5 +50,5 @@ class ExperimentQueryManager(BaseQueryManager):
         # Tags
         'tags': ArrayCondition,
         # Metrics
-        'metric': ComparisonCondition,
+        'metric': ValuesTableCondition,
     }
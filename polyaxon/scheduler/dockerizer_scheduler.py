@@ -1,4 +1,5 @@
 import logging
+import time
 
 from kubernetes.client.rest import ApiException
 
@@ -16,12 +17,25 @@ from scheduler.spawners.utils import get_job_definition
 
 _logger = logging.getLogger('polyaxon.scheduler.dockerizer')
 
+IMAGES_CACHE_TTL = 5 * 60
+
+# The time the images were last found, by tagged image
+_images_cache = {}
+
 
 def check_image(build_job):
+    tagged_image = get_tagged_image(build_job)
+    found_at = _images_cache.get(tagged_image)
+    if found_at and time.time() - found_at < IMAGES_CACHE_TTL:
+        return True
+
     from docker import APIClient
 
     docker = APIClient(version='auto')
-    return docker.images(get_tagged_image(build_job))
+    images = docker.images(tagged_image)
+    if images:
+        _images_cache[tagged_image] = time.time()
+    return images
 
 
 def create_build_job(user, project, config, code_reference):
@@ -0,0 +1,68 @@
+import logging
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from kubernetes.client.rest import ApiException
+
+_logger = logging.getLogger('polyaxon.scheduler.spawners')
+
+# The statuses of the k8s API calls worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_DELAY = 0.5
+
+
+class SpawnerApiException(ApiException):
+    """Aggregates the errors of several calls to the k8s API."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        reason = '{} call(s) failed: {}'.format(
+            len(errors),
+            '; '.join('{}: {}'.format(e.__class__.__name__, e) for e in errors))
+        super().__init__(status=getattr(errors[0], 'status', None), reason=reason)
+
+
+def call_with_retries(fn, max_retries, retry_delay=RETRY_DELAY, **kwargs):
+    """Calls `fn`, retrying with an exponential backoff if the API is unavailable."""
+    retries = 0
+    while True:
+        try:
+            return fn(**kwargs)
+        except ApiException as e:
+            if e.status not in RETRY_STATUSES or retries >= max_retries:
+                raise
+            retries += 1
+            _logger.info('Call to the k8s API failed with status `%s`, retry %s/%s',
+                         e.status, retries, max_retries)
+            time.sleep(retry_delay * 2 ** (retries - 1))
+
+
+def run_concurrently(fn, calls, max_workers):
+    """Calls `fn` with each kwargs of `calls`, using at most `max_workers` threads.
+
+    All the calls are made even if some of them fail with an `ApiException`,
+    any other exception is propagated as is.
+
+    Returns:
+        the results of the calls, in order.
+
+    Raises:
+        SpawnerApiException: aggregating the errors of the failed calls.
+    """
+    def call(kwargs):
+        try:
+            return fn(**kwargs), None
+        except ApiException as e:
+            return None, e
+
+    if max_workers > 1 and len(calls) > 1:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(calls))) as executor:
+            outcomes = list(executor.map(call, calls))
+    else:
+        outcomes = [call(kwargs) for kwargs in calls]
+
+    errors = [error for _, error in outcomes if error is not None]
+    if errors:
+        raise SpawnerApiException(errors)
+    return [result for result, _ in outcomes]
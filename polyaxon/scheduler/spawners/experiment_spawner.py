@@ -1,5 +1,9 @@
+from django.conf import settings
+
 from polyaxon_k8s.manager import K8SManager
 from polyaxon_schemas.utils import TaskType
+from scheduler.spawners.concurrency import call_with_retries, run_concurrently
+from scheduler.spawners.informers import InformersMixin
 from scheduler.spawners.templates import constants, services
 from scheduler.spawners.templates.base_pods import get_pod_command_args
 from scheduler.spawners.templates.experiment_jobs import config_maps, pods
@@ -7,7 +11,7 @@ from scheduler.spawners.templates.sidecars import get_sidecar_args
 from scheduler.spawners.templates.volumes import get_pod_volumes
 
 
-class ExperimentSpawner(K8SManager):
+class ExperimentSpawner(InformersMixin, K8SManager):
     MASTER_SERVICE = False
 
     def __init__(self,
@@ -110,7 +114,7 @@ class ExperimentSpawner(K8SManager):
                                        resources=resources,
                                        node_selector=node_selector,
                                        restart_policy=restart_policy)
-        pod_resp, _ = self.create_or_update_pod(name=job_name, data=pod)
+        pod_resp, _ = self._call_with_retries(self.create_or_update_pod, name=job_name, data=pod)
 
         service = services.get_service(namespace=self.namespace,
                                        name=job_name,
@@ -120,38 +124,50 @@ class ExperimentSpawner(K8SManager):
 
         results = {'pod': pod_resp.to_dict()}
         if add_service:
-            service_resp, _ = self.create_or_update_service(name=job_name, data=service)
+            service_resp, _ = self._call_with_retries(self.create_or_update_service,
+                                                      name=job_name,
+                                                      data=service)
             results['service'] = service_resp.to_dict()
         return results
 
+    @staticmethod
+    def _call_with_retries(fn, **kwargs):
+        return call_with_retries(fn, max_retries=settings.K8S_SPAWNER_MAX_RETRIES, **kwargs)
+
+    @staticmethod
+    def _run_concurrently(fn, calls):
+        return run_concurrently(fn=fn, calls=calls, max_workers=settings.K8S_SPAWNER_MAX_WORKERS)
+
     def create_multi_jobs(self, task_type, add_service):
-        resp = []
+        calls = []
         n_pods = self.get_n_pods(task_type=task_type)
         for i in range(n_pods):
             command, args = self.get_pod_command_args(task_type=task_type, task_idx=i)
             env_vars = self.get_env_vars(task_type=task_type, task_idx=i)
             resources = self.get_resources(task_type=task_type, task_idx=i)
             node_selector = self.get_node_selectors(task_type=task_type, task_idx=i)
-            resp.append(self._create_job(task_type=task_type,
-                                         task_idx=i,
-                                         command=command,
-                                         args=args,
-                                         env_vars=env_vars,
-                                         resources=resources,
-                                         node_selector=node_selector,
-                                         add_service=add_service))
-        return resp
+            calls.append(dict(task_type=task_type,
+                              task_idx=i,
+                              command=command,
+                              args=args,
+                              env_vars=env_vars,
+                              resources=resources,
+                              node_selector=node_selector,
+                              add_service=add_service))
+        return self._run_concurrently(self._create_job, calls)
 
     def _delete_job(self, task_type, task_idx, has_service):
         job_name = self.pod_manager.get_job_name(task_type=task_type, task_idx=task_idx)
-        self.delete_pod(name=job_name)
+        self._call_with_retries(self.delete_pod, name=job_name)
         if has_service:
-            self.delete_service(name=job_name)
+            self._call_with_retries(self.delete_service, name=job_name)
 
     def delete_multi_jobs(self, task_type, has_service):
         n_pods = self.get_n_pods(task_type=task_type)
-        for i in range(n_pods):
-            self._delete_job(task_type=task_type, task_idx=i, has_service=has_service)
+        self._run_concurrently(self._delete_job, [
+            dict(task_type=task_type, task_idx=i, has_service=has_service)
+            for i in range(n_pods)
+        ])
 
     def get_pod_command_args(self, task_type, task_idx):
         return get_pod_command_args(run_config=self.spec.run)
@@ -0,0 +1,57 @@
+from kubernetes.client.rest import ApiException
+
+from libs.k8s_informer import CONFIG_MAPS, PODS, SERVICES, get_informer
+
+
+class InformersMixin(object):
+    """Checks the informers cache before querying the k8s API.
+
+    The objects not found in the cache are read from the API, since the cache can lag behind.
+    The objects not found in a synced cache are created without checking the API first,
+    if they were created in the meantime the object is updated instead.
+    """
+
+    def _get_cached(self, kind, name):
+        """Returns a tuple (is_synced, object) of the informer of `kind`."""
+        informer = get_informer(kind=kind, k8s_api=self.k8s_api, namespace=self.namespace)
+        if informer is None:
+            return False, None
+        return informer.get(name)
+
+    def get_pod(self, name, *args, **kwargs):
+        _, pod = self._get_cached(PODS, name)
+        if pod is not None:
+            return pod
+        return super().get_pod(name, *args, **kwargs)
+
+    def get_service(self, name, *args, **kwargs):
+        _, service = self._get_cached(SERVICES, name)
+        if service is not None:
+            return service
+        return super().get_service(name, *args, **kwargs)
+
+    def get_config_map(self, name, *args, **kwargs):
+        _, config_map = self._get_cached(CONFIG_MAPS, name)
+        if config_map is not None:
+            return config_map
+        return super().get_config_map(name, *args, **kwargs)
+
+    def create_or_update_pod(self, name, data):
+        is_synced, pod = self._get_cached(PODS, name)
+        if is_synced and pod is None:
+            try:
+                return self.k8s_api.create_namespaced_pod(self.namespace, data), True
+            except ApiException as e:
+                if e.status != 409:
+                    raise
+        return super().create_or_update_pod(name=name, data=data)
+
+    def create_or_update_service(self, name, data):
+        is_synced, service = self._get_cached(SERVICES, name)
+        if is_synced and service is None:
+            try:
+                return self.k8s_api.create_namespaced_service(self.namespace, data), True
+            except ApiException as e:
+                if e.status != 409:
+                    raise
+        return super().create_or_update_service(name=name, data=data)
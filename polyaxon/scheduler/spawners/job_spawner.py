@@ -1,12 +1,13 @@
 from polyaxon.config_manager import config
 from polyaxon_k8s.manager import K8SManager
+from scheduler.spawners.informers import InformersMixin
 from scheduler.spawners.templates.base_pods import get_pod_command_args
 from scheduler.spawners.templates.env_vars import get_env_var, get_service_env_vars
 from scheduler.spawners.templates.jobs import pods
 from scheduler.spawners.templates.volumes import get_pod_volumes
 
 
-class JobSpawner(K8SManager):
+class JobSpawner(InformersMixin, K8SManager):
     JOB_NAME = 'job'
 
     def __init__(self,
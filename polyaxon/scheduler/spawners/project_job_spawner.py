@@ -1,10 +1,11 @@
 from django.conf import settings
 
 from polyaxon_k8s.manager import K8SManager
+from scheduler.spawners.informers import InformersMixin
 from scheduler.spawners.templates import constants
 
 
-class ProjectJobSpawner(K8SManager):
+class ProjectJobSpawner(InformersMixin, K8SManager):
 
     def __init__(self,
                  project_name,
@@ -5,7 +5,9 @@ import publisher
 from constants.experiments import ExperimentLifeCycle
 from db.getters.experiments import get_valid_experiment
 from db.models.experiments import ExperimentMetric
+from libs.metric_series import create_metrics
 from libs.paths.experiments import copy_experiment_outputs
+from libs.redis_db import RedisDebounce
 from polyaxon.celery_api import app as celery_app
 from polyaxon.settings import SchedulerCeleryTasks
 from polyaxon_schemas.polyaxonfile.specification import ExperimentSpecification
@@ -87,6 +89,10 @@ def experiments_build(experiment_id):
 
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS, ignore_result=True)
 def experiments_check_status(experiment_uuid=None, experiment_id=None):
+    if experiment_id:
+        # The next job statuses changes need another check
+        RedisDebounce.release(event=SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
+                              object_id=experiment_id)
     experiment = get_valid_experiment(experiment_id=experiment_id, experiment_uuid=experiment_uuid)
     if not experiment:
         return
@@ -105,6 +111,16 @@ def experiments_set_metrics(experiment_uuid, metrics, created_at=None):
     ExperimentMetric.objects.create(experiment=experiment, values=metrics, **kwargs)
 
 
+@celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_SET_METRICS_BATCH, ignore_result=True)
+def experiments_set_metrics_batch(experiment_uuid, metrics):
+    """Creates a batch of metrics, `metrics` is a list of `{'values', 'created_at'}`."""
+    experiment = get_valid_experiment(experiment_uuid=experiment_uuid)
+    if not experiment:
+        return
+
+    create_metrics(experiment=experiment, metrics=metrics)
+
+
 @celery_app.task(name=SchedulerCeleryTasks.EXPERIMENTS_START, ignore_result=True)
 def experiments_start(experiment_id):
     experiment = get_valid_experiment(experiment_id=experiment_id)
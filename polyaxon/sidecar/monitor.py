@@ -1,14 +1,20 @@
 import logging
 import time
 
+from django.conf import settings
+
 import publisher
 
 from constants.experiments import ExperimentLifeCycle
 from constants.pods import PodLifeCycle
+from libs.k8s_informer import Informer
 from polyaxon_schemas.experiment import JobLabelConfig
 
 logger = logging.getLogger('polyaxon.monitors.sidecar')
 
+# The number of sleep intervals to wait for the pod events before checking the API
+INFORMER_WAIT_FACTOR = 30
+
 
 def _handle_log_stream(stream, publish):
     log_lines = []
@@ -76,15 +82,42 @@ def run_for_job(k8s_manager,
     _handle_log_stream(stream=raw.stream(), publish=publish)
 
 
+def _is_started(pod):
+    return (pod.status.phase == PodLifeCycle.RUNNING or
+            pod.status.phase in PodLifeCycle.DONE_STATUS)
+
+
+def get_pod_informer(k8s_manager, pod_id):
+    if not settings.K8S_INFORMERS:
+        return None
+    informer = Informer(name=pod_id,
+                        list_fn=k8s_manager.k8s_api.list_namespaced_pod,
+                        namespace=k8s_manager.namespace,
+                        field_selector='metadata.name={}'.format(pod_id))
+    informer.start()
+    return informer
+
+
 def can_log(k8s_manager, pod_id, log_sleep_interval):
-    status = k8s_manager.k8s_api.read_namespaced_pod_status(pod_id,
-                                                            k8s_manager.namespace)
-    labels = status.metadata.labels
-    while (status.status.phase != PodLifeCycle.RUNNING and
-           status.status.phase not in PodLifeCycle.DONE_STATUS):
-        time.sleep(log_sleep_interval)
-        status = k8s_manager.k8s_api.read_namespaced_pod_status(pod_id,
-                                                                k8s_manager.namespace)
-        labels = status.metadata.labels
-
-    return status.status.phase == PodLifeCycle.RUNNING, JobLabelConfig.from_dict(labels)
+    """Waits for the pod to start, on the pod events if the informers are enabled."""
+    informer = get_pod_informer(k8s_manager, pod_id)
+    try:
+        while True:
+            status = None
+            if informer:
+                status = informer.wait_for(pod_id,
+                                           predicate=_is_started,
+                                           timeout=log_sleep_interval * INFORMER_WAIT_FACTOR)
+            if status is None:
+                status = k8s_manager.k8s_api.read_namespaced_pod_status(pod_id,
+                                                                        k8s_manager.namespace)
+            if _is_started(status):
+                break
+            if not informer:
+                time.sleep(log_sleep_interval)
+    finally:
+        if informer:
+            informer.stop()
+
+    return status.status.phase == PodLifeCycle.RUNNING, JobLabelConfig.from_dict(
+        status.metadata.labels)
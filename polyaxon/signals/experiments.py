@@ -21,10 +21,12 @@ from event_manager.events.experiment import (
     EXPERIMENT_SUCCEEDED
 )
 from libs.decorators import check_specification, ignore_raw, ignore_updates, ignore_updates_pre
+from libs.metric_series import append_metrics, set_last_metric_values
 from libs.paths.experiments import delete_experiment_logs, delete_experiment_outputs
+from libs.redis_db import RedisDebounce, RedisGroupScheduler
 from libs.repos.utils import assign_code_reference
 from polyaxon.celery_api import app as celery_app
-from polyaxon.settings import SchedulerCeleryTasks
+from polyaxon.settings import Intervals, SchedulerCeleryTasks
 from signals.run_time import (
     set_finished_at,
     set_job_finished_at,
@@ -130,10 +132,14 @@ def experiment_job_status_post_save(sender, **kwargs):
     if experiment.is_done:
         return
 
-    celery_app.send_task(
-        SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
-        kwargs={'experiment_id': experiment.id},
-        countdown=1)
+    # Coalesce the checks of the statuses changes of the experiment's jobs
+    if RedisDebounce.acquire(event=SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
+                             object_id=experiment.id,
+                             ttl=Intervals.EXPERIMENTS_SCHEDULER):
+        celery_app.send_task(
+            SchedulerCeleryTasks.EXPERIMENTS_CHECK_STATUS,
+            kwargs={'experiment_id': experiment.id},
+            countdown=1)
 
 
 @receiver(post_save, sender=ExperimentStatus, dispatch_uid="experiment_status_post_save")
@@ -180,6 +186,17 @@ def experiment_status_post_save(sender, **kwargs):
                        instance=experiment,
                        previous_status=previous_status)
 
+        if experiment.experiment_group_id:
+            # Wake the scheduler of the group, a slot is free and a new observation is available
+            task_name = RedisGroupScheduler.wake(
+                experiment_group_id=experiment.experiment_group_id,
+                debounce=Intervals.EXPERIMENTS_GROUPS_SCHEDULER_DEBOUNCE)
+            if task_name:
+                celery_app.send_task(
+                    task_name,
+                    kwargs={'experiment_group_id': experiment.experiment_group_id},
+                    countdown=Intervals.EXPERIMENTS_GROUPS_SCHEDULER_DEBOUNCE)
+
 
 @receiver(post_save, sender=ExperimentMetric, dispatch_uid="experiment_metric_post_save")
 @ignore_updates
@@ -190,6 +207,10 @@ def experiment_metric_post_save(sender, **kwargs):
     # update experiment last_metric
     experiment.metric = instance
     experiment.save()
+    set_last_metric_values(experiment=experiment, metric=instance)
+    append_metrics(experiment_id=experiment.id,
+                   values=instance.values,
+                   created_at=instance.created_at)
     auditor.record(event_type=EXPERIMENT_NEW_METRIC,
                    instance=experiment)
 
@@ -1,5 +1,5 @@
-import asyncio
 import logging
+import uuid
 
 from sanic import Sanic, exceptions
 from websockets import ConnectionClosed
@@ -20,15 +20,13 @@ from libs.permissions.projects import has_project_permissions
 from libs.redis_db import RedisToStream
 from polyaxon.settings import CeleryQueues, RoutingKeys
 from streams.authentication import authorized
-from streams.consumers import Consumer
-from streams.socket_manager import SocketManager
+from streams.consumers import AmqpConnection, Consumer
+from streams.logs import LogsHub
+from streams.resources import ExperimentResourcesStreamer, JobResourcesStreamer
+from streams.socket_manager import wait_for_disconnect
 
 _logger = logging.getLogger('polyaxon.streams.api')
 
-SOCKET_SLEEP = 2
-MAX_RETRIES = 7
-RESOURCES_CHECK = 7
-CHECK_DELAY = 5
 
 app = Sanic(__name__)
 
@@ -63,6 +61,11 @@ def _get_job(experiment, job_id):
     return job
 
 
+def _get_stream_queue(object_uuid):
+    # Each hub gets its own queue, otherwise streams workers would share the messages
+    return '{}.{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, object_uuid, uuid.uuid4().hex)
+
+
 def _get_running_experiment(project, experiment_id):
     experiment = _get_experiment(project, experiment_id)
     if not experiment.is_running:
@@ -89,50 +92,36 @@ async def job_resources(request, ws, username, project_name, experiment_id, job_
         _logger.info('Job resources with uuid `%s` is now being monitored', job_name)
         RedisToStream.monitor_job_resources(job_uuid=job_uuid)
 
+    def handle_job_streamer_stopped():
+        if request.app.job_resources_ws_mangers.get(job_uuid) is not ws_manager:
+            return
+        _logger.info('Stopping resources monitor for job %s', job_name)
+        RedisToStream.remove_job_resources(job_uuid=job_uuid)
+        request.app.job_resources_ws_mangers.pop(job_uuid)
+
     if job_uuid in request.app.job_resources_ws_mangers:
         ws_manager = request.app.job_resources_ws_mangers[job_uuid]
     else:
-        ws_manager = SocketManager()
+        ws_manager = JobResourcesStreamer(job=job,
+                                          job_name=job_name,
+                                          on_stop=handle_job_streamer_stopped)
         request.app.job_resources_ws_mangers[job_uuid] = ws_manager
 
-    def handle_job_disconnected_ws(ws):
-        ws_manager.remove_sockets(ws)
-        if not ws_manager.ws:
-            _logger.info('Stopping resources monitor for job %s', job_name)
-            RedisToStream.remove_job_resources(job_uuid=job_uuid)
-            request.app.job_resources_ws_mangers.pop(job_uuid, None)
-
-        _logger.info('Quitting resources socket for job %s', job_name)
-
     ws_manager.add_socket(ws)
-    should_check = 0
-    while True:
-        resources = RedisToStream.get_latest_job_resources(job=job_uuid, job_name=job_name)
-        should_check += 1
-
-        # After trying a couple of time, we must check the status of the job
-        if should_check > RESOURCES_CHECK:
-            job.refresh_from_db()
-            if job.is_done:
-                _logger.info('removing all socket because the job `%s` is done', job_name)
-                ws_manager.ws = set([])
-                handle_job_disconnected_ws(ws)
-                return
-            else:
-                should_check -= CHECK_DELAY
-
+    try:
+        resources = ws_manager.get_latest_resources()
         if resources:
-            try:
-                await ws.send(resources)
-            except ConnectionClosed:
-                handle_job_disconnected_ws(ws)
-                return
-
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            handle_job_disconnected_ws(ws)
-            return
-        await asyncio.sleep(SOCKET_SLEEP)
+            await ws.send(resources)
+        ws_manager.start()
+        await wait_for_disconnect(ws)
+    except ConnectionClosed:
+        pass
+    finally:
+        ws_manager.remove_sockets(ws)
+        # The streamer was not started, e.g. the first send failed
+        if not ws_manager.is_running and not ws_manager.ws:
+            handle_job_streamer_stopped()
+    _logger.info('Quitting resources socket for job %s', job_name)
 
 
 @authorized()
@@ -150,57 +139,41 @@ async def experiment_resources(request, ws, username, project_name, experiment_i
         _logger.info('Experiment resource with uuid `%s` is now being monitored', experiment_uuid)
         RedisToStream.monitor_experiment_resources(experiment_uuid=experiment_uuid)
 
+    def handle_experiment_streamer_stopped():
+        if request.app.experiment_resources_ws_mangers.get(experiment_uuid) is not ws_manager:
+            return
+        _logger.info('Stopping resources monitor for uuid %s', experiment_uuid)
+        RedisToStream.remove_experiment_resources(experiment_uuid=experiment_uuid)
+        request.app.experiment_resources_ws_mangers.pop(experiment_uuid)
+
     if experiment_uuid in request.app.experiment_resources_ws_mangers:
         ws_manager = request.app.experiment_resources_ws_mangers[experiment_uuid]
     else:
-        ws_manager = SocketManager()
+        jobs = []
+        for job in experiment.jobs.values('uuid', 'role', 'id'):
+            job['uuid'] = job['uuid'].hex
+            job['name'] = '{}.{}'.format(job.pop('role'), job.pop('id'))
+            jobs.append(job)
+        ws_manager = ExperimentResourcesStreamer(experiment=experiment,
+                                                 jobs=jobs,
+                                                 on_stop=handle_experiment_streamer_stopped)
         request.app.experiment_resources_ws_mangers[experiment_uuid] = ws_manager
 
-    def handle_experiment_disconnected_ws(ws):
-        ws_manager.remove_sockets(ws)
-        if not ws_manager.ws:
-            _logger.info('Stopping resources monitor for uuid %s', experiment_uuid)
-            RedisToStream.remove_experiment_resources(experiment_uuid=experiment_uuid)
-            request.app.experiment_resources_ws_mangers.pop(experiment_uuid, None)
-
-        _logger.info('Quitting resources socket for uuid %s', experiment_uuid)
-
-    jobs = []
-    for job in experiment.jobs.values('uuid', 'role', 'id'):
-        job['uuid'] = job['uuid'].hex
-        job['name'] = '{}.{}'.format(job.pop('role'), job.pop('id'))
-        jobs.append(job)
     ws_manager.add_socket(ws)
-    should_check = 0
-    while True:
-        resources = RedisToStream.get_latest_experiment_resources(jobs)
-        should_check += 1
-
-        # After trying a couple of time, we must check the status of the experiment
-        if should_check > RESOURCES_CHECK:
-            experiment.refresh_from_db()
-            if experiment.is_done:
-                _logger.info(
-                    'removing all socket because the experiment `%s` is done', experiment_uuid)
-                ws_manager.ws = set([])
-                handle_experiment_disconnected_ws(ws)
-                return
-            else:
-                should_check -= CHECK_DELAY
-
+    try:
+        resources = ws_manager.get_latest_resources()
         if resources:
-            try:
-                await ws.send(resources)
-            except ConnectionClosed:
-                handle_experiment_disconnected_ws(ws)
-                return
-
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            handle_experiment_disconnected_ws(ws)
-            return
-
-        await asyncio.sleep(SOCKET_SLEEP)
+            await ws.send(resources)
+        ws_manager.start()
+        await wait_for_disconnect(ws)
+    except ConnectionClosed:
+        pass
+    finally:
+        ws_manager.remove_sockets(ws)
+        # The streamer was not started, e.g. the first send failed
+        if not ws_manager.is_running and not ws_manager.ws:
+            handle_experiment_streamer_stopped()
+    _logger.info('Quitting resources socket for uuid %s', experiment_uuid)
 
 
 @authorized()
@@ -219,63 +192,28 @@ async def job_logs(request, ws, username, project_name, experiment_id, job_id):
         _logger.info('Job uuid `%s` logs is now being monitored', job_uuid)
         RedisToStream.monitor_job_logs(job_uuid=job_uuid)
 
-    # start consumer
-    if job_uuid in request.app.job_logs_consumers:
-        consumer = request.app.job_logs_consumers[job_uuid]
+    def handle_job_hub_stopped():
+        _logger.info('Stopping logs monitor for job uuid %s', job_uuid)
+        RedisToStream.remove_job_logs(job_uuid=job_uuid)
+        request.app.job_logs_hubs.pop(job_uuid, None)
+
+    if job_uuid in request.app.job_logs_hubs:
+        hub = request.app.job_logs_hubs[job_uuid]
     else:
         _logger.info('Add job log consumer for %s', job_uuid)
         consumer = Consumer(
             routing_key='{}.{}.{}'.format(RoutingKeys.LOGS_SIDECARS,
                                           experiment.uuid.hex,
                                           job_uuid),
-            queue='{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, job_uuid))
-        request.app.job_logs_consumers[job_uuid] = consumer
-        consumer.run()
-
-    # add socket manager
-    consumer.add_socket(ws)
-    should_quite = False
-    num_message_retries = 0
-    while True:
-        num_message_retries += 1
-        for message in consumer.get_messages():
-            num_message_retries = 0
-            disconnected_ws = set()
-            for _ws in consumer.ws:
-                try:
-                    await _ws.send(message)
-                except ConnectionClosed:
-                    disconnected_ws.add(_ws)
-            consumer.remove_sockets(disconnected_ws)
-
-        # After trying a couple of time, we must check the status of the experiment
-        if num_message_retries > MAX_RETRIES:
-            job.refresh_from_db()
-            if job.is_done:
-                _logger.info('removing all socket because the job `%s` is done', job_uuid)
-                consumer.ws = set([])
-            else:
-                num_message_retries -= CHECK_DELAY
-
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            _logger.info('Quitting logs socket for job uuid %s', job_uuid)
-            consumer.remove_sockets({ws, })
-            should_quite = True
-
-        if not consumer.ws:
-            _logger.info('Stopping logs monitor for job uuid %s', job_uuid)
-            RedisToStream.remove_job_logs(job_uuid=job_uuid)
-            # if job_uuid in request.app.job_logs_consumers:
-            #     consumer = request.app.job_logs_consumers.pop(job_uuid, None)
-            #     if consumer:
-            #         consumer.stop()
-            should_quite = True
-
-        if should_quite:
-            return
+            queue=_get_stream_queue(job_uuid),
+            connection=request.app.amqp_connection)
+        hub = LogsHub(instance=job, consumer=consumer, on_stop=handle_job_hub_stopped)
+        request.app.job_logs_hubs[job_uuid] = hub
 
-        await asyncio.sleep(SOCKET_SLEEP)
+    await hub.subscribe(ws)
+    await wait_for_disconnect(ws)
+    hub.remove_sockets(ws)
+    _logger.info('Quitting logs socket for job uuid %s', job_uuid)
 
 
 @authorized()
@@ -293,62 +231,28 @@ async def experiment_logs(request, ws, username, project_name, experiment_id):
         _logger.info('Experiment uuid `%s` logs is now being monitored', experiment_uuid)
         RedisToStream.monitor_experiment_logs(experiment_uuid=experiment_uuid)
 
-    # start consumer
-    if experiment_uuid in request.app.experiment_logs_consumers:
-        consumer = request.app.experiment_logs_consumers[experiment_uuid]
+    def handle_experiment_hub_stopped():
+        _logger.info('Stopping logs monitor for experiment uuid %s', experiment_uuid)
+        RedisToStream.remove_experiment_logs(experiment_uuid=experiment_uuid)
+        request.app.experiment_logs_hubs.pop(experiment_uuid, None)
+
+    if experiment_uuid in request.app.experiment_logs_hubs:
+        hub = request.app.experiment_logs_hubs[experiment_uuid]
     else:
         _logger.info('Add experiment log consumer for %s', experiment_uuid)
         consumer = Consumer(
             routing_key='{}.{}.*'.format(RoutingKeys.LOGS_SIDECARS, experiment_uuid),
-            queue='{}.{}'.format(CeleryQueues.STREAM_LOGS_SIDECARS, experiment_uuid))
-        request.app.experiment_logs_consumers[experiment_uuid] = consumer
-        consumer.run()
-
-    # add socket manager
-    consumer.add_socket(ws)
-    should_quite = False
-    num_message_retries = 0
-    while True:
-        num_message_retries += 1
-        for message in consumer.get_messages():
-            num_message_retries = 0
-            disconnected_ws = set()
-            for _ws in consumer.ws:
-                try:
-                    await _ws.send(message)
-                except ConnectionClosed:
-                    disconnected_ws.add(_ws)
-            consumer.remove_sockets(disconnected_ws)
-
-        # After trying a couple of time, we must check the status of the experiment
-        if num_message_retries > MAX_RETRIES:
-            experiment.refresh_from_db()
-            if experiment.is_done:
-                _logger.info(
-                    'removing all socket because the experiment `%s` is done', experiment_uuid)
-                consumer.ws = set([])
-            else:
-                num_message_retries -= CHECK_DELAY
-
-        # Just to check if connection closed
-        if ws._connection_lost:  # pylint:disable=protected-access
-            _logger.info('Quitting logs socket for experiment uuid %s', experiment_uuid)
-            consumer.remove_sockets({ws, })
-            should_quite = True
-
-        if not consumer.ws:
-            _logger.info('Stopping logs monitor for experiment uuid %s', experiment_uuid)
-            RedisToStream.remove_experiment_logs(experiment_uuid=experiment_uuid)
-            # if experiment_uuid in request.app.experiment_logs_consumers:
-            #     consumer = request.app.experiment_logs_consumers.pop(experiment_uuid, None)
-            #     if consumer:
-            #         consumer.stop()
-            should_quite = True
-
-        if should_quite:
-            return
+            queue=_get_stream_queue(experiment_uuid),
+            connection=request.app.amqp_connection)
+        hub = LogsHub(instance=experiment,
+                      consumer=consumer,
+                      on_stop=handle_experiment_hub_stopped)
+        request.app.experiment_logs_hubs[experiment_uuid] = hub
 
-        await asyncio.sleep(SOCKET_SLEEP)
+    await hub.subscribe(ws)
+    await wait_for_disconnect(ws)
+    hub.remove_sockets(ws)
+    _logger.info('Quitting logs socket for experiment uuid %s', experiment_uuid)
 
 
 EXPERIMENT_URL = '/v1/<username>/<project_name>/experiments/<experiment_id>'
@@ -389,21 +293,20 @@ app.add_websocket_route(
 async def notify_server_started(app, loop):  # pylint:disable=redefined-outer-name
     app.job_resources_ws_mangers = {}
     app.experiment_resources_ws_mangers = {}
-    app.job_logs_consumers = {}
-    app.experiment_logs_consumers = {}
+    app.job_logs_hubs = {}
+    app.experiment_logs_hubs = {}
+    app.amqp_connection = AmqpConnection(loop=loop)
 
 
 @app.listener('after_server_stop')
 async def notify_server_stopped(app, loop):  # pylint:disable=redefined-outer-name
     app.job_resources_ws_mangers = {}
-    app.experiment_resources_ws_manger = {}
+    app.experiment_resources_ws_mangers = {}
 
-    consumer_keys = list(app.job_logs_consumers.keys())
-    for consumer_key in consumer_keys:
-        consumer = app.job_logs_consumers.pop(consumer_key, None)
-        consumer.stop()
+    hubs = list(app.job_logs_hubs.values()) + list(app.experiment_logs_hubs.values())
+    app.job_logs_hubs = {}
+    app.experiment_logs_hubs = {}
+    for hub in hubs:
+        await hub.stop()
 
-    consumer_keys = list(app.experiment_logs_consumers.keys())
-    for consumer_key in consumer_keys:
-        consumer = app.experiment_logs_consumers.pop(consumer_key, None)
-        consumer.stop()
+    app.amqp_connection.close()
@@ -4,214 +4,252 @@ import logging
 import pika
 
 from pika import adapters
-from pika.exceptions import AMQPConnectionError
+from pika.exceptions import (
+    AMQPChannelError,
+    AMQPConnectionError,
+    ChannelClosed,
+    ConnectionClosed
+)
 
 from django.conf import settings
 
-from streams.socket_manager import SocketManager
-
 _logger = logging.getLogger("polyaxon.streams.events")
 
+RECONNECT_DELAY = 5
+MAX_BUFFERED_MESSAGES = 1000
+
 
-class Consumer(SocketManager):
-    """This is a consumer that will handle unexpected interactions
-    with RabbitMQ such as channel and connection closures.
+class AmqpConnection(object):
+    """A single RabbitMQ connection and channel shared by all the consumers of a streams worker.
 
-    If RabbitMQ closes the connection, it will reopen it. You should
-    look at the output, as there are limited reasons why the connection may
-    be closed, which usually are tied to permission related issues or
-    socket timeouts.
+    The connection runs on the worker's event loop, all RPC commands are awaitable,
+    and no call blocks the loop.
 
-    If the channel is closed, it will indicate a problem with one of the
-    commands that were issued and that should surface in the output as well.
+    If RabbitMQ closes the connection or the channel, the pending RPC commands fail,
+    and it will reopen it and restart all the registered consumers.
     """
     AMQP_URL = settings.CELERY_BROKER_URL
     EXCHANGE = settings.INTERNAL_EXCHANGE
     EXCHANGE_TYPE = 'topic'
 
-    def __init__(self, routing_key, queue, loop=None):
+    def __init__(self, loop=None):
+        self._loop = loop or asyncio.get_event_loop()
         self._connection = None
         self._channel = None
         self._closing = False
-        self._consumer_tag = None
-        self._routing_key = routing_key
-        self._queue = queue
-        self._loop = loop
-        self.messages = []
-        super().__init__()
-
-    def get_messages(self):
-        messages = self.messages[:]
-        self.messages = []
-        return messages
-
-    def connect(self):
-        """This method connects to RabbitMQ, returning the connection handle.
-        When the connection is established, the on_connection_open method
-        will be invoked by pika.
-
-        :rtype: pika.SelectConnection
-        """
-        _logger.info('Connecting to %s', self.AMQP_URL)
-        while True:
+        self._connecting = None
+        self._pending = set()
+        self.consumers = set()
+
+    @property
+    def is_open(self):
+        return self._channel is not None and self._channel.is_open
+
+    def _create_future(self):
+        """Returns a future that fails if the channel or the connection closes before it is done."""
+        future = self._loop.create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    def _fail_pending(self, error):
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(error)
+        self._pending = set()
+
+    def _rpc(self, method, *args, **kwargs):
+        """Calls a callback based pika channel method and returns a future of its result."""
+        future = self._create_future()
+
+        def callback(frame):
+            if not future.done():
+                future.set_result(frame)
+
+        method(callback, *args, **kwargs)
+        return future
+
+    def _open_connection(self):
+        future = self._loop.create_future()
+
+        def on_open(connection):
+            if not future.done():
+                future.set_result(connection)
+
+        def on_open_error(connection, error):
+            if not future.done():
+                future.set_exception(AMQPConnectionError(error))
+
+        adapters.AsyncioConnection(pika.URLParameters(self.AMQP_URL),
+                                   on_open_callback=on_open,
+                                   on_open_error_callback=on_open_error,
+                                   on_close_callback=self.on_connection_closed,
+                                   custom_ioloop=self._loop)
+        return future
+
+    def _open_channel(self):
+        future = self._create_future()
+
+        def on_open(channel):
+            if not future.done():
+                future.set_result(channel)
+
+        self._connection.channel(on_open_callback=on_open)
+        return future
+
+    async def _connect(self):
+        while not self._closing:
+            _logger.info('Connecting to %s', self.AMQP_URL)
             try:
-                return adapters.AsyncioConnection(pika.URLParameters(self.AMQP_URL),
-                                                  self.on_connection_open)
+                self._connection = await self._open_connection()
             except AMQPConnectionError:
-                asyncio.sleep(1)
-
-    def close_connection(self):
-        _logger.info('Closing connection')
-        self._connection.close()
+                _logger.warning('Connection failed, retrying in %s seconds', RECONNECT_DELAY)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
 
-    def add_on_connection_close_callback(self):
-        """This method adds an on close callback that will be invoked by pika
-        when RabbitMQ closes the connection to the publisher unexpectedly.
+            try:
+                channel = await self._open_channel()
+                channel.add_on_close_callback(self.on_channel_closed)
+                _logger.debug('Declaring exchange %s', self.EXCHANGE)
+                await self._rpc(channel.exchange_declare,
+                                exchange=self.EXCHANGE,
+                                exchange_type=self.EXCHANGE_TYPE,
+                                durable=True,
+                                passive=True)
+            except (AMQPConnectionError, AMQPChannelError) as e:
+                # The connection is closed by `on_channel_closed`
+                _logger.warning('Opening the channel failed, retrying in %s seconds: %r',
+                                RECONNECT_DELAY, e)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            self._channel = channel
+            _logger.info('Channel opened')
+            return channel
+
+    async def get_channel(self):
+        """Returns the shared channel, connecting to RabbitMQ if necessary.
+
+        Concurrent callers wait on the same connection attempt.
         """
-        _logger.debug('Adding connection close callback')
-        self._connection.add_on_close_callback(self.on_connection_closed)
+        if self.is_open:
+            return self._channel
+        if self._connecting is None:
+            self._connecting = asyncio.ensure_future(self._connect(), loop=self._loop)
+        try:
+            return await asyncio.shield(self._connecting)
+        finally:
+            if self._connecting is not None and self._connecting.done():
+                self._connecting = None
 
     def on_connection_closed(self, connection, reply_code, reply_text):
-        """This method is invoked by pika when the connection to RabbitMQ is
-        closed unexpectedly. Since it is unexpected, we will reconnect to
-        RabbitMQ if it disconnects.
+        """Invoked by pika when the connection to RabbitMQ is closed.
 
-        :param pika.connection.Connection connection: The closed connection obj
-        :param int reply_code: The server provided reply_code if given
-        :param str reply_text: The server provided reply_text if given
+        Since it is unexpected if we are not closing, we will reconnect to RabbitMQ
+        and restart the consumers, unless a connection attempt is already retrying.
         """
         self._channel = None
-        if self._closing:
-            self._connection.ioloop.stop()
-        else:
-            _logger.warning('Connection closed, reopening in 5 seconds: (%s) %s',
-                            reply_code, reply_text)
-            self._connection.add_timeout(5, self.reconnect)
-
-    def on_connection_open(self, unused_connection):
-        """This method is called by pika once the connection to RabbitMQ has
-        been established. It passes the handle to the connection object in
-        case we need it, but in this case, we'll just mark it unused.
-
-        :type unused_connection: pika.SelectConnection
-        """
-        _logger.debug('Connection opened')
-        self.add_on_connection_close_callback()
-        self.open_channel()
-
-    def reconnect(self):
-        """Will be invoked by the IOLoop timer if the connection is
-        closed. See the on_connection_closed method.
-        """
-        if not self._closing:
-            # Create a new connection
-            self._connection = self.connect()
-
-    def add_on_channel_close_callback(self):
-        """This method tells pika to call the on_channel_closed method if
-        RabbitMQ unexpectedly closes the channel.
-        """
-        _logger.debug('Adding channel close callback')
-        self._channel.add_on_close_callback(self.on_channel_closed)
+        self._connection = None
+        self._fail_pending(ConnectionClosed(reply_code, reply_text))
+        if self._closing or (self._connecting is not None and not self._connecting.done()):
+            return
+        _logger.warning('Connection closed, reopening in %s seconds: (%s) %s',
+                        RECONNECT_DELAY, reply_code, reply_text)
+        self._loop.call_later(RECONNECT_DELAY, self.reconnect)
 
     def on_channel_closed(self, channel, reply_code, reply_text):
-        _logger.warning('Channel %i was closed: (%s) %s', channel, reply_code, reply_text)
-        self._connection.close()
-
-    def on_channel_open(self, channel):
-        """This method is invoked by pika when the channel has been opened.
-        The channel object is passed in so we can make use of it.
-
-        Since the channel is now open, we'll declare the exchange to use.
-
-        :param pika.channel.Channel channel: The channel object
-        """
-        _logger.info('Channel opened')
-        self._channel = channel
-        self.add_on_channel_close_callback()
-        self.setup_exchange(self.EXCHANGE)
-
-    def setup_exchange(self, exchange_name):
-        """Setup the exchange on RabbitMQ by invoking the Exchange.Declare RPC
-        command. When it is complete, the on_exchange_declareok method will
-        be invoked by pika.
-
-        :param str|unicode exchange_name: The name of the exchange to declare
-        """
-        _logger.debug('Declaring exchange %s', exchange_name)
-        self._channel.exchange_declare(self.on_exchange_declareok,
-                                       exchange_name,
-                                       self.EXCHANGE_TYPE,
-                                       durable=True,
-                                       passive=True)
-
-    def on_exchange_declareok(self, unused_frame):
-        """Invoked by pika when RabbitMQ has finished the Exchange.Declare RPC
-        command.
-
-        :param pika.Frame.Method unused_frame: Exchange.DeclareOk response frame
-        """
-        _logger.info('Exchange declared')
-        self.setup_queue(self._queue)
-
-    def setup_queue(self, queue_name):
-        """Setup the queue on RabbitMQ by invoking the Queue.Declare RPC
-        command. When it is complete, the on_queue_declareok method will
-        be invoked by pika.
+        _logger.warning('Channel %i was closed: (%s) %s',
+                        channel.channel_number, reply_code, reply_text)
+        self._channel = None
+        self._fail_pending(ChannelClosed(reply_code, reply_text))
+        if self._connection and not self._closing:
+            self._connection.close()
 
-        :param str|unicode queue_name: The name of the queue to declare.
-        """
-        _logger.debug('Declaring queue %s', queue_name)
-        self._channel.queue_declare(self.on_queue_declareok, queue_name)
+    def reconnect(self):
+        if self._closing:
+            return
 
-    def on_queue_declareok(self, method_frame):
-        """Method invoked by pika when the Queue.Declare RPC call made in
-        setup_queue has completed. In this method we will bind the queue
-        and exchange together with the routing key by issuing the Queue.Bind
-        RPC command. When this command is complete, the on_bindok method will
-        be invoked by pika.
+        async def restart_consumers():
+            try:
+                await self.get_channel()
+                for consumer in list(self.consumers):
+                    await consumer.consume()
+            except (AMQPConnectionError, AMQPChannelError) as e:
+                # The connection is closed again, and will be reopened by `on_connection_closed`
+                _logger.warning('Restarting the consumers failed: %r', e)
+
+        asyncio.ensure_future(restart_consumers(), loop=self._loop)
+
+    async def queue_declare(self, queue, **kwargs):
+        channel = await self.get_channel()
+        return await self._rpc(channel.queue_declare, queue=queue, **kwargs)
+
+    async def queue_bind(self, queue, routing_key):
+        channel = await self.get_channel()
+        _logger.info('Binding %s to %s with %s', self.EXCHANGE, queue, routing_key)
+        return await self._rpc(channel.queue_bind, queue, self.EXCHANGE, routing_key)
+
+    async def basic_consume(self, on_message, queue):
+        channel = await self.get_channel()
+        return channel.basic_consume(on_message, queue)
+
+    async def basic_cancel(self, consumer_tag):
+        if not self.is_open:
+            return
+        try:
+            await self._rpc(self._channel.basic_cancel, consumer_tag=consumer_tag)
+        except (AMQPConnectionError, AMQPChannelError):
+            # The consumer is cancelled with the channel
+            pass
+
+    def basic_ack(self, delivery_tag):
+        if self.is_open:
+            self._channel.basic_ack(delivery_tag)
+
+    def close(self):
+        _logger.info('Closing connection')
+        self._closing = True
+        self.consumers = set()
+        if self._connection:
+            self._connection.close()
 
-        :param pika.frame.Method method_frame: The Queue.DeclareOk frame
-        """
-        _logger.info('Binding %s to %s with %s',
-                     self.EXCHANGE, self._queue, self._routing_key)
-        self._channel.queue_bind(self.on_bindok, self._queue,
-                                 self.EXCHANGE, self._routing_key)
-
-    def add_on_cancel_callback(self):
-        """Add a callback that will be invoked if RabbitMQ cancels the consumer
-        for some reason. If RabbitMQ does cancel the consumer,
-        on_consumer_cancelled will be invoked by pika.
-        """
-        _logger.debug('Adding consumer cancellation callback')
-        self._channel.add_on_cancel_callback(self.on_consumer_cancelled)
 
-    def on_consumer_cancelled(self, method_frame):
-        """Invoked by pika when RabbitMQ sends a Basic.Cancel for a consumer
-        receiving messages.
+class Consumer(object):
+    """A subscription to the logs published on the internal exchange for a routing key.
 
-        :param pika.frame.Method method_frame: The Basic.Cancel frame
-        """
-        _logger.info('Consumer was cancelled remotely, shutting down: %r', method_frame)
-        if self._channel:
-            self._channel.close()
+    Messages are buffered in a bounded `asyncio.Queue` that wakes the websocket handler
+    as soon as a message arrives. If the sockets are too slow to consume the messages,
+    the oldest messages are dropped instead of growing the buffer without limit.
 
-    def acknowledge_message(self, delivery_tag):
-        """Acknowledge the message delivery from RabbitMQ by sending a
-        Basic.Ack RPC method for the delivery tag.
+    The queue is exclusive to the streams worker and auto-deleted,
+    RabbitMQ removes it as soon as the consumer is cancelled or the connection is lost.
+    """
 
-        :param int delivery_tag: The delivery tag from the Basic.Deliver frame
-        """
-        _logger.debug('Acknowledging message %s', delivery_tag)
-        self._channel.basic_ack(delivery_tag)
+    def __init__(self, routing_key, queue, connection, maxsize=MAX_BUFFERED_MESSAGES):
+        self._routing_key = routing_key
+        self._queue = queue
+        self._connection = connection
+        self._consumer_tag = None
+        self.messages = asyncio.Queue(maxsize=maxsize)
+        self.num_dropped_messages = 0
+
+    async def consume(self):
+        """Declares and binds the queue and starts consuming messages."""
+        self._connection.consumers.add(self)
+        await self._connection.queue_declare(self._queue, exclusive=True, auto_delete=True)
+        await self._connection.queue_bind(self._queue, self._routing_key)
+        self._consumer_tag = await self._connection.basic_consume(self.on_message, self._queue)
+        _logger.debug('Consuming from queue %s', self._queue)
+
+    def put_message(self, message):
+        if self.messages.full():
+            self.messages.get_nowait()
+            self.num_dropped_messages += 1
+            _logger.debug('Dropped message for %s, total dropped: %s',
+                          self._queue, self.num_dropped_messages)
+        self.messages.put_nowait(message)
 
     def on_message(self, unused_channel, basic_deliver, properties, body):
-        """Invoked by pika when a message is delivered from RabbitMQ. The
-        channel is passed for your convenience. The basic_deliver object that
-        is passed in carries the exchange, routing key, delivery tag and
-        a redelivered flag for the message. The properties passed in is an
-        instance of BasicProperties with the message properties and the body
-        is the message that was sent.
+        """Invoked by pika when a message is delivered from RabbitMQ.
 
         :param pika.channel.Channel unused_channel: The channel object
         :param pika.Spec.Basic.Deliver: basic_deliver method
@@ -220,90 +258,28 @@ class Consumer(SocketManager):
         """
         _logger.debug('Received message # %s from %s: %s',
                       basic_deliver.delivery_tag, properties.app_id, body)
-        if self.ws and body:
-            self.messages.append(body)
-        _logger.debug('out ws : %s', len(self.ws))
-        _logger.debug('out messages : %s', len(self.messages))
-        self.acknowledge_message(basic_deliver.delivery_tag)
-
-    def on_cancelok(self, unused_frame):
-        """This method is invoked by pika when RabbitMQ acknowledges the
-        cancellation of a consumer. At this point we will close the channel.
-        This will invoke the on_channel_closed method once the channel has been
-        closed, which will in-turn close the connection.
-
-        :param pika.frame.Method unused_frame: The Basic.CancelOk frame
-        """
-        _logger.debug('RabbitMQ acknowledged the cancellation of the consumer')
-        self.close_channel()
-
-    def stop_consuming(self):
-        """Tell RabbitMQ that you would like to stop consuming by sending the
-        Basic.Cancel RPC command.
-        """
-        if self._channel:
-            _logger.debug('Sending a Basic.Cancel RPC command to RabbitMQ')
-            self._channel.basic_cancel(self.on_cancelok, self._consumer_tag)
-
-    def start_consuming(self):
-        """This method sets up the consumer by first calling
-        add_on_cancel_callback so that the object is notified if RabbitMQ
-        cancels the consumer. It then issues the Basic.Consume RPC command
-        which returns the consumer tag that is used to uniquely identify the
-        consumer with RabbitMQ. We keep the value to use it when we want to
-        cancel consuming. The on_message method is passed in as a callback pika
-        will invoke when a message is fully received.
-        """
-        _logger.debug('Issuing consumer related RPC commands')
-        self.add_on_cancel_callback()
-        self._consumer_tag = self._channel.basic_consume(self.on_message,
-                                                         self._queue)
-
-    def on_bindok(self, unused_frame):
-        """Invoked by pika when the Queue.Bind method has completed. At this
-        point we will start consuming messages by calling start_consuming
-        which will invoke the needed RPC commands to start the process.
-
-        :param pika.frame.Method unused_frame: The Queue.BindOk response frame
-        """
-        _logger.debug('Queue bound')
-        self.start_consuming()
-
-    def close_channel(self):
-        """Call to close the channel with RabbitMQ cleanly by issuing the
-        Channel.Close RPC command.
-
-        """
-        _logger.info('Closing the channel')
-        self._channel.close()
-
-    def open_channel(self):
-        """Open a new channel with RabbitMQ by issuing the Channel.Open RPC
-        command. When RabbitMQ responds that the channel is open, the
-        on_channel_open callback will be invoked by pika.
-        """
-        _logger.info('Creating a new channel')
-        self._connection.channel(on_open_callback=self.on_channel_open)
+        if body:
+            self.put_message(body)
+        self._connection.basic_ack(basic_deliver.delivery_tag)
+
+    async def get_messages(self, timeout=None):
+        """Waits for at least a message, up to `timeout` seconds,
+        and returns all the buffered messages."""
+        try:
+            message = await asyncio.wait_for(self.messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        messages = [message]
+        while not self.messages.empty():
+            messages.append(self.messages.get_nowait())
+        return messages
 
-    def run(self):
-        """Run the example consumer by connecting to RabbitMQ and then
-        starting the IOLoop to block and allow the SelectConnection to operate.
-        """
-        self._connection = self.connect()
-        self._connection.ioloop.start()
-
-    def stop(self):
-        """Cleanly shutdown the connection to RabbitMQ by stopping the consumer
-        with RabbitMQ. When RabbitMQ confirms the cancellation, on_cancelok
-        will be invoked by pika, which will then closing the channel and
-        connection. The IOLoop is started again because this method is invoked
-        when CTRL-C is pressed raising a KeyboardInterrupt exception. This
-        exception stops the IOLoop which needs to be running for pika to
-        communicate with RabbitMQ. All of the commands issued prior to starting
-        the IOLoop will be buffered but not processed.
-        """
-        _logger.debug('Stopping')
-        self._closing = True
-        self.stop_consuming()
-        self._connection.ioloop.start()
-        _logger.info('Stopped')
+    async def stop(self):
+        """Cancels the consumer, which deletes its queue."""
+        _logger.debug('Stopping consumer for %s', self._queue)
+        self._connection.consumers.discard(self)
+        if self._consumer_tag:
+            await self._connection.basic_cancel(self._consumer_tag)
+            self._consumer_tag = None
+        _logger.info('Stopped consumer for %s', self._queue)
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import logging
+import time
+
+from collections import deque
+
+from websockets import ConnectionClosed
+
+from streams.socket_manager import SocketManager
+
+_logger = logging.getLogger('polyaxon.streams.logs')
+
+BACKLOG_LINES = 1000
+MESSAGES_TIMEOUT = 2
+DONE_CHECK_INTERVAL = 10
+
+
+def get_num_lines(message):
+    try:
+        log_lines = json.loads(message.decode('utf-8'))['log_lines']
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return 1
+    return len(log_lines) if isinstance(log_lines, list) else 1
+
+
+class LogsHub(SocketManager):
+    """Fans out the logs of a job/experiment to all the sockets watching it.
+
+    A single AMQP consumer is used per job/experiment, the last log lines are kept
+    in a bounded backlog that is replayed to sockets joining late.
+    The consumer is stopped, and its queue removed, once the last socket disconnects.
+    """
+
+    def __init__(self, instance, consumer, on_stop=None, backlog_lines=BACKLOG_LINES):
+        self.instance = instance
+        self.consumer = consumer
+        self.backlog = deque()
+        self.backlog_lines = backlog_lines
+        self.num_backlog_lines = 0
+        self._on_stop = on_stop
+        self._task = None
+        super().__init__()
+
+    @property
+    def is_running(self):
+        return self._task is not None
+
+    def add_to_backlog(self, message):
+        num_lines = get_num_lines(message)
+        self.backlog.append((message, num_lines))
+        self.num_backlog_lines += num_lines
+        while self.num_backlog_lines > self.backlog_lines and len(self.backlog) > 1:
+            _, num_lines = self.backlog.popleft()
+            self.num_backlog_lines -= num_lines
+
+    async def subscribe(self, ws):
+        """Adds the socket, replays the backlog to it, and starts the hub if necessary."""
+        self.add_socket(ws)
+        for message, _ in list(self.backlog):
+            try:
+                await ws.send(message)
+            except ConnectionClosed:
+                self.remove_sockets(ws)
+                return
+        self.start()
+
+    def start(self):
+        if self.is_running:
+            return
+        self._task = asyncio.ensure_future(self.run())
+
+    def check_done(self):
+        self.instance.refresh_from_db()
+        return self.instance.is_done
+
+    async def run(self):
+        last_check = time.time()
+        try:
+            await self.consumer.consume()
+            while self.ws:
+                for message in await self.consumer.get_messages(timeout=MESSAGES_TIMEOUT):
+                    self.add_to_backlog(message)
+                    await self.broadcast(message)
+
+                if time.time() - last_check > DONE_CHECK_INTERVAL:
+                    last_check = time.time()
+                    if self.check_done():
+                        _logger.info('Removing all sockets because `%s` is done', self.instance)
+                        await self.close_sockets()
+        finally:
+            self._task = None
+            if self._on_stop:
+                self._on_stop()
+            await self.consumer.stop()
+
+    async def stop(self):
+        await self.close_sockets()
+        await self.consumer.stop()
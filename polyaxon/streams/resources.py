@@ -0,0 +1,159 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from libs.redis_db import RedisToStream
+from streams.socket_manager import SocketManager
+
+_logger = logging.getLogger('polyaxon.streams.resources')
+
+PUBSUB_TIMEOUT = 0.5
+MESSAGES_TIMEOUT = 2
+DONE_CHECK_INTERVAL = 10
+
+
+class BaseResourcesStreamer(SocketManager):
+    """Fans out the resources published by the resources monitor.
+
+    A single Redis subscription is used per job/experiment, every payload is sent once
+    to all the sockets watching the same instance, regardless of the number of sockets.
+    The subscription is read in a thread, not to block the event loop,
+    and the payloads are handed over to the loop through a queue.
+    """
+
+    def __init__(self, instance, on_stop=None):
+        self.instance = instance
+        self._on_stop = on_stop
+        self._pubsub = None
+        self._task = None
+        super().__init__()
+
+    @property
+    def is_running(self):
+        return self._task is not None
+
+    def subscribe(self):
+        raise NotImplementedError
+
+    def get_latest_resources(self):
+        """Returns the last known resources to send to new sockets."""
+        raise NotImplementedError
+
+    def handle_payload(self, payload):
+        """Returns the message to broadcast for a published payload."""
+        raise NotImplementedError
+
+    def start(self):
+        if self.is_running:
+            return
+        self._pubsub = self.subscribe()
+        self._task = asyncio.ensure_future(self.run())
+
+    def check_done(self):
+        self.instance.refresh_from_db()
+        return self.instance.is_done
+
+    @staticmethod
+    def read_pubsub(pubsub, stop_reading, loop, queue):
+        """Puts the published payloads in the queue until `stop_reading` is set.
+
+        The pubsub is only used, and closed, by the thread reading it.
+        """
+        try:
+            while not stop_reading.is_set():
+                message = pubsub.get_message(ignore_subscribe_messages=True,
+                                             timeout=PUBSUB_TIMEOUT)
+                if message and message['type'] == 'message':
+                    loop.call_soon_threadsafe(queue.put_nowait, message['data'])
+        finally:
+            pubsub.close()
+
+    async def run(self):
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue()
+        stop_reading = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        reader = loop.run_in_executor(executor,
+                                      self.read_pubsub,
+                                      self._pubsub,
+                                      stop_reading,
+                                      loop,
+                                      queue)
+        last_check = time.time()
+        try:
+            while self.ws:
+                if reader.done():
+                    # Raises the error that stopped the reader
+                    reader.result()
+                    return
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=MESSAGES_TIMEOUT)
+                except asyncio.TimeoutError:
+                    payload = None
+                if payload is not None:
+                    resources = self.handle_payload(payload)
+                    if resources:
+                        await self.broadcast(resources)
+
+                if time.time() - last_check > DONE_CHECK_INTERVAL:
+                    last_check = time.time()
+                    if self.check_done():
+                        _logger.info('Removing all sockets because `%s` is done', self.instance)
+                        await self.close_sockets()
+                        return
+        finally:
+            stop_reading.set()
+            executor.shutdown(wait=False)
+            self._pubsub = None
+            self._task = None
+            if self._on_stop:
+                self._on_stop()
+
+
+class JobResourcesStreamer(BaseResourcesStreamer):
+    def __init__(self, job, job_name, on_stop=None):
+        self.job_uuid = job.uuid.hex
+        self.job_name = job_name
+        super().__init__(instance=job, on_stop=on_stop)
+
+    def subscribe(self):
+        return RedisToStream.subscribe_job_resources(job_uuid=self.job_uuid)
+
+    def get_latest_resources(self):
+        return RedisToStream.get_latest_job_resources(job=self.job_uuid, job_name=self.job_name)
+
+    def handle_payload(self, payload):
+        resources = json.loads(payload.decode('utf-8'))
+        resources['job_name'] = self.job_name
+        return json.dumps(resources)
+
+
+class ExperimentResourcesStreamer(BaseResourcesStreamer):
+    def __init__(self, experiment, jobs, on_stop=None):
+        self.experiment_uuid = experiment.uuid.hex
+        self.jobs = jobs
+        self.job_names = {job['uuid']: job['name'] for job in jobs}
+        self._latest = {}
+        super().__init__(instance=experiment, on_stop=on_stop)
+
+    def subscribe(self):
+        return RedisToStream.subscribe_experiment_resources(experiment_uuid=self.experiment_uuid)
+
+    def get_latest_resources(self):
+        resources = RedisToStream.get_latest_experiment_resources(self.jobs, as_json=True)
+        for job_resources in resources:
+            self._latest.setdefault(job_resources['job_uuid'], job_resources)
+        return json.dumps(list(self._latest.values())) if self._latest else None
+
+    def handle_payload(self, payload):
+        resources = json.loads(payload.decode('utf-8'))
+        job_uuid = resources['job_uuid']
+        if job_uuid not in self.job_names:
+            return None
+        resources['job_name'] = self.job_names[job_uuid]
+        self._latest[job_uuid] = resources
+        return json.dumps(list(self._latest.values()))
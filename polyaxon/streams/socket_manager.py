@@ -1,3 +1,10 @@
+import asyncio
+
+from websockets import ConnectionClosed
+
+SEND_TIMEOUT = 10
+
+
 class SocketManager(object):
     def __init__(self):
         self.ws = set()
@@ -9,3 +16,28 @@ class SocketManager(object):
         if not isinstance(disconnected_ws, set):
             disconnected_ws = {disconnected_ws, }
         self.ws -= disconnected_ws
+
+    async def broadcast(self, message):
+        """Sends the message to all sockets, slow sockets that can't keep up are dropped."""
+        disconnected_ws = set()
+        for ws in list(self.ws):
+            try:
+                await asyncio.wait_for(ws.send(message), timeout=SEND_TIMEOUT)
+            except (ConnectionClosed, asyncio.TimeoutError):
+                disconnected_ws.add(ws)
+        self.remove_sockets(disconnected_ws)
+
+    async def close_sockets(self):
+        sockets = self.ws
+        self.ws = set()
+        for ws in sockets:
+            await ws.close()
+
+
+async def wait_for_disconnect(ws):
+    """Blocks until the client closes the socket, clients are not expected to send messages."""
+    while True:
+        try:
+            await ws.recv()
+        except ConnectionClosed:
+            return
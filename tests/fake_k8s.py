@@ -0,0 +1,127 @@
+import queue
+import threading
+import uuid
+
+from types import SimpleNamespace
+
+from kubernetes.client.rest import ApiException
+
+PODS = 'pods'
+SERVICES = 'services'
+CONFIG_MAPS = 'config_maps'
+
+
+class FakeK8SApi(object):
+    """A local stand-in of the k8s API server, keeping the objects in memory.
+
+    The watches are served by `FakeWatch`, patched in place of `kubernetes.watch.Watch`.
+    """
+
+    def __init__(self):
+        self.resource_version = 0
+        self.objects = {PODS: {}, SERVICES: {}, CONFIG_MAPS: {}}
+        self.watchers = []
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _next_resource_version(self):
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def _notify(self, kind, event_type, obj):
+        for watcher_kind, events in self.watchers:
+            if watcher_kind == kind:
+                events.put({'type': event_type, 'object': obj})
+
+    def create(self, kind, name, labels=None, phase=None, notify=True):
+        with self._lock:
+            obj = SimpleNamespace(
+                metadata=SimpleNamespace(name=name,
+                                         uid=uuid.uuid4().hex,
+                                         labels=labels or {},
+                                         resource_version=self._next_resource_version()),
+                status=SimpleNamespace(phase=phase))
+            self.objects[kind][name] = obj
+            if notify:
+                self._notify(kind, 'ADDED', obj)
+        return obj
+
+    def update(self, kind, name, phase):
+        with self._lock:
+            obj = self.objects[kind][name]
+            obj = SimpleNamespace(
+                metadata=SimpleNamespace(name=name,
+                                         uid=obj.metadata.uid,
+                                         labels=obj.metadata.labels,
+                                         resource_version=self._next_resource_version()),
+                status=SimpleNamespace(phase=phase))
+            self.objects[kind][name] = obj
+            self._notify(kind, 'MODIFIED', obj)
+        return obj
+
+    def delete(self, kind, name):
+        with self._lock:
+            obj = self.objects[kind].pop(name)
+            self._notify(kind, 'DELETED', obj)
+
+    def _list(self, kind, **kwargs):
+        self.calls.append(('list', kind))
+        with self._lock:
+            return SimpleNamespace(
+                items=list(self.objects[kind].values()),
+                metadata=SimpleNamespace(resource_version=str(self.resource_version)))
+
+    def list_namespaced_pod(self, namespace, **kwargs):
+        return self._list(PODS, **kwargs)
+
+    def list_namespaced_service(self, namespace, **kwargs):
+        return self._list(SERVICES, **kwargs)
+
+    def list_namespaced_config_map(self, namespace, **kwargs):
+        return self._list(CONFIG_MAPS, **kwargs)
+
+    def read_namespaced_pod_status(self, name, namespace):
+        self.calls.append(('read', PODS))
+        obj = self.objects[PODS].get(name)
+        if obj is None:
+            raise ApiException(status=404)
+        return obj
+
+    def create_namespaced_pod(self, namespace, body):
+        self.calls.append(('create', PODS))
+        if body.metadata.name in self.objects[PODS]:
+            raise ApiException(status=409)
+        return self.create(PODS, body.metadata.name, labels=body.metadata.labels)
+
+    def get_watch(self):
+        return FakeWatch(self)
+
+
+class FakeWatch(object):
+    LIST_FUNCTIONS = {
+        'list_namespaced_pod': PODS,
+        'list_namespaced_service': SERVICES,
+        'list_namespaced_config_map': CONFIG_MAPS,
+    }
+
+    def __init__(self, k8s_api):
+        self.k8s_api = k8s_api
+        self._stop = False
+
+    def stream(self, func, resource_version=None, **kwargs):
+        kind = self.LIST_FUNCTIONS[func.__name__]
+        events = queue.Queue()
+        with self.k8s_api._lock:  # pylint:disable=protected-access
+            self.k8s_api.watchers.append((kind, events))
+            # Send the changes since the resource version
+            for obj in self.k8s_api.objects[kind].values():
+                if int(obj.metadata.resource_version) > int(resource_version or 0):
+                    events.put({'type': 'MODIFIED', 'object': obj})
+        while not self._stop:
+            try:
+                yield events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+
+    def stop(self):
+        self._stop = True
@@ -1,10 +1,12 @@
 import os
 import uuid
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from events_handlers.ingest import handle_logs
+from events_handlers.management.commands.ingest_logs import Command
 from events_handlers.tasks import (
     events_handle_logs_build_job,
     events_handle_logs_experiment_job,
@@ -15,6 +17,7 @@ from factories.factory_experiments import ExperimentFactory
 from factories.factory_jobs import JobFactory
 from libs.paths.experiments import get_experiment_logs_path
 from libs.paths.jobs import get_job_logs_path
+from polyaxon.settings import EventsCeleryTasks
 from polyaxon_schemas.utils import TaskType
 from tests.utils import BaseTest
 
@@ -137,5 +140,151 @@ class TestBuildJobLogsHandling(BaseTestLogsHandling):
         events_handle_logs_build_job(**params)
 
 
+@pytest.mark.monitors_mark
+class TestBulkLogsHandling(BaseTest):
+    @staticmethod
+    def file_lines(filename):
+        return [line.strip() for line in open(filename)]
+
+    def test_handle_logs(self):
+        with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+            experiment = ExperimentFactory()
+        with patch('scheduler.tasks.jobs.jobs_build.apply_async') as _:  # noqa
+            job = JobFactory()
+        experiment_kwargs = dict(experiment_name=experiment.unique_name,
+                                 experiment_uuid=experiment.uuid.hex,
+                                 job_uuid=uuid.uuid4().hex,
+                                 task_type=TaskType.WORKER,
+                                 task_idx='0')
+        tasks = [
+            (EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB,
+             dict(log_lines=['line1', 'line2'], **experiment_kwargs)),
+            (EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+             dict(job_name=job.unique_name, job_uuid=job.uuid.hex, log_lines='line1')),
+            (EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB,
+             dict(log_lines=['line3'], **experiment_kwargs)),
+            # Unknown instances are ignored
+            (EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+             dict(job_name='user.project.1', job_uuid=uuid.uuid4().hex, log_lines='line1')),
+        ]
+
+        # The instances are checked again before creating their log files
+        with self.assertNumQueries(4):
+            assert handle_logs(tasks) == 4
+
+        assert self.file_lines(get_experiment_logs_path(experiment.unique_name)) == [
+            'worker.1 -- line1', 'worker.1 -- line2', 'worker.1 -- line3']
+        assert self.file_lines(get_job_logs_path(job.unique_name)) == ['line1']
+
+        # Existing instances are cached
+        with self.assertNumQueries(0):
+            assert handle_logs(tasks[:3]) == 4
+
+    def test_handle_logs_of_deleted_instances(self):
+        with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+            experiment = ExperimentFactory()
+        tasks = [(EventsCeleryTasks.EVENTS_HANDLE_LOGS_EXPERIMENT_JOB,
+                  dict(experiment_name=experiment.unique_name,
+                       experiment_uuid=experiment.uuid.hex,
+                       job_uuid=uuid.uuid4().hex,
+                       log_lines=['line1']))]
+        assert handle_logs(tasks) == 1
+        log_path = get_experiment_logs_path(experiment.unique_name)
+        assert os.path.exists(log_path) is True
+
+        # The deleted experiment is still cached as existing, but its logs are not recreated
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            experiment.delete()
+        assert os.path.exists(log_path) is False
+        assert handle_logs(tasks) == 0
+        assert os.path.exists(log_path) is False
+
+
+@pytest.mark.monitors_mark
+class TestIngestLogsCommand(BaseTest):
+    @staticmethod
+    def get_job_kwargs(**kwargs):
+        job_kwargs = dict(job_name='user.project.1', job_uuid=uuid.uuid4().hex, log_lines='line1')
+        job_kwargs.update(kwargs)
+        return job_kwargs
+
+    @staticmethod
+    def get_message(body=None, redelivered=False):
+        message = MagicMock(headers={}, delivery_info={'redelivered': redelivered})
+        if body is None:
+            message.decode.side_effect = ValueError
+        else:
+            message.decode.return_value = body
+        return message
+
+    def get_job_message(self, redelivered=False, **kwargs):
+        return self.get_message({'task': EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+                                 'kwargs': self.get_job_kwargs(**kwargs)},
+                                redelivered=redelivered)
+
+    def test_handle_batch_acks_the_handled_messages(self):
+        messages = [self.get_job_message(), self.get_message()]
+        with patch('events_handlers.management.commands.ingest_logs.handle_logs') as mock_fct:
+            mock_fct.return_value = 0
+            Command.handle_batch(messages)
+        assert mock_fct.call_args[0][0] == [(EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+                                             messages[0].decode()['kwargs'])]
+        assert [message.ack.call_count for message in messages] == [1, 1]
+        assert [message.reject.call_count for message in messages] == [0, 0]
+
+    def test_handle_batch_acks_the_invalid_messages(self):
+        messages = [self.get_job_message(),
+                    self.get_message({'task': EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+                                      'kwargs': {'job_name': 'user.project.1',
+                                                 'log_lines': 'line1'}}),
+                    self.get_job_message(job_uuid='not-a-uuid'),
+                    self.get_message({'task': 'unknown_task', 'kwargs': self.get_job_kwargs()})]
+        with patch('events_handlers.management.commands.ingest_logs.handle_logs') as mock_fct:
+            mock_fct.return_value = 0
+            Command.handle_batch(messages)
+        assert mock_fct.call_args[0][0] == [(EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+                                             messages[0].decode()['kwargs'])]
+        assert [message.ack.call_count for message in messages] == [1, 1, 1, 1]
+        assert [message.reject.call_count for message in messages] == [0, 0, 0, 0]
+
+    def test_handle_batch_requeues_the_messages_on_transient_failure(self):
+        messages = [self.get_job_message(), self.get_message(), self.get_job_message()]
+        with patch('events_handlers.management.commands.ingest_logs.handle_logs') as mock_fct:
+            mock_fct.side_effect = OSError
+            Command.handle_batch(messages)
+        # The undecodable message is dropped, the other ones are requeued
+        assert [message.ack.call_count for message in messages] == [0, 1, 0]
+        messages[0].reject.assert_called_once_with(requeue=True)
+        assert messages[1].reject.call_count == 0
+        messages[2].reject.assert_called_once_with(requeue=True)
+
+    def test_handle_batch_drops_the_redelivered_messages_on_transient_failure(self):
+        messages = [self.get_job_message(redelivered=True), self.get_job_message()]
+        with patch('events_handlers.management.commands.ingest_logs.handle_logs') as mock_fct:
+            mock_fct.side_effect = OSError
+            Command.handle_batch(messages)
+        assert [message.ack.call_count for message in messages] == [1, 0]
+        assert messages[0].reject.call_count == 0
+        messages[1].reject.assert_called_once_with(requeue=True)
+
+    def test_handle_batch_drops_the_failing_messages(self):
+        messages = [self.get_job_message(), self.get_job_message(job_name='failing')]
+
+        def handle_logs(tasks):
+            if any(kwargs['job_name'] == 'failing' for _, kwargs in tasks):
+                raise KeyError('failing')
+            return len(tasks)
+
+        with patch('events_handlers.management.commands.ingest_logs.handle_logs') as mock_fct:
+            mock_fct.side_effect = handle_logs
+            Command.handle_batch(messages)
+        # The messages are handled one by one, only the failing one is dropped
+        assert mock_fct.call_count == 3
+        assert mock_fct.call_args_list[1][0][0] == [(EventsCeleryTasks.EVENTS_HANDLE_LOGS_JOB,
+                                                     messages[0].decode()['kwargs'])]
+        assert [message.ack.call_count for message in messages] == [1, 1]
+        assert [message.reject.call_count for message in messages] == [0, 0]
+
+
 # Prevent base class from running
 del BaseTestLogsHandling
@@ -1,6 +1,6 @@
 import pytest
 
-from mock import patch
+from mock import MagicMock, patch
 
 from django.conf import settings
 
@@ -14,7 +14,8 @@ from events_handlers.tasks import (
     events_handle_build_job_statuses,
     events_handle_experiment_job_statuses,
     events_handle_job_statuses,
-    events_handle_plugin_job_statuses
+    events_handle_plugin_job_statuses,
+    events_handle_statuses
 )
 from factories.factory_build_jobs import BuildJobFactory
 from factories.factory_experiments import ExperimentJobFactory
@@ -22,6 +23,8 @@ from factories.factory_jobs import JobFactory
 from factories.factory_plugins import NotebookJobFactory, TensorboardJobFactory
 from factories.factory_projects import ProjectFactory
 from monitor_statuses.jobs import get_job_state
+from monitor_statuses.monitor import StatusesBuffer, get_watch
+from polyaxon.settings import EventsCeleryTasks
 from tests.fixtures import (
     status_build_job_event,
     status_build_job_event_with_conditions,
@@ -162,5 +165,77 @@ class TestEventsDockerizerJobsStatusesHandling(TestEventsBaseJobsStatusesHandlin
         return BuildJobFactory(uuid=job_uuid, project=project)
 
 
+@pytest.mark.monitors_mark
+class TestEventsStatusesBatchHandling(BaseTest):
+    @staticmethod
+    def get_job_state(event):
+        return get_job_state(
+            event_type=event['type'],
+            event=event['object'],
+            job_container_names=(settings.CONTAINER_NAME_EXPERIMENT_JOB,
+                                 settings.CONTAINER_NAME_JOB),
+            experiment_type_label=settings.TYPE_LABELS_EXPERIMENT)
+
+    def test_handle_events_statuses(self):
+        experiment_job_state = self.get_job_state(status_experiment_job_event_with_conditions)
+        experiment_job = ExperimentJobFactory(
+            uuid=experiment_job_state.details.labels.job_uuid.hex)
+        job_state = self.get_job_state(status_job_event)
+        with patch('scheduler.tasks.jobs.jobs_build.apply_async') as _:  # noqa
+            job = JobFactory(uuid=job_state.details.labels.job_uuid.hex)
+
+        events_handle_statuses([
+            (EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
+             experiment_job_state.to_dict()),
+            (EventsCeleryTasks.EVENTS_HANDLE_JOB_STATUSES, job_state.to_dict()),
+            (EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES,
+             experiment_job_state.to_dict()),
+        ])
+
+        statuses = ExperimentJobStatus.objects.filter(
+            job=experiment_job).values_list('status', flat=True)
+        assert sorted(statuses) == sorted([JobLifeCycle.CREATED, JobLifeCycle.FAILED])
+        statuses = JobStatus.objects.filter(job=job).values_list('status', flat=True)
+        assert set(statuses) == {JobLifeCycle.CREATED, JobLifeCycle.UNKNOWN}
+
+    def test_statuses_buffer_drops_unchanged_statuses(self):
+        statuses_buffer = StatusesBuffer(flush_interval=1)
+        job_state = self.get_job_state(status_experiment_job_event).to_dict()
+        task = EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES
+
+        assert statuses_buffer.add(task, job_state) is True
+        assert statuses_buffer.add(task, job_state) is False
+
+        with patch('monitor_statuses.monitor.celery_app.send_task') as send_task_mock:
+            assert statuses_buffer.flush() == 1
+            assert statuses_buffer.flush() == 0
+
+        assert send_task_mock.call_count == 1
+        assert send_task_mock.call_args[0][0] == EventsCeleryTasks.EVENTS_HANDLE_STATUSES
+        assert send_task_mock.call_args[1]['kwargs'] == {'payloads': [(task, job_state)]}
+
+        # A new status is emitted
+        job_state_with_conditions = self.get_job_state(
+            status_experiment_job_event_with_conditions).to_dict()
+        assert statuses_buffer.add(task, job_state_with_conditions) is True
+
+    def test_statuses_buffer_is_flushed_before_persisting_the_watch(self):
+        statuses_buffer = StatusesBuffer(flush_interval=1)
+        resumable_watch = get_watch(MagicMock(), statuses_buffer=statuses_buffer)
+        job_state = self.get_job_state(status_experiment_job_event).to_dict()
+        statuses_buffer.add(EventsCeleryTasks.EVENTS_HANDLE_EXPERIMENT_JOB_STATUSES, job_state)
+
+        # The statuses are kept, and the resource version is not persisted, if they are not sent
+        with patch('monitor_statuses.monitor.celery_app.send_task') as send_task_mock:
+            send_task_mock.side_effect = OSError
+            assert resumable_watch.persist() is False
+
+        with patch('monitor_statuses.monitor.celery_app.send_task') as send_task_mock:
+            with patch('libs.k8s_watch.RedisWatches.save') as save_mock:
+                assert resumable_watch.persist() is True
+        assert send_task_mock.call_count == 1
+        assert save_mock.call_count == 1
+
+
 # Prevent this base class from running tests
 del TestEventsBaseJobsStatusesHandling
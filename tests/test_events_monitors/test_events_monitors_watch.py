@@ -0,0 +1,117 @@
+import pytest
+
+from kubernetes.client.rest import ApiException
+from mock import MagicMock, patch
+
+from libs.k8s_watch import ResumableWatch
+from libs.redis_db import RedisWatches
+from tests.utils import BaseTest
+
+
+def get_object(uid, resource_version):
+    obj = MagicMock()
+    obj.metadata.uid = uid
+    obj.metadata.resource_version = resource_version
+    return obj
+
+
+def get_list(objects, resource_version):
+    objects_list = MagicMock()
+    objects_list.items = objects
+    objects_list.metadata.resource_version = resource_version
+    return objects_list
+
+
+@pytest.mark.monitors_mark
+class TestResumableWatch(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.list_fn = MagicMock()
+
+    def get_watch(self, events):
+        watch_mock = MagicMock()
+        watch_mock.return_value.stream.return_value = iter(events)
+        return patch('libs.k8s_watch.watch.Watch', watch_mock)
+
+    def test_lists_the_objects_and_resumes_from_the_resource_version(self):
+        pod1 = get_object('uid1', '1')
+        pod2 = get_object('uid2', '2')
+        self.list_fn.return_value = get_list([pod1, pod2], '2')
+        resumable_watch = ResumableWatch(name='test', list_fn=self.list_fn, namespace='ns')
+
+        pod1_modified = get_object('uid1', '3')
+        with self.get_watch([{'type': 'MODIFIED', 'object': pod1_modified}]) as watch_mock:
+            events = list(resumable_watch.stream())
+
+        assert [(event['type'], event['object']) for event in events] == [
+            ('ADDED', pod1), ('ADDED', pod2), ('MODIFIED', pod1_modified)]
+        assert watch_mock.return_value.stream.call_args[1]['resource_version'] == '2'
+        assert resumable_watch.resource_version == '3'
+        assert RedisWatches.get_resource_version('test') == '3'
+        assert RedisWatches.get_counters('test') == {'new': 3, 'relists': 1}
+
+        # A new watch resumes from the persisted resource version without listing the objects
+        resumable_watch = ResumableWatch(name='test', list_fn=self.list_fn, namespace='ns')
+        with self.get_watch([]) as watch_mock:
+            assert list(resumable_watch.stream()) == []
+        assert self.list_fn.call_count == 1
+        assert watch_mock.return_value.stream.call_args[1]['resource_version'] == '3'
+
+    def test_expired_resource_version_lists_only_the_changed_objects(self):
+        pod1 = get_object('uid1', '1')
+        pod2 = get_object('uid2', '2')
+        self.list_fn.return_value = get_list([pod1, pod2], '2')
+        resumable_watch = ResumableWatch(name='test',
+                                         list_fn=self.list_fn,
+                                         emit_deletions=True,
+                                         namespace='ns')
+        with self.get_watch([]):
+            assert len(list(resumable_watch.stream())) == 2
+
+        # The resource version expired, pod1 did not change, pod2 was deleted
+        pod3 = get_object('uid3', '5')
+        self.list_fn.return_value = get_list([pod1, pod3], '5')
+        watch_mock = MagicMock()
+        watch_mock.return_value.stream.side_effect = [ApiException(status=410), iter([])]
+        with patch('libs.k8s_watch.watch.Watch', watch_mock):
+            events = list(resumable_watch.stream())
+
+        assert [(event['type'], event['object']) for event in events] == [
+            ('ADDED', pod3), ('DELETED', pod2)]
+        assert resumable_watch.counters == {'new': 4, 'replayed': 1, 'relists': 2}
+        assert watch_mock.return_value.stream.call_args[1]['resource_version'] == '5'
+
+    def test_replayed_and_bookmark_events_are_skipped(self):
+        pod1 = get_object('uid1', '1')
+        self.list_fn.return_value = get_list([pod1], '1')
+        resumable_watch = ResumableWatch(name='test', list_fn=self.list_fn, namespace='ns')
+
+        bookmark = get_object(None, '4')
+        with self.get_watch([{'type': 'ADDED', 'object': pod1},
+                             {'type': 'BOOKMARK', 'object': bookmark}]):
+            events = list(resumable_watch.stream())
+
+        assert [event['object'] for event in events] == [pod1]
+        assert resumable_watch.counters == {'new': 1, 'replayed': 1, 'relists': 1}
+        assert resumable_watch.resource_version == '4'
+
+    def test_resource_version_is_persisted_once_the_events_are_delivered(self):
+        pod1 = get_object('uid1', '1')
+        self.list_fn.return_value = get_list([pod1], '1')
+        before_persist = MagicMock(side_effect=ValueError)
+        resumable_watch = ResumableWatch(name='test',
+                                         list_fn=self.list_fn,
+                                         before_persist=before_persist,
+                                         namespace='ns')
+
+        pod1_modified = get_object('uid1', '2')
+        with self.get_watch([{'type': 'MODIFIED', 'object': pod1_modified}]):
+            assert len(list(resumable_watch.stream())) == 2
+
+        # The events could not be delivered, they are replayed after a restart
+        assert before_persist.call_count > 0
+        assert RedisWatches.get_resource_version('test') is None
+
+        before_persist.side_effect = None
+        assert resumable_watch.persist() is True
+        assert RedisWatches.get_resource_version('test') == '2'
@@ -1,16 +1,21 @@
 import pytest
 
+from mock import patch
+
+from constants.experiments import ExperimentLifeCycle
 from db.models.experiment_groups import ExperimentGroupIteration
 from db.models.experiments import ExperimentMetric
 from factories.factory_experiment_groups import ExperimentGroupFactory
-from factories.factory_experiments import ExperimentFactory
+from factories.factory_experiments import ExperimentFactory, ExperimentStatusFactory
 from factories.fixtures import (
     experiment_group_spec_content_bo,
     experiment_group_spec_content_early_stopping,
     experiment_group_spec_content_hyperband
 )
 from hpsearch.iteration_managers import (
+    AshaIterationManager,
     BOIterationManager,
+    GridIterationManager,
     HyperbandIterationManager,
     get_search_iteration_manager
 )
@@ -24,7 +29,7 @@ class TestIterationManagers(BaseTest):
     def test_get_search_iteration_manager(self):
         # Grid search
         experiment_group = ExperimentGroupFactory()
-        assert get_search_iteration_manager(experiment_group) is None
+        assert isinstance(get_search_iteration_manager(experiment_group), GridIterationManager)
 
         # Random search
         experiment_group = ExperimentGroupFactory(
@@ -36,12 +41,40 @@ class TestIterationManagers(BaseTest):
             content=experiment_group_spec_content_hyperband)
         assert isinstance(get_search_iteration_manager(experiment_group), HyperbandIterationManager)
 
+        # Asynchronous hyperband, as recorded by the group's iteration
+        AshaIterationManager(experiment_group=experiment_group).create_iteration(experiment_ids=[])
+        assert isinstance(get_search_iteration_manager(experiment_group), AshaIterationManager)
+
         # BO
         experiment_group = ExperimentGroupFactory(
             content=experiment_group_spec_content_bo)
         assert isinstance(get_search_iteration_manager(experiment_group), BOIterationManager)
 
 
+@pytest.mark.experiment_groups_mark
+class TestGridIterationManagers(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment_group = ExperimentGroupFactory()
+        self.iteration_manager = GridIterationManager(experiment_group=self.experiment_group)
+
+    def test_offset(self):
+        # The offset of the groups created before it was recorded
+        ExperimentFactory(project=self.experiment_group.project,
+                          experiment_group=self.experiment_group)
+        assert self.iteration_manager.get_offset() == 1
+
+        self.iteration_manager.update_offset(offset=2)
+        assert ExperimentGroupIteration.objects.count() == 1
+        assert self.iteration_manager.get_offset() == 2
+
+        self.iteration_manager.update_offset(offset=4)
+        assert ExperimentGroupIteration.objects.count() == 1
+        assert self.iteration_manager.get_offset() == 4
+
+
 @pytest.mark.experiment_groups_mark
 class TestHyperbandIterationManagers(BaseTest):
     DISABLE_RUNNER = True
@@ -51,7 +84,8 @@ class TestHyperbandIterationManagers(BaseTest):
         self.experiment_group = ExperimentGroupFactory(
             content=experiment_group_spec_content_hyperband)
         for _ in range(3):
-            ExperimentFactory(experiment_group=self.experiment_group)
+            ExperimentFactory(project=self.experiment_group.project,
+                          experiment_group=self.experiment_group)
         self.iteration_manager = HyperbandIterationManager(experiment_group=self.experiment_group)
 
     def test_create_iteration(self):
@@ -111,6 +145,89 @@ class TestHyperbandIterationManagers(BaseTest):
         assert self.iteration_manager.get_reduced_configs() == []
 
 
+@pytest.mark.experiment_groups_mark
+class TestAshaIterationManagers(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.experiment_group = ExperimentGroupFactory(
+            content=experiment_group_spec_content_hyperband)
+        self.experiments = [
+            ExperimentFactory(experiment_group=self.experiment_group,
+                              declarations={'lr': lr, 'steps': 1})
+            for lr in [0.01, 0.1, 0.5]]
+        self.iteration_manager = AshaIterationManager(experiment_group=self.experiment_group)
+        self.iteration = self.iteration_manager.create_iteration(
+            experiment_ids=[experiment.id for experiment in self.experiments])
+
+    @staticmethod
+    def set_experiment_done(experiment, loss):
+        ExperimentMetric.objects.create(experiment=experiment, values={'loss': loss})
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=experiment, status=ExperimentLifeCycle.SUCCEEDED)
+
+    def test_create_iteration(self):
+        experiment_ids = [experiment.id for experiment in self.experiments]
+        assert self.iteration.data == {
+            'iteration': 0,
+            'experiment_ids': experiment_ids,
+            'experiments_rungs': [[experiment_id, 0] for experiment_id in experiment_ids],
+            'experiments_metrics': None,
+            'promoted_experiment_ids': None,
+            'asynchronous': True,
+        }
+        assert self.experiment_group.is_async_hyperband is True
+
+    def test_update_iteration(self):
+        # The metrics of the experiments still running are not observed
+        ExperimentMetric.objects.create(experiment=self.experiments[0], values={'loss': 0.4})
+        self.iteration_manager.update_iteration()
+        self.iteration.refresh_from_db()
+        assert self.iteration.data['experiments_metrics'] is None
+
+        self.set_experiment_done(self.experiments[0], loss=0.5)
+        self.set_experiment_done(self.experiments[1], loss=0.1)
+        self.iteration_manager.update_iteration()
+        self.iteration.refresh_from_db()
+        assert sorted(self.iteration.data['experiments_metrics']) == [
+            [self.experiments[0].id, 0.5], [self.experiments[1].id, 0.1]]
+
+        # The observed experiments are kept
+        self.set_experiment_done(self.experiments[2], loss=0.9)
+        self.iteration_manager.update_iteration()
+        self.iteration.refresh_from_db()
+        assert sorted(self.iteration.data['experiments_metrics']) == [
+            [self.experiments[0].id, 0.5],
+            [self.experiments[1].id, 0.1],
+            [self.experiments[2].id, 0.9]]
+
+    def test_promote_experiments(self):
+        # No experiment completed the first rung yet
+        assert self.iteration_manager.promote_experiments(n_promotions=2) == []
+
+        for experiment, loss in zip(self.experiments, [0.5, 0.1, 0.9]):
+            self.set_experiment_done(experiment, loss=loss)
+        self.iteration_manager.update_iteration()
+
+        # The top third of the first rung is restarted with the resources of the second rung
+        new_experiments = self.iteration_manager.promote_experiments(n_promotions=2)
+        assert len(new_experiments) == 1
+        new_experiment = new_experiments[0]
+        assert new_experiment.original_experiment_id == self.experiments[1].id
+        assert new_experiment.experiment_group_id == self.experiment_group.id
+        assert new_experiment.declarations == {'lr': 0.1, 'steps': 5}
+
+        self.iteration.refresh_from_db()
+        assert self.iteration.data['iteration'] == 1
+        assert self.iteration.data['promoted_experiment_ids'] == [self.experiments[1].id]
+        assert self.iteration.data['experiment_ids'][-1] == new_experiment.id
+        assert self.iteration.data['experiments_rungs'][-1] == [new_experiment.id, 1]
+
+        # The experiments are only promoted once
+        assert self.iteration_manager.promote_experiments(n_promotions=2) == []
+
+
 @pytest.mark.experiment_groups_mark
 class TestBOIterationManagers(BaseTest):
     DISABLE_RUNNER = True
@@ -228,6 +345,36 @@ class TestBOIterationManagers(BaseTest):
         ]
         assert iteration.data['experiments_metrics'] == experiment_iter3_metrics
 
+    def test_update_iteration_adds_the_late_metrics_of_previous_iterations(self):
+        experiment_iter1_ids = [experiment.id for experiment in self.experiments_iter1]
+        self.iteration_manager.create_iteration(
+            experiment_ids=experiment_iter1_ids,
+            experiments_configs=[[experiment.id, experiment.declarations]
+                                 for experiment in self.experiments_iter1])
+        experiment_iter2_ids = [experiment.id for experiment in self.experiments_iter2]
+        iteration = self.iteration_manager.create_iteration(
+            experiment_ids=experiment_iter2_ids,
+            experiments_configs=[[experiment.id, experiment.declarations]
+                                 for experiment in self.experiments_iter2])
+        assert iteration.data['old_experiments_metrics'] is None
+
+        # An experiment of the first iteration finishes after the second iteration is created
+        ExperimentMetric.objects.create(
+            experiment_id=experiment_iter1_ids[0],
+            values={self.experiment_group.hptuning_config.bo.metric.name: 0.7})
+        ExperimentMetric.objects.create(
+            experiment_id=experiment_iter2_ids[0],
+            values={self.experiment_group.hptuning_config.bo.metric.name: 0.9})
+        self.iteration_manager.update_iteration()
+        iteration.refresh_from_db()
+        assert iteration.data['old_experiments_metrics'] == [[experiment_iter1_ids[0], 0.7]]
+        assert iteration.data['experiments_metrics'] == [[experiment_iter2_ids[0], 0.9]]
+
+        # Updating again does not duplicate the metrics
+        self.iteration_manager.update_iteration()
+        iteration.refresh_from_db()
+        assert iteration.data['old_experiments_metrics'] == [[experiment_iter1_ids[0], 0.7]]
+
     def test_update_iteration_raises_if_not_iteration_is_created(self):
         self.iteration_manager.update_iteration()
         assert ExperimentGroupIteration.objects.count() == 0
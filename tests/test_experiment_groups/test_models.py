@@ -1,6 +1,6 @@
 import random
 
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -26,15 +26,25 @@ from factories.fixtures import (
     experiment_group_spec_content_hyperband,
     experiment_group_spec_content_hyperband_trigger_reschedule
 )
-from hpsearch.iteration_managers import BOIterationManager, HyperbandIterationManager
+from hpsearch.iteration_managers import (
+    AshaIterationManager,
+    BOIterationManager,
+    HyperbandIterationManager
+)
 from hpsearch.search_managers import (
+    AshaSearchManager,
     BOSearchManager,
     GridSearchManager,
     HyperbandSearchManager,
     RandomSearchManager
 )
-from hpsearch.tasks.bo import hp_bo_start
+from hpsearch.tasks.asha import hp_asha_iterate
+from hpsearch.tasks.base import retry_group_scheduler
+from hpsearch.tasks.bo import hp_bo_create, hp_bo_iterate, hp_bo_start
+from hpsearch.tasks.grid import hp_grid_search_start
 from hpsearch.tasks.hyperband import hp_hyperband_start
+from libs.redis_db import RedisGroupScheduler
+from polyaxon.settings import HPCeleryTasks, Intervals
 from polyaxon_schemas.hptuning import HPTuningConfig
 from polyaxon_schemas.matrix import MatrixConfig
 from polyaxon_schemas.polyaxonfile.specification import GroupSpecification
@@ -197,6 +207,8 @@ class TestExperimentGroupModel(BaseTest):
         metrics = [m.precision for m in experiment_metrics if m.precision is not None]
         assert len(metrics) == 2
         assert sorted(metrics, reverse=True) == metrics
+        # Experiments without the metric come last
+        assert [m.precision for m in experiment_metrics][:2] == metrics
 
         experiment_metrics = experiment_group.get_ordered_experiments_by_metric(
             experiment_ids=experiment_ids,
@@ -367,6 +379,44 @@ class TestExperimentGroupModel(BaseTest):
         assert experiment_group.running_experiments.count() == 0
         assert experiment_group.succeeded_experiments.count() == 1
 
+    def test_grid_experiments_creation_in_chunks(self):
+        with self.settings(HPSEARCH_EXPERIMENTS_CHUNK_SIZE=1):
+            with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as mock_fct:
+                experiment_group = ExperimentGroupFactory()
+
+            assert mock_fct.call_count == 1
+            assert experiment_group.experiments.count() == 1
+            experiment = experiment_group.experiments.first()
+            assert experiment.last_status == ExperimentLifeCycle.CREATED
+            assert experiment.declarations == {'lr': 0.01}
+
+            # The next experiments are created when the free slots need them
+            with patch('scheduler.tasks.experiments.experiments_build.apply_async') as build_fct:
+                with patch('hpsearch.tasks.base.check_group_experiments_finished') as check_fct:
+                    hp_grid_search_start(experiment_group.id)
+
+        assert experiment_group.experiments.count() == 2
+        assert experiment_group.pending_experiments.count() == 2
+        assert build_fct.call_count == 2
+        assert check_fct.call_count == 1
+
+    def test_grid_experiments_creation_after_deletion(self):
+        with self.settings(HPSEARCH_EXPERIMENTS_CHUNK_SIZE=1):
+            with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as _:  # noqa
+                experiment_group = ExperimentGroupFactory()
+
+            experiment_group.experiments.first().delete()
+
+            # The next chunk starts after the grid points already created
+            with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+                with patch('hpsearch.tasks.base.check_group_experiments_finished') as check_fct:
+                    hp_grid_search_start(experiment_group.id)
+
+        assert experiment_group.experiments.count() == 1
+        assert experiment_group.experiments.first().declarations == {'lr': 0.1}
+        assert experiment_group.iteration_config.offset == 2
+        assert check_fct.call_count == 1
+
     def test_experiment_group_deletion_triggers_stopping_for_running_experiment(self):
         with patch('hpsearch.tasks.grid.hp_grid_search_start.apply_async') as mock_fct:
             experiment_group = ExperimentGroupFactory()
@@ -549,6 +599,81 @@ class TestExperimentGroupModel(BaseTest):
         assert mock_fct2.call_count == 1
         assert mock_fct3.call_count == 1
 
+    def test_asha_mode_is_recorded_at_creation(self):
+        with self.settings(HPSEARCH_ASYNC_HYPERBAND=True):
+            with patch('hpsearch.tasks.asha.hp_asha_start.apply_async') as mock_fct:
+                experiment_group = ExperimentGroupFactory(
+                    content=experiment_group_spec_content_hyperband)
+        assert mock_fct.call_count == 1
+        with patch('hpsearch.tasks.hyperband.hp_hyperband_start.apply_async') as mock_fct:
+            hyperband_experiment_group = ExperimentGroupFactory(
+                content=experiment_group_spec_content_hyperband)
+        assert mock_fct.call_count == 1
+
+        # Changing the setting does not change the mode of the existing groups
+        for async_hyperband in [True, False]:
+            with self.settings(HPSEARCH_ASYNC_HYPERBAND=async_hyperband):
+                experiment_group = ExperimentGroup.objects.get(id=experiment_group.id)
+                assert experiment_group.is_async_hyperband is True
+                assert isinstance(experiment_group.search_manager, AshaSearchManager)
+                assert isinstance(experiment_group.iteration_manager, AshaIterationManager)
+
+                hyperband_experiment_group = ExperimentGroup.objects.get(
+                    id=hyperband_experiment_group.id)
+                assert hyperband_experiment_group.is_async_hyperband is False
+                assert isinstance(hyperband_experiment_group.search_manager,
+                                  HyperbandSearchManager)
+                assert isinstance(hyperband_experiment_group.iteration_manager,
+                                  HyperbandIterationManager)
+
+    def test_asha_iterate(self):
+        with self.settings(HPSEARCH_ASYNC_HYPERBAND=True):
+            with patch('hpsearch.tasks.asha.hp_asha_start.apply_async') as mock_fct:
+                experiment_group = ExperimentGroupFactory(
+                    content=experiment_group_spec_content_hyperband)
+        assert mock_fct.call_count == 1
+        experiments = list(experiment_group.experiments.order_by('id'))
+        assert len(experiments) == 2
+
+        def set_experiments_done(experiments_losses):
+            for experiment, loss in experiments_losses:
+                ExperimentMetric.objects.create(experiment=experiment, values={'loss': loss})
+            with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+                for experiment, _ in experiments_losses:
+                    ExperimentStatusFactory(experiment=experiment,
+                                            status=ExperimentLifeCycle.SUCCEEDED)
+
+        # The slots freed on the first rung start its last config
+        set_experiments_done([(experiments[0], 0.5), (experiments[1], 0.1)])
+        with patch('hpsearch.tasks.asha.hp_asha_start.apply_async') as mock_fct:
+            hp_asha_iterate(experiment_group.id)
+        assert mock_fct.call_count == 1
+        assert experiment_group.experiments.count() == 3
+        iteration_config = experiment_group.iteration_config
+        assert iteration_config.n_configs == 3
+        assert sorted(iteration_config.experiments_metrics) == [
+            [experiments[0].id, 0.5], [experiments[1].id, 0.1]]
+
+        # Once the first rung is completed, its top third is promoted
+        experiments = list(experiment_group.experiments.order_by('id'))
+        set_experiments_done([(experiments[2], 0.9)])
+        with patch('hpsearch.tasks.asha.hp_asha_start.apply_async') as mock_fct:
+            hp_asha_iterate(experiment_group.id)
+        assert mock_fct.call_count == 1
+        promoted_experiment = experiment_group.experiments.order_by('id').last()
+        assert promoted_experiment.original_experiment_id == experiments[1].id
+        assert promoted_experiment.declarations['steps'] == 5
+        assert experiment_group.iteration_config.promoted_experiment_ids == [experiments[1].id]
+
+        # The search finishes with the last rung
+        set_experiments_done([(promoted_experiment, 0.05)])
+        with patch('hpsearch.tasks.asha.hp_asha_start.apply_async') as mock_fct:
+            with patch('hpsearch.tasks.base.check_group_experiments_finished') as check_fct:
+                hp_asha_iterate(experiment_group.id)
+        assert mock_fct.call_count == 0
+        assert check_fct.call_count == 1
+        assert experiment_group.experiments.count() == 4
+
     def test_bo_rescheduling(self):
         with patch('hpsearch.tasks.bo.hp_bo_start.apply_async') as mock_fct:
             ExperimentGroupFactory(content=experiment_group_spec_content_bo)
@@ -586,6 +711,126 @@ class TestExperimentGroupModel(BaseTest):
             hp_bo_start(experiment_group.id)
         assert mock_fct1.call_count == 1
 
+    def test_bo_suggests_experiments_for_the_free_slots(self):
+        with patch('hpsearch.tasks.bo.hp_bo_start.apply_async') as mock_fct:
+            experiment_group = ExperimentGroupFactory(
+                content=experiment_group_spec_content_bo)
+        assert mock_fct.call_count == 1
+        assert experiment_group.non_done_experiments.count() == 2
+
+        # One experiment is done while the other one is still running
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=experiment_group.experiments.first(),
+                                    status=ExperimentLifeCycle.SUCCEEDED)
+        with patch('hpsearch.tasks.bo.hp_bo_create.apply_async') as mock_fct1:
+            hp_bo_iterate(experiment_group.id)
+        assert mock_fct1.call_count == 1
+        assert mock_fct1.call_args[0][1] == {'experiment_group_id': experiment_group.id,
+                                             'n_suggestions': 1}
+
+    def test_bo_failed_experiments_are_not_pending(self):
+        with patch('hpsearch.tasks.bo.hp_bo_start.apply_async') as _:  # noqa
+            experiment_group = ExperimentGroupFactory(
+                content=experiment_group_spec_content_bo)
+        failed_experiment, running_experiment = experiment_group.experiments.all()
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=failed_experiment,
+                                    status=ExperimentLifeCycle.FAILED)
+
+        with patch.object(BOSearchManager, 'get_suggestions') as mock_fct:
+            mock_fct.return_value = None
+            with patch('hpsearch.tasks.bo.hp_bo_iterate.apply_async') as _:  # noqa
+                hp_bo_create(experiment_group.id, n_suggestions=1)
+        assert mock_fct.call_args[1]['pending_experiment_ids'] == {running_experiment.id}
+
+
+@pytest.mark.experiment_groups_mark
+class TestExperimentGroupScheduler(BaseTest):
+    def setUp(self):
+        super().setUp()
+        with patch('hpsearch.tasks.bo.hp_bo_start.apply_async') as _:  # noqa
+            self.experiment_group = ExperimentGroupFactory(
+                content=experiment_group_spec_content_bo)
+        self.experiments = list(self.experiment_group.experiments.order_by('id'))
+
+    @staticmethod
+    def set_experiment_done(experiment):
+        with patch('scheduler.experiment_scheduler.stop_experiment') as _:  # noqa
+            ExperimentStatusFactory(experiment=experiment, status=ExperimentLifeCycle.SUCCEEDED)
+
+    def test_experiments_done_wake_the_group_scheduler(self):
+        # The iterate task is running the scheduler of the group
+        assert RedisGroupScheduler.claim(experiment_group_id=self.experiment_group.id,
+                                         task_name=HPCeleryTasks.HP_BO_ITERATE,
+                                         task_id='iterate1',
+                                         is_retry=False,
+                                         ttl=60) is True
+
+        # The experiments done during the run only ask for another pass
+        with patch('hpsearch.tasks.bo.hp_bo_iterate.apply_async') as mock_fct:
+            self.set_experiment_done(self.experiments[0])
+        assert mock_fct.call_count == 0
+        assert RedisGroupScheduler.release(experiment_group_id=self.experiment_group.id,
+                                           task_id='iterate1') is True
+
+        # Once the run is over, the experiments done wake the scheduler
+        with patch('hpsearch.tasks.bo.hp_bo_iterate.apply_async') as mock_fct:
+            self.set_experiment_done(self.experiments[1])
+        assert mock_fct.call_count == 1
+        assert mock_fct.call_args[0][1] == {'experiment_group_id': self.experiment_group.id}
+
+    def test_bo_create_holds_the_group_scheduler(self):
+        self.set_experiment_done(self.experiments[0])
+
+        # The iterate task hands the run over to the creation of the suggestions
+        with patch('hpsearch.tasks.bo.hp_bo_create.apply_async') as mock_fct:
+            hp_bo_iterate.apply(kwargs={'experiment_group_id': self.experiment_group.id},
+                                task_id='iterate1')
+        assert mock_fct.call_count == 1
+        create_kwargs = mock_fct.call_args[0][1]
+        create_task_id = mock_fct.call_args[1]['task_id']
+
+        # While the suggestions are made, the experiments done do not wake the scheduler,
+        # and the tasks woken before the run stop
+        with patch('hpsearch.tasks.bo.hp_bo_iterate.apply_async') as mock_fct:
+            self.set_experiment_done(self.experiments[1])
+        assert mock_fct.call_count == 0
+        with patch('hpsearch.tasks.bo.hp_bo_create.apply_async') as mock_fct:
+            hp_bo_iterate.apply(kwargs={'experiment_group_id': self.experiment_group.id},
+                                task_id='iterate2')
+        assert mock_fct.call_count == 0
+        assert self.experiment_group.experiments.count() == 2
+
+        # The creation hands the run over to the start task, which makes another pass
+        with patch('hpsearch.tasks.bo.hp_bo_start.apply_async') as mock_fct:
+            hp_bo_create.apply(kwargs=create_kwargs, task_id=create_task_id)
+        assert mock_fct.call_count == 1
+        assert self.experiment_group.experiments.count() == 3
+        start_task_id = mock_fct.call_args[1]['task_id']
+        assert RedisGroupScheduler.release(experiment_group_id=self.experiment_group.id,
+                                           task_id=start_task_id) is True
+
+    def test_retry_group_scheduler(self):
+        task = MagicMock(request=MagicMock(id='iterate1', retries=0))
+        task.name = HPCeleryTasks.HP_BO_ITERATE
+        RedisGroupScheduler.claim(experiment_group_id=self.experiment_group.id,
+                                  task_name=task.name,
+                                  task_id='iterate1',
+                                  is_retry=False,
+                                  ttl=60)
+        retry_group_scheduler(task=task, experiment_group_id=self.experiment_group.id)
+        assert task.retry.call_args[1]['countdown'] == Intervals.EXPERIMENTS_GROUPS_SCHEDULER
+
+        # The group was woken during the run
+        RedisGroupScheduler.claim(experiment_group_id=self.experiment_group.id,
+                                  task_name=task.name,
+                                  task_id='iterate1',
+                                  is_retry=True,
+                                  ttl=60)
+        self.set_experiment_done(self.experiments[0])
+        retry_group_scheduler(task=task, experiment_group_id=self.experiment_group.id)
+        assert task.retry.call_args[1]['countdown'] == 1
+
 
 class TestExperimentGroupCommit(BaseViewTest):
     def setUp(self):
@@ -6,7 +6,13 @@ from factories.fixtures import (
     experiment_group_spec_content_early_stopping,
     experiment_group_spec_content_hyperband
 )
-from hpsearch.schemas import BOIterationConfig, HyperbandIterationConfig, get_iteration_config
+from hpsearch.schemas import (
+    AshaIterationConfig,
+    BOIterationConfig,
+    GridIterationConfig,
+    HyperbandIterationConfig,
+    get_iteration_config
+)
 from tests.utils import BaseTest
 
 
@@ -18,6 +24,9 @@ class TestSearchManagers(BaseTest):
         # Grid search
         experiment_group = ExperimentGroupFactory()
         assert get_iteration_config(experiment_group.search_algorithm) is None
+        assert isinstance(get_iteration_config(experiment_group.search_algorithm,
+                                               iteration={'offset': 2}),
+                          GridIterationConfig)
 
         # Random search
         experiment_group = ExperimentGroupFactory(
@@ -37,6 +46,17 @@ class TestSearchManagers(BaseTest):
                                                iteration=iteration),
                           HyperbandIterationConfig)
 
+        # Asynchronous hyperband
+        iteration = {
+            'iteration': 1,
+            'experiment_ids': [1, 2, 3],
+            'experiments_rungs': [[1, 0], [2, 0], [3, 1]],
+            'asynchronous': True
+        }
+        assert isinstance(get_iteration_config(experiment_group.search_algorithm,
+                                               iteration=iteration),
+                          AshaIterationConfig)
+
         # BO
         experiment_group = ExperimentGroupFactory(
             content=experiment_group_spec_content_bo)
@@ -84,3 +104,11 @@ class TestBOIterationConfig(BaseTest):
         }
 
         assert BOIterationConfig.from_dict(config).to_dict() == config
+
+        config['gaussian_process'] = {
+            'experiment_ids': [1, 2, 3],
+            'x': [[0.5], [0.5], [0.5]],
+            'theta': [0.],
+            'n_optimized': 3
+        }
+        assert BOIterationConfig.from_dict(config).to_dict() == config
@@ -5,6 +5,8 @@ from unittest.mock import patch
 
 import pytest
 
+from sklearn.gaussian_process import GaussianProcessRegressor
+
 from db.models.experiment_groups import ExperimentGroupIteration
 from factories.factory_experiment_groups import ExperimentGroupFactory
 from factories.fixtures import (
@@ -12,17 +14,26 @@ from factories.fixtures import (
     experiment_group_spec_content_early_stopping,
     experiment_group_spec_content_hyperband
 )
-from hpsearch.schemas import BOIterationConfig
+from hpsearch.schemas import AshaIterationConfig, BOIterationConfig
 from hpsearch.search_managers import (
+    AshaSearchManager,
     BOSearchManager,
     GridSearchManager,
     HyperbandSearchManager,
     RandomSearchManager,
     get_search_algorithm_manager
 )
+from hpsearch.search_managers.bayesian_optimization import gaussian_process
+from hpsearch.search_managers.bayesian_optimization.acquisition_function import UtilityFunction
+from hpsearch.search_managers.bayesian_optimization.gaussian_process import (
+    GaussianProcessState,
+    fit_gaussian_process
+)
 from hpsearch.search_managers.bayesian_optimization.optimizer import BOOptimizer
 from hpsearch.search_managers.bayesian_optimization.space import SearchSpace
-from polyaxon_schemas.hptuning import HPTuningConfig
+from hpsearch.search_managers.space import MatrixSpace
+from hpsearch.search_managers.utils import Suggestion
+from polyaxon_schemas.hptuning import HPTuningConfig, UtilityFunctionConfig
 from polyaxon_schemas.matrix import MatrixConfig
 from tests.utils import BaseTest
 
@@ -48,6 +59,9 @@ class TestSearchManagers(BaseTest):
             content=experiment_group_spec_content_hyperband)
         assert isinstance(get_search_algorithm_manager(experiment_group.hptuning_config),
                           HyperbandSearchManager)
+        assert isinstance(get_search_algorithm_manager(experiment_group.hptuning_config,
+                                                       async_hyperband=True),
+                          AshaSearchManager)
 
         # BO
         experiment_group = ExperimentGroupFactory(
@@ -56,6 +70,49 @@ class TestSearchManagers(BaseTest):
                           BOSearchManager)
 
 
+@pytest.mark.experiment_groups_mark
+class TestMatrixSpace(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'random_search': {'n_experiments': 10},
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'linspace': [1, 2, 5]},
+                'feature3': {'values': ['a', 'b', 'c']}
+            }
+        })
+        self.space = MatrixSpace(matrix=hptuning_config.matrix)
+
+    def test_values_are_cached(self):
+        with patch.object(MatrixConfig, 'to_numpy', return_value=[1, 2]) as to_numpy_mock:
+            assert self.space.size == 8
+            assert len(self.space.enumerate()) == 8
+
+        assert to_numpy_mock.call_count == 3
+
+    def test_enumerate(self):
+        assert self.space.size == 45
+        suggestions = self.space.enumerate()
+        assert len(suggestions) == 45
+        assert suggestions[0] == {'feature1': 1, 'feature2': 1, 'feature3': 'a'}
+        assert self.space.enumerate(offset=10, stop=20) == suggestions[10:20]
+
+    def test_encode_decode(self):
+        assert self.space.features == ['feature1', 'feature2', 'feature3']
+        assert self.space.dim == 5
+        configs = [{'feature1': 1, 'feature2': 1.25, 'feature3': 'b'},
+                   {'feature1': 3, 'feature2': 2, 'feature3': 'c'}]
+        x = self.space.encode(configs)
+        assert np.all(x == [[1, 1.25, 0, 1, 0], [3, 2, 0, 0, 1]])
+        assert [self.space.decode(point) for point in x] == configs
+        assert self.space.decode([2.2, 1.3, 0.1, 0.2, 0.7]) == {
+            'feature1': 2, 'feature2': 1.25, 'feature3': 'c'}
+
+
 @pytest.mark.experiment_groups_mark
 class TestGridSearchManager(BaseTest):
     DISABLE_RUNNER = True
@@ -81,6 +138,36 @@ class TestGridSearchManager(BaseTest):
         manager = GridSearchManager(hptuning_config=hptuning_config)
         assert len(manager.get_suggestions()) == 10
 
+    def test_get_suggestions_offset(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'grid_search': {'n_experiments': 10},
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'linspace': [1, 2, 5]},
+                'feature3': {'range': [1, 5, 1]}
+            }
+        })
+        manager = GridSearchManager(hptuning_config=hptuning_config)
+        assert manager.get_n_suggestions() == 10
+        suggestions = manager.get_suggestions()
+        assert manager.get_suggestions(n_suggestions=4) == suggestions[:4]
+        assert manager.get_suggestions(offset=4, n_suggestions=4) == suggestions[4:8]
+        assert manager.get_suggestions(offset=8, n_suggestions=4) == suggestions[8:]
+        assert manager.get_suggestions(offset=10, n_suggestions=4) == []
+
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'linspace': [1, 2, 5]},
+                'feature3': {'range': [1, 5, 1]}
+            }
+        })
+        manager = GridSearchManager(hptuning_config=hptuning_config)
+        assert manager.get_n_suggestions() == 60
+        assert len(manager.get_suggestions(offset=50)) == 10
+
     def test_get_suggestions_calls_to_numpy(self):
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
@@ -137,6 +224,37 @@ class TestRandomSearchManager(BaseTest):
         manager = RandomSearchManager(hptuning_config=hptuning_config)
         assert len(manager.get_suggestions()) == 10
 
+    def test_get_suggestions_are_unique(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'random_search': {'n_experiments': 50},
+            'seed': 1,
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'linspace': [1, 2, 5]},
+                'feature3': {'range': [1, 5, 1]}
+            }
+        })
+        manager = RandomSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.get_suggestions()
+        assert len(suggestions) == 50
+        assert len({Suggestion(params=suggestion) for suggestion in suggestions}) == 50
+        assert manager.get_suggestions() == suggestions
+
+    def test_get_suggestions_exhausts_the_space(self):
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'random_search': {'n_experiments': 10},
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'values': [1, 2]}
+            }
+        })
+        manager = RandomSearchManager(hptuning_config=hptuning_config)
+        suggestions = manager.get_suggestions()
+        assert len(suggestions) == 6
+        assert len({Suggestion(params=suggestion) for suggestion in suggestions}) == 6
+
     def test_get_suggestions_calls_sample(self):
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
@@ -617,6 +735,86 @@ class TestHyperbandSearchManager(BaseTest):
             assert 'feature4' in suggestion
 
 
+@pytest.mark.experiment_groups_mark
+class TestAshaSearchManager(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        hptuning_config = HPTuningConfig.from_dict({
+            'concurrency': 2,
+            'seed': 1,
+            'hyperband': {
+                'max_iter': 10,
+                'eta': 3,
+                'resource': {'name': 'steps', 'type': 'float'},
+                'resume': False,
+                'metric': {'name': 'loss', 'optimization': 'minimize'}
+            },
+            'matrix': {
+                'feature1': {'values': [1, 2, 3]},
+                'feature2': {'linspace': [1, 2, 5]},
+                'feature3': {'range': [1, 5, 1]}
+            }
+        })
+        self.manager = AshaSearchManager(hptuning_config=hptuning_config)
+
+    def test_asha_properties(self):
+        assert self.manager.s_max == 2
+        assert self.manager.n_rungs == 3
+        assert self.manager.n_configs == 9
+        assert round(self.manager.get_n_resources_for_rung(rung=0), 2) == 1.11
+        assert round(self.manager.get_n_resources_for_rung(rung=1), 2) == 3.33
+        assert round(self.manager.get_n_resources_for_rung(rung=2), 2) == 10
+
+    def test_get_suggestions(self):
+        suggestions = self.manager.get_suggestions()
+        assert len(suggestions) == 9
+        for suggestion in suggestions:
+            assert round(suggestion['steps'], 2) == 1.11
+
+        assert self.manager.get_suggestions(n_suggestions=4) == suggestions[:4]
+
+        # The configs already started are not suggested again
+        iteration_config = AshaIterationConfig(
+            iteration=1,
+            experiment_ids=list(range(1, 9)),
+            experiments_rungs=[[i, 0] for i in range(1, 8)] + [[8, 1]])
+        assert self.manager.get_suggestions(iteration_config=iteration_config,
+                                            n_suggestions=4) == suggestions[7:]
+
+        iteration_config.experiments_rungs.append([9, 0])
+        assert self.manager.get_suggestions(iteration_config=iteration_config) == []
+
+    def test_get_promotions(self):
+        iteration_config = AshaIterationConfig(
+            iteration=1,
+            experiment_ids=list(range(1, 10)),
+            experiments_rungs=[[i, 0] for i in range(1, 10)],
+            experiments_metrics=[[1, 0.5], [2, 0.1], [3, 0.9], [4, 0.3], [5, 0.7], [6, 0.2]])
+        # The top third of the configs that completed the first rung
+        assert self.manager.get_promotions(iteration_config=iteration_config,
+                                           n_promotions=5) == [(2, 1), (6, 1)]
+        assert self.manager.get_promotions(iteration_config=iteration_config,
+                                           n_promotions=1) == [(2, 1)]
+
+        # The configs are promoted once, the highest rungs first
+        iteration_config.promoted_experiment_ids = [2]
+        iteration_config.experiment_ids += [10, 11, 12]
+        iteration_config.experiments_rungs += [[10, 1], [11, 1], [12, 1]]
+        iteration_config.experiments_metrics += [[10, 0.05], [11, 0.3], [12, 0.2]]
+        assert self.manager.get_promotions(iteration_config=iteration_config,
+                                           n_promotions=5) == [(10, 2), (6, 1)]
+
+        # The configs on the last rung are not promoted
+        iteration_config.promoted_experiment_ids += [10, 6]
+        iteration_config.experiment_ids += [13]
+        iteration_config.experiments_rungs += [[13, 2]]
+        iteration_config.experiments_metrics += [[13, 0.01]]
+        assert self.manager.get_promotions(iteration_config=iteration_config,
+                                           n_promotions=5) == []
+
+
 @pytest.mark.experiment_groups_mark
 class TestBOSearchManager(BaseTest):
     DISABLE_RUNNER = True
@@ -925,6 +1123,281 @@ class TestBOSearchManager(BaseTest):
         assert 1 <= suggestion['feature4'] <= 5
         assert suggestion['feature5'] in ['a', 'b', 'c']
 
+    @staticmethod
+    def get_fitted_utility_function(acquisition_function, kernel, nu=2.5):
+        config = UtilityFunctionConfig.from_dict({
+            'acquisition_function': acquisition_function,
+            'kappa': 1.2,
+            'eps': 0.1,
+            'gaussian_process': {
+                'kernel': kernel,
+                'length_scale': 1.0,
+                'nu': nu,
+                'n_restarts_optimizer': 0
+            }
+        })
+        utility_function = UtilityFunction(config=config, seed=1)
+        random_generator = np.random.RandomState(1)
+        x = random_generator.uniform(size=(20, 4))
+        y = -((x - 0.3) ** 2).sum(axis=1)
+        utility_function.gaussian_process.fit(x, y)
+        return utility_function, y.max()
+
+    def test_utility_function_gradients(self):
+        x = np.random.RandomState(2).uniform(size=(5, 4))
+        for kernel, nu in [('rbf', 2.5), ('matern', 0.5), ('matern', 1.5), ('matern', 2.5)]:
+            for acquisition_function in ['ucb', 'ei', 'poi']:
+                utility_function, y_max = self.get_fitted_utility_function(
+                    acquisition_function=acquisition_function, kernel=kernel, nu=nu)
+
+                mean, std = utility_function.gaussian_process.predict(x, return_std=True)
+                posterior_mean, posterior_std = utility_function.posterior.predict(x)
+                assert np.allclose(mean, posterior_mean)
+                assert np.allclose(std, posterior_std)
+
+                values, gradient = utility_function.compute_with_gradient(x, y_max=y_max)
+                assert np.allclose(values, utility_function.compute(x, y_max=y_max))
+                numerical_gradient = np.zeros_like(gradient)
+                for i in range(x.shape[1]):
+                    step = np.zeros(x.shape[1])
+                    step[i] = 1e-6
+                    numerical_gradient[:, i] = (
+                        utility_function.compute(x + step, y_max=y_max) -
+                        utility_function.compute(x - step, y_max=y_max)) / 2e-6
+                assert np.allclose(gradient, numerical_gradient, rtol=1e-4, atol=1e-6)
+
+    def test_utility_function_posterior_is_cached_until_refit(self):
+        utility_function, _ = self.get_fitted_utility_function(acquisition_function='ucb',
+                                                              kernel='rbf')
+        posterior = utility_function.posterior
+        assert utility_function.posterior is posterior
+
+        utility_function.gaussian_process.fit(np.eye(4), np.arange(4))
+        assert utility_function.posterior is not posterior
+
+    def test_utility_function_max_compute(self):
+        bounds = np.array([[0, 1]] * 4)
+        # Analytic gradients: the seeds are optimized together
+        utility_function, y_max = self.get_fitted_utility_function(acquisition_function='ei',
+                                                                  kernel='matern')
+        with patch.object(UtilityFunction, '_maximize_each_seed') as maximize_each_seed_mock:
+            x_max = utility_function.max_compute(y_max=y_max, bounds=bounds, n_warmup=100)
+        assert maximize_each_seed_mock.call_count == 0
+        assert set(utility_function.timings) == {'warmup', 'optimization'}
+        assert np.all(x_max >= 0) and np.all(x_max <= 1)
+        x_tries = np.random.RandomState(3).uniform(size=(100, 4))
+        assert (utility_function.compute(x_max.reshape(1, -1), y_max=y_max)[0] >=
+                utility_function.compute(x_tries, y_max=y_max).max())
+
+        # No analytic gradients: the seeds are optimized one by one
+        utility_function, y_max = self.get_fitted_utility_function(acquisition_function='ei',
+                                                                  kernel='matern',
+                                                                  nu=1.9)
+        with patch.object(UtilityFunction, '_maximize_seeds') as maximize_seeds_mock:
+            x_max = utility_function.max_compute(y_max=y_max, bounds=bounds, n_warmup=100,
+                                                 n_iter=5)
+        assert maximize_seeds_mock.call_count == 0
+        assert np.all(x_max >= 0) and np.all(x_max <= 1)
+
+    def test_fit_gaussian_process_incrementally(self):
+        random_generator = np.random.RandomState(1)
+        x = random_generator.uniform(size=(30, 4))
+        y = -((x - 0.3) ** 2).sum(axis=1)
+        utility_function, _ = self.get_fitted_utility_function(acquisition_function='ucb',
+                                                              kernel='matern')
+        gp = utility_function.gaussian_process
+        state = fit_gaussian_process(gaussian_process=gp,
+                                     x=x[:20],
+                                     y=y[:20],
+                                     experiment_ids=list(range(20)))
+        assert state.n_optimized == 20
+        state = GaussianProcessState.from_dict(state.to_dict())
+        theta = gp.kernel_.theta
+
+        with patch.object(gp, 'fit') as fit_mock:
+            # With the cached Cholesky factor
+            new_state = fit_gaussian_process(gaussian_process=gp,
+                                             x=x[:25],
+                                             y=y[:25],
+                                             experiment_ids=list(range(25)),
+                                             state=state)
+            extended_factor = gp.L_
+            # Without the cached Cholesky factor
+            gaussian_process._cholesky_factors.clear()  # pylint:disable=protected-access
+            fit_gaussian_process(gaussian_process=gp,
+                                 x=x[:25],
+                                 y=y[:25],
+                                 experiment_ids=list(range(25)),
+                                 state=state)
+        assert fit_mock.call_count == 0
+        assert new_state.n_optimized == 20
+        assert np.allclose(new_state.theta, theta)
+        assert np.allclose(extended_factor, gp.L_)
+
+        # The predictions are the ones of a process fitted with the same kernel
+        mean, std = gp.predict(x[25:], return_std=True)
+        expected_gp = GaussianProcessRegressor(kernel=gp.kernel_, optimizer=None)
+        expected_gp.fit(x[:25], y[:25])
+        expected_mean, expected_std = expected_gp.predict(x[25:], return_std=True)
+        assert np.allclose(mean, expected_mean)
+        assert np.allclose(std, expected_std)
+
+        # Without new observations, the cached Cholesky factor is reused
+        with patch.object(gp, 'fit') as fit_mock:
+            new_state = fit_gaussian_process(gaussian_process=gp,
+                                             x=x[:25],
+                                             y=y[:25],
+                                             experiment_ids=list(range(25)),
+                                             state=new_state)
+        assert fit_mock.call_count == 0
+        assert np.allclose(extended_factor, gp.L_)
+
+        # The process is fitted from scratch if the factor can not be extended
+        with patch.object(gp, 'fit') as fit_mock:
+            with patch.object(gaussian_process,
+                              'extend_cholesky_factor',
+                              side_effect=ValueError):
+                fit_gaussian_process(gaussian_process=gp,
+                                     x=x[:26],
+                                     y=y[:26],
+                                     experiment_ids=list(range(26)),
+                                     state=new_state)
+        assert fit_mock.call_count == 1
+
+        # The hyperparameters are optimized again once the observations grew enough
+        with patch.object(gp, 'fit') as fit_mock:
+            new_state = fit_gaussian_process(gaussian_process=gp,
+                                             x=x,
+                                             y=y,
+                                             experiment_ids=list(range(30)),
+                                             state=state)
+        assert fit_mock.call_count == 1
+
+        # The observations changed
+        with patch.object(gp, 'fit') as fit_mock:
+            fit_gaussian_process(gaussian_process=gp,
+                                 x=x[1:25],
+                                 y=y[1:25],
+                                 experiment_ids=list(range(1, 25)),
+                                 state=state)
+        assert fit_mock.call_count == 1
+
+    def test_get_suggestions_reuses_the_gaussian_process_state(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 1,
+            'old_experiment_ids': [1, 2, 3],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}]],
+            'old_experiments_metrics': [[3, 3], [1, 1], [2, 2]],
+            'experiment_ids': [4],
+            'experiments_configs': [[4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
+            'experiments_metrics': [[4, 4]]
+        })
+        assert len(self.manager1.get_suggestions(iteration_config)) == 1
+        state = self.manager1.gaussian_process_state
+        assert state.experiment_ids == [3, 1, 2, 4]
+
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 2,
+            'old_experiment_ids': [1, 2, 3, 4],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}],
+                                        [4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}]],
+            'old_experiments_metrics': [[3, 3], [1, 1], [2, 2], [4, 4]],
+            'experiment_ids': [5, 6],
+            'experiments_configs': [[5, {'feature1': 1, 'feature2': 1.5, 'feature3': 4}],
+                                    [6, {'feature1': 3, 'feature2': 1.1, 'feature3': 2}]],
+            'experiments_metrics': [[6, 6], [5, 5]],
+            'gaussian_process': state.to_dict()
+        })
+        with patch.object(SearchSpace, 'parse_x', wraps=SearchSpace(
+                hptuning_config=self.manager1.hptuning_config).parse_x) as parse_x_mock:
+            assert len(self.manager1.get_suggestions(iteration_config)) == 1
+
+        # Only the new configs are encoded
+        assert parse_x_mock.call_count == 2
+        state = self.manager1.gaussian_process_state
+        assert state.experiment_ids == [3, 1, 2, 4, 6, 5]
+
+    def test_optimizer_get_suggestions(self):
+        optimizer = BOOptimizer(hptuning_config=self.manager1.hptuning_config)
+        configs = [
+            {'feature1': 1, 'feature2': 1, 'feature3': 1},
+            {'feature1': 2, 'feature2': 1.25, 'feature3': 2},
+            {'feature1': 3, 'feature2': 1.5, 'feature3': 3},
+            {'feature1': 2, 'feature2': 2, 'feature3': 5},
+        ]
+        metrics = [1, 2, 3, 4]
+        pending_configs = [{'feature1': 1, 'feature2': 1.75, 'feature3': 4}]
+
+        optimizer.add_observations(configs=configs, metrics=metrics)
+        suggestions = optimizer.get_suggestions(n_suggestions=3, pending_configs=pending_configs)
+        assert 1 <= len(suggestions) <= 3
+        for i, suggestion in enumerate(suggestions):
+            assert suggestion not in suggestions[i + 1:]
+
+        # The pending config and the suggestions are believed, but not observed
+        gaussian_process = optimizer.utility_function.gaussian_process
+        assert len(gaussian_process.X_train_) == len(configs) + len(suggestions)
+        assert len(optimizer.gaussian_process_state.x) == len(configs)
+        assert len(optimizer.space.x) == len(configs)
+        _, std = gaussian_process.predict(optimizer.space.parse_x(pending_configs),
+                                          return_std=True)
+        assert std[0] < 1e-3
+
+    def test_get_suggestions_with_pending_experiments(self):
+        iteration_config = BOIterationConfig.from_dict({
+            'iteration': 1,
+            'old_experiment_ids': [1, 2, 3],
+            'old_experiments_configs': [[1, {'feature1': 1, 'feature2': 1, 'feature3': 1}],
+                                        [2, {'feature1': 2, 'feature2': 1.2, 'feature3': 2}],
+                                        [3, {'feature1': 3, 'feature2': 1.3, 'feature3': 3}]],
+            'old_experiments_metrics': [[1, 1], [2, 2], [3, 3]],
+            'experiment_ids': [4, 5],
+            'experiments_configs': [[4, {'feature1': 2, 'feature2': 1.5, 'feature3': 4}],
+                                    [5, {'feature1': 1, 'feature2': 2, 'feature3': 5}]],
+            'experiments_metrics': [[4, 4]]
+        })
+        with patch.object(BOOptimizer, 'get_suggestions') as get_suggestions_mock:
+            self.manager1.get_suggestions(iteration_config, n_suggestions=2)
+
+        assert get_suggestions_mock.call_count == 1
+        assert get_suggestions_mock.call_args[1] == {
+            'n_suggestions': 2,
+            'pending_configs': [{'feature1': 1, 'feature2': 2, 'feature3': 5}]
+        }
+
+        suggestions = self.manager1.get_suggestions(iteration_config, n_suggestions=2)
+        assert 1 <= len(suggestions) <= 2
+        # The pending experiment is not part of the gaussian process state
+        assert self.manager1.gaussian_process_state.experiment_ids == [1, 2, 3, 4]
+
+        # The experiments done without a metric are not pending
+        with patch.object(BOOptimizer, 'get_suggestions') as get_suggestions_mock:
+            self.manager1.get_suggestions(iteration_config,
+                                          n_suggestions=2,
+                                          pending_experiment_ids=set())
+        assert get_suggestions_mock.call_args[1] == {'n_suggestions': 2, 'pending_configs': []}
+
+    def test_should_reschedule_counts_the_suggested_experiments(self):
+        def get_iteration_config(n_old_experiments, n_experiments):
+            return BOIterationConfig.from_dict({
+                'iteration': 1,
+                'old_experiment_ids': list(range(n_old_experiments)),
+                'experiment_ids': list(range(n_old_experiments,
+                                             n_old_experiments + n_experiments)),
+            })
+
+        # 5 initial trials and 5 suggestions
+        iteration_config = get_iteration_config(n_old_experiments=5, n_experiments=2)
+        assert self.manager1.get_n_remaining_suggestions(iteration_config) == 3
+        assert self.manager1.should_reschedule(iteration_config) is True
+        iteration_config = get_iteration_config(n_old_experiments=8, n_experiments=2)
+        assert self.manager1.get_n_remaining_suggestions(iteration_config) == 0
+        assert self.manager1.should_reschedule(iteration_config) is False
+
     def test_concrete_example(self):
         hptuning_config = HPTuningConfig.from_dict({
             'concurrency': 2,
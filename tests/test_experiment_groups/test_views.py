@@ -20,11 +20,11 @@ from factories.factory_experiments import (
 )
 from factories.factory_projects import ProjectFactory
 from factories.fixtures import experiment_group_spec_content_early_stopping
-from tests.utils import BaseViewTest
+from tests.utils import BaseViewTest, ListViewNumQueriesMixin
 
 
 @pytest.mark.experiment_groups_mark
-class TestProjectExperimentGroupListViewV1(BaseViewTest):
+class TestProjectExperimentGroupListViewV1(ListViewNumQueriesMixin, BaseViewTest):
     serializer_class = ExperimentGroupSerializer
     model_class = ExperimentGroup
     factory_class = ExperimentGroupFactory
@@ -332,6 +332,10 @@ model:
         assert last_object.project == self.project
         assert last_object.content is None
 
+    def create_object(self):
+        group = self.factory_class(project=self.project)
+        ExperimentFactory(project=self.project, experiment_group=group)
+
 
 @pytest.mark.experiment_groups_mark
 class TestExperimentGroupDetailViewV1(BaseViewTest):
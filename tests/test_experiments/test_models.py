@@ -37,7 +37,11 @@ from factories.fixtures import (
 from libs.paths.experiments import create_experiment_outputs_path, get_experiment_outputs_path
 from polyaxon_schemas.polyaxonfile.specification import ExperimentSpecification
 from polyaxon_schemas.utils import TaskType
-from scheduler.tasks.experiments import copy_experiment, experiments_set_metrics
+from scheduler.tasks.experiments import (
+    copy_experiment,
+    experiments_set_metrics,
+    experiments_set_metrics_batch
+)
 from tests.fixtures import start_experiment_value
 from tests.utils import BaseTest, BaseViewTest
 
@@ -343,6 +347,22 @@ class TestExperimentModel(BaseTest):
 
         assert experiment.metrics.count() == 1
 
+    def test_set_metrics_batch(self):
+        config = ExperimentSpecification.read(experiment_spec_content)
+        experiment = ExperimentFactory(config=config.parsed_data)
+        assert experiment.metrics.count() == 0
+
+        with patch('auditor.record') as auditor_record:
+            experiments_set_metrics_batch(
+                experiment_uuid=experiment.uuid.hex,
+                metrics=[{'values': {'accuracy': 0.8}},
+                         {'values': {'accuracy': 0.9}, 'created_at': timezone.now()}])
+
+        assert experiment.metrics.count() == 2
+        assert auditor_record.call_count == 1
+        experiment.refresh_from_db()
+        assert experiment.last_metric == {'accuracy': 0.9}
+
     def test_master_success_influences_other_experiment_workers_status(self):
         with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
             with patch.object(Experiment, 'set_status') as _:  # noqa
@@ -370,6 +390,25 @@ class TestExperimentModel(BaseTest):
         experiment.refresh_from_db()
         assert experiment.last_status == ExperimentLifeCycle.SUCCEEDED
 
+    def test_last_job_statuses_by_role(self):
+        with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+            with patch.object(Experiment, 'set_status') as _:  # noqa
+                experiment = ExperimentFactory()
+                master = ExperimentJobFactory(experiment=experiment, role=TaskType.MASTER)
+                workers = [ExperimentJobFactory(experiment=experiment, role=TaskType.WORKER)
+                           for _ in range(2)]
+                ExperimentJobStatusFactory(job=master, status=JobLifeCycle.RUNNING)
+                for worker in workers:
+                    ExperimentJobStatusFactory(job=worker, status=JobLifeCycle.RUNNING)
+
+        with self.assertNumQueries(1):
+            statuses = experiment.get_last_job_statuses_by_role()
+        assert statuses == {
+            TaskType.MASTER: [JobLifeCycle.RUNNING],
+            TaskType.WORKER: [JobLifeCycle.RUNNING],
+        }
+        assert experiment.calculated_status == ExperimentLifeCycle.RUNNING
+
     def test_sync_experiments_and_jobs_statuses(self):
         with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
             with patch.object(Experiment, 'set_status') as _:  # noqa
@@ -30,13 +30,14 @@ from factories.factory_experiments import (
 )
 from factories.factory_projects import ProjectFactory
 from factories.fixtures import exec_experiment_spec_parsed_content
+from libs.metric_series import get_metric_series
 from libs.paths.experiments import create_experiment_logs_path, get_experiment_logs_path
 from polyaxon_schemas.polyaxonfile.specification import ExperimentSpecification
-from tests.utils import BaseViewTest
+from tests.utils import BaseViewTest, ListViewNumQueriesMixin
 
 
 @pytest.mark.experiments_mark
-class TestProjectExperimentListViewV1(BaseViewTest):
+class TestProjectExperimentListViewV1(ListViewNumQueriesMixin, BaseViewTest):
     serializer_class = ExperimentSerializer
     model_class = Experiment
     factory_class = ExperimentFactory
@@ -319,6 +320,29 @@ class TestProjectExperimentListViewV1(BaseViewTest):
             'dropout': 0.5
         }
 
+    def create_object(self):
+        experiment = self.factory_class(project=self.project)
+        ExperimentJobFactory(experiment=experiment)
+        ExperimentMetricFactory(experiment=experiment, values={'loss': 0.1})
+
+    def test_cursor_pagination(self):
+        queryset = self.model_class.objects.filter(project=self.project).order_by(
+            '-created_at', '-id')
+        limit = self.num_objects - 1
+        resp = self.auth_client.get(self.url, {'cursor': '', 'limit': limit})
+        assert resp.status_code == status.HTTP_200_OK
+        assert 'count' not in resp.data
+        assert [e['id'] for e in resp.data['results']] == [e.id for e in queryset[:limit]]
+
+        resp = self.auth_client.get(resp.data['next'])
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        assert [e['id'] for e in resp.data['results']] == [e.id for e in queryset[limit:]]
+
+        # The cursor is only valid in its ordering
+        resp = self.auth_client.get(self.url, {'cursor': '', 'sort': 'created_at'})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
 
 @pytest.mark.experiments_mark
 class TestExperimentGroupExperimentListViewV1(BaseViewTest):
@@ -737,6 +761,27 @@ class TestExperimentStatusListViewV1(BaseViewTest):
         assert last_object.experiment == self.experiment
         assert last_object.status == data['status']
 
+    def test_cursor_pagination(self):
+        limit = self.num_objects - 1
+        resp = self.auth_client.get(self.url, {'cursor': '', 'limit': limit})
+        assert resp.status_code == status.HTTP_200_OK
+        assert 'count' not in resp.data
+        assert resp.data['results'] == self.serializer_class(self.queryset[:limit], many=True).data
+
+        next_page = resp.data['next']
+        assert next_page is not None
+        resp = self.auth_client.get(next_page)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['next'] is None
+        assert resp.data['results'] == self.serializer_class(self.queryset[limit:], many=True).data
+
+        resp = self.auth_client.get(self.url, {'cursor': '', 'count': 'true'})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['count'] == self.num_objects
+
+        resp = self.auth_client.get(self.url, {'cursor': 'foo'})
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
 
 @pytest.mark.experiments_mark
 class TestExperimentMetricListViewV1(BaseViewTest):
@@ -808,6 +853,21 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert last_object.experiment == self.experiment
         assert last_object.values == data['values']
 
+    def test_create_batch(self):
+        data = [{'values': {'precision': 0.8}}, {}]
+        resp = self.auth_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert self.model_class.objects.count() == self.num_objects
+
+        data = [{'values': {'precision': 0.8, 'loss': 0.2}}, {'values': {'precision': 0.9}}]
+        resp = self.auth_client.post(self.url, data)
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert len(resp.data) == 2
+        assert self.model_class.objects.count() == self.num_objects + 2
+        self.experiment.refresh_from_db()
+        assert self.experiment.last_metric == {'precision': 0.9}
+        assert get_metric_series(self.experiment.id, 'precision')[1] == [0.8, 0.9]
+
     def test_create_internal(self):
         data = {}
         resp = self.internal_client.post(self.url, data)
@@ -822,6 +882,54 @@ class TestExperimentMetricListViewV1(BaseViewTest):
         assert last_object.values == data['values']
 
 
+@pytest.mark.experiments_mark
+class TestExperimentMetricSeriesViewV1(BaseViewTest):
+    num_objects = 20
+    HAS_AUTH = True
+
+    def setUp(self):
+        super().setUp()
+        with patch.object(Experiment, 'set_status') as _:  # noqa
+            with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+                project = ProjectFactory(user=self.auth_client.user)
+                self.experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/metrics/series'.format(API_V1,
+                                                                   project.user.username,
+                                                                   project.name,
+                                                                   self.experiment.id)
+        self.values = [(i % 7) / 10 for i in range(self.num_objects)]
+        for value in self.values:
+            ExperimentMetricFactory(experiment=self.experiment,
+                                    values={'loss': value, 'step_name': 'train'})
+
+    def test_get_metric_names(self):
+        resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data == {'metrics': ['loss']}
+
+    def test_get_series(self):
+        resp = self.auth_client.get(self.url, {'metric': 'loss'})
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data['num_values'] == self.num_objects
+        assert resp.data['steps'] == list(range(self.num_objects))
+        assert resp.data['values'] == self.values
+        assert len(resp.data['timestamps']) == self.num_objects
+
+    def test_get_downsampled_series(self):
+        for method in ['lttb', 'minmax']:
+            resp = self.auth_client.get(self.url, {'metric': 'loss', 'points': 6, 'method': method})
+            assert resp.status_code == status.HTTP_200_OK
+            assert resp.data['num_values'] == self.num_objects
+            assert len(resp.data['values']) <= 6
+            assert resp.data['values'] == [self.values[i] for i in resp.data['steps']]
+
+        resp = self.auth_client.get(self.url, {'metric': 'loss', 'method': 'mean'})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url, {'metric': 'loss', 'points': -1})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.experiments_mark
 class TestExperimentStatusDetailViewV1(BaseViewTest):
     serializer_class = ExperimentStatusSerializer
@@ -1361,3 +1469,102 @@ class TestExperimentLogsViewV1(BaseViewTest):
         data = [d for d in data[0].decode('utf-8').split('\n') if d]
         assert len(data) == len(self.logs)
         assert data == self.logs
+
+    def test_get_tail(self):
+        resp = self.auth_client.get(self.url + '?tail=3')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.content.decode('utf-8').split('\n') == self.logs[-3:]
+
+    def test_get_offset_limit(self):
+        resp = self.auth_client.get(self.url + '?offset=2&limit=4')
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.content.decode('utf-8').split('\n') == self.logs[2:6]
+
+        resp = self.auth_client.get(self.url + '?offset=-1')
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_range(self):
+        content = ''.join('{}\n'.format(line) for line in self.logs).encode('utf-8')
+        resp = self.auth_client.get(self.url, HTTP_RANGE='bytes=5-20')
+        assert resp.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert resp['Content-Range'] == 'bytes 5-20/{}'.format(len(content))
+        assert b''.join(resp.streaming_content) == content[5:21]
+
+        resp = self.auth_client.get(self.url, HTTP_RANGE='bytes=-10')
+        assert resp.status_code == status.HTTP_206_PARTIAL_CONTENT
+        assert b''.join(resp.streaming_content) == content[-10:]
+
+        resp = self.auth_client.get(self.url,
+                                    HTTP_RANGE='bytes={}-'.format(len(content) + 1))
+        assert resp.status_code == status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+
+
+@pytest.mark.experiments_mark
+class TestExperimentLogsSearchViewV1(BaseViewTest):
+    HAS_AUTH = True
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        project = ProjectFactory(user=self.auth_client.user)
+        experiment = ExperimentFactory(project=project)
+        self.url = '/{}/{}/{}/experiments/{}/logs/search'.format(
+            API_V1,
+            project.user.username,
+            project.name,
+            experiment.id)
+
+        log_path = get_experiment_logs_path(experiment.unique_name)
+        create_experiment_logs_path(experiment_name=experiment.unique_name)
+        self.logs = []
+        for task_type, task_idx in [('master', 1), ('worker', 1), ('worker', 2)]:
+            for i in range(5):
+                self.logs.append('{}.{} -- step {}'.format(task_type, task_idx, i))
+        self.logs.append('worker.2 -- Traceback (most recent call last):')
+        with open(log_path, 'w') as file:
+            for line in self.logs:
+                file.write(line)
+                file.write('\n')
+
+    def get_lines(self, resp):
+        assert resp.status_code == status.HTTP_200_OK
+        return b''.join(resp.streaming_content).decode('utf-8').splitlines()
+
+    def test_search(self):
+        resp = self.auth_client.get(self.url, {'query': 'Traceback'})
+        assert self.get_lines(resp) == self.logs[-1:]
+
+        resp = self.auth_client.get(self.url, {'regex': 'step [34]$', 'task_type': 'worker'})
+        assert self.get_lines(resp) == [
+            'worker.1 -- step 3', 'worker.1 -- step 4', 'worker.2 -- step 3', 'worker.2 -- step 4']
+
+        resp = self.auth_client.get(self.url, {'task_type': 'worker', 'task_idx': 2, 'limit': 2})
+        assert self.get_lines(resp) == ['worker.2 -- step 0', 'worker.2 -- step 1']
+
+        resp = self.auth_client.get(self.url, {'since': '2000-01-01 00:00'})
+        assert self.get_lines(resp) == self.logs
+
+    def test_search_invalid_params(self):
+        resp = self.auth_client.get(self.url, {'regex': 'step ['})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url, {'regex': '(step +)+$'})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url, {'task_idx': 1})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        resp = self.auth_client.get(self.url, {'since': 'yesterday'})
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+        for limit in [0, -1]:
+            resp = self.auth_client.get(self.url, {'limit': limit})
+            assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_search_limit_is_capped(self):
+        with patch('api.utils.views.MAX_SEARCH_RESULTS', 3):
+            resp = self.auth_client.get(self.url, {'limit': 1000000})
+            assert self.get_lines(resp) == self.logs[:3]
+
+            resp = self.auth_client.get(self.url)
+            assert self.get_lines(resp) == self.logs[:3]
@@ -603,3 +603,10 @@ class TestJobLogsViewV1(BaseViewTest):
         data = [d for d in data[0].decode('utf-8').split('\n') if d]
         assert len(data) == len(self.logs)
         assert data == self.logs
+
+    def test_search(self):
+        query = self.logs[3][:10]
+        resp = self.auth_client.get(self.url + '/search', {'query': query})
+        assert resp.status_code == status.HTTP_200_OK
+        data = b''.join(resp.streaming_content).decode('utf-8').splitlines()
+        assert data == [line for line in self.logs if query in line]
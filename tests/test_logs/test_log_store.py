@@ -0,0 +1,125 @@
+import os
+import tempfile
+
+import pytest
+
+from events_handlers.utils import LogWriters
+from libs.log_search import MAX_REGEX_LENGTH, LogsFilter, search_logs
+from libs.log_store import LogStore
+from tests.utils import BaseTest
+
+
+@pytest.mark.paths_mark
+class TestLogStore(BaseTest):
+    SEGMENT_SIZE = 100
+
+    def setUp(self):
+        super().setUp()
+        self.log_path = os.path.join(tempfile.mkdtemp(), 'logs')
+        self.lines = []
+
+    def write_logs(self, compression, num_batches=50):
+        log_store = LogStore(self.log_path,
+                             segment_size=self.SEGMENT_SIZE,
+                             compression=compression)
+        for i in range(num_batches):
+            lines = ['line {}.{}'.format(i, j) for j in range(3)]
+            self.lines += lines
+            with open(self.log_path, 'a') as log_file:
+                log_file.write('\n'.join(lines) + '\n')
+                if log_store.should_seal(log_file.tell()):
+                    log_store.seal()
+        return log_store
+
+    def assert_reads(self, log_store):
+        content = ''.join('{}\n'.format(line) for line in self.lines).encode('utf-8')
+        assert log_store.get_size() == len(content)
+        assert b''.join(log_store.iter_range()) == content
+        assert b''.join(log_store.iter_range(start=95, end=205)) == content[95:205]
+        assert log_store.read_lines() == self.lines
+        assert log_store.read_lines(offset=17, limit=9) == self.lines[17:26]
+        assert log_store.read_lines(offset=len(self.lines)) == []
+        assert log_store.tail(0) == []
+        assert log_store.tail(5) == self.lines[-5:]
+        assert log_store.tail(40) == self.lines[-40:]
+        assert log_store.tail(1000) == self.lines
+
+    def test_segments(self):
+        log_store = self.write_logs(compression=LogStore.GZIP)
+        segments = log_store.get_segments()
+        assert len(segments) > 1
+        assert segments[0]['first_line'] == 0
+        assert segments[1]['first_line'] == segments[0]['num_lines']
+        assert all(segment['name'].endswith('.gz') for segment in segments)
+
+    def test_reads_compressed(self):
+        self.assert_reads(self.write_logs(compression=LogStore.GZIP))
+
+    def test_reads_uncompressed(self):
+        self.assert_reads(self.write_logs(compression=''))
+
+    def test_reads_without_segments(self):
+        self.assert_reads(self.write_logs(compression='', num_batches=2))
+
+    def test_delete(self):
+        log_store = self.write_logs(compression=LogStore.GZIP)
+        log_store.delete()
+        assert log_store.exists() is False
+        assert os.listdir(os.path.dirname(self.log_path)) == []
+
+    def test_log_writers_seal_segments(self):
+        log_writers = LogWriters()
+        log_store = LogStore(self.log_path)
+        with self.settings(LOGS_SEGMENT_SIZE=self.SEGMENT_SIZE):
+            for i in range(20):
+                lines = ['line {}.{}'.format(i, j) for j in range(3)]
+                self.lines += lines
+                log_writers.write(self.log_path, lines)
+            assert len(log_store.get_segments()) > 1
+            self.assert_reads(log_store)
+        log_writers.close()
+
+    def test_iter_window_lines(self):
+        log_store = self.write_logs(compression=LogStore.GZIP)
+        segments = log_store.get_segments()
+        assert list(log_store.iter_window_lines()) == self.lines
+
+        sealed_at = segments[0]['sealed_at']
+        lines = list(log_store.iter_window_lines(until=sealed_at - 1))
+        assert lines == self.lines[:segments[0]['num_lines']]
+        lines = list(log_store.iter_window_lines(since=segments[-1]['sealed_at'] + 1))
+        assert lines == self.lines[segments[-1]['first_line'] + segments[-1]['num_lines']:]
+
+    def test_search_logs(self):
+        log_store = self.write_logs(compression='')
+        lines = list(search_logs(log_store, LogsFilter(query='.2')))
+        assert lines == [line for line in self.lines if '.2' in line]
+        lines = list(search_logs(log_store, LogsFilter(regex=r'^line 1\d\.0$')))
+        assert lines == ['line {}.0'.format(i) for i in range(10, 20)]
+        lines = list(search_logs(log_store, LogsFilter(regex=r'\.1$'), limit=3))
+        assert lines == ['line 0.1', 'line 1.1', 'line 2.1']
+        lines = list(search_logs(log_store, LogsFilter(query='.2'), max_scanned_lines=10))
+        assert lines == [line for line in self.lines[:10] if '.2' in line]
+
+
+@pytest.mark.paths_mark
+class TestLogsFilter(BaseTest):
+    def test_match_task(self):
+        logs_filter = LogsFilter(task_type='worker', task_idx=1)
+        assert logs_filter.match('worker.1 -- Traceback') is True
+        assert logs_filter.match('worker.11 -- Traceback') is False
+        assert logs_filter.match('master.1 -- Traceback') is False
+
+        logs_filter = LogsFilter(query='Traceback', task_type='worker')
+        assert logs_filter.match('worker.11 -- Traceback') is True
+        assert logs_filter.match('worker.11 -- Epoch 1') is False
+
+        with self.assertRaises(ValueError):
+            LogsFilter(task_idx=1)
+
+    def test_expensive_regex_are_rejected(self):
+        for regex in ['(a+)+$', r'(\w+\s?)*$', '(x{2,})+', 'a' * (MAX_REGEX_LENGTH + 1)]:
+            with self.assertRaises(ValueError):
+                LogsFilter(regex=regex)
+
+        assert LogsFilter(regex='(ab)+ (a|b)*c').match('abab bac') is True
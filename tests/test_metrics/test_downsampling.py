@@ -0,0 +1,31 @@
+import math
+
+from libs.downsampling import lttb, min_max
+from tests.utils import BaseTest
+
+
+class TestDownsampling(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        self.xs = list(range(1000))
+        self.ys = [math.sin(x / 50) for x in self.xs]
+
+    def test_lttb(self):
+        assert lttb(self.xs[:10], self.ys[:10], 20) == list(range(10))
+        assert lttb(self.xs, self.ys, 2) == [0, 999]
+        indices = lttb(self.xs, self.ys, 100)
+        assert len(indices) == 100
+        assert indices[0] == 0
+        assert indices[-1] == 999
+        assert indices == sorted(set(indices))
+
+    def test_min_max(self):
+        assert min_max(self.ys[:10], 20) == list(range(10))
+        indices = min_max(self.ys, 100)
+        assert len(indices) <= 100
+        assert indices == sorted(set(indices))
+        values = [self.ys[i] for i in indices]
+        assert max(values) == max(self.ys)
+        assert min(values) == min(self.ys)
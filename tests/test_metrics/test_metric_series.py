@@ -0,0 +1,76 @@
+from unittest.mock import patch
+
+import pytest
+
+from db.models.experiments import Experiment, ExperimentMetricChunk, ExperimentMetricValue
+from factories.factory_experiments import ExperimentFactory, ExperimentMetricFactory
+from libs.metric_series import (
+    append_metrics,
+    append_metrics_batch,
+    create_metrics,
+    get_metric_names,
+    get_metric_series
+)
+from tests.utils import BaseTest
+
+
+@pytest.mark.experiments_mark
+class TestMetricSeries(BaseTest):
+    DISABLE_RUNNER = True
+
+    def setUp(self):
+        super().setUp()
+        with patch.object(Experiment, 'set_status') as _:  # noqa
+            with patch('scheduler.tasks.experiments.experiments_build.apply_async') as _:  # noqa
+                self.experiment = ExperimentFactory()
+
+    def test_metric_reports_are_appended_to_series(self):
+        ExperimentMetricFactory(experiment=self.experiment, values={'loss': 0.5, 'accuracy': 0.7})
+        ExperimentMetricFactory(experiment=self.experiment, values={'loss': 0.4, 'tag': 'foo'})
+        assert get_metric_names(self.experiment.id) == ['accuracy', 'loss']
+        timestamps, values = get_metric_series(self.experiment.id, 'loss')
+        assert values == [0.5, 0.4]
+        assert len(timestamps) == 2
+        assert timestamps[0] <= timestamps[1]
+        assert get_metric_series(self.experiment.id, 'tag') == ([], [])
+
+    def test_series_are_chunked(self):
+        with patch.object(ExperimentMetricChunk, 'MAX_POINTS', 3):
+            for i in range(8):
+                append_metrics(self.experiment.id, {'loss': i, 'done': True})
+        chunks = ExperimentMetricChunk.objects.filter(experiment=self.experiment, name='loss')
+        assert [chunk.num_points for chunk in chunks] == [3, 3, 2]
+        assert [chunk.index for chunk in chunks] == [0, 1, 2]
+        assert get_metric_series(self.experiment.id, 'loss')[1] == list(range(8))
+        assert get_metric_names(self.experiment.id) == ['loss']
+
+    def test_batch_fills_last_chunk_and_creates_new_chunks(self):
+        with patch.object(ExperimentMetricChunk, 'MAX_POINTS', 3):
+            append_metrics(self.experiment.id, {'loss': 0})
+            append_metrics_batch(self.experiment.id,
+                                 [(None, {'loss': i, 'accuracy': i}) for i in range(1, 8)])
+        chunks = ExperimentMetricChunk.objects.filter(experiment=self.experiment, name='loss')
+        assert [chunk.num_points for chunk in chunks] == [3, 3, 2]
+        assert get_metric_series(self.experiment.id, 'loss')[1] == list(range(8))
+        assert get_metric_series(self.experiment.id, 'accuracy')[1] == list(range(1, 8))
+
+    def get_metric_values(self):
+        return dict(ExperimentMetricValue.objects.filter(
+            experiment=self.experiment).values_list('name', 'value'))
+
+    def test_metric_values_follow_the_last_metric(self):
+        assert self.get_metric_values() == {}
+        metric = ExperimentMetricFactory(experiment=self.experiment,
+                                         values={'loss': 0.5, 'accuracy': 0.7, 'tag': 'foo'})
+        assert self.get_metric_values() == {'loss': 0.5, 'accuracy': 0.7}
+        ExperimentMetricFactory(experiment=self.experiment, values={'loss': 0.4})
+        assert self.get_metric_values() == {'loss': 0.4}
+
+        create_metrics(self.experiment, [{'values': {'loss': 0.3}}, {'values': {'loss': 0.2}}])
+        assert self.get_metric_values() == {'loss': 0.2}
+        metric.delete()
+        assert self.get_metric_values() == {'loss': 0.2}
+
+        self.experiment.refresh_from_db()
+        self.experiment.metric.delete()
+        assert self.get_metric_values() == {}
@@ -22,7 +22,7 @@ from factories.factory_experiments import ExperimentFactory, ExperimentJobFactor
 from factories.factory_jobs import JobFactory
 from factories.factory_plugins import NotebookJobFactory, TensorboardJobFactory
 from factories.factory_projects import ProjectFactory
-from tests.utils import BaseViewTest
+from tests.utils import BaseViewTest, ListViewNumQueriesMixin
 
 
 @pytest.mark.projects_mark
@@ -50,7 +50,7 @@ class TestProjectCreateViewV1(BaseViewTest):
 
 
 @pytest.mark.projects_mark
-class TestProjectListViewV1(BaseViewTest):
+class TestProjectListViewV1(ListViewNumQueriesMixin, BaseViewTest):
     serializer_class = ProjectSerializer
     model_class = Project
     factory_class = ProjectFactory
@@ -117,6 +117,11 @@ class TestProjectListViewV1(BaseViewTest):
         assert len(data) == 1
         assert data == self.serializer_class(self.queryset[limit:], many=True).data
 
+    def create_object(self):
+        project = self.factory_class(user=self.user)
+        ExperimentFactory(project=project)
+        NotebookJobFactory(project=project)
+
 
 @pytest.mark.projects_mark
 class TestProjectDetailViewV1(BaseViewTest):
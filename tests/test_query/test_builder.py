@@ -12,7 +12,13 @@ from factories.factory_experiments import (
     ExperimentStatusFactory
 )
 from libs.date_utils import DateTimeFormatter
-from query.builder import ComparisonCondition, DateTimeCondition, EqualityCondition, ValueCondition
+from query.builder import (
+    ComparisonCondition,
+    DateTimeCondition,
+    EqualityCondition,
+    ValueCondition,
+    ValuesTableCondition
+)
 from query.exceptions import QueryConditionException
 from tests.utils import BaseTest
 
@@ -220,6 +226,53 @@ class TestComparisonCondition(BaseTest):
         assert queryset.count() == 1
 
 
+@pytest.mark.query_mark
+class TestValuesTableCondition(BaseTest):
+    DISABLE_RUNNER = True
+
+    def test_negated_equality_operator(self):
+        neq_cond = ValuesTableCondition(op='=', negation=True)
+        assert neq_cond.operator == ValuesTableCondition._neq_operator
+        assert neq_cond.operator('field', 1) == Q(field__lt=1) | Q(field__gt=1)
+
+    def test_values_table_apply(self):
+        ExperimentMetricFactory(values={'loss': 0.1, 'step': 1})
+        ExperimentMetricFactory(values={'loss': 0.3, 'step': 10})
+        ExperimentMetricFactory(values={'loss': 0.9, 'step': 100})
+        ExperimentFactory()
+
+        eq_cond = ValuesTableCondition(op='eq')
+        neq_cond = ValuesTableCondition(op='eq', negation=True)
+        lte_cond = ValuesTableCondition(op='lte')
+        gt_cond = ValuesTableCondition(op='gt', negation=True)
+
+        queryset = eq_cond.apply(queryset=Experiment.objects,
+                                 name='metric_values__loss',
+                                 params=0.1)
+        assert queryset.count() == 1
+
+        queryset = eq_cond.apply(queryset=Experiment.objects,
+                                 name='metric_values__step',
+                                 params=0.1)
+        assert queryset.count() == 0
+
+        # Only the experiments with the metric are compared
+        queryset = neq_cond.apply(queryset=Experiment.objects,
+                                  name='metric_values__loss',
+                                  params=0.1)
+        assert queryset.count() == 2
+
+        queryset = lte_cond.apply(queryset=Experiment.objects,
+                                  name='metric_values__loss',
+                                  params=0.3)
+        assert queryset.count() == 2
+
+        queryset = gt_cond.apply(queryset=Experiment.objects,
+                                 name='metric_values__step',
+                                 params=10)
+        assert queryset.count() == 2
+
+
 @pytest.mark.query_mark
 class TestDateTimeCondition(BaseTest):
     DISABLE_RUNNER = True
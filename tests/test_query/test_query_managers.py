@@ -7,10 +7,10 @@ from django.db.models import Q
 from db.models.experiments import Experiment
 from query.builder import (
     ArrayCondition,
-    ComparisonCondition,
     DateTimeCondition,
     QueryCondSpec,
-    ValueCondition
+    ValueCondition,
+    ValuesTableCondition
 )
 from query.exceptions import QueryError
 from query.managers.build import BuildQueryManager
@@ -111,7 +111,7 @@ class TestQueryManager(BaseTest):
         built_query = ExperimentQueryManager.build(parsed_query)
         assert built_query == {
             'metric__loss': [
-                QueryCondSpec(ComparisonCondition(op='<=', negation=False), params=0.8)],
+                QueryCondSpec(ValuesTableCondition(op='<=', negation=False), params=0.8)],
             'status': [
                 QueryCondSpec(ValueCondition(op='|', negation=False),
                               params=['starting', 'running'])],
@@ -176,14 +176,14 @@ class TestQueryManager(BaseTest):
                                                        queryset=Experiment.objects)
         queries = [
             str(Experiment.objects.filter(
-                metric__values__loss__lte=0.8
+                Q(metric_values__name='loss') & Q(metric_values__value__lte=0.8)
             ).filter(
                 status__status__in=['starting', 'running']
             ).query),
             str(Experiment.objects.filter(
                 status__status__in=['starting', 'running']
             ).filter(
-                metric__values__loss__lte=0.8
+                Q(metric_values__name='loss') & Q(metric_values__value__lte=0.8)
             ).query)
         ]
         assert str(result_queryset.query) in queries
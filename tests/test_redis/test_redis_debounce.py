@@ -0,0 +1,17 @@
+import pytest
+
+from libs.redis_db import RedisDebounce
+from tests.utils import BaseTest
+
+
+@pytest.mark.redis_mark
+class TestRedisDebounce(BaseTest):
+    def test_acquire_release(self):
+        assert RedisDebounce.acquire(event='event1', object_id=1, ttl=60) is True
+        # The event is already scheduled for this object
+        assert RedisDebounce.acquire(event='event1', object_id=1, ttl=60) is False
+        assert RedisDebounce.acquire(event='event1', object_id=2, ttl=60) is True
+        assert RedisDebounce.acquire(event='event2', object_id=1, ttl=60) is True
+
+        RedisDebounce.release(event='event1', object_id=1)
+        assert RedisDebounce.acquire(event='event1', object_id=1, ttl=60) is True
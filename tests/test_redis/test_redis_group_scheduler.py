@@ -0,0 +1,79 @@
+import pytest
+
+from libs.redis_db import RedisGroupScheduler
+from tests.utils import BaseTest
+
+
+@pytest.mark.redis_mark
+class TestRedisGroupScheduler(BaseTest):
+    def test_claim(self):
+        assert RedisGroupScheduler.claim(experiment_group_id=1,
+                                         task_name='task1',
+                                         task_id='id1',
+                                         is_retry=True,
+                                         ttl=60) is True
+        # A single task runs the scheduler of the group at a time
+        assert RedisGroupScheduler.claim(experiment_group_id=1,
+                                         task_name='task2',
+                                         task_id='id2',
+                                         is_retry=False,
+                                         ttl=60) is False
+        # The group needs another pass
+        assert RedisGroupScheduler.release(experiment_group_id=1, task_id='id1') is True
+
+        # A new task takes over the scheduling of the group
+        assert RedisGroupScheduler.claim(experiment_group_id=1,
+                                         task_name='task2',
+                                         task_id='id2',
+                                         is_retry=False,
+                                         ttl=60) is True
+        assert RedisGroupScheduler.release(experiment_group_id=1, task_id='id2') is False
+        # The retries of the previous task are superseded
+        assert RedisGroupScheduler.claim(experiment_group_id=1,
+                                         task_name='task1',
+                                         task_id='id1',
+                                         is_retry=True,
+                                         ttl=60) is False
+        assert RedisGroupScheduler.claim(experiment_group_id=1,
+                                         task_name='task2',
+                                         task_id='id2',
+                                         is_retry=True,
+                                         ttl=60) is True
+
+    def test_hand_over(self):
+        assert RedisGroupScheduler.acquire(experiment_group_id=1, task_id='id1', ttl=60) is True
+        assert RedisGroupScheduler.acquire(experiment_group_id=1, task_id='id2', ttl=60) is False
+
+        assert RedisGroupScheduler.hand_over(experiment_group_id=1,
+                                             task_id='id1',
+                                             next_task_id='id2',
+                                             ttl=60) is True
+        # The run was handed over
+        assert RedisGroupScheduler.hand_over(experiment_group_id=1,
+                                             task_id='id1',
+                                             next_task_id='id3',
+                                             ttl=60) is False
+        assert RedisGroupScheduler.release(experiment_group_id=1, task_id='id1') is False
+        assert RedisGroupScheduler.acquire(experiment_group_id=1, task_id='id2', ttl=60) is True
+        assert RedisGroupScheduler.release(experiment_group_id=1, task_id='id2') is True
+        assert RedisGroupScheduler.acquire(experiment_group_id=1, task_id='id3', ttl=60) is True
+
+    def test_wake(self):
+        assert RedisGroupScheduler.wake(experiment_group_id=1, debounce=60) is None
+
+        RedisGroupScheduler.claim(experiment_group_id=1,
+                                  task_name='task1',
+                                  task_id='id1',
+                                  is_retry=False,
+                                  ttl=60)
+        # The running scheduler makes another pass instead
+        assert RedisGroupScheduler.wake(experiment_group_id=1, debounce=60) is None
+        assert RedisGroupScheduler.release(experiment_group_id=1, task_id='id1') is True
+
+        assert RedisGroupScheduler.wake(experiment_group_id=1, debounce=60) == 'task1'
+        # The wake ups are debounced
+        assert RedisGroupScheduler.wake(experiment_group_id=1, debounce=60) is None
+        assert RedisGroupScheduler.wake(experiment_group_id=2, debounce=60) is None
+
+        RedisGroupScheduler.remove(experiment_group_id=1)
+        assert RedisGroupScheduler.wake(experiment_group_id=1, debounce=60) is None
@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+
+from factories.factory_experiments import ExperimentJobFactory
+from libs.redis_db import RedisJobContainers, RedisToStream
+from tests.utils import BaseTest
+
+
+@pytest.mark.redis_mark
+class TestRedisJobContainers(BaseTest):
+    def test_get_jobs(self):
+        job1 = ExperimentJobFactory()
+        job2 = ExperimentJobFactory()
+        container_ids = [uuid.uuid4().hex for _ in range(3)]
+        RedisJobContainers.monitor(container_id=container_ids[0], job_uuid=job1.uuid.hex)
+        RedisJobContainers.monitor(container_id=container_ids[1], job_uuid=job2.uuid.hex)
+
+        assert RedisJobContainers.get_jobs([]) == {}
+        assert RedisJobContainers.get_jobs(container_ids) == {
+            container_ids[0]: (job1.uuid.hex, job1.experiment.uuid.hex),
+            container_ids[1]: (job2.uuid.hex, job2.experiment.uuid.hex),
+        }
+        for container_id in container_ids:
+            assert (RedisJobContainers.get_jobs([container_id]).get(container_id, (None, None)) ==
+                    RedisJobContainers.get_job(container_id))
+
+    def test_remove_job(self):
+        job = ExperimentJobFactory()
+        container_ids = [uuid.uuid4().hex for _ in range(2)]
+        for container_id in container_ids:
+            RedisJobContainers.monitor(container_id=container_id, job_uuid=job.uuid.hex)
+        assert set(RedisJobContainers.get_containers()) == set(container_ids)
+
+        RedisJobContainers.remove_job(job.uuid.hex)
+        assert RedisJobContainers.get_containers() == []
+        assert RedisJobContainers.get_jobs(container_ids) == {}
+        assert RedisJobContainers.get_experiment_for_job(job.uuid.hex) is None
+
+
+@pytest.mark.redis_mark
+class TestRedisToStreamBatch(BaseTest):
+    def test_get_monitored_resources(self):
+        job_uuid = uuid.uuid4().hex
+        experiment_uuid = uuid.uuid4().hex
+        RedisToStream.monitor_job_resources(job_uuid)
+        RedisToStream.monitor_experiment_resources(experiment_uuid)
+
+        monitored_jobs, monitored_experiments = RedisToStream.get_monitored_resources()
+        assert job_uuid in monitored_jobs
+        assert experiment_uuid in monitored_experiments
+
+        RedisToStream.remove_job_resources(job_uuid)
+        RedisToStream.remove_experiment_resources(experiment_uuid)
+        monitored_jobs, monitored_experiments = RedisToStream.get_monitored_resources()
+        assert job_uuid not in monitored_jobs
+        assert experiment_uuid not in monitored_experiments
+
+    def test_get_latest_experiment_resources(self):
+        jobs = [{'uuid': uuid.uuid4().hex, 'name': 'master.0'},
+                {'uuid': uuid.uuid4().hex, 'name': 'worker.1'}]
+        RedisToStream.set_latest_job_resources(jobs[1]['uuid'], {'job_uuid': jobs[1]['uuid']})
+
+        assert RedisToStream.get_latest_experiment_resources([], as_json=True) == []
+        assert RedisToStream.get_latest_experiment_resources(jobs, as_json=True) == [
+            {'job_uuid': jobs[1]['uuid'], 'job_name': 'worker.1'}]
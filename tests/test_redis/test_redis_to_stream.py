@@ -1,3 +1,4 @@
+import json
 import uuid
 
 import pytest
@@ -105,3 +106,32 @@ class TestRedisToStream(BaseTest):
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is True
         RedisToStream.remove_experiment_logs(experiment_uuid)
         assert RedisToStream.is_monitored_experiment_logs(experiment_uuid) is False
+
+    def test_publish_latest_job_resources(self):
+        job_uuid = uuid.uuid4().hex
+        experiment_uuid = uuid.uuid4().hex
+        config_dict = {
+            'job_uuid': job_uuid,
+            'experiment_uuid': experiment_uuid,
+            'container_id': '3175e88873af9077688cee20eaadc0c07746efb84d01ae696d6d17ed9bcdfbc4',
+            'cpu_percentage': 0.6947691836734693,
+            'percpu_percentage': [0.4564075715616173, 0.23836161211185192],
+            'memory_used': 84467712,
+            'memory_limit': 2096160768,
+            'gpu_resources': None
+        }
+
+        job_pubsub = RedisToStream.subscribe_job_resources(job_uuid)
+        experiment_pubsub = RedisToStream.subscribe_experiment_resources(experiment_uuid)
+        RedisToStream.publish_latest_job_resources(job=job_uuid,
+                                                   experiment=experiment_uuid,
+                                                   payload=config_dict)
+
+        for pubsub in [job_pubsub, experiment_pubsub]:
+            message = pubsub.get_message(timeout=1)
+            assert message['type'] == 'message'
+            assert json.loads(message['data'].decode('utf-8')) == config_dict
+            pubsub.close()
+
+        config_dict['job_name'] = 'master.0'
+        assert config_dict == RedisToStream.get_latest_job_resources(job_uuid, 'master.0', True)
@@ -0,0 +1,157 @@
+import threading
+
+from unittest import TestCase
+
+import pytest
+
+from kubernetes.client.rest import ApiException
+from mock import MagicMock, patch
+
+from django.test import override_settings
+
+from polyaxon_schemas.utils import TaskType
+from scheduler.spawners.concurrency import (
+    SpawnerApiException,
+    call_with_retries,
+    run_concurrently
+)
+from scheduler.spawners.experiment_spawner import ExperimentSpawner
+
+
+class FakeExperimentSpawner(ExperimentSpawner):
+    """Only the k8s calls of the jobs are made, the calls wait for each other."""
+
+    def __init__(self, n_pods):  # pylint:disable=super-init-not-called
+        self.namespace = 'polyaxon'
+        self.n_pods = n_pods
+        self.pod_manager = MagicMock(ports=[2222])
+        self.pod_manager.get_job_name.side_effect = '{}-{}'.format
+        self.barrier = threading.Barrier(n_pods, timeout=5)
+        self.calls = []
+
+    def get_n_pods(self, task_type):
+        return self.n_pods
+
+    def get_pod_command_args(self, task_type, task_idx):
+        return None, None
+
+    def _call(self, call, name):
+        self.calls.append((call, name))
+        # Only returns once all the calls of the task type are in flight
+        self.barrier.wait()
+        return MagicMock(**{'to_dict.return_value': {'name': name}}), True
+
+    def create_or_update_pod(self, name, data):
+        return self._call('create_pod', name)
+
+    def create_or_update_service(self, name, data):
+        return self._call('create_service', name)
+
+    def delete_pod(self, name):
+        self._call('delete_pod', name)
+
+    def delete_service(self, name):
+        self._call('delete_service', name)
+
+
+@pytest.mark.spawner_mark
+class TestRunConcurrently(TestCase):
+    def test_results_are_in_order(self):
+        calls = [{'task_idx': i} for i in range(20)]
+        for max_workers in (1, 8):
+            results = run_concurrently(fn=lambda task_idx: task_idx * 2,
+                                       calls=calls,
+                                       max_workers=max_workers)
+            assert results == [i * 2 for i in range(20)]
+
+    def test_retries_unavailable_api(self):
+        attempts = []
+
+        def create(status):
+            attempts.append(status)
+            if len(attempts) < 3:
+                raise ApiException(status=status)
+            return len(attempts)
+
+        assert call_with_retries(create, max_retries=2, retry_delay=0, status=503) == 3
+
+        # The client errors are not retried
+        attempts[:] = []
+        with self.assertRaises(ApiException):
+            call_with_retries(create, max_retries=2, retry_delay=0, status=422)
+        assert attempts == [422]
+
+    def test_api_errors_are_aggregated(self):
+        attempts = []
+
+        def create(task_idx):
+            attempts.append(task_idx)
+            if task_idx % 2:
+                raise ApiException(status=422)
+            return task_idx
+
+        with self.assertRaises(SpawnerApiException) as context:
+            run_concurrently(fn=create,
+                             calls=[{'task_idx': i} for i in range(4)],
+                             max_workers=4)
+
+        # All the calls are made
+        assert sorted(attempts) == [0, 1, 2, 3]
+        assert len(context.exception.errors) == 2
+        assert context.exception.status == 422
+
+    def test_other_errors_are_propagated(self):
+        def create(task_idx):
+            if task_idx == 1:
+                raise KeyError(task_idx)
+            return task_idx
+
+        for max_workers in (1, 4):
+            with self.assertRaises(KeyError):
+                run_concurrently(fn=create,
+                                 calls=[{'task_idx': i} for i in range(4)],
+                                 max_workers=max_workers)
+
+
+@pytest.mark.spawner_mark
+class TestExperimentSpawnerConcurrency(TestCase):
+    @override_settings(K8S_SPAWNER_MAX_WORKERS=4)
+    def test_create_multi_jobs_uses_the_pool(self):
+        spawner = FakeExperimentSpawner(n_pods=3)
+        results = spawner.create_multi_jobs(task_type=TaskType.WORKER, add_service=True)
+
+        assert [result['pod'] for result in results] == [
+            {'name': '{}-{}'.format(TaskType.WORKER, i)} for i in range(3)]
+        assert sorted(spawner.calls) == sorted(
+            [('create_pod', '{}-{}'.format(TaskType.WORKER, i)) for i in range(3)] +
+            [('create_service', '{}-{}'.format(TaskType.WORKER, i)) for i in range(3)])
+
+    @override_settings(K8S_SPAWNER_MAX_WORKERS=4)
+    def test_delete_multi_jobs_uses_the_pool(self):
+        spawner = FakeExperimentSpawner(n_pods=3)
+        spawner.delete_multi_jobs(task_type=TaskType.WORKER, has_service=False)
+
+        assert sorted(spawner.calls) == [
+            ('delete_pod', '{}-{}'.format(TaskType.WORKER, i)) for i in range(3)]
+
+    @override_settings(K8S_SPAWNER_MAX_WORKERS=4, K8S_SPAWNER_MAX_RETRIES=2)
+    def test_create_multi_jobs_retries_each_call(self):
+        spawner = FakeExperimentSpawner(n_pods=1)
+        create_or_update_service = spawner.create_or_update_service
+        services_calls = []
+
+        def failing_create_or_update_service(name, data):
+            services_calls.append(name)
+            if len(services_calls) == 1:
+                raise ApiException(status=503)
+            return create_or_update_service(name=name, data=data)
+
+        spawner.create_or_update_service = failing_create_or_update_service
+        with patch('scheduler.spawners.concurrency.time.sleep') as sleep:
+            spawner.create_multi_jobs(task_type=TaskType.WORKER, add_service=True)
+
+        # Only the failed service call is retried, the pod is created once
+        assert sleep.call_count == 1
+        assert spawner.calls == [('create_pod', '{}-0'.format(TaskType.WORKER)),
+                                 ('create_service', '{}-0'.format(TaskType.WORKER))]
+        assert len(services_calls) == 2
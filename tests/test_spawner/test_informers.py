@@ -0,0 +1,141 @@
+import time
+
+import pytest
+
+from kubernetes.client.rest import ApiException
+from mock import patch
+
+from django.test import override_settings
+
+from libs import k8s_informer
+from libs.k8s_informer import Informer
+from polyaxon_k8s.manager import K8SManager
+from scheduler.spawners.informers import InformersMixin
+from tests.fake_k8s import PODS, FakeK8SApi
+from tests.utils import BaseTest
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline
+        time.sleep(0.01)
+
+
+class FakeSpawner(InformersMixin, K8SManager):
+    def __init__(self, k8s_api):  # pylint:disable=super-init-not-called
+        self.k8s_api = k8s_api
+        self.namespace = 'polyaxon'
+
+
+@pytest.mark.spawner_mark
+class TestInformer(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.k8s_api = FakeK8SApi()
+        patcher = patch('libs.k8s_informer.watch.Watch', self.k8s_api.get_watch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_informer_lists_and_watches_the_objects(self):
+        self.k8s_api.create(PODS, 'pod1', phase='Pending')
+        informer = Informer(name=PODS,
+                            list_fn=self.k8s_api.list_namespaced_pod,
+                            namespace='polyaxon')
+        informer.start()
+        self.addCleanup(informer.stop)
+
+        pod = informer.wait_for('pod1', predicate=lambda pod: True, timeout=5)
+        assert pod.status.phase == 'Pending'
+        assert informer.get('pod2') == (True, None)
+
+        # The informer follows the changes of the objects
+        self.k8s_api.create(PODS, 'pod2', phase='Pending')
+        self.k8s_api.update(PODS, 'pod1', phase='Running')
+        pod = informer.wait_for('pod1',
+                                predicate=lambda pod: pod.status.phase == 'Running',
+                                timeout=5)
+        assert pod.status.phase == 'Running'
+        wait_until(lambda: informer.get('pod2')[1] is not None)
+
+        self.k8s_api.delete(PODS, 'pod2')
+        wait_until(lambda: informer.get('pod2')[1] is None)
+        assert self.k8s_api.calls == [('list', PODS)]
+
+    def test_wait_for_timeout(self):
+        self.k8s_api.create(PODS, 'pod1', phase='Pending')
+        informer = Informer(name=PODS,
+                            list_fn=self.k8s_api.list_namespaced_pod,
+                            namespace='polyaxon')
+        informer.start()
+        self.addCleanup(informer.stop)
+
+        assert informer.wait_for('pod1',
+                                 predicate=lambda pod: pod.status.phase == 'Running',
+                                 timeout=0.1) is None
+
+    @override_settings(K8S_INFORMERS=True)
+    def test_spawner_checks_the_cache_first(self):
+        self.addCleanup(self.clear_informers)
+        spawner = FakeSpawner(self.k8s_api)
+        informer = k8s_informer.get_informer(kind=PODS,
+                                             k8s_api=self.k8s_api,
+                                             namespace=spawner.namespace)
+        wait_until(lambda: informer.is_synced)
+
+        pod_data = self.k8s_api.create(PODS, 'pod1')
+        self.k8s_api.delete(PODS, 'pod1')
+        wait_until(lambda: informer.get('pod1')[1] is None)
+
+        # The pod is created without reading it first
+        pod, created = spawner.create_or_update_pod(name='pod1', data=pod_data)
+        assert created is True
+        assert pod.metadata.name == 'pod1'
+        wait_until(lambda: informer.get('pod1')[1] is not None)
+        assert spawner.get_pod('pod1').metadata.uid == pod.metadata.uid
+        assert self.k8s_api.calls == [('list', PODS), ('create', PODS)]
+
+    @override_settings(K8S_INFORMERS=True)
+    def test_spawner_reads_the_api_on_cache_miss(self):
+        self.addCleanup(self.clear_informers)
+        spawner = FakeSpawner(self.k8s_api)
+        informer = k8s_informer.get_informer(kind=PODS,
+                                             k8s_api=self.k8s_api,
+                                             namespace=spawner.namespace)
+        wait_until(lambda: informer.is_synced)
+
+        # The informer did not receive the event of the pod yet
+        self.k8s_api.create(PODS, 'pod1', notify=False)
+        assert informer.get('pod1') == (True, None)
+        assert spawner.get_pod('pod1').metadata.name == 'pod1'
+        assert spawner.get_pod('pod2') is None
+        assert self.k8s_api.calls == [('list', PODS), ('read', PODS), ('read', PODS)]
+
+    @override_settings(K8S_INFORMERS=True)
+    def test_spawner_only_updates_on_conflicts(self):
+        self.addCleanup(self.clear_informers)
+        spawner = FakeSpawner(self.k8s_api)
+        informer = k8s_informer.get_informer(kind=PODS,
+                                             k8s_api=self.k8s_api,
+                                             namespace=spawner.namespace)
+        wait_until(lambda: informer.is_synced)
+        pod_data = self.k8s_api.create(PODS, 'pod1', notify=False)
+
+        with patch.object(K8SManager, 'create_or_update_pod') as create_or_update_pod:
+            create_or_update_pod.return_value = (pod_data, False)
+            assert spawner.create_or_update_pod(name='pod1', data=pod_data) == (pod_data, False)
+            assert create_or_update_pod.call_count == 1
+
+            for status in (422, 500):
+                with patch.object(self.k8s_api,
+                                  'create_namespaced_pod',
+                                  side_effect=ApiException(status=status)):
+                    with self.assertRaises(ApiException):
+                        spawner.create_or_update_pod(name='pod2', data=pod_data)
+            assert create_or_update_pod.call_count == 1
+
+    @staticmethod
+    def clear_informers():
+        for informer in k8s_informer._informers.values():  # pylint:disable=protected-access
+            informer.stop()
+        k8s_informer._informers.clear()  # pylint:disable=protected-access
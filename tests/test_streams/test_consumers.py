@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from mock import MagicMock, patch
+from pika.exceptions import ChannelClosed
+
+from streams.consumers import AmqpConnection, Consumer
+from tests.utils import BaseTest
+
+
+class FakeChannel(object):
+    def __init__(self, broker, channel_number):
+        self.broker = broker
+        self.channel_number = channel_number
+        self.is_open = True
+        self.calls = []
+        self._on_close_callbacks = []
+
+    def add_on_close_callback(self, callback):
+        self._on_close_callbacks.append(callback)
+
+    def _call(self, method, callback):
+        self.calls.append(method)
+        # The broker does not reply to the blocked methods
+        if method not in self.broker.blocked_methods:
+            self.broker.loop.call_soon(callback, MagicMock())
+
+    def exchange_declare(self, callback, **kwargs):
+        self._call('exchange_declare', callback)
+
+    def queue_declare(self, callback, queue, **kwargs):
+        self._call('queue_declare', callback)
+
+    def queue_bind(self, callback, queue, exchange, routing_key):
+        self._call('queue_bind', callback)
+
+    def basic_consume(self, on_message, queue):
+        self.calls.append('basic_consume')
+        return 'ctag{}'.format(self.channel_number)
+
+    def basic_cancel(self, callback, consumer_tag):
+        self._call('basic_cancel', callback)
+
+    def close(self, reply_code, reply_text):
+        self.is_open = False
+        for callback in self._on_close_callbacks:
+            callback(self, reply_code, reply_text)
+
+
+class FakeConnection(object):
+    def __init__(self, broker, on_open_callback, on_close_callback):
+        self.broker = broker
+        self.is_open = True
+        self.channels = []
+        self._on_close_callback = on_close_callback
+        broker.loop.call_soon(on_open_callback, self)
+
+    def channel(self, on_open_callback):
+        channel = FakeChannel(broker=self.broker, channel_number=len(self.channels) + 1)
+        self.channels.append(channel)
+        self.broker.loop.call_soon(on_open_callback, channel)
+
+    def close(self, reply_code=200, reply_text='Normal shutdown'):
+        if not self.is_open:
+            return
+        self.is_open = False
+        for channel in self.channels:
+            channel.is_open = False
+        self.broker.loop.call_soon(self._on_close_callback, self, reply_code, reply_text)
+
+
+class FakeBroker(object):
+    def __init__(self, loop):
+        self.loop = loop
+        self.connections = []
+        self.blocked_methods = set()
+
+    def connect(self, parameters, on_open_callback, on_open_error_callback, on_close_callback,
+                custom_ioloop):
+        connection = FakeConnection(broker=self,
+                                    on_open_callback=on_open_callback,
+                                    on_close_callback=on_close_callback)
+        self.connections.append(connection)
+        return connection
+
+    @property
+    def channel(self):
+        return self.connections[-1].channels[-1]
+
+    @property
+    def calls(self):
+        """The calls made on the last opened channel."""
+        if not self.connections or not self.connections[-1].channels:
+            return []
+        return self.channel.calls
+
+
+@pytest.mark.streams_mark
+class TestAmqpConnection(BaseTest):
+    def setUp(self):
+        super().setUp()
+        self.loop = asyncio.get_event_loop()
+        self.broker = FakeBroker(loop=self.loop)
+        for patcher in [patch('streams.consumers.adapters.AsyncioConnection', self.broker.connect),
+                        patch('streams.consumers.RECONNECT_DELAY', 0)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.connection = AmqpConnection(loop=self.loop)
+        self.addCleanup(self.connection.close)
+
+    def run_until(self, condition):
+        async def wait():
+            while not condition():
+                await asyncio.sleep(0.01)
+
+        self.loop.run_until_complete(asyncio.wait_for(wait(), timeout=5))
+
+    def run_coroutine(self, coroutine):
+        return self.loop.run_until_complete(asyncio.wait_for(coroutine, timeout=5))
+
+    def test_concurrent_consumers_share_the_connection(self):
+        consumers = [Consumer(routing_key='logs.sidecar.{}'.format(i),
+                              queue='queue{}'.format(i),
+                              connection=self.connection) for i in range(2)]
+        self.run_coroutine(asyncio.gather(*[consumer.consume() for consumer in consumers]))
+
+        assert len(self.broker.connections) == 1
+        assert self.connection.is_open is True
+        assert self.broker.calls == ['exchange_declare'] + [
+            'queue_declare', 'queue_declare', 'queue_bind', 'queue_bind',
+            'basic_consume', 'basic_consume']
+        assert self.connection.consumers == set(consumers)
+
+    def test_reconnect_restarts_the_consumers(self):
+        consumer = Consumer(routing_key='logs.sidecar.1',
+                            queue='queue1',
+                            connection=self.connection)
+        self.run_coroutine(consumer.consume())
+
+        # The broker closes the connection
+        self.broker.connections[0].close(reply_code=320, reply_text='CONNECTION_FORCED')
+        self.run_until(lambda: len(self.broker.connections) == 2 and
+                       'basic_consume' in self.broker.calls)
+
+        assert self.connection.is_open is True
+        assert self.broker.calls == [
+            'exchange_declare', 'queue_declare', 'queue_bind', 'basic_consume']
+        assert self.connection._pending == set()  # pylint:disable=protected-access
+
+    def test_channel_closed_during_rpc(self):
+        consumer = Consumer(routing_key='logs.sidecar.1',
+                            queue='queue1',
+                            connection=self.connection)
+        self.broker.blocked_methods.add('queue_bind')
+        consuming = asyncio.ensure_future(consumer.consume(), loop=self.loop)
+        self.run_until(lambda: 'queue_bind' in self.broker.calls)
+
+        # The pending RPC fails instead of waiting forever
+        self.broker.channel.close(reply_code=404, reply_text='NOT_FOUND')
+        with self.assertRaises(ChannelClosed):
+            self.run_coroutine(consuming)
+
+        # The consumer is restarted on a new connection
+        self.broker.blocked_methods.clear()
+        self.run_until(lambda: len(self.broker.connections) == 2 and
+                       'basic_consume' in self.broker.calls)
+        assert self.broker.connections[0].is_open is False
+        assert self.connection.is_open is True
+
+    def test_channel_closed_while_connecting(self):
+        self.broker.blocked_methods.add('exchange_declare')
+        connecting = asyncio.ensure_future(self.connection.get_channel(), loop=self.loop)
+        self.run_until(lambda: 'exchange_declare' in self.broker.calls)
+
+        # The connection attempt is retried
+        self.broker.blocked_methods.clear()
+        self.broker.channel.close(reply_code=404, reply_text='NOT_FOUND')
+        channel = self.run_coroutine(connecting)
+
+        assert len(self.broker.connections) == 2
+        assert channel is self.broker.channel
+        assert self.connection.is_open is True
@@ -0,0 +1,65 @@
+import asyncio
+import json
+
+import pytest
+
+from mock import MagicMock
+
+from streams.logs import LogsHub, get_num_lines
+from tests.utils import BaseTest
+
+
+class FailingConsumer(object):
+    def __init__(self):
+        self.stopped = False
+
+    async def consume(self):
+        raise ConnectionError('Could not connect to the broker')
+
+    async def stop(self):
+        self.stopped = True
+
+
+def get_message(log_lines):
+    return json.dumps({'log_lines': log_lines}).encode('utf-8')
+
+
+@pytest.mark.streams_mark
+class TestLogsHub(BaseTest):
+    def test_get_num_lines(self):
+        assert get_num_lines(get_message(['line1', 'line2'])) == 2
+        assert get_num_lines(get_message('line1')) == 1
+        assert get_num_lines(b'not json') == 1
+
+    def test_backlog_is_bounded(self):
+        hub = LogsHub(instance=MagicMock(), consumer=MagicMock(), backlog_lines=5)
+        for i in range(5):
+            hub.add_to_backlog(get_message(['line{}'.format(i), 'line{}'.format(i)]))
+
+        assert hub.num_backlog_lines == 4
+        assert [message for message, _ in hub.backlog] == [
+            get_message(['line3', 'line3']),
+            get_message(['line4', 'line4'])]
+
+    def test_backlog_keeps_last_message(self):
+        hub = LogsHub(instance=MagicMock(), consumer=MagicMock(), backlog_lines=2)
+        hub.add_to_backlog(get_message(['line'] * 10))
+        assert len(hub.backlog) == 1
+        assert hub.num_backlog_lines == 10
+
+    def test_failed_consume_stops_the_hub(self):
+        stopped_hubs = []
+        consumer = FailingConsumer()
+        hub = LogsHub(instance=MagicMock(),
+                      consumer=consumer,
+                      on_stop=lambda: stopped_hubs.append(hub))
+        hub.add_socket(MagicMock())
+        hub.start()
+        assert hub.is_running is True
+
+        loop = asyncio.get_event_loop()
+        with self.assertRaises(ConnectionError):
+            loop.run_until_complete(hub._task)  # pylint:disable=protected-access
+        assert hub.is_running is False
+        assert stopped_hubs == [hub]
+        assert consumer.stopped is True
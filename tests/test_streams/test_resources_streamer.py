@@ -0,0 +1,82 @@
+import asyncio
+import queue
+
+import pytest
+
+from mock import MagicMock
+
+from streams.resources import BaseResourcesStreamer
+from tests.utils import BaseTest
+
+
+class FakePubSub(object):
+    def __init__(self, payloads):
+        self.messages = queue.Queue()
+        for payload in payloads:
+            self.messages.put({'type': 'message', 'data': payload})
+        self.closed = False
+
+    def get_message(self, ignore_subscribe_messages=False, timeout=0):
+        try:
+            return self.messages.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.closed = True
+
+
+class FakeResourcesStreamer(BaseResourcesStreamer):
+    def __init__(self, pubsub, on_stop=None):
+        self.pubsub = pubsub
+        self.num_subscriptions = 0
+        super().__init__(instance=MagicMock(is_done=False), on_stop=on_stop)
+
+    def subscribe(self):
+        self.num_subscriptions += 1
+        return self.pubsub
+
+    def handle_payload(self, payload):
+        return payload.decode('utf-8')
+
+
+class FakeSocket(object):
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    async def close(self):
+        pass
+
+
+@pytest.mark.streams_mark
+class TestResourcesStreamer(BaseTest):
+    def test_payloads_are_sent_to_all_the_sockets(self):
+        stopped_streamers = []
+        pubsub = FakePubSub([b'resources1', b'resources2'])
+        streamer = FakeResourcesStreamer(pubsub=pubsub,
+                                         on_stop=lambda: stopped_streamers.append(streamer))
+        sockets = [FakeSocket(), FakeSocket()]
+
+        async def stream():
+            for ws in sockets:
+                streamer.add_socket(ws)
+                streamer.start()
+            task = streamer._task  # pylint:disable=protected-access
+            while any(len(ws.messages) < 2 for ws in sockets):
+                await asyncio.sleep(0.01)
+            streamer.remove_sockets(set(sockets))
+            await task
+
+        loop = asyncio.get_event_loop()
+        loop.run_until_complete(asyncio.wait_for(stream(), timeout=10))
+
+        # A single subscription is read, and closed once the last socket leaves
+        assert streamer.num_subscriptions == 1
+        assert [ws.messages for ws in sockets] == [['resources1', 'resources2']] * 2
+        assert streamer.is_running is False
+        assert stopped_streamers == [streamer]
+        loop.run_until_complete(asyncio.sleep(1))
+        assert pubsub.closed is True
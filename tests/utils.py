@@ -13,8 +13,10 @@ from rest_framework.authtoken.models import Token
 
 from django.conf import settings
 from django.core.cache import cache
+from django.db import connection
 from django.test import Client, TestCase
 from django.test.client import FakePayload
+from django.test.utils import CaptureQueriesContext
 
 from factories.factory_users import UserFactory
 from polyaxon.settings import RedisPools
@@ -287,3 +289,28 @@ class BaseViewTest(BaseTest):
             if not self.HAS_INTERNAL:
                 assert self.internal_client.get(self.url).status_code in (
                     status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN)
+
+
+class ListViewNumQueriesMixin(object):
+    """Checks that the number of queries of a list view does not depend on the number of objects.
+
+    `create_object` creates a listed object, with the related objects it serializes.
+    """
+
+    def create_object(self):
+        raise NotImplementedError
+
+    def test_get_num_queries_does_not_depend_on_the_number_of_objects(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        num_queries = len(queries)
+
+        for _ in range(5):
+            self.create_object()
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.auth_client.get(self.url)
+        assert resp.status_code == status.HTTP_200_OK
+        assert len(resp.data['results']) == self.num_objects + 5
+        assert resp.data['results'] == self.serializer_class(self.queryset, many=True).data
+        assert len(queries) == num_queries